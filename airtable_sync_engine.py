@@ -0,0 +1,258 @@
+"""
+Airtable Sync Engine - batched, diffed upserts keyed by a record field
+
+The job-board sync used to look every job up with table.all(formula=...) and
+then create or update it on its own: about 2N serial API calls for N jobs.
+AirtableSyncEngine instead:
+
+1. loads the table once (paged) into a key -> record map
+2. plans a field-level diff: new keys are created, existing records are
+   updated with only the fields whose values changed, identical records are
+   skipped, and stale records (per a caller-supplied filter) are deleted
+3. applies the plan in Airtable's maximum batch size (10 records per call)
+   under a rate limiter (5 requests/second per base), retrying 429s with
+   exponential backoff
+
+plan() alone is the dry run; SyncPlan.report() renders what would change.
+fake_airtable.FakeAirtableTable is an offline stand-in for tests.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+AIRTABLE_BATCH_SIZE = 10  # Airtable API limit per create/update/delete call
+AIRTABLE_PAGE_SIZE = 100  # Airtable API limit per list page
+AIRTABLE_REQUESTS_PER_SECOND = 5.0  # Airtable API limit per base
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart (thread-safe)"""
+
+    def __init__(self, rate_per_second: float = AIRTABLE_REQUESTS_PER_SECOND,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.waited = 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval
+        if start > now:
+            self.waited += start - now
+            self.sleep(start - now)
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp, truncated to the milliseconds Airtable stores (Supabase has microseconds)"""
+    if not isinstance(value, str) or len(value) < 19 or value[4] != '-' or value[10] not in 'T ':
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return dt.replace(microsecond=dt.microsecond // 1000 * 1000)
+
+
+def values_equal(current: Any, desired: Any) -> bool:
+    """Compare an Airtable field value with the value we would write"""
+    if current == desired:
+        return True
+    if current is None or desired is None:
+        return False
+    current_dt, desired_dt = _as_datetime(current), _as_datetime(desired)
+    if current_dt is not None and desired_dt is not None:
+        return current_dt == desired_dt
+    # Airtable trims long text and returns numbers as numbers
+    return str(current).strip() == str(desired).strip()
+
+
+@dataclass
+class SyncPlan:
+    """What a sync would do, before any write"""
+    creates: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)  # {'id', 'key', 'fields', 'changed'}
+    deletes: List[Dict[str, Any]] = field(default_factory=list)  # {'id', 'key'}
+    unchanged: int = 0
+    duplicate_keys: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'create': len(self.creates),
+            'update': len(self.updates),
+            'delete': len(self.deletes),
+            'unchanged': self.unchanged,
+            'duplicate_keys': len(self.duplicate_keys),
+            'write_calls': sum(-(-len(items) // AIRTABLE_BATCH_SIZE)
+                               for items in (self.creates, self.updates, self.deletes)),
+        }
+
+    def report(self, key_field: str = 'Job ID', limit: int = 20) -> str:
+        """Human-readable dry-run report"""
+        s = self.summary()
+        lines = [f"📋 Sync plan: {s['create']} create, {s['update']} update, {s['delete']} delete, "
+                 f"{s['unchanged']} unchanged ({s['write_calls']} write calls)"]
+        for record in self.creates[:limit]:
+            lines.append(f"   + {record.get(key_field)}: {record.get('Job Title', '')} @ {record.get('Company', '')}")
+        for update in self.updates[:limit]:
+            lines.append(f"   ~ {update['key']}: {', '.join(update['changed'])}")
+        for delete in self.deletes[:limit]:
+            lines.append(f"   - {delete['key']} ({delete['id']})")
+        hidden = sum(max(0, len(items) - limit) for items in (self.creates, self.updates, self.deletes))
+        if hidden:
+            lines.append(f"   ... and {hidden} more")
+        if self.duplicate_keys:
+            lines.append(f"⚠️ {len(self.duplicate_keys)} keys have duplicate Airtable records "
+                         f"(first one kept in sync): {', '.join(self.duplicate_keys[:limit])}")
+        return '\n'.join(lines)
+
+
+class AirtableSyncEngine:
+    """Batched create/update/delete of Airtable records keyed by one field"""
+
+    def __init__(self, table, key_field: str = 'Job ID', rate_limiter: Optional[RateLimiter] = None,
+                 batch_size: int = AIRTABLE_BATCH_SIZE, max_retries: int = 3,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            table: pyairtable Table (or fake_airtable.FakeAirtableTable)
+            key_field: Field that identifies a record (unique per job)
+            rate_limiter: Shared limiter (default: 5 requests/second)
+            batch_size: Records per write call (Airtable allows at most 10)
+            max_retries: Retries for rate-limited (429) calls
+            sleep: Backoff sleep (injectable for tests)
+        """
+        self.table = table
+        self.key_field = key_field
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.batch_size = min(batch_size, AIRTABLE_BATCH_SIZE)
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.api_calls = 0
+
+    def _call(self, fn: Callable, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            self.api_calls += 1
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if '429' in str(e) and attempt < self.max_retries:
+                    wait_time = 2 ** attempt  # Exponential backoff
+                    logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 1}/{self.max_retries}")
+                    self.sleep(wait_time)
+                else:
+                    raise
+
+    def load_existing(self, fields: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Page through the table once
+
+        Args:
+            fields: Fields to fetch (None = all); must include the key field
+
+        Returns:
+            key -> records with that key (normally exactly one)
+        """
+        options = {'page_size': AIRTABLE_PAGE_SIZE}
+        if fields:
+            options['fields'] = sorted(set(fields) | {self.key_field})
+        pages = self.table.iterate(**options)
+        existing: Dict[str, List[Dict]] = {}
+        while True:
+            self.rate_limiter.acquire()
+            page = next(pages, None)
+            if page is None:
+                break
+            self.api_calls += 1
+            for record in page:
+                key = record.get('fields', {}).get(self.key_field)
+                if key:
+                    existing.setdefault(str(key), []).append(record)
+        return existing
+
+    def plan(self, desired: Iterable[Dict[str, Any]], existing: Dict[str, List[Dict]],
+             delete_filter: Optional[Callable[[Dict[str, Any]], bool]] = None) -> SyncPlan:
+        """
+        Diff desired records against the loaded table
+
+        Args:
+            desired: Field dicts to write, each with the key field (first one wins per key)
+            existing: Output of load_existing()
+            delete_filter: fields -> True for existing records to delete
+                (records whose key is desired are never deleted)
+
+        Returns:
+            SyncPlan
+        """
+        plan = SyncPlan(duplicate_keys=sorted(k for k, records in existing.items() if len(records) > 1))
+        seen = set()
+        for record in desired:
+            key = str(record.get(self.key_field) or '')
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            current = existing.get(key)
+            if not current:
+                plan.creates.append(dict(record))
+                continue
+            current_fields = current[0].get('fields', {})
+            changed = {name: value for name, value in record.items()
+                       if not values_equal(current_fields.get(name), value)}
+            if changed:
+                plan.updates.append({'id': current[0]['id'], 'key': key, 'fields': changed,
+                                     'changed': sorted(changed)})
+            else:
+                plan.unchanged += 1
+
+        if delete_filter is not None:
+            for key, records in existing.items():
+                if key in seen:
+                    continue
+                plan.deletes.extend({'id': r['id'], 'key': key} for r in records if delete_filter(r.get('fields', {})))
+        return plan
+
+    def apply(self, plan: SyncPlan) -> Dict[str, int]:
+        """
+        Write a plan in batches
+
+        Returns:
+            Counts of created, updated, deleted records and failed batches
+        """
+        result = {'created': 0, 'updated': 0, 'deleted': 0, 'errors': 0}
+        steps = (
+            ('deleted', [d['id'] for d in plan.deletes], self.table.batch_delete),
+            ('created', plan.creates, self.table.batch_create),
+            ('updated', [{'id': u['id'], 'fields': u['fields']} for u in plan.updates], self.table.batch_update),
+        )
+        for label, items, write in steps:
+            for i in range(0, len(items), self.batch_size):
+                batch = items[i:i + self.batch_size]
+                try:
+                    self._call(write, batch)
+                    result[label] += len(batch)
+                except Exception as e:
+                    result['errors'] += 1
+                    logger.error(f"❌ Failed to write batch of {len(batch)} ({label}): {e}")
+        return result
+
+    def sync(self, desired: Iterable[Dict[str, Any]], delete_filter: Optional[Callable[[Dict], bool]] = None,
+             dry_run: bool = False, fields: Optional[List[str]] = None):
+        """
+        Load, diff and (unless dry_run) apply
+
+        Returns:
+            Tuple of (plan, write result or None for a dry run)
+        """
+        plan = self.plan(desired, self.load_existing(fields), delete_filter)
+        return plan, (None if dry_run else self.apply(plan))
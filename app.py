@@ -1260,7 +1260,7 @@ def show_analytics_dashboard(coach, coach_manager):
     # Import required modules
     from datetime import datetime, timedelta, timezone
     # pandas already imported globally
-    from supabase_utils import fetch_click_events, fetch_candidate_clicks
+    from supabase_utils import fetch_click_rollups, fetch_candidate_clicks
     
     # Default analytics settings - no user controls needed
     since_days = 14  # Default to last 2 weeks
@@ -1282,19 +1282,13 @@ def show_analytics_dashboard(coach, coach_manager):
     else:
         start_date = end_date - timedelta(days=since_days)
 
-    # Fetch all click events within the date range
-    all_clicks_df = fetch_click_events(start_date, end_date)
-
-    if all_clicks_df.empty:
-        st.info("No click data available for the selected period and filters.")
-        return
-
-    # Apply coach filter
+    # Coach filter (server-side)
+    coach_username = None
     if coach_filter == "My Free Agents":
-        all_clicks_df = all_clicks_df[all_clicks_df['coach_username'] == coach.username]
+        coach_username = coach.username
     elif coach_filter == "Specific Coach" and selected_coach:
         # Need to map selected_coach name back to username
-        target_coach_username = next(
+        coach_username = next(
             (
                 c.username
                 for c in coach_manager.coaches.values()
@@ -1303,70 +1297,62 @@ def show_analytics_dashboard(coach, coach_manager):
             ),
             None,
         )
-        if target_coach_username:
-            all_clicks_df = all_clicks_df[all_clicks_df['coach_username'] == target_coach_username]
-        else:
+        if not coach_username:
             st.warning(f"Could not find username for selected coach: {selected_coach}")
-            all_clicks_df = pd.DataFrame() # Empty dataframe if coach not found
+            st.info("No click data available for the selected period and filters.")
+            return
     # Admin View (All) means no filter needed
 
-    # Apply Free Agent search filter
+    # Free Agent search filter (server-side)
+    candidate_ids = None
     if airtable_matches:
-        matched_uuids = [m['uuid'] for m in airtable_matches if m['uuid']]
-        if matched_uuids:
-            all_clicks_df = all_clicks_df[all_clicks_df['candidate_id'].isin(matched_uuids)]
-        else:
-            all_clicks_df = pd.DataFrame() # No UUIDs from search, so no clicks
+        candidate_ids = [m['uuid'] for m in airtable_matches if m['uuid']]
 
-    if all_clicks_df.empty:
-        st.info("No click data available after applying Free Agent filters.")
-        return
+    # Stream click events within the date range and aggregate while paging
+    rollups = fetch_click_rollups(start_date, end_date, coach_username=coach_username,
+                                  candidate_ids=candidate_ids)
+    totals = rollups['totals']
 
-    total_clicks = len(all_clicks_df)
-    unique_clicks = all_clicks_df['click_id'].nunique()
-    unique_agents = all_clicks_df['candidate_id'].nunique()
-    unique_jobs = all_clicks_df['target_url'].nunique()
+    if totals['total_clicks'] == 0:
+        st.info("No click data available for the selected period and filters.")
+        return
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Clicks", total_clicks)
+        st.metric("Total Clicks", totals['total_clicks'])
     with col2:
-        st.metric("Unique Clicks", unique_clicks)
+        st.metric("Unique Clicks", totals['unique_clicks'])
     with col3:
-        st.metric("Unique Free Agents", unique_agents)
+        st.metric("Unique Free Agents", totals['unique_agents'])
     with col4:
-        st.metric("Unique Jobs Clicked", unique_jobs)
+        st.metric("Unique Jobs Clicked", totals['unique_jobs'])
 
     st.markdown("### 📊 Click Activity Over Time")
-    # Group by date and count clicks
-    clicks_over_time = all_clicks_df.groupby(all_clicks_df['timestamp'].dt.date).size().reset_index(name='clicks')
-    clicks_over_time.columns = ['Date', 'Clicks']
+    clicks_over_time = rollups['daily'].rename(columns={'date': 'Date', 'clicks': 'Clicks'})
     st.line_chart(clicks_over_time, x='Date', y='Clicks')
 
     st.markdown("### 🔝 Top Clicked Jobs")
-    top_jobs = all_clicks_df['target_url'].value_counts().reset_index(name='clicks')
-    top_jobs.columns = ['Job URL', 'Clicks']
+    top_jobs = rollups['jobs'].rename(columns={'target_url': 'Job URL', 'clicks': 'Clicks'})
     st.dataframe(top_jobs.head(10), width="stretch")
 
     st.markdown("### 👥 Free Agent Engagement")
-    # Aggregate clicks by candidate
-    agent_engagement = all_clicks_df.groupby('candidate_id').agg(
-        total_clicks=('click_id', 'count'),
-        unique_jobs_clicked=('target_url', 'nunique')
-    ).reset_index()
+    agent_engagement = rollups['agents'].copy()
 
-    # Try to get agent names from Airtable matches if available, otherwise use UUID
+    # Try to get agent names from Airtable matches if available, otherwise click data, otherwise UUID
     if airtable_matches:
         uuid_to_name = {m['uuid']: m['name'] for m in airtable_matches if m['uuid']}
         agent_engagement['Agent Name'] = agent_engagement['candidate_id'].map(uuid_to_name).fillna(agent_engagement['candidate_id'])
     else:
-        agent_engagement['Agent Name'] = agent_engagement['candidate_id']
-    
-    agent_engagement = agent_engagement.sort_values(by='total_clicks', ascending=False)
+        agent_engagement['Agent Name'] = agent_engagement['candidate_name'].fillna(agent_engagement['candidate_id'])
+    agent_engagement = agent_engagement.drop(columns=['candidate_name'])
     st.dataframe(agent_engagement, width="stretch")
 
+    st.markdown("### 🗺️ Clicks by Market")
+    st.dataframe(rollups['markets'].rename(columns={'market': 'Market', 'clicks': 'Clicks'}), width="stretch")
+
     st.markdown("### 📋 Raw Click Data")
-    st.dataframe(all_clicks_df, width="stretch")
+    st.caption(f"Most recent {len(rollups['recent'])} of {totals['total_clicks']} clicks")
+    st.dataframe(rollups['recent'], width="stretch")
 
     # --- New: Coach Performance Analytics ---
     st.markdown("### 📊 Coach Performance Analytics")
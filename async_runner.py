@@ -0,0 +1,46 @@
+"""
+Async Runner
+Runs a coroutine to completion from synchronous code.
+
+The pipeline's async clients (Outscraper ingestion, Indeed link checks,
+Short.io batches) are called from plain functions, sometimes on a thread that
+already runs an event loop (Streamlit, notebooks). asyncio.run() refuses to
+nest, so in that case the coroutine gets its own loop on a helper thread and
+the caller blocks until it finishes. The helper thread runs in a copy of the
+caller's context, so context variables (the run's active performance monitor)
+carry over.
+"""
+
+import asyncio
+import contextvars
+import threading
+
+
+def run_coroutine_sync(coro):
+    """
+    Run a coroutine to completion, off-thread if this thread already has a loop.
+
+    Args:
+        coro: coroutine object to run
+
+    Returns:
+        The coroutine's result (its exception is re-raised in the caller)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    outcome = {}
+
+    def runner():
+        try:
+            outcome['value'] = asyncio.run(coro)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(runner,), daemon=True)
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
@@ -11,6 +11,9 @@ Usage:
 
 Features:
 - Processes scheduled Indeed and Google Jobs
+- Queries only due jobs and claims each one atomically (safe to run several schedulers)
+- Runs jobs in parallel on a bounded worker pool with per-job timeouts
+- Adaptive polling with queue-depth and lag metrics (see job_scheduler_core)
 - Handles recurring schedules (daily, weekly)
 - Proper error handling and logging
 - Never stops running (daemon mode)
@@ -32,6 +35,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import our job management system
 try:
     from async_job_manager import AsyncJobManager, AsyncJob
+    from job_scheduler_core import SchedulerCore, SupabaseJobQueue
     from supabase_utils import get_client
 except ImportError as e:
     print(f"❌ Failed to import required modules: {e}")
@@ -39,11 +43,11 @@ except ImportError as e:
     sys.exit(1)
 
 class BackgroundJobScheduler:
-    def __init__(self):
+    def __init__(self, queue=None):
         self.running = True
         self.job_manager = AsyncJobManager()
         self.supabase_client = get_client()
-        self.check_interval = 60  # Check every 60 seconds
+        self.check_interval = 60  # Idle polling ceiling; the core polls sooner when jobs are due
 
         # Setup logging
         logging.basicConfig(
@@ -56,6 +60,10 @@ class BackgroundJobScheduler:
         )
         self.logger = logging.getLogger(__name__)
 
+        self.queue = queue or (SupabaseJobQueue(self.supabase_client) if self.supabase_client else None)
+        self.core = SchedulerCore(self.queue, self._run_claimed_job, max_interval=self.check_interval,
+                                  logger=self.logger) if self.queue else None
+
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -67,56 +75,45 @@ class BackgroundJobScheduler:
         self.logger.info(f"📥 Received signal {signum}, shutting down gracefully...")
         self.running = False
 
-    def get_ready_scheduled_jobs(self) -> List[AsyncJob]:
-        """Get all scheduled jobs that are ready to run"""
-        if not self.supabase_client:
+    def _row_to_job(self, job_data: dict) -> AsyncJob:
+        """Convert an async_job_queue row to an AsyncJob"""
+        return AsyncJob(
+            id=job_data['id'],
+            scheduled_search_id=job_data.get('scheduled_search_id'),
+            coach_username=job_data['coach_username'],
+            job_type=job_data['job_type'],
+            request_id=job_data.get('request_id'),
+            status=job_data['status'],
+            search_params=job_data['search_params'],
+            submitted_at=job_data.get('submitted_at'),
+            completed_at=job_data.get('completed_at'),
+            result_count=job_data.get('result_count', 0),
+            quality_job_count=job_data.get('quality_job_count', 0),
+            error_message=job_data.get('error_message'),
+            csv_filename=job_data.get('csv_filename'),
+            created_at=datetime.fromisoformat(job_data['created_at'].replace('Z', '+00:00'))
+        )
+
+    def get_ready_scheduled_jobs(self, limit: int = 50) -> List[AsyncJob]:
+        """Get scheduled jobs that are ready to run (due rows only, oldest first)"""
+        if not self.queue:
             self.logger.error("❌ Supabase client not available")
             return []
 
         try:
-            now = datetime.now(timezone.utc)
-
-            # Query for scheduled jobs that are ready to run
-            result = self.supabase_client.table('async_job_queue').select('*').eq('status', 'scheduled').execute()
-
-            ready_jobs = []
-            for job_data in result.data:
-                # Check if job has a scheduled_run_at time
-                scheduled_run_at = job_data.get('scheduled_run_at')
-                if not scheduled_run_at:
-                    continue
-
-                # Parse the scheduled time
-                try:
-                    run_time = datetime.fromisoformat(scheduled_run_at.replace('Z', '+00:00'))
-                    if run_time <= now:
-                        # Convert to AsyncJob object
-                        job = AsyncJob(
-                            id=job_data['id'],
-                            scheduled_search_id=job_data.get('scheduled_search_id'),
-                            coach_username=job_data['coach_username'],
-                            job_type=job_data['job_type'],
-                            request_id=job_data.get('request_id'),
-                            status=job_data['status'],
-                            search_params=job_data['search_params'],
-                            submitted_at=job_data.get('submitted_at'),
-                            completed_at=job_data.get('completed_at'),
-                            result_count=job_data['result_count'],
-                            quality_job_count=job_data['quality_job_count'],
-                            error_message=job_data.get('error_message'),
-                            csv_filename=job_data.get('csv_filename'),
-                            created_at=datetime.fromisoformat(job_data['created_at'].replace('Z', '+00:00'))
-                        )
-                        ready_jobs.append(job)
-                except ValueError as e:
-                    self.logger.warning(f"⚠️ Invalid scheduled_run_at format for job {job_data['id']}: {e}")
-
-            return ready_jobs
-
+            rows = self.queue.fetch_due(datetime.now(timezone.utc), limit)
         except Exception as e:
             self.logger.error(f"❌ Error getting ready scheduled jobs: {e}")
             return []
 
+        ready_jobs = []
+        for job_data in rows:
+            try:
+                ready_jobs.append(self._row_to_job(job_data))
+            except (KeyError, ValueError, AttributeError) as e:
+                self.logger.warning(f"⚠️ Skipping malformed scheduled job {job_data.get('id')}: {e}")
+        return ready_jobs
+
     def execute_indeed_job(self, job: AsyncJob) -> bool:
         """Execute a scheduled Indeed job"""
         try:
@@ -172,13 +169,14 @@ class BackgroundJobScheduler:
                 except Exception as e:
                     self.logger.warning(f"⚠️ Failed to store jobs to Supabase for job {job.id}: {e}")
 
-                # Update job as completed
-                self.job_manager.update_job(job.id, {
+                # Update job as completed (unless the scheduler already failed it for a timeout)
+                if not self._finish_job(job.id, {
                     'status': 'completed',
                     'completed_at': datetime.now(timezone.utc).isoformat(),
                     'result_count': result_count,
                     'quality_job_count': quality_count
-                })
+                }):
+                    return False
 
                 # Send notification to coach
                 self.job_manager.notify_coach(
@@ -195,11 +193,12 @@ class BackgroundJobScheduler:
                 error_msg = metadata.get('error_message', 'Unknown error during pipeline execution')
                 self.logger.error(f"❌ Indeed job {job.id} failed: {error_msg}")
 
-                self.job_manager.update_job(job.id, {
+                if not self._finish_job(job.id, {
                     'status': 'failed',
                     'completed_at': datetime.now(timezone.utc).isoformat(),
                     'error_message': error_msg
-                })
+                }):
+                    return False
 
                 self.job_manager.notify_coach(
                     job.coach_username,
@@ -215,11 +214,12 @@ class BackgroundJobScheduler:
             self.logger.error(f"❌ Error executing Indeed job {job.id}: {error_msg}")
             self.logger.error(traceback.format_exc())
 
-            self.job_manager.update_job(job.id, {
+            if not self._finish_job(job.id, {
                 'status': 'failed',
                 'completed_at': datetime.now(timezone.utc).isoformat(),
                 'error_message': error_msg
-            })
+            }):
+                return False
 
             self.job_manager.notify_coach(
                 job.coach_username,
@@ -240,11 +240,12 @@ class BackgroundJobScheduler:
             submitted_job = self.job_manager.submit_google_search(job.search_params, job.coach_username)
 
             # Update the original scheduled job to mark it as submitted
-            self.job_manager.update_job(job.id, {
+            if not self._finish_job(job.id, {
                 'status': 'submitted_async',
                 'submitted_at': datetime.now(timezone.utc).isoformat(),
                 'request_id': submitted_job.request_id
-            })
+            }):
+                return False
 
             self.logger.info(f"✅ Google job {job.id} submitted to async system with request_id: {submitted_job.request_id}")
 
@@ -262,11 +263,12 @@ class BackgroundJobScheduler:
             self.logger.error(f"❌ Error executing Google job {job.id}: {error_msg}")
             self.logger.error(traceback.format_exc())
 
-            self.job_manager.update_job(job.id, {
+            if not self._finish_job(job.id, {
                 'status': 'failed',
                 'completed_at': datetime.now(timezone.utc).isoformat(),
                 'error_message': error_msg
-            })
+            }):
+                return False
 
             self.job_manager.notify_coach(
                 job.coach_username,
@@ -342,61 +344,79 @@ class BackgroundJobScheduler:
             self.logger.error(f"❌ Error handling recurring job {job.id}: {e}")
             return False
 
-    def process_ready_jobs(self):
-        """Main job processing loop"""
-        ready_jobs = self.get_ready_scheduled_jobs()
-
-        if not ready_jobs:
-            return
+    def _finish_job(self, job_id, updates: dict) -> bool:
+        """
+        Write a claimed job's final status
 
-        self.logger.info(f"📋 Found {len(ready_jobs)} ready scheduled jobs")
-
-        for job in ready_jobs:
-            try:
-                self.logger.info(f"🎯 Processing job {job.id} ({job.job_type}) for {job.coach_username}")
-
-                success = False
-                if job.job_type == 'indeed_jobs':
-                    success = self.execute_indeed_job(job)
-                elif job.job_type == 'google_jobs':
-                    success = self.execute_google_job(job)
-                else:
-                    self.logger.warning(f"⚠️ Unknown job type: {job.job_type}")
-                    continue
-
-                # Handle recurring schedules
-                if success:
-                    self.handle_recurring_job(job)
+        Returns:
+            False if the job is no longer claimed (the scheduler failed it for a
+            timeout) - the late result is dropped and the caller should stop there
+        """
+        if not self.queue:
+            return self.job_manager.update_job(job_id, updates)
+        try:
+            if self.queue.finish(job_id, updates):
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Error finishing job {job_id}: {e}")
+            return False
+        self.logger.warning(f"⚠️ Job {job_id} is no longer claimed (timed out) - dropping its "
+                            f"'{updates.get('status')}' result")
+        return False
+
+    def _run_claimed_job(self, job_data: dict) -> bool:
+        """Worker-pool entry point: run one claimed job and handle its recurrence"""
+        job = self._row_to_job(job_data)
+        self.logger.info(f"🎯 Processing job {job.id} ({job.job_type}) for {job.coach_username}")
+
+        if job.job_type == 'indeed_jobs':
+            success = self.execute_indeed_job(job)
+        elif job.job_type == 'google_jobs':
+            success = self.execute_google_job(job)
+        else:
+            self.logger.warning(f"⚠️ Unknown job type: {job.job_type}")
+            self._finish_job(job.id, {
+                'status': 'failed',
+                'completed_at': datetime.now(timezone.utc).isoformat(),
+                'error_message': f"Unknown job type: {job.job_type}"
+            })
+            return False
 
-            except Exception as e:
-                self.logger.error(f"❌ Error processing job {job.id}: {e}")
-                self.logger.error(traceback.format_exc())
+        # Handle recurring schedules
+        if success:
+            self.handle_recurring_job(job)
+        return success
 
-                # Mark job as failed
-                self.job_manager.update_job(job.id, {
-                    'status': 'failed',
-                    'completed_at': datetime.now(timezone.utc).isoformat(),
-                    'error_message': str(e)
-                })
+    def process_ready_jobs(self) -> int:
+        """Claim due jobs and start them on the worker pool"""
+        if not self.core:
+            self.logger.error("❌ Supabase client not available")
+            return 0
+
+        started = self.core.poll_once()
+        metrics = self.core.metrics()
+        if started or metrics['queue_depth']:
+            self.logger.info(
+                f"📋 Started {started} jobs | due {metrics['queue_depth']} | lag {metrics['lag_seconds']:.0f}s | "
+                f"running {metrics['running']}/{metrics['max_workers']} | next poll {metrics['next_interval']:.0f}s"
+            )
+        return started
 
     def run(self):
         """Main scheduler loop - runs forever"""
         self.logger.info("🚀 Background Job Scheduler starting...")
-        self.logger.info(f"⏰ Checking for scheduled jobs every {self.check_interval} seconds")
+        self.logger.info(f"⏰ Polling for due jobs every {self.core.min_interval if self.core else self.check_interval:.0f}-{self.check_interval}s")
 
         while self.running:
             try:
-                start_time = time.time()
-
-                # Process ready jobs
+                # Process ready jobs; the core picks the next interval from the queue state
                 self.process_ready_jobs()
+                sleep_time = self.core.next_interval if self.core else self.check_interval
 
-                # Calculate sleep time (accounting for processing time)
-                processing_time = time.time() - start_time
-                sleep_time = max(0, self.check_interval - processing_time)
-
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                # Sleep in short steps so shutdown signals are handled promptly
+                deadline = time.time() + sleep_time
+                while self.running and time.time() < deadline:
+                    time.sleep(max(0.0, min(1.0, deadline - time.time())))
 
             except KeyboardInterrupt:
                 self.logger.info("⏹️ Received interrupt signal, shutting down...")
@@ -406,6 +426,9 @@ class BackgroundJobScheduler:
                 self.logger.error(traceback.format_exc())
                 time.sleep(self.check_interval)  # Sleep before retrying
 
+        if self.core:
+            self.logger.info("⏳ Waiting for running jobs to finish...")
+            self.core.shutdown(wait=True)
         self.logger.info("🔚 Background Job Scheduler stopped")
 
 def main():
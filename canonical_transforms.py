@@ -4,6 +4,7 @@ Pure functions that operate on the single canonical DataFrame
 Each function only adds/updates its namespace - no deletions or overwrites
 """
 
+import numpy as np
 import pandas as pd
 import re
 import hashlib
@@ -72,6 +73,91 @@ def _extract_salary_fields(salary_snippet) -> Dict[str, Any]:
     
     return fields
 
+def _parse_salary(salary_text: str) -> Dict[str, Any]:
+    """Parse salary text into structured components"""
+    if pd.isna(salary_text) or salary_text == '':
+        return {
+            'display': '',
+            'min': None,
+            'max': None,
+            'unit': None,  # Use None instead of empty string for validation
+            'currency': 'USD'
+        }
+    
+    salary_text = str(salary_text).strip()
+    
+    # Handle JSON salary data from Indeed/Outscraper
+    if salary_text.startswith('{') and 'baseSalary' in salary_text:
+        try:
+            import ast
+            salary_dict = ast.literal_eval(salary_text)
+            base_salary = salary_dict.get('baseSalary', {})
+            if isinstance(base_salary, dict):
+                salary_range = base_salary.get('range', {})
+                if isinstance(salary_range, dict):
+                    min_val = salary_range.get('min')
+                    max_val = salary_range.get('max')
+                    # Map unitOfWork to valid schema values
+                    raw_unit = base_salary.get('unitOfWork', 'YEAR').upper()
+                    unit_mapping = {
+                        'HOUR': 'hour', 'HOURLY': 'hour', 'HR': 'hour',
+                        'WEEK': 'week', 'WEEKLY': 'week', 'WK': 'week',
+                        'MONTH': 'month', 'MONTHLY': 'month', 'MON': 'month',
+                        'YEAR': 'year', 'YEARLY': 'year', 'ANNUAL': 'year', 'YR': 'year'
+                    }
+                    unit = unit_mapping.get(raw_unit, 'year')
+                    currency = salary_dict.get('currencyCode', 'USD')
+                    
+                    # Create display text
+                    if min_val and max_val:
+                        display = f"${min_val:,} - ${max_val:,} per {unit}"
+                    elif min_val:
+                        display = f"${min_val:,} per {unit}"
+                    else:
+                        display = ""
+                    
+                    return {
+                        'display': display,
+                        'min': min_val,
+                        'max': max_val,
+                        'unit': unit,
+                        'currency': currency
+                    }
+        except (ValueError, SyntaxError, KeyError):
+            pass
+    
+    # Extract numbers using regex (fallback for simple salary strings)
+    numbers = re.findall(r'[\d,]+(?:\.\d{2})?', salary_text)
+    numbers = [float(n.replace(',', '')) for n in numbers if n and n.strip() and ',' not in n.strip()]
+    
+    # Determine unit
+    if 'hour' in salary_text.lower():
+        unit = 'hour'
+    elif 'week' in salary_text.lower():
+        unit = 'week'
+    elif 'month' in salary_text.lower():
+        unit = 'month'
+    elif 'year' in salary_text.lower():
+        unit = 'year'
+    else:
+        unit = 'year'  # Default assumption
+    
+    # Set min/max
+    if len(numbers) >= 2:
+        salary_min, salary_max = min(numbers), max(numbers)
+    elif len(numbers) == 1:
+        salary_min = salary_max = numbers[0]
+    else:
+        salary_min = salary_max = None
+    
+    return {
+        'display': salary_text,
+        'min': salary_min,
+        'max': salary_max,
+        'unit': unit,
+        'currency': 'USD'
+    }
+
 # ==============================================================================
 # STAGE 1: INGESTION TRANSFORMS
 # ==============================================================================
@@ -496,91 +582,6 @@ def transform_normalize(df: pd.DataFrame) -> pd.DataFrame:
             # Single word - assume it's a city
             return location, '', location
     
-    def parse_salary(salary_text: str) -> Dict[str, Any]:
-        """Parse salary text into structured components"""
-        if pd.isna(salary_text) or salary_text == '':
-            return {
-                'display': '',
-                'min': None,
-                'max': None,
-                'unit': None,  # Use None instead of empty string for validation
-                'currency': 'USD'
-            }
-        
-        salary_text = str(salary_text).strip()
-        
-        # Handle JSON salary data from Indeed/Outscraper
-        if salary_text.startswith('{') and 'baseSalary' in salary_text:
-            try:
-                import ast
-                salary_dict = ast.literal_eval(salary_text)
-                base_salary = salary_dict.get('baseSalary', {})
-                if isinstance(base_salary, dict):
-                    salary_range = base_salary.get('range', {})
-                    if isinstance(salary_range, dict):
-                        min_val = salary_range.get('min')
-                        max_val = salary_range.get('max')
-                        # Map unitOfWork to valid schema values
-                        raw_unit = base_salary.get('unitOfWork', 'YEAR').upper()
-                        unit_mapping = {
-                            'HOUR': 'hour', 'HOURLY': 'hour', 'HR': 'hour',
-                            'WEEK': 'week', 'WEEKLY': 'week', 'WK': 'week',
-                            'MONTH': 'month', 'MONTHLY': 'month', 'MON': 'month',
-                            'YEAR': 'year', 'YEARLY': 'year', 'ANNUAL': 'year', 'YR': 'year'
-                        }
-                        unit = unit_mapping.get(raw_unit, 'year')
-                        currency = salary_dict.get('currencyCode', 'USD')
-                        
-                        # Create display text
-                        if min_val and max_val:
-                            display = f"${min_val:,} - ${max_val:,} per {unit}"
-                        elif min_val:
-                            display = f"${min_val:,} per {unit}"
-                        else:
-                            display = ""
-                        
-                        return {
-                            'display': display,
-                            'min': min_val,
-                            'max': max_val,
-                            'unit': unit,
-                            'currency': currency
-                        }
-            except (ValueError, SyntaxError, KeyError):
-                pass
-        
-        # Extract numbers using regex (fallback for simple salary strings)
-        numbers = re.findall(r'[\d,]+(?:\.\d{2})?', salary_text)
-        numbers = [float(n.replace(',', '')) for n in numbers if n and n.strip() and ',' not in n.strip()]
-        
-        # Determine unit
-        if 'hour' in salary_text.lower():
-            unit = 'hour'
-        elif 'week' in salary_text.lower():
-            unit = 'week'
-        elif 'month' in salary_text.lower():
-            unit = 'month'
-        elif 'year' in salary_text.lower():
-            unit = 'year'
-        else:
-            unit = 'year'  # Default assumption
-        
-        # Set min/max
-        if len(numbers) >= 2:
-            salary_min, salary_max = min(numbers), max(numbers)
-        elif len(numbers) == 1:
-            salary_min = salary_max = numbers[0]
-        else:
-            salary_min = salary_max = None
-        
-        return {
-            'display': salary_text,
-            'min': salary_min,
-            'max': salary_max,
-            'unit': unit,
-            'currency': 'USD'
-        }
-    
     # Debug: Check source fields before normalization
     if len(df) > 0:
         sample_row = df.iloc[0]
@@ -604,7 +605,7 @@ def transform_normalize(df: pd.DataFrame) -> pd.DataFrame:
     normalized_fields['norm.location'] = location_data.apply(lambda x: x[2])
     
     # Parse salaries
-    salary_data = df['source.salary_raw'].apply(parse_salary)
+    salary_data = df['source.salary_raw'].apply(_parse_salary)
     normalized_fields['norm.salary_display'] = salary_data.apply(lambda x: x['display'])
     normalized_fields['norm.salary_min'] = salary_data.apply(lambda x: x['min'])
     normalized_fields['norm.salary_max'] = salary_data.apply(lambda x: x['max'])
@@ -830,10 +831,44 @@ def transform_business_rules(df: pd.DataFrame, filter_settings: Dict[str, bool]
 # STAGE 4: AI CLASSIFICATION TRANSFORM
 # ==============================================================================
 
+# Fields written by the AI classification stage, with the value used when a job
+# has no classification (and when a preserved row lacks the column)
+AI_FIELD_DEFAULTS = {
+    'ai.match': '',  # Empty = not classified
+    'ai.reason': '',
+    'ai.summary': '',
+    'ai.normalized_location': '',
+    'ai.fair_chance': 'no_requirements_mentioned',
+    'ai.endorsements': 'none_required',
+    'ai.route_type': '',
+    'ai.career_pathway': 'cdl_pathway',  # Default to CDL pathway
+    'ai.training_provided': False,
+}
+
+# Classifier result key and fallback for each AI field
+AI_RESULT_FIELDS = {
+    'ai.match': ('match', 'error'),
+    'ai.reason': ('reason', 'No reason provided'),
+    'ai.summary': ('summary', 'No summary provided'),
+    'ai.normalized_location': ('normalized_location', ''),
+    'ai.fair_chance': ('fair_chance', 'no_requirements_mentioned'),
+    'ai.endorsements': ('endorsements', 'none_required'),
+    'ai.route_type': ('route_type', 'Unknown'),
+    # Pathway classifier fields; CDL results fall back to the CDL defaults
+    'ai.career_pathway': ('career_pathway', 'cdl_pathway'),
+    'ai.training_provided': ('training_provided', False),
+}
+
 def transform_ai_classification(df: pd.DataFrame, ai_results: Dict[str, Dict], job_ids_classified: set = None) -> pd.DataFrame:
     """
     Apply AI classification results - fills ai.* fields only
     
+    Results are joined on id.job in one pass (no per-job DataFrame scans):
+    - If the FIRST row for a job_id already has ai.match, every row with that
+      job_id keeps that row's existing ai.* values (memory jobs, etc.)
+    - Otherwise the job gets its entry from ai_results, or neutral defaults if
+      the AI didn't return a result (API errors, filtering during AI processing)
+    
     Args:
         df: DataFrame with jobs ready for classification
         ai_results: Dictionary mapping job_id to AI classification results
@@ -841,72 +876,44 @@ def transform_ai_classification(df: pd.DataFrame, ai_results: Dict[str, Dict], j
     Returns:
         DataFrame with ai.* fields populated
     """
-    def apply_ai_result(job_id: str) -> Dict[str, Any]:
-        """Apply AI result for a specific job"""
-        # Check if this job has already been classified (memory jobs, etc.)
-        current_row = df[df['id.job'] == job_id].iloc[0] if not df[df['id.job'] == job_id].empty else None
-        if current_row is not None and current_row.get('ai.match') and str(current_row.get('ai.match')).strip():
-            # Job already has classification - preserve existing values
-            return {
-                'ai.match': current_row.get('ai.match', ''),
-                'ai.reason': current_row.get('ai.reason', ''),
-                'ai.summary': current_row.get('ai.summary', ''),
-                'ai.normalized_location': current_row.get('ai.normalized_location', ''),
-                'ai.fair_chance': current_row.get('ai.fair_chance', 'no_requirements_mentioned'),
-                'ai.endorsements': current_row.get('ai.endorsements', 'none_required'),
-                'ai.route_type': current_row.get('ai.route_type', ''),
-                'ai.career_pathway': current_row.get('ai.career_pathway', 'cdl_pathway'),
-                'ai.training_provided': current_row.get('ai.training_provided', False)
-            }
-        
-        if job_id not in ai_results:
-            # Job was eligible for classification but AI didn't return a result
-            # This could be due to API errors, filtering during AI processing, etc.
-            # Use neutral defaults that won't break routing
-            return {
-                'ai.match': '',  # Empty = not classified
-                'ai.reason': '',
-                'ai.summary': '',
-                'ai.normalized_location': '',
-                'ai.fair_chance': 'no_requirements_mentioned',
-                'ai.endorsements': 'none_required',
-                'ai.route_type': '',
-                'ai.career_pathway': 'cdl_pathway',  # Default to CDL pathway
-                'ai.training_provided': False
-            }
-        
-        result = ai_results[job_id]
-        ai_result = {
-            'ai.match': result.get('match', 'error'),
-            'ai.reason': result.get('reason', 'No reason provided'),
-            'ai.summary': result.get('summary', 'No summary provided'),
-            'ai.normalized_location': result.get('normalized_location', ''),
-            'ai.fair_chance': result.get('fair_chance', 'no_requirements_mentioned'),
-            'ai.endorsements': result.get('endorsements', 'none_required'),
-            'ai.route_type': result.get('route_type', 'Unknown')
-        }
-
-        # Handle career pathway fields (from pathway classifier)
-        if 'career_pathway' in result:
-            ai_result['ai.career_pathway'] = result.get('career_pathway', 'cdl_pathway')
-        else:
-            # For CDL jobs, set career_pathway to 'cdl_pathway'
-            ai_result['ai.career_pathway'] = 'cdl_pathway'
-
-        if 'training_provided' in result:
-            ai_result['ai.training_provided'] = result.get('training_provided', False)
-        else:
-            # Default for CDL jobs
-            ai_result['ai.training_provided'] = False
-
-        return ai_result
+    job_ids = df['id.job'] if 'id.job' in df.columns else pd.Series(index=df.index, dtype=object)
+    
+    # Existing classification, taken from the first row of each job_id
+    existing_cols = [col for col in AI_FIELD_DEFAULTS if col in df.columns]
+    first_rows = (
+        df.loc[job_ids.notna(), ['id.job'] + existing_cols]
+        .drop_duplicates('id.job', keep='first')
+        .set_index('id.job')
+    )
+    if 'ai.match' in first_rows.columns:
+        has_match = np.fromiter(
+            (v is not pd.NA and bool(v) and bool(str(v).strip()) for v in first_rows['ai.match'].to_numpy(dtype=object)),
+            dtype=bool, count=len(first_rows)
+        )
+        keep_by_id = pd.Series(has_match, index=first_rows.index)
+        keep_mask = job_ids.map(keep_by_id).fillna(False).astype(bool).to_numpy()
+    else:
+        keep_mask = np.zeros(len(df), dtype=bool)
+    
+    result_mask = ~keep_mask & job_ids.isin(list(ai_results.keys())).to_numpy()
+    result_ids = job_ids[result_mask]
+    kept_ids = job_ids[keep_mask]
     
     # Apply AI results
     ai_fields = {}
-    classification_data = df['id.job'].apply(apply_ai_result)
-    
-    for field in ['ai.match', 'ai.reason', 'ai.summary', 'ai.normalized_location', 'ai.fair_chance', 'ai.endorsements', 'ai.route_type', 'ai.career_pathway', 'ai.training_provided']:
-        ai_fields[field] = classification_data.apply(lambda x: x[field])
+    for field, default in AI_FIELD_DEFAULTS.items():
+        values = np.full(len(df), default, dtype=object)
+        
+        if result_mask.any():
+            key, fallback = AI_RESULT_FIELDS[field]
+            field_lookup = {job_id: result.get(key, fallback) for job_id, result in ai_results.items()}
+            values[result_mask] = result_ids.map(field_lookup).to_numpy(dtype=object)
+        
+        if keep_mask.any() and field in first_rows.columns:
+            values[keep_mask] = kept_ids.map(first_rows[field]).to_numpy(dtype=object)
+        
+        # Rebuild from a list so dtype inference matches a per-row apply
+        ai_fields[field] = pd.Series(values.tolist(), index=df.index)
     
     # Set classification metadata
     current_date = datetime.now().date().isoformat()  # Just YYYY-MM-DD format
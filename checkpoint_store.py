@@ -0,0 +1,450 @@
+"""
+Checkpoint Store - background, column-delta pipeline checkpoints
+
+FreeWorldPipelineV3 checkpoints the canonical DataFrame after every stage. Writing
+a full Parquet copy (plus SAFETY CSVs) on the pipeline thread serialized the whole
+frame ten times per run. CheckpointWriter instead:
+
+- takes a copy on the caller's thread and serializes on a background thread; SAFETY
+  CSVs (the paid-results backups) are still written before submit() returns
+- writes only the column groups (source.*, norm.*, ai.*, ...) that changed since the
+  previous stage when the rows are unchanged; otherwise a full snapshot
+- records every stage in a per-run manifest so load_checkpoint() can rebuild any
+  stage from the nearest full snapshot plus its deltas
+- marks the run finished when closed, then compacts old finished runs and enforces
+  a disk-usage cap without touching runs that are still in progress
+
+Files in the parquet directory:
+    {run_id}_{stage}.parquet        full snapshot (same name as before; *_99_complete
+                                    is always full for pipeline_wrapper)
+    {run_id}_{stage}.delta.parquet  changed column groups only
+    {run_id}_manifest.json          stage order, file kind and column lists
+
+Environment:
+    FREEWORLD_CHECKPOINT_ASYNC=off      write on the calling thread
+    FREEWORLD_CHECKPOINT_KEEP_RUNS=10   runs that keep every stage checkpoint
+    FREEWORLD_CHECKPOINT_MAX_MB=500     disk cap for checkpoint files
+"""
+
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ALWAYS_FULL_STAGES = ('99_complete', 'error')
+DEFAULT_KEEP_RUNS = 10
+DEFAULT_MAX_MB = 500
+CHECKPOINT_PATTERNS = ('pipeline_v3_*.parquet', 'SAFETY_*.csv')
+STALE_RUN_SECONDS = 24 * 3600  # An unfinished run idle this long is treated as abandoned
+
+
+def column_group(column: str) -> str:
+    """Namespace of a canonical column ('ai.match' -> 'ai')"""
+    return column.split('.', 1)[0] if '.' in column else '_'
+
+
+def _group_columns(columns) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for col in columns:
+        groups.setdefault(column_group(col), []).append(col)
+    return groups
+
+
+def _group_fingerprint(df: pd.DataFrame, cols: List[str]) -> Optional[tuple]:
+    """Row-wise hash of a column group (None if the values cannot be hashed)"""
+    try:
+        hashes = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    except Exception:
+        return None
+    return (tuple(cols), tuple(str(df[c].dtype) for c in cols), hashes)
+
+
+def _same_fingerprint(a: Optional[tuple], b: Optional[tuple]) -> bool:
+    if a is None or b is None:
+        return False
+    return a[0] == b[0] and a[1] == b[1] and np.array_equal(a[2], b[2])
+
+
+def _manifest_path(parquet_dir: str, run_id: str) -> str:
+    return os.path.join(parquet_dir, f"{run_id}_manifest.json")
+
+
+def _read_manifest(parquet_dir: str, run_id: str) -> Optional[Dict[str, Any]]:
+    path = _manifest_path(parquet_dir, run_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Unreadable checkpoint manifest {path}: {e}")
+        return None
+
+
+def load_checkpoint(parquet_dir: str, run_id: str, stage: str) -> Optional[pd.DataFrame]:
+    """
+    Rebuild the DataFrame checkpointed for one stage of a run
+
+    Args:
+        parquet_dir: Checkpoint directory
+        run_id: Pipeline run id
+        stage: Stage name, e.g. '05_classification'
+
+    Returns:
+        DataFrame, or None if the stage (or a file it depends on) is missing
+    """
+    manifest = _read_manifest(parquet_dir, run_id)
+    if manifest is None:
+        legacy_path = os.path.join(parquet_dir, f"{run_id}_{stage}.parquet")
+        return pd.read_parquet(legacy_path) if os.path.exists(legacy_path) else None
+
+    stages = manifest.get('stages', [])
+    target = next((i for i, e in enumerate(stages) if e['stage'] == stage), None)
+    if target is None:
+        return None
+    base = next((i for i in range(target, -1, -1) if stages[i]['kind'] == 'full'), None)
+    if base is None:
+        return None
+
+    chain = stages[base:target + 1]
+    for entry in chain:
+        if not os.path.exists(os.path.join(parquet_dir, entry['file'])):
+            print(f"⚠️ Checkpoint file missing for {run_id} {entry['stage']}: {entry['file']}")
+            return None
+
+    df = pd.read_parquet(os.path.join(parquet_dir, chain[0]['file']))
+    for entry in chain[1:]:
+        delta = pd.read_parquet(os.path.join(parquet_dir, entry['file']))
+        for col in delta.columns:
+            df[col] = delta[col].to_numpy()
+        df = df[entry['columns']]
+    return df
+
+
+def iter_stage_checkpoints(parquet_dir: str, stage: str) -> List[tuple]:
+    """
+    All checkpoints of one stage across runs, as (name, DataFrame) sorted by name
+
+    Covers legacy full files and delta stages rebuilt through their manifest.
+    """
+    found = {
+        os.path.basename(p): p
+        for p in glob.glob(os.path.join(parquet_dir, f"pipeline_v3_*_{stage}.parquet"))
+    }
+    frames = [(name, pd.read_parquet(path)) for name, path in found.items()]
+    for path in glob.glob(os.path.join(parquet_dir, '*_manifest.json')):
+        run_id = os.path.basename(path)[:-len('_manifest.json')]
+        manifest = _read_manifest(parquet_dir, run_id) or {}
+        entry = next((e for e in manifest.get('stages', []) if e['stage'] == stage), None)
+        if entry is None or entry['kind'] != 'delta':
+            continue
+        df = load_checkpoint(parquet_dir, run_id, stage)
+        if df is not None:
+            frames.append((entry['file'], df))
+    return sorted(frames, key=lambda item: item[0])
+
+
+def checkpoint_disk_usage(parquet_dir: str) -> int:
+    """Bytes used by checkpoint files (full, delta and SAFETY CSV)"""
+    return sum(os.path.getsize(p) for p in _checkpoint_files(parquet_dir))
+
+
+def _checkpoint_files(parquet_dir: str) -> List[str]:
+    files = set()
+    for pattern in CHECKPOINT_PATTERNS:
+        files.update(glob.glob(os.path.join(parquet_dir, pattern)))
+    return sorted(files)
+
+
+def _run_finished(manifest_path: str, manifest: Dict[str, Any], now: float) -> bool:
+    """Closed by its writer, or abandoned (an unfinished manifest untouched for STALE_RUN_SECONDS)"""
+    return bool(manifest.get('finished')) or now - os.path.getmtime(manifest_path) > STALE_RUN_SECONDS
+
+
+def _stage_units(stages: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Deletable groups of manifest stages: each stage together with the later deltas
+    of its chain, which cannot be rebuilt without it (a base is never removed while
+    a delta still references it)
+    """
+    units = []
+    for i in range(len(stages)):
+        unit = [i]
+        for j in range(i + 1, len(stages)):
+            if stages[j]['kind'] == 'full':
+                break
+            unit.append(j)
+        units.append(unit)
+    return units
+
+
+def apply_retention(parquet_dir: str, keep_runs: int = DEFAULT_KEEP_RUNS,
+                    max_mb: float = DEFAULT_MAX_MB, protect_run_id: Optional[str] = None) -> Dict[str, int]:
+    """
+    Compact old runs and enforce the checkpoint disk cap
+
+    Only finished runs are touched: a run whose writer has not closed its manifest
+    (and has written within STALE_RUN_SECONDS) may still be appending deltas to its
+    base snapshots, so none of its files are removed, and neither are protect_run_id's.
+
+    Finished runs beyond the keep_runs most recent (by run start) are compacted down
+    to their full 99_complete/error snapshots. If checkpoint files still exceed
+    max_mb, the oldest stages of finished runs are deleted - each together with the
+    deltas that depend on it - until under the cap. Checkpoint files no manifest
+    knows about (legacy runs) are deleted only once older than STALE_RUN_SECONDS.
+
+    Returns:
+        {'compacted_runs', 'deleted_files', 'deleted_bytes'}
+    """
+    stats = {'compacted_runs': 0, 'deleted_files': 0, 'deleted_bytes': 0}
+    now = time.time()
+
+    def _delete(path: str) -> int:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            stats['deleted_files'] += 1
+            stats['deleted_bytes'] += size
+            return size
+        except OSError:
+            return 0
+
+    def _save(path: str, manifest: Dict[str, Any]) -> None:
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    runs, active = [], {protect_run_id} if protect_run_id else set()
+    for path in glob.glob(os.path.join(parquet_dir, '*_manifest.json')):
+        run_id = os.path.basename(path)[:-len('_manifest.json')]
+        manifest = _read_manifest(parquet_dir, run_id)
+        if not manifest:
+            continue
+        if run_id in active or not _run_finished(path, manifest, now):
+            active.add(run_id)
+            continue
+        # Order by run start; compaction rewrites the manifest so mtime is not usable
+        runs.append((manifest.get('created', os.path.getmtime(path)), run_id, path, manifest))
+    runs.sort(reverse=True, key=lambda run: run[:2])
+    for _, run_id, path, manifest in runs[keep_runs:]:
+        if manifest.get('compacted'):
+            continue
+        kept = []
+        for entry in manifest.get('stages', []):
+            if entry['stage'] in ALWAYS_FULL_STAGES and entry['kind'] == 'full':
+                kept.append(entry)
+            else:
+                _delete(os.path.join(parquet_dir, entry['file']))
+        for safety in glob.glob(os.path.join(parquet_dir, f"SAFETY_*_{run_id}.csv")):
+            _delete(safety)
+        manifest['stages'] = kept
+        manifest['compacted'] = True
+        _save(path, manifest)
+        stats['compacted_runs'] += 1
+
+    cap_bytes = max_mb * 1024 * 1024
+    usage = checkpoint_disk_usage(parquet_dir)
+    if usage > cap_bytes:
+        # Deletion candidates: (mtime, run_id, manifest file or None, files - base last when reversed)
+        candidates = []
+        tracked = set()
+        for _, run_id, path, manifest in runs:
+            stages = manifest.get('stages', [])
+            for index, unit in enumerate(_stage_units(stages)):
+                files = [os.path.join(parquet_dir, stages[i]['file']) for i in unit]
+                tracked.add(files[0])
+                if os.path.exists(files[0]):
+                    candidates.append((os.path.getmtime(files[0]), run_id, stages[index]['file'], files))
+        runs_by_id = {run_id: (path, manifest) for _, run_id, path, manifest in runs}
+        for file_path in _checkpoint_files(parquet_dir):
+            name = os.path.basename(file_path)
+            if file_path in tracked or any(run_id in name for run_id in active):
+                continue
+            owner = next((run_id for run_id in runs_by_id if run_id in name), None)
+            if owner is None and now - os.path.getmtime(file_path) <= STALE_RUN_SECONDS:
+                continue  # Unknown writer, recently touched: may belong to a run in progress
+            candidates.append((os.path.getmtime(file_path), owner, None, [file_path]))
+
+        for _, run_id, stage_file, files in sorted(candidates, key=lambda c: (c[0], c[2] or '')):
+            if usage <= cap_bytes:
+                break
+            if not os.path.exists(files[0]):
+                continue
+            for file_path in reversed(files):  # Dependent deltas first, the base last
+                usage -= _delete(file_path)
+            if stage_file is not None:
+                path, manifest = runs_by_id[run_id]
+                gone = {os.path.basename(f) for f in files}
+                manifest['stages'] = [e for e in manifest['stages'] if e['file'] not in gone]
+                _save(path, manifest)
+
+    if stats['deleted_files']:
+        print(f"🧹 Checkpoint retention: compacted {stats['compacted_runs']} runs, "
+              f"removed {stats['deleted_files']} files ({stats['deleted_bytes'] / 1024 / 1024:.1f} MB)")
+    return stats
+
+
+class CheckpointWriter:
+    """Writes stage checkpoints for one run on a background thread"""
+
+    def __init__(self, parquet_dir: str, run_id: str,
+                 prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                 background: Optional[bool] = None, max_pending: int = 4):
+        """
+        Args:
+            parquet_dir: Output directory
+            run_id: Pipeline run id (file prefix)
+            prepare: Applied to each snapshot on the writer thread (e.g. ensure_schema)
+            background: Write on a thread (default: unless FREEWORLD_CHECKPOINT_ASYNC=off)
+            max_pending: Queued snapshots before submit() blocks (bounds memory)
+        """
+        self.parquet_dir = parquet_dir
+        self.run_id = run_id
+        self.prepare = prepare
+        if background is None:
+            background = os.getenv('FREEWORLD_CHECKPOINT_ASYNC', '').lower() not in ('off', '0', 'false')
+        self.background = background
+        os.makedirs(parquet_dir, exist_ok=True)
+
+        self.manifest: Dict[str, Any] = {'run_id': run_id, 'created': time.time(), 'stages': []}
+        self._prev_index: Optional[pd.Index] = None
+        self._prev_fingerprints: Dict[str, Optional[tuple]] = {}
+        self.stats = {'full': 0, 'delta': 0, 'groups_skipped': 0, 'bytes': 0,
+                      'write_seconds': 0.0, 'errors': 0}
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        if self.background:
+            self._thread = threading.Thread(target=self._worker, name=f"checkpoint-{run_id}", daemon=True)
+            self._thread.start()
+
+    def submit(self, df: pd.DataFrame, stage: str, full: bool = False,
+               safety_csv: Optional[str] = None) -> None:
+        """
+        Queue a checkpoint of df for this stage
+
+        Args:
+            df: Stage output (copied here, so the caller may keep mutating it)
+            stage: Stage name
+            full: Force a full snapshot instead of a delta
+            safety_csv: Also export the snapshot to this CSV path (written before returning)
+        """
+        snapshot, prepared = df.copy(), False
+        if safety_csv:
+            # The SAFETY CSV is the copy of paid results meant to survive a crash: it is on
+            # disk before submit() returns, never left in the queue of a daemon thread
+            snapshot, prepared = self._write_safety_csv(snapshot, safety_csv)
+        job = (snapshot, stage, full or stage in ALWAYS_FULL_STAGES, prepared)
+        if self._thread is None:
+            self._write(*job)
+        else:
+            self._queue.put(job)
+
+    def _write_safety_csv(self, df: pd.DataFrame, path: str) -> tuple:
+        """Prepare df and export it to path on the calling thread; returns (frame, whether prepared)"""
+        prepared = df
+        try:
+            if self.prepare is not None:
+                prepared = self.prepare(df)
+            if not prepared.empty:
+                tmp_path = f"{path}.tmp"
+                prepared.to_csv(tmp_path, index=False)
+                os.replace(tmp_path, path)
+                print(f"💾 Safety export: {len(prepared)} jobs saved to {os.path.basename(path)}")
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"⚠️ Safety export {os.path.basename(path)} failed: {e}")
+            return df, False
+        return prepared, self.prepare is not None
+
+    def flush(self) -> None:
+        """Block until every queued checkpoint is on disk"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, retention: bool = True) -> None:
+        """Flush, stop the writer thread, mark the run finished and apply the retention policy"""
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=30)
+            self._thread = None
+        if self.manifest['stages']:
+            # Retention only prunes finished runs; until now other runs' pruning leaves this one alone
+            self.manifest['finished'] = True
+            try:
+                with open(_manifest_path(self.parquet_dir, self.run_id), 'w') as f:
+                    json.dump(self.manifest, f, indent=2)
+            except Exception as e:
+                print(f"⚠️ Could not mark checkpoint run finished: {e}")
+        if retention:
+            try:
+                apply_retention(
+                    self.parquet_dir,
+                    keep_runs=int(os.getenv('FREEWORLD_CHECKPOINT_KEEP_RUNS', DEFAULT_KEEP_RUNS)),
+                    max_mb=float(os.getenv('FREEWORLD_CHECKPOINT_MAX_MB', DEFAULT_MAX_MB)),
+                    protect_run_id=self.run_id
+                )
+            except Exception as e:
+                print(f"⚠️ Checkpoint retention failed: {e}")
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._write(*job)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, df: pd.DataFrame, stage: str, full: bool, prepared: bool = False) -> None:
+        start = time.time()
+        try:
+            if self.prepare is not None and not prepared:
+                df = self.prepare(df)
+            groups = _group_columns(df.columns)
+            fingerprints = {name: _group_fingerprint(df, cols) for name, cols in groups.items()}
+
+            rows_unchanged = self._prev_index is not None and df.index.equals(self._prev_index)
+            if full or not rows_unchanged:
+                path = os.path.join(self.parquet_dir, f"{self.run_id}_{stage}.parquet")
+                df.to_parquet(path, index=False)
+                entry = {'stage': stage, 'kind': 'full', 'file': os.path.basename(path),
+                         'groups': sorted(groups)}
+                self.stats['full'] += 1
+                print(f"✅ Checkpoint saved: {path}")
+            else:
+                changed = [name for name in groups
+                           if not _same_fingerprint(fingerprints[name], self._prev_fingerprints.get(name))]
+                cols = [c for name in changed for c in groups[name]]
+                path = os.path.join(self.parquet_dir, f"{self.run_id}_{stage}.delta.parquet")
+                df[cols].to_parquet(path, index=False)
+                entry = {'stage': stage, 'kind': 'delta', 'file': os.path.basename(path),
+                         'groups': changed}
+                self.stats['delta'] += 1
+                self.stats['groups_skipped'] += len(groups) - len(changed)
+                print(f"✅ Checkpoint delta saved: {path} ({', '.join(changed) or 'no changes'})")
+            entry['columns'] = list(df.columns)
+            entry['rows'] = len(df)
+            self.stats['bytes'] += os.path.getsize(path)
+
+            self.manifest['stages'] = [e for e in self.manifest['stages'] if e['stage'] != stage] + [entry]
+            with open(_manifest_path(self.parquet_dir, self.run_id), 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+
+            self._prev_index = df.index
+            self._prev_fingerprints = fingerprints
+        except Exception as e:
+            # Next stage starts a fresh chain so later deltas never depend on a failed write
+            self.stats['errors'] += 1
+            self._prev_index = None
+            self._prev_fingerprints = {}
+            print(f"⚠️ Checkpoint {stage} failed: {e}")
+        finally:
+            self.stats['write_seconds'] += time.time() - start
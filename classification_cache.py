@@ -0,0 +1,223 @@
+"""
+Local Classification Cache
+On-disk cache of LLM classification results keyed by job CONTENT, so reposted or
+lightly edited listings (new id.job, same posting text) are not paid for twice.
+
+Complements JobMemoryDB.check_job_memory, which only matches the exact id.job.
+Keys hash the normalized title, company, location and description together with
+the classifier type and its PROMPT_VERSION, so a prompt change never serves stale
+verdicts.
+
+Configuration:
+    FREEWORLD_CLASSIFICATION_CACHE  path to the SQLite file, or "off" to disable
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join('FreeWorld_Jobs', 'cache', 'classification_cache.sqlite')
+DEFAULT_TTL_HOURS = 720  # Same horizon as the Supabase memory lookup
+DEFAULT_MAX_ENTRIES = 50000
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(value) -> str:
+    """Lowercase and collapse whitespace so cosmetic edits hash the same"""
+    if value is None:
+        return ''
+    text = str(value)
+    if text.lower() in ('nan', 'none', 'null'):
+        return ''
+    return _WHITESPACE_RE.sub(' ', text).strip().lower()
+
+
+def content_hash(job: Dict, classifier_type: str, prompt_version: str) -> str:
+    """Cache key for a job dict in classifier input format"""
+    parts = [
+        classifier_type,
+        prompt_version,
+        normalize_text(job.get('job_title')),
+        normalize_text(job.get('company')),
+        normalize_text(job.get('location')),
+        normalize_text(job.get('job_description')),
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """SQLite-backed content-hash cache with TTL and LRU size bound"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_hours: float = DEFAULT_TTL_HOURS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._clock = time.time
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'expired': 0, 'evictions': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS classification_cache (
+                cache_key TEXT PRIMARY KEY,
+                classifier_type TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_classification_cache_access ON classification_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def lookup_jobs(self, jobs: List[Dict], classifier_type: str, prompt_version: str) -> Tuple[Dict[str, Dict], List[Dict]]:
+        """
+        Split jobs into cached results and jobs that still need the LLM
+
+        Returns:
+            (results keyed by job_id - stamped with the requesting job_id,
+             list of jobs with no fresh cache entry)
+        """
+        keys = [content_hash(job, classifier_type, prompt_version) for job in jobs]
+        now = self._clock()
+
+        with self._lock:
+            rows = {}
+            unique_keys = list(dict.fromkeys(keys))
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for key, result, created_at in self._conn.execute(
+                    f"SELECT cache_key, result, created_at FROM classification_cache WHERE cache_key IN ({placeholders})",
+                    chunk
+                ):
+                    rows[key] = (result, created_at)
+
+            expired = [key for key, (_, created_at) in rows.items() if now - created_at > self.ttl_seconds]
+            if expired:
+                self._conn.executemany("DELETE FROM classification_cache WHERE cache_key = ?", [(k,) for k in expired])
+                self.stats['expired'] += len(expired)
+                for key in expired:
+                    rows.pop(key)
+
+            if rows:
+                self._conn.executemany(
+                    "UPDATE classification_cache SET last_access = ? WHERE cache_key = ?",
+                    [(now, key) for key in rows]
+                )
+            self._conn.commit()
+
+        cached, misses = {}, []
+        for job, key in zip(jobs, keys):
+            if key in rows:
+                result = json.loads(rows[key][0])
+                result['job_id'] = job['job_id']  # Never serve another posting's id
+                cached[job['job_id']] = result
+            else:
+                misses.append(job)
+
+        self.stats['hits'] += len(jobs) - len(misses)
+        self.stats['misses'] += len(misses)
+        return cached, misses
+
+    def store_results(self, jobs: List[Dict], results: List[Dict], classifier_type: str, prompt_version: str) -> int:
+        """Cache successful results (errors are never cached). Returns rows written."""
+        by_id = {r.get('job_id'): r for r in results if isinstance(r, dict)}
+        now = self._clock()
+        records = []
+        for job in jobs:
+            result = by_id.get(job['job_id'])
+            if not result or result.get('match') in (None, '', 'error'):
+                continue
+            payload = {k: v for k, v in result.items() if k != 'job_id'}
+            records.append((
+                content_hash(job, classifier_type, prompt_version),
+                classifier_type,
+                json.dumps(payload),
+                now,
+                now,
+            ))
+
+        if not records:
+            return 0
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO classification_cache "
+                "(cache_key, classifier_type, result, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                records
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+        self.stats['stores'] += len(records)
+        return len(records)
+
+    def _evict_locked(self) -> None:
+        """Drop least-recently-used rows beyond max_entries"""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM classification_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM classification_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM classification_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.stats['evictions'] += overflow
+
+    def purge_expired(self) -> int:
+        """Delete every entry older than the TTL"""
+        cutoff = self._clock() - self.ttl_seconds
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM classification_cache WHERE created_at < ?", (cutoff,))
+            self._conn.commit()
+        self.stats['expired'] += cursor.rowcount
+        return cursor.rowcount
+
+    def entry_count(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM classification_cache").fetchone()
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM classification_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared_caches: Dict[str, ClassificationCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_classification_cache() -> Optional[ClassificationCache]:
+    """Process-wide cache instance, or None when disabled via FREEWORLD_CLASSIFICATION_CACHE=off"""
+    path = os.getenv('FREEWORLD_CLASSIFICATION_CACHE', DEFAULT_CACHE_PATH)
+    if path.strip().lower() in ('off', 'false', '0', 'none', ''):
+        return None
+
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            try:
+                cache = ClassificationCache(path)
+            except Exception as e:
+                print(f"⚠️ Classification cache unavailable ({e}) - continuing without it")
+                return None
+            _shared_caches[path] = cache
+        return cache
@@ -0,0 +1,303 @@
+"""
+Classifier Runtime
+Long-lived async runtime shared by the AI classifiers (JobClassifier,
+PathwayClassifier).
+
+classify_jobs_in_batches() used to build a new event loop and a new aiohttp
+connector on every call, so pooled connections and TLS sessions were thrown
+away between batches and between pipeline runs in the same Streamlit process.
+The runtime instead owns one background event loop and one pooled session for
+the life of the process; sync callers hand it work through submit()/run(),
+which return concurrent.futures results and are safe from any thread. Work
+runs with the submitting thread's context variables (the run's active
+performance monitor), not the loop thread's.
+
+Concurrency is set by an AdaptiveLimiter shared by every batch (both
+classifiers hit the same OpenAI quota): additive increase while responses are
+fast, halve on a 429, and back off 10% when smoothed latency climbs well
+above the best seen (the API queueing us). The learned limit carries over to
+the next batch instead of re-discovering the rate limit each time.
+
+Environment:
+    FREEWORLD_CLASSIFIER_RUNTIME=off          per-call event loop and session (legacy)
+    FREEWORLD_CLASSIFIER_CONCURRENCY=50       starting concurrency
+    FREEWORLD_CLASSIFIER_MAX_CONCURRENCY=100  ceiling for the adaptive limit
+"""
+
+import asyncio
+import atexit
+import contextvars
+import os
+import ssl
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def classifier_connector() -> aiohttp.TCPConnector:
+    """Connection pool settings the classifiers use for the OpenAI API (must be called on a running loop)"""
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False  # Disable hostname verification
+    ssl_context.verify_mode = ssl.CERT_NONE  # Disable certificate verification
+    return aiohttp.TCPConnector(
+        limit=200,
+        limit_per_host=100,
+        keepalive_timeout=30,
+        enable_cleanup_closed=True,
+        ssl=ssl_context
+    )
+
+
+CLASSIFIER_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+
+
+class AdaptiveLimiter:
+    """
+    Async concurrency limit tuned from observed responses (AIMD).
+
+    Used as `async with limiter:` around each request; the caller reports every
+    response with record(status, latency). All methods must run on one event loop.
+    """
+
+    def __init__(self, initial: int = DEFAULT_CONCURRENCY, min_limit: int = 1, max_limit: Optional[int] = None,
+                 adaptive: bool = True, latency_tolerance: float = 2.0, cooldown: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            initial: starting concurrency
+            min_limit: floor for the limit
+            max_limit: ceiling for the limit (default: initial)
+            adaptive: False keeps the limit fixed (a plain semaphore that still counts responses)
+            latency_tolerance: back off when smoothed latency exceeds this multiple of the best seen
+            cooldown: minimum seconds between two decreases (default: the smoothed latency,
+                so a burst of 429s from one round trip halves the limit once)
+            clock: time source (tests)
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial)
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.adaptive = adaptive
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self._clock = clock
+        self._last_decrease = float('-inf')
+        self._ewma: Optional[float] = None
+        self._best: Optional[float] = None
+        self._waiters: List[asyncio.Future] = []
+        self.in_flight = 0
+        self.stats = {'responses': 0, 'throttled': 0, 'decreases': 0, 'peak_in_flight': 0}
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self._take()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter  # The slot is taken on our behalf when the waiter is woken
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+        return False
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.in_flight)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    async def backoff(self, seconds: float) -> None:
+        """Sleep before a retry without holding a slot, then queue for one under the current limit"""
+        self.release()
+        try:
+            await asyncio.sleep(seconds)
+            await self.acquire()
+        except asyncio.CancelledError:
+            self.in_flight += 1  # Balanced by the caller's release on the way out
+            raise
+
+    def _decrease(self, factor: float) -> None:
+        now = self._clock()
+        cooldown = self.cooldown if self.cooldown is not None else (self._ewma or 0.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+        self.stats['decreases'] += 1
+
+    def record(self, status: int, latency: float) -> None:
+        """
+        Feed one response into the limit.
+
+        Args:
+            status: HTTP status of the response
+            latency: seconds the request took
+        """
+        self.stats['responses'] += 1
+        if status == 429:
+            self.stats['throttled'] += 1
+        if not self.adaptive:
+            return
+        if status == 429:
+            self._decrease(0.5)
+            return
+        if status != 200:
+            return
+
+        self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+        # The best latency drifts up slowly so a permanently slower API is re-learned
+        self._best = self._ewma if self._best is None else min(self._ewma, self._best * 1.01)
+        if self._ewma > self.latency_tolerance * self._best:
+            self._decrease(0.9)
+        else:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            self._wake()
+
+
+async def _in_context(context: contextvars.Context, coro: Awaitable):
+    """Await coro with the context variables of the thread that submitted it"""
+    for var, value in context.items():
+        var.set(value)  # Task-local: the loop thread's own context is untouched
+    return await coro
+
+
+class ClassifierRuntime:
+    """Background event loop + pooled aiohttp session + shared AdaptiveLimiter"""
+
+    def __init__(self, initial_concurrency: Optional[int] = None, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            initial_concurrency: starting limit (default: FREEWORLD_CLASSIFIER_CONCURRENCY)
+            max_concurrency: limit ceiling (default: FREEWORLD_CLASSIFIER_MAX_CONCURRENCY)
+        """
+        self.initial_concurrency = initial_concurrency or _env_int('FREEWORLD_CLASSIFIER_CONCURRENCY',
+                                                                   DEFAULT_CONCURRENCY)
+        self.max_concurrency = max_concurrency or _env_int('FREEWORLD_CLASSIFIER_MAX_CONCURRENCY',
+                                                           DEFAULT_MAX_CONCURRENCY)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.limiter: Optional[AdaptiveLimiter] = None
+        self.runs = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    async def _open(self) -> None:
+        self.session = aiohttp.ClientSession(connector=classifier_connector(), timeout=CLASSIFIER_TIMEOUT)
+        self.limiter = AdaptiveLimiter(self.initial_concurrency, max_limit=self.max_concurrency)
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._open())
+        self._ready.set()
+
+        self._loop.run_forever()
+        self._loop.run_until_complete(self.session.close())
+        self._loop.close()
+
+    def start(self) -> None:
+        """Start the loop thread (no-op when already running)"""
+        with self._lock:
+            if self.running:
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._serve, name='classifier-runtime', daemon=True)
+            self._thread.start()
+            if not self._ready.wait(timeout=10):
+                raise RuntimeError("Classifier runtime failed to start")
+
+    def submit(self, work: Callable[[aiohttp.ClientSession, AdaptiveLimiter], Awaitable]) -> Future:
+        """
+        Schedule work(session, limiter) on the runtime loop.
+
+        Args:
+            work: coroutine function taking the pooled session and the shared limiter
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("submit() called from the runtime loop; await the coroutine instead")
+        self.runs += 1
+        context = contextvars.copy_context()
+        return asyncio.run_coroutine_threadsafe(
+            _in_context(context, work(self.session, self.limiter)), self._loop
+        )
+
+    def run(self, work: Callable[[aiohttp.ClientSession, AdaptiveLimiter], Awaitable],
+            timeout: Optional[float] = None):
+        """Blocking submit(): the coroutine's result (or its exception)"""
+        return self.submit(work).result(timeout)
+
+    def snapshot(self) -> Dict:
+        """Current limit and limiter counters"""
+        if self.limiter is None:
+            return {'running': False, 'runs': self.runs}
+        return {'running': self.running, 'runs': self.runs, 'limit': self.limiter.limit,
+                'in_flight': self.limiter.in_flight, **self.limiter.stats}
+
+    def close(self) -> None:
+        """Close the session and stop the loop thread"""
+        with self._lock:
+            if self._loop and self.running:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=10)
+            self._thread = None
+
+
+_classifier_runtime: Optional[ClassifierRuntime] = None
+_classifier_runtime_lock = threading.Lock()
+
+
+def get_classifier_runtime() -> Optional[ClassifierRuntime]:
+    """Process-wide runtime, or None when FREEWORLD_CLASSIFIER_RUNTIME=off"""
+    global _classifier_runtime
+    if os.getenv('FREEWORLD_CLASSIFIER_RUNTIME', '').lower() in ('off', '0', 'false'):
+        return None
+    with _classifier_runtime_lock:
+        if _classifier_runtime is None:
+            _classifier_runtime = ClassifierRuntime()
+            atexit.register(_classifier_runtime.close)
+        return _classifier_runtime
@@ -44,8 +44,8 @@ def get_coach_performance_metrics(
         print("Warning: Supabase utilities not available. Cannot fetch click data.")
         return metrics
 
-    # Fetch click events for the coach
-    all_clicks_df = fetch_click_events(start_date, end_date)
+    # Fetch click events for the coach (filtered server-side)
+    all_clicks_df = fetch_click_events(start_date, end_date, coach_username=coach_username)
     
     # Handle empty DataFrame or missing columns gracefully
     if all_clicks_df.empty:
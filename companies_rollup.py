@@ -5,17 +5,25 @@ Creates and maintains a rollup table of companies derived from the jobs table
 """
 
 import os
+import hashlib
+import math
+import threading
+import time
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 import json
 
+from rollup_state import load_rollup_state, rollup_state_path, save_rollup_state
+
 try:
     from supabase_utils import get_client
 except Exception:
     get_client = None
 
+QUALITY_LEVELS = ['good', 'so-so']
+
 def create_companies_table_sql():
     """Generate SQL to create the companies rollup table"""
     return """
@@ -99,6 +107,144 @@ def normalize_company_name(company_name: str) -> str:
 
 # NOTE: extract_market_from_location function removed - we now use the market field directly from jobs table
 
+def prepare_company_jobs(jobs_data: List[Dict]) -> pd.DataFrame:
+    """Jobs rows -> DataFrame with normalized_company and parsed salary_min/salary_max"""
+    df = pd.DataFrame(jobs_data)
+    
+    # Normalize company names
+    df['normalized_company'] = df['company'].apply(normalize_company_name)
+    
+    # Use the market field directly from the jobs table (no conversion needed)
+    
+    # Parse salary data (assuming it's stored as text like "50000-60000" or "50000")
+    def parse_salary(salary_str):
+        if not salary_str or pd.isna(salary_str):
+            return None, None
+        
+        try:
+            salary_str = str(salary_str).replace('$', '').replace(',', '')
+            if '-' in salary_str:
+                parts = salary_str.split('-')
+                return float(parts[0]), float(parts[1])
+            else:
+                val = float(salary_str)
+                return val, val
+        except:
+            return None, None
+    
+    df[['salary_min', 'salary_max']] = df['salary'].apply(
+        lambda x: pd.Series(parse_salary(x))
+    )
+    return df
+
+def build_company_row(company_name: str, company_jobs: pd.DataFrame) -> Optional[Dict]:
+    """
+    Build one companies row from a company's jobs
+
+    Args:
+        company_name: Normalized company name
+        company_jobs: Rows of prepare_company_jobs() for this company
+
+    Returns:
+        Row dict, or None when the company is skipped
+    """
+    if company_name == "Unknown Company" and len(company_jobs) < 3:
+        return None  # Skip unknown companies with very few jobs
+
+    # Calculate metrics
+    total_jobs = len(company_jobs)
+
+    # Fair chance analysis
+    fair_chance_jobs = company_jobs['fair_chance'].astype(str).str.lower().str.contains('fair|yes|true', na=False).sum()
+    has_fair_chance = fair_chance_jobs > 0
+
+    # Markets (unique locations)
+    markets = company_jobs['market'].dropna().unique().tolist()
+
+    # Job titles (top 10 most common)
+    job_titles = company_jobs['job_title'].dropna().value_counts().head(10).index.tolist()
+
+    # Route types
+    route_types = company_jobs['route_type'].dropna().unique().tolist()
+
+    # Quality breakdown
+    quality_counts = company_jobs['match_level'].value_counts().to_dict()
+
+    # Route breakdown with job counts
+    route_counts = company_jobs['route_type'].value_counts().to_dict()
+    # Normalize route names
+    normalized_route_counts = {}
+    for route, count in route_counts.items():
+        if pd.notna(route):
+            route_key = str(route).lower()
+            if 'local' in route_key:
+                normalized_route_counts['Local'] = normalized_route_counts.get('Local', 0) + count
+            elif 'otr' in route_key or 'over the road' in route_key:
+                normalized_route_counts['OTR'] = normalized_route_counts.get('OTR', 0) + count
+            elif 'regional' in route_key:
+                normalized_route_counts['Regional'] = normalized_route_counts.get('Regional', 0) + count
+            else:
+                normalized_route_counts['Other'] = normalized_route_counts.get('Other', 0) + count
+
+    # Free agent feedback aggregation (placeholder for future enhancement)
+    feedback_data = {}
+    # Note: Free agent feedback will be populated when click tracking data is integrated
+    # For now, we'll track basic engagement metrics
+    feedback_data['total_jobs_posted'] = total_jobs
+    feedback_data['last_job_date'] = company_jobs['created_at'].max() if not company_jobs.empty else None
+
+    # Date ranges
+    dates = pd.to_datetime(company_jobs['created_at'])
+    oldest_date = dates.min()
+    newest_date = dates.max()
+
+    # Salary averages
+    salary_data = company_jobs[['salary_min', 'salary_max']].dropna()
+    avg_salary_min = salary_data['salary_min'].mean() if not salary_data.empty else None
+    avg_salary_max = salary_data['salary_max'].mean() if not salary_data.empty else None
+
+    # Ensure no NaN or infinity values
+    if avg_salary_min is not None and (pd.isna(avg_salary_min) or not math.isfinite(avg_salary_min)):
+        avg_salary_min = None
+    if avg_salary_max is not None and (pd.isna(avg_salary_max) or not math.isfinite(avg_salary_max)):
+        avg_salary_max = None
+
+    return {
+        'company_name': company_jobs['company'].iloc[0],  # Original name
+        'normalized_company_name': company_name,
+        'total_jobs': total_jobs,
+        'active_jobs': total_jobs,  # All jobs in 60-day window are considered "active"
+        'fair_chance_jobs': int(fair_chance_jobs),
+        'has_fair_chance': bool(has_fair_chance),
+        'markets': markets,
+        'job_titles': job_titles,
+        'route_types': [rt for rt in route_types if rt and not pd.isna(rt)],
+        'quality_breakdown': quality_counts,
+        'route_breakdown': normalized_route_counts,
+        'free_agent_feedback': feedback_data,
+        'is_blacklisted': False,  # Default to not blacklisted
+        'blacklist_reason': None,
+        'oldest_job_date': oldest_date.isoformat() if pd.notna(oldest_date) else None,
+        'newest_job_date': newest_date.isoformat() if pd.notna(newest_date) else None,
+        'avg_salary_min': avg_salary_min,
+        'avg_salary_max': avg_salary_max,
+    }
+
+def build_company_rows(jobs_data: List[Dict]) -> pd.DataFrame:
+    """Group jobs by normalized company name and build a companies row for each"""
+    if not jobs_data:
+        return pd.DataFrame()
+    df = prepare_company_jobs(jobs_data)
+
+    # Group by normalized company name
+    companies_rollup = []
+    for company_name, company_jobs in df.groupby('normalized_company'):
+        row = build_company_row(company_name, company_jobs)
+        if row is not None:
+            companies_rollup.append(row)
+
+    return pd.DataFrame(companies_rollup)
+
 def analyze_jobs_for_companies() -> pd.DataFrame:
     """Analyze jobs table and create companies rollup data - only include companies with good/so-so jobs"""
     client = get_client()
@@ -118,7 +264,7 @@ def analyze_jobs_for_companies() -> pd.DataFrame:
     while True:
         result = client.table('jobs').select(
             'company, location, job_title, match_level, route_type, fair_chance, salary, created_at, success_coach, market'
-        ).in_('match_level', ['good', 'so-so']).range(offset, offset + page_size - 1).execute()
+        ).in_('match_level', QUALITY_LEVELS).order('id').range(offset, offset + page_size - 1).execute()
 
         page_data = result.data or []
         if not page_data:
@@ -132,11 +278,6 @@ def analyze_jobs_for_companies() -> pd.DataFrame:
 
         offset += page_size
 
-        # Safety break to prevent infinite loops
-        if offset > 50000:  # Max 50k jobs
-            print("⚠️ Safety break: reached 50k jobs limit")
-            break
-
     jobs_data = all_jobs_data
     print(f"📊 Analyzing {len(jobs_data)} total quality jobs (ALL TIME)...")
     
@@ -144,167 +285,303 @@ def analyze_jobs_for_companies() -> pd.DataFrame:
         print("⚠️ No jobs data found")
         return pd.DataFrame()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(jobs_data)
-    
-    # Normalize company names
-    df['normalized_company'] = df['company'].apply(normalize_company_name)
-    
-    # Use the market field directly from the jobs table (no conversion needed)
-    
-    # Parse salary data (assuming it's stored as text like "50000-60000" or "50000")
-    def parse_salary(salary_str):
-        if not salary_str or pd.isna(salary_str):
-            return None, None
-        
-        try:
-            salary_str = str(salary_str).replace('$', '').replace(',', '')
-            if '-' in salary_str:
-                parts = salary_str.split('-')
-                return float(parts[0]), float(parts[1])
+    return build_company_rows(jobs_data)
+
+COMPANY_JOB_FIELDS = ('company', 'job_title', 'match_level', 'route_type', 'fair_chance', 'salary', 'created_at', 'market')
+JOB_CHANGE_OVERLAP_SECONDS = 300  # Re-read window for rows committed slightly out of order
+DEFAULT_RECONCILE_HOURS = 24
+# Set by hand in the dashboard; never overwritten for existing companies
+MANUAL_COMPANY_FIELDS = ('is_blacklisted', 'blacklist_reason')
+
+
+def _row_hash(row: Dict) -> str:
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class IncrementalCompanyRollup:
+    """
+    Companies rollup maintained from changed jobs only
+
+    rollup_state keeps, per good/so-so job (keyed by jobs.id), the fields the
+    rollup uses plus its normalized company, the companies.id of every company
+    row, a content hash of every row last written and an updated_at watermark.
+    Each run:
+
+    1. reads jobs with updated_at (or created_at when updated_at is NULL) newer
+       than the watermark at any match level, so downgraded jobs leave the rollup
+    2. periodically lists good/so-so job ids to drop deleted jobs
+    3. rebuilds only the companies those jobs belong to (with the same
+       build_company_row as the full rollup) and diff-writes them by id:
+       changed rows are upserted, new companies inserted, empty ones deleted
+    4. keeps the companies whose write batch failed in the state and rebuilds
+       them on the next run (their jobs are already behind the watermark)
+
+    Without state the first run is a full rebuild; it still diff-writes against
+    the existing table instead of truncating it.
+    """
+
+    def __init__(self, client, state_path: Optional[str] = None, page_size: int = 1000,
+                 overlap_seconds: int = JOB_CHANGE_OVERLAP_SECONDS, reconcile_hours: Optional[float] = None):
+        """
+        Args:
+            client: Supabase client
+            state_path: Rollup state file (None = in-memory only, i.e. full rebuild)
+            page_size: Rows per jobs/companies request
+            overlap_seconds: Seconds before the watermark to re-read
+            reconcile_hours: Hours between job-id reconciliations
+                (default FREEWORLD_COMPANIES_RECONCILE_HOURS or 24)
+        """
+        self.client = client
+        self.state_path = state_path
+        self.page_size = page_size
+        self.overlap_seconds = overlap_seconds
+        if reconcile_hours is None:
+            reconcile_hours = float(os.getenv('FREEWORLD_COMPANIES_RECONCILE_HOURS', DEFAULT_RECONCILE_HOURS))
+        self.reconcile_hours = reconcile_hours
+        self.state = load_rollup_state(state_path)
+        for key in ('jobs', 'company_ids', 'row_hashes'):
+            self.state.setdefault(key, {})
+        self._stale_ids: List[int] = []
+        self.stats = {'jobs_read': 0, 'changed_jobs': 0, 'changed_companies': 0, 'upserted': 0,
+                      'inserted': 0, 'deleted': 0, 'full_rebuild': self.state.get('watermark') is None,
+                      'reconciled': False, 'retried': 0, 'failed': 0}
+
+    # ----- reading jobs -----
+
+    def _page_jobs(self, columns: str, configure) -> List[Dict]:
+        """Keyset-page jobs by id with extra filters applied by configure(query)"""
+        rows, last_id = [], None
+        while True:
+            query = configure(self.client.table('jobs').select(columns))
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            page = query.order('id').limit(self.page_size).execute().data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            last_id = page[-1]['id']
+
+    def _job_record(self, job: Dict) -> Optional[List]:
+        if job.get('match_level') not in QUALITY_LEVELS:
+            return None
+        return [job.get(field) for field in COMPANY_JOB_FIELDS] + [normalize_company_name(job.get('company'))]
+
+    def _apply_jobs(self, jobs: List[Dict], changed: set) -> None:
+        stored = self.state['jobs']
+        for job in jobs:
+            key = str(job['id'])
+            record = self._job_record(job)
+            old = stored.get(key)
+            if old == record:
+                continue
+            self.stats['changed_jobs'] += 1
+            if old is not None:
+                changed.add(old[-1])
+            if record is not None:
+                changed.add(record[-1])
+                stored[key] = record
             else:
-                val = float(salary_str)
-                return val, val
-        except:
-            return None, None
-    
-    df[['salary_min', 'salary_max']] = df['salary'].apply(
-        lambda x: pd.Series(parse_salary(x))
-    )
-    
-    # Group by normalized company name
-    companies_rollup = []
-    
-    for company_name, company_jobs in df.groupby('normalized_company'):
-        if company_name == "Unknown Company" and len(company_jobs) < 3:
-            continue  # Skip unknown companies with very few jobs
-        
-        # Calculate metrics
-        total_jobs = len(company_jobs)
-        
-        # Fair chance analysis
-        fair_chance_jobs = company_jobs['fair_chance'].astype(str).str.lower().str.contains('fair|yes|true', na=False).sum()
-        has_fair_chance = fair_chance_jobs > 0
-        
-        # Markets (unique locations)
-        markets = company_jobs['market'].dropna().unique().tolist()
-        
-        # Job titles (top 10 most common)
-        job_titles = company_jobs['job_title'].dropna().value_counts().head(10).index.tolist()
-        
-        # Route types
-        route_types = company_jobs['route_type'].dropna().unique().tolist()
-        
-        # Quality breakdown
-        quality_counts = company_jobs['match_level'].value_counts().to_dict()
-
-        # Route breakdown with job counts
-        route_counts = company_jobs['route_type'].value_counts().to_dict()
-        # Normalize route names
-        normalized_route_counts = {}
-        for route, count in route_counts.items():
-            if pd.notna(route):
-                route_key = str(route).lower()
-                if 'local' in route_key:
-                    normalized_route_counts['Local'] = normalized_route_counts.get('Local', 0) + count
-                elif 'otr' in route_key or 'over the road' in route_key:
-                    normalized_route_counts['OTR'] = normalized_route_counts.get('OTR', 0) + count
-                elif 'regional' in route_key:
-                    normalized_route_counts['Regional'] = normalized_route_counts.get('Regional', 0) + count
+                stored.pop(key, None)
+
+    def collect_changes(self, now: Optional[datetime] = None) -> set:
+        """
+        Fold changed jobs into the stored job records
+
+        Returns:
+            Normalized names of companies whose rows must be rebuilt
+        """
+        now = now or datetime.now(timezone.utc)
+        columns = 'id,' + ','.join(COMPANY_JOB_FIELDS) + ',updated_at'
+        changed: set = set()
+        watermark = self.state.get('watermark')
+
+        if watermark is None:
+            self.state['jobs'] = {}
+            jobs = self._page_jobs(columns, lambda q: q.in_('match_level', QUALITY_LEVELS))
+            self.state['last_reconcile'] = now.isoformat()
+            changed.update(self.state['company_ids'])
+        else:
+            since = (pd.Timestamp(watermark) - pd.Timedelta(seconds=self.overlap_seconds)).isoformat()
+            jobs = self._page_jobs(columns, lambda q: q.or_(
+                f"updated_at.gte.{since},and(updated_at.is.null,created_at.gte.{since})"))
+        self.stats['jobs_read'] = len(jobs)
+        self._apply_jobs(jobs, changed)
+
+        stamps = [j.get('updated_at') or j.get('created_at') for j in jobs]
+        stamps = [pd.Timestamp(ts) for ts in stamps if ts]
+        if watermark:
+            stamps.append(pd.Timestamp(watermark))
+        if stamps:
+            newest = max(ts.tz_localize('UTC') if ts.tzinfo is None else ts for ts in stamps)
+            self.state['watermark'] = newest.isoformat()
+
+        last_reconcile = self.state.get('last_reconcile')
+        if last_reconcile and now - pd.Timestamp(last_reconcile).to_pydatetime() >= timedelta(hours=self.reconcile_hours):
+            self._reconcile(columns, changed)
+            self.state['last_reconcile'] = now.isoformat()
+        return changed
+
+    def _reconcile(self, columns: str, changed: set) -> None:
+        """Drop deleted jobs and pick up missed ones by listing good/so-so job ids"""
+        self.stats['reconciled'] = True
+        listed = {str(row['id']) for row in self._page_jobs('id', lambda q: q.in_('match_level', QUALITY_LEVELS))}
+        stored = self.state['jobs']
+        for key in set(stored) - listed:
+            changed.add(stored.pop(key)[-1])
+            self.stats['changed_jobs'] += 1
+        missing = sorted(listed - set(stored), key=int)
+        for i in range(0, len(missing), 200):
+            chunk = [int(key) for key in missing[i:i + 200]]
+            self._apply_jobs(self._page_jobs(columns, lambda q: q.in_('id', chunk)), changed)
+
+    # ----- building and writing rows -----
+
+    def _load_company_ids(self) -> None:
+        """Map existing companies rows to normalized names (full rebuild only)"""
+        ids: Dict[str, int] = {}
+        duplicates = []
+        offset = 0
+        while True:
+            page = (self.client.table('companies').select('id,normalized_company_name').order('id')
+                    .range(offset, offset + self.page_size - 1).execute().data or [])
+            for row in page:
+                if row['normalized_company_name'] in ids:
+                    duplicates.append(row['id'])
                 else:
-                    normalized_route_counts['Other'] = normalized_route_counts.get('Other', 0) + count
-
-        # Free agent feedback aggregation (placeholder for future enhancement)
-        feedback_data = {}
-        # Note: Free agent feedback will be populated when click tracking data is integrated
-        # For now, we'll track basic engagement metrics
-        feedback_data['total_jobs_posted'] = total_jobs
-        feedback_data['last_job_date'] = company_jobs['created_at'].max() if not company_jobs.empty else None
-
-        # Date ranges
-        dates = pd.to_datetime(company_jobs['created_at'])
-        oldest_date = dates.min()
-        newest_date = dates.max()
-
-        # Salary averages
-        salary_data = company_jobs[['salary_min', 'salary_max']].dropna()
-        avg_salary_min = salary_data['salary_min'].mean() if not salary_data.empty else None
-        avg_salary_max = salary_data['salary_max'].mean() if not salary_data.empty else None
-
-        # Ensure no NaN or infinity values
-        if avg_salary_min is not None and (pd.isna(avg_salary_min) or not pd.isfinite(avg_salary_min)):
-            avg_salary_min = None
-        if avg_salary_max is not None and (pd.isna(avg_salary_max) or not pd.isfinite(avg_salary_max)):
-            avg_salary_max = None
-        
-        companies_rollup.append({
-            'company_name': company_jobs['company'].iloc[0],  # Original name
-            'normalized_company_name': company_name,
-            'total_jobs': total_jobs,
-            'active_jobs': total_jobs,  # All jobs in 60-day window are considered "active"
-            'fair_chance_jobs': int(fair_chance_jobs),
-            'has_fair_chance': bool(has_fair_chance),
-            'markets': markets,
-            'job_titles': job_titles,
-            'route_types': [rt for rt in route_types if rt and not pd.isna(rt)],
-            'quality_breakdown': quality_counts,
-            'route_breakdown': normalized_route_counts,
-            'free_agent_feedback': feedback_data,
-            'is_blacklisted': False,  # Default to not blacklisted
-            'blacklist_reason': None,
-            'oldest_job_date': oldest_date.isoformat() if pd.notna(oldest_date) else None,
-            'newest_job_date': newest_date.isoformat() if pd.notna(newest_date) else None,
-            'avg_salary_min': avg_salary_min,
-            'avg_salary_max': avg_salary_max,
-        })
-    
-    return pd.DataFrame(companies_rollup)
-
-def update_companies_table():
-    """Update the companies rollup table with fresh data"""
+                    ids[row['normalized_company_name']] = row['id']
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+        self.state['company_ids'] = ids
+        self.state['row_hashes'] = {}
+        self._stale_ids = duplicates
+
+    def build_changes(self, changed: set) -> Tuple[List[Dict], List[Dict], List[str]]:
+        """
+        Rebuild the changed companies
+
+        Returns:
+            (rows to update, rows to insert, normalized names to delete)
+        """
+        by_company: Dict[str, List[Dict]] = {}
+        if changed:
+            for record in self.state['jobs'].values():
+                if record[-1] in changed:
+                    by_company.setdefault(record[-1], []).append(dict(zip(COMPANY_JOB_FIELDS, record)))
+
+        rows = {}
+        if by_company:
+            df = prepare_company_jobs([job for jobs in by_company.values() for job in jobs])
+            for company_name, company_jobs in df.groupby('normalized_company'):
+                row = build_company_row(company_name, company_jobs)
+                if row is not None:
+                    rows[company_name] = row
+
+        updates, inserts, deletes = [], [], []
+        for company_name in sorted(changed):
+            row = rows.get(company_name)
+            if row is None:
+                if company_name in self.state['company_ids']:
+                    deletes.append(company_name)
+            elif self.state['row_hashes'].get(company_name) != _row_hash(row):
+                (updates if company_name in self.state['company_ids'] else inserts).append(row)
+        self.stats['changed_companies'] = len(updates) + len(inserts) + len(deletes)
+        return updates, inserts, deletes
+
+    def write(self, updates: List[Dict], inserts: List[Dict], deletes: List[str], batch_size: int = 100) -> None:
+        """Diff-write the companies table (no truncate window); failed companies are kept for the next run"""
+        ids, hashes = self.state['company_ids'], self.state['row_hashes']
+        failed: set = set()
+
+        for i in range(0, len(updates), batch_size):
+            batch = updates[i:i + batch_size]
+            payload = [{'id': ids[row['normalized_company_name']],
+                        **{k: v for k, v in row.items() if k not in MANUAL_COMPANY_FIELDS}} for row in batch]
+            try:
+                self.client.table('companies').upsert(payload).execute()
+                for row in batch:
+                    hashes[row['normalized_company_name']] = _row_hash(row)
+                self.stats['upserted'] += len(batch)
+            except Exception as e:
+                print(f"❌ Error updating companies batch {i//batch_size + 1}: {e}")
+                failed.update(row['normalized_company_name'] for row in batch)
+
+        for i in range(0, len(inserts), batch_size):
+            batch = inserts[i:i + batch_size]
+            try:
+                result = self.client.table('companies').insert(batch).execute()
+                for row, written in zip(batch, result.data or []):
+                    ids[row['normalized_company_name']] = written['id']
+                    hashes[row['normalized_company_name']] = _row_hash(row)
+                self.stats['inserted'] += len(batch)
+            except Exception as e:
+                print(f"❌ Error inserting companies batch {i//batch_size + 1}: {e}")
+                failed.update(row['normalized_company_name'] for row in batch)
+
+        names_by_id = {ids[name]: name for name in deletes}
+        delete_ids = list(names_by_id) + self._stale_ids
+        for i in range(0, len(delete_ids), batch_size):
+            batch = delete_ids[i:i + batch_size]
+            try:
+                self.client.table('companies').delete().in_('id', batch).execute()
+                self.stats['deleted'] += len(batch)
+            except Exception as e:
+                print(f"❌ Error deleting companies batch {i//batch_size + 1}: {e}")
+                failed.update(names_by_id[company_id] for company_id in batch if company_id in names_by_id)
+                continue
+            for company_id in batch:
+                name = names_by_id.get(company_id)
+                if name is not None:
+                    ids.pop(name, None)
+                    hashes.pop(name, None)
+
+        self.state['retry_companies'] = sorted(failed)
+        self.stats['failed'] = len(failed)
+
+    def run(self) -> Dict:
+        """Collect changed jobs, rebuild affected companies, write and persist state"""
+        started = time.perf_counter()
+        if self.state.get('watermark') is None:
+            self._load_company_ids()
+        changed = self.collect_changes()
+        retry = set(self.state.get('retry_companies', []))
+        self.stats['retried'] = len(retry - changed)
+        changed |= retry
+        updates, inserts, deletes = self.build_changes(changed)
+        self.write(updates, inserts, deletes)
+        save_rollup_state(self.state_path, self.state)
+        self.stats['companies'] = len({record[-1] for record in self.state['jobs'].values()})
+        self.stats['seconds'] = round(time.perf_counter() - started, 3)
+        return self.stats
+
+
+def update_companies_table(incremental: Optional[bool] = None):
+    """Update the companies rollup table from jobs changed since the last run
+
+    Args:
+        incremental: Reuse the stored rollup state (default; FREEWORLD_INCREMENTAL_ROLLUP=off
+            rebuilds from every job). Either way the table is diff-written, never truncated.
+    """
     client = get_client()
     if not client:
         raise Exception("Supabase client not available")
-    
+
     print("🏢 UPDATING COMPANIES ROLLUP TABLE")
     print("=" * 50)
-    
-    # Analyze jobs and create rollup data
-    companies_df = analyze_jobs_for_companies()
-    
-    if companies_df.empty:
-        print("⚠️ No companies data to update")
-        return
-    
-    # Clear existing data and insert new data
-    print(f"🗑️ Clearing existing companies data...")
-    client.table('companies').delete().neq('id', 0).execute()  # Delete all rows
-    
-    print(f"📊 Inserting {len(companies_df)} companies...")
-    
-    # Convert DataFrame to list of dicts for Supabase
-    companies_data = companies_df.to_dict('records')
-    
-    # Insert in batches of 100
-    batch_size = 100
-    for i in range(0, len(companies_data), batch_size):
-        batch = companies_data[i:i + batch_size]
-        result = client.table('companies').insert(batch).execute()
-        print(f"✅ Inserted batch {i//batch_size + 1}: {len(batch)} companies")
-    
-    print(f"🎉 Companies rollup table updated successfully!")
-    
-    # Print summary
-    total_companies = len(companies_df)
-    fair_chance_companies = companies_df['has_fair_chance'].sum()
-    top_markets = companies_df.explode('markets')['markets'].value_counts().head(5)
-    
-    print(f"\n📈 SUMMARY:")
-    print(f"   Total Companies: {total_companies}")
-    print(f"   Fair Chance Companies: {fair_chance_companies} ({fair_chance_companies/total_companies*100:.1f}%)")
-    print(f"   Top Markets: {dict(top_markets)}")
-    
-    return companies_df
+
+    if incremental is None:
+        incremental = os.getenv('FREEWORLD_INCREMENTAL_ROLLUP', '').lower() not in ('off', '0', 'false')
+
+    engine = IncrementalCompanyRollup(client, rollup_state_path('companies') if incremental else None)
+    stats = engine.run()
+
+    print(f"📊 {stats['jobs_read']} jobs read, {stats['changed_jobs']} changed"
+          f"{' (full rebuild)' if stats['full_rebuild'] else ''}")
+    print(f"🎉 Companies rollup updated in {stats['seconds']:.2f}s: {stats['upserted']} updated, "
+          f"{stats['inserted']} inserted, {stats['deleted']} removed ({stats['companies']} companies)")
+    if stats['failed']:
+        print(f"⚠️ {stats['failed']} companies failed to write; they will be retried on the next run")
+    return stats
 
 def get_company_analytics(company_name: str = None, limit: int = None) -> pd.DataFrame:
     """Get ALL companies data - using range queries to bypass 1000 row limit"""
@@ -386,6 +663,7 @@ def update_company_blacklist(company_id: int, is_blacklisted: bool, reason: str
 
     try:
         result = client.table('companies').update(update_data).eq('id', company_id).execute()
+        get_blacklist_lookup().invalidate()
         return True
     except Exception as e:
         print(f"Error updating company blacklist: {e}")
@@ -404,24 +682,82 @@ def get_blacklisted_companies() -> pd.DataFrame:
         print(f"Error fetching blacklisted companies: {e}")
         return pd.DataFrame()
 
-def is_company_blacklisted(company_name: str) -> bool:
-    """Check if a company is blacklisted"""
-    if not company_name:
-        return False
-
-    blacklisted_df = get_blacklisted_companies()
-    if blacklisted_df.empty:
-        return False
+class BlacklistLookup:
+    """
+    Cached blacklist for per-job checks
 
-    normalized_name = normalize_company_name(company_name)
+    is_company_blacklisted() used to query Supabase on every call, once per job
+    in the pipeline's blacklist filter. The lookup loads the blacklisted
+    companies once per TTL and memoizes answers per company name.
+    """
 
-    # Check both original and normalized names
-    is_blacklisted = (
-        blacklisted_df['company_name'].str.lower().str.contains(company_name.lower(), na=False).any() or
-        blacklisted_df['normalized_company_name'].str.lower().str.contains(normalized_name.lower(), na=False).any()
-    )
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            ttl_seconds: Seconds before reloading the blacklist
+                (default FREEWORLD_BLACKLIST_TTL_SECONDS or 300)
+        """
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv('FREEWORLD_BLACKLIST_TTL_SECONDS', '300'))
+        self.ttl_seconds = ttl_seconds
+        self._names: Tuple[str, ...] = ()
+        self._normalized: Tuple[str, ...] = ()
+        self._answers: Dict[str, bool] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._clock = time.time
+        self.stats = {'loads': 0, 'hits': 0, 'misses': 0}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self) -> None:
+        now = self._clock()
+        if self._loaded_at is not None and now - self._loaded_at < self.ttl_seconds:
+            return
+        blacklisted_df = get_blacklisted_companies()
+        names, normalized = (), ()
+        if not blacklisted_df.empty:
+            names = tuple(str(n).lower() for n in blacklisted_df['company_name'].dropna())
+            normalized = tuple(str(n).lower() for n in blacklisted_df['normalized_company_name'].dropna())
+        self._names, self._normalized = names, normalized
+        self._answers = {}
+        self._loaded_at = now
+        self.stats['loads'] += 1
+
+    def is_blacklisted(self, company_name: str) -> bool:
+        """Same matching as before: a blacklisted (normalized) name contains this (normalized) name"""
+        if not company_name:
+            return False
+        with self._lock:
+            self._ensure_loaded()
+            answer = self._answers.get(company_name)
+            if answer is not None:
+                self.stats['hits'] += 1
+                return answer
+            self.stats['misses'] += 1
+            name = company_name.lower()
+            normalized_name = normalize_company_name(company_name).lower()
+            answer = (any(name in n for n in self._names) or
+                      any(normalized_name in n for n in self._normalized))
+            self._answers[company_name] = answer
+            return answer
+
+
+_blacklist_lookup: Optional[BlacklistLookup] = None
+
+
+def get_blacklist_lookup() -> BlacklistLookup:
+    """Process-wide blacklist lookup"""
+    global _blacklist_lookup
+    if _blacklist_lookup is None:
+        _blacklist_lookup = BlacklistLookup()
+    return _blacklist_lookup
 
-    return bool(is_blacklisted)
+def is_company_blacklisted(company_name: str) -> bool:
+    """Check if a company is blacklisted (cached; see BlacklistLookup)"""
+    return get_blacklist_lookup().is_blacklisted(company_name)
 
 if __name__ == "__main__":
     import argparse
@@ -0,0 +1,135 @@
+"""
+Component Registry - lazy, process-wide pipeline dependencies
+
+FreeWorldPipelineV3 used to construct its scraper, classifiers, Supabase memory DB,
+bypass system, route classifier and Free Agent lookup in __init__, so memory-only
+searches (and every Streamlit rerun) paid for components they never touched.
+The registry builds each component on first use, keeps it for the life of the
+process, and records how long each construction took.
+
+Usage:
+    registry = get_component_registry()
+    registry.register('memory_db', JobMemoryDB)
+    registry.get('memory_db')        # constructed here, once
+    registry.init_seconds            # {'memory_db': 0.41}
+
+Classes expose components as attributes with LazyComponent:
+    class Pipeline:
+        memory_db = LazyComponent('memory_db')
+
+Set FREEWORLD_SHARED_COMPONENTS=off to give each pipeline its own registry.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class ComponentRegistry:
+    """Constructs registered components on first use (thread-safe)"""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self.init_seconds: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], replace: bool = False) -> None:
+        """
+        Register a factory (no-op if the name exists, unless replace=True)
+
+        Args:
+            name: Component name
+            factory: Zero-argument callable building the component
+            replace: Drop any existing factory/instance for this name
+        """
+        with self._registry_lock:
+            if name in self._factories and not replace:
+                return
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """Return the component, constructing it on first use"""
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._factories:
+            raise KeyError(f"Unknown component: {name}")
+        with self._locks[name]:
+            if name not in self._instances:
+                start = time.time()
+                instance = self._factories[name]()
+                self.init_seconds[name] = time.time() - start
+                self._instances[name] = instance
+                print(f"🧩 Initialized {name} in {self.init_seconds[name]:.2f}s")
+        return self._instances[name]
+
+    def is_initialized(self, name: str) -> bool:
+        return name in self._instances
+
+    def warm(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Construct components ahead of first use (e.g. at app start)
+
+        Args:
+            names: Components to build (default: all registered)
+
+        Returns:
+            Construction time per component built by this call
+        """
+        built = {}
+        for name in list(names if names is not None else self._factories):
+            if not self.is_initialized(name):
+                self.get(name)
+                built[name] = self.init_seconds.get(name, 0.0)
+        return built
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget constructed instances so the next get() rebuilds them"""
+        with self._registry_lock:
+            for key in ([name] if name else list(self._instances)):
+                self._instances.pop(key, None)
+                self.init_seconds.pop(key, None)
+
+
+class LazyComponent:
+    """
+    Attribute that resolves to a registry component on first access
+
+    The owning object needs a `components` attribute holding a ComponentRegistry.
+    Assigning the attribute overrides it for that object only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __set_name__(self, owner, attr_name):
+        self.attr_name = attr_name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.attr_name in obj.__dict__:
+            return obj.__dict__[self.attr_name]
+        return obj.components.get(self.name)
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr_name] = value
+
+
+_shared_registry: Optional[ComponentRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_component_registry() -> ComponentRegistry:
+    """Process-wide registry, or a fresh one when FREEWORLD_SHARED_COMPONENTS=off"""
+    global _shared_registry
+    if os.getenv('FREEWORLD_SHARED_COMPONENTS', '').lower() in ('off', '0', 'false'):
+        return ComponentRegistry()
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ComponentRegistry()
+        return _shared_registry
@@ -159,7 +159,43 @@ class CostCalculator:
         # OpenAI cost estimate for classification only (memory jobs)
         openai_cost = num_jobs * self.openai_cost_per_job if num_jobs > 0 else 0.0
         return openai_cost
-    
+
+    @staticmethod
+    def shared_classification_cache_stats():
+        """Copy of the shared classification cache's cumulative counters ({} when disabled)"""
+        try:
+            from classification_cache import get_classification_cache
+            cache = get_classification_cache()
+            return dict(cache.stats) if cache else {}
+        except Exception:
+            return {}
+
+    def calculate_classification_cache_savings(self, cache_stats=None, since=None):
+        """Summarize local classification cache effectiveness.
+
+        Args:
+            cache_stats: ClassificationCache.stats dict; defaults to the shared cache
+            since: earlier snapshot of the same counters (e.g. taken at run start);
+                only lookups after it are counted
+
+        Returns:
+            Dict with hits, misses, hit_rate, saved_usd and spent_usd
+        """
+        if cache_stats is None:
+            cache_stats = self.shared_classification_cache_stats()
+        since = since or {}
+
+        hits = max(0, int(cache_stats.get('hits', 0) or 0) - int(since.get('hits', 0) or 0))
+        misses = max(0, int(cache_stats.get('misses', 0) or 0) - int(since.get('misses', 0) or 0))
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'saved_usd': hits * self.openai_cost_per_job,
+            'spent_usd': misses * self.openai_cost_per_job,
+        }
+
     def show_mode_costs(self):
         """Show cost estimates for different search modes"""
         print("💰 Search Mode Cost Estimates:")
@@ -0,0 +1,192 @@
+"""
+Deduplication Engine for Pipeline v3 (stage 4)
+Hash-indexed replacement for the groupby loops in FreeWorldPipelineV3._stage4_deduplication
+
+Decision rules (unchanged from the loop version):
+- Exact: drop repeated id.job, keeping the LAST row (fresh wins over memory)
+- R1: same rules.duplicate_r1 (company+title+market) -> keep the first row
+- R2: same rules.duplicate_r2 (company+market) -> keep the first row not already filtered
+- URL: same clean URL + meta.market -> keep the first unfiltered row, Indeed before Google
+All three keys are resolved with duplicated()-style masks instead of per-group writes.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+R1_STATUS = 'filtered: R1 collapse (company+title+market)'
+R2_STATUS = 'filtered: R2 collapse (company+market)'
+URL_STATUS = 'filtered: URL duplicate (same job posting)'
+
+# Source preference for URL duplicates (lower wins; anything else sorts last)
+SOURCE_PRIORITY = {'indeed': 0, 'google': 1}
+
+_INDEED_JK_RE = re.compile(r'jk=([a-zA-Z0-9]+)')
+
+
+def extract_clean_url(url: str) -> str:
+    """Extract clean URL for deduplication (remove tracking params)"""
+    if pd.isna(url) or not url or url == '':
+        return ''
+
+    try:
+        from urllib.parse import urlparse, parse_qs, urlencode
+
+        # For Indeed URLs, extract job key
+        if 'indeed.com' in url and 'jk=' in url:
+            match = _INDEED_JK_RE.search(url)
+            if match:
+                return f"indeed_{match.group(1)}"
+
+        # For other URLs, use the full path without query params
+        parsed = urlparse(url)
+
+        # Keep only essential params (like job ID)
+        if parsed.query:
+            params = parse_qs(parsed.query)
+            essential_params = ['jk', 'jobid', 'id', 'job_id']
+            clean_params = {k: v for k, v in params.items()
+                           if k.lower() in essential_params}
+
+            if clean_params:
+                clean_query = urlencode(clean_params, doseq=True)
+                return f"{parsed.netloc}{parsed.path}?{clean_query}"
+
+        # Return netloc + path (without query)
+        return f"{parsed.netloc}{parsed.path}"
+
+    except Exception:
+        # Fallback: return original URL if parsing fails
+        return url
+
+
+def clean_url_series(urls: pd.Series) -> pd.Series:
+    """
+    Column version of extract_clean_url.
+
+    Indeed job keys are pulled with one str.extract; only non-Indeed URLs go
+    through urlparse, once per distinct URL.
+    """
+    values = urls.astype(object)
+    blank = (values.isna() | (values == '')).to_numpy()
+    text = values.where(~blank, '').astype(str)
+
+    indeed = text.str.contains('indeed.com', regex=False) & text.str.contains('jk=', regex=False)
+    job_keys = text.str.extract(_INDEED_JK_RE, expand=False)
+    indeed_hit = (indeed & job_keys.notna()).to_numpy()
+
+    result = np.full(len(values), '', dtype=object)
+    result[indeed_hit] = ('indeed_' + job_keys[indeed_hit]).to_numpy(dtype=object)
+
+    rest = ~blank & ~indeed_hit
+    if rest.any():
+        codes, uniques = pd.factorize(values[rest])
+        cleaned = np.array([extract_clean_url(u) for u in uniques], dtype=object)
+        result[rest] = cleaned[codes]
+
+    return pd.Series(result, index=urls.index, dtype=object)
+
+
+def _first_in_group(keys: pd.Series, eligible: np.ndarray) -> np.ndarray:
+    """
+    Mask of eligible rows that repeat an earlier eligible row's key.
+    Rows with a missing key never collapse (groupby drops NaN keys).
+    """
+    mask = eligible & keys.notna().to_numpy()
+    dupes = np.zeros(len(keys), dtype=bool)
+    if mask.any():
+        dupes[mask] = keys[mask].duplicated(keep='first').to_numpy()
+    return dupes
+
+
+def _mark_filtered(df: pd.DataFrame, mask: np.ndarray, status: str) -> None:
+    """Flag duplicates in place (same three fields the loop version wrote)"""
+    if not mask.any():
+        return
+    df.loc[mask, 'route.final_status'] = status
+    df.loc[mask, 'route.filtered'] = True
+    df.loc[mask, 'route.ready_for_ai'] = False  # Duplicates don't need classification
+
+
+def _unfiltered(df: pd.DataFrame) -> np.ndarray:
+    """Rows not yet filtered (NA counts as filtered, as in boolean indexing)"""
+    return (df['route.filtered'] != True).fillna(False).to_numpy(dtype=bool)
+
+
+def deduplicate_jobs(df: pd.DataFrame, filter_settings: Dict[str, bool] = None) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Run exact, R1, R2 and URL deduplication and drop the losers.
+
+    Args:
+        df: DataFrame with rules.duplicate_r1/r2 keys (stage 3 output)
+        filter_settings: r1_dedup / r2_dedup / url_dedup toggles (default on)
+
+    Returns:
+        (deduplicated DataFrame, per-rule drop counts)
+    """
+    if filter_settings is None:
+        filter_settings = {'r1_dedup': True, 'r2_dedup': True}
+
+    stats = {'exact': 0, 'r1': 0, 'r2': 0, 'url': 0, 'removed': 0}
+    initial_count = len(df)
+
+    # Exact duplicates by job_id (fresh wins over memory)
+    df = df.drop_duplicates(subset=['id.job'], keep='last')
+    stats['exact'] = initial_count - len(df)
+
+    df = df.copy()
+    df['clean_apply_url'] = clean_url_series(df.get('source.url', pd.Series('', index=df.index)))
+
+    # R1: company + title + market
+    if filter_settings.get('r1_dedup', True):
+        r1_dupes = _first_in_group(df['rules.duplicate_r1'], np.ones(len(df), dtype=bool))
+        _mark_filtered(df, r1_dupes, R1_STATUS)
+        stats['r1'] = int(r1_dupes.sum())
+    else:
+        print("⚠️  R1 deduplication disabled by filter settings")
+
+    # R2: company + market, among rows R1 left standing
+    if filter_settings.get('r2_dedup', True):
+        r2_dupes = _first_in_group(df['rules.duplicate_r2'], _unfiltered(df))
+        _mark_filtered(df, r2_dupes, R2_STATUS)
+        stats['r2'] = int(r2_dupes.sum())
+    else:
+        print("⚠️  R2 deduplication disabled by filter settings")
+
+    # URL: same posting reached through different sources, per market
+    if filter_settings.get('url_dedup', True):
+        eligible = (
+            _unfiltered(df)
+            & (df['clean_apply_url'] != '').to_numpy()
+            & df['meta.market'].notna().to_numpy()
+        )
+        url_dupes = np.zeros(len(df), dtype=bool)
+        if eligible.any():
+            candidates = pd.DataFrame({
+                'url': df['clean_apply_url'].to_numpy()[eligible],
+                'market': df['meta.market'].to_numpy()[eligible],
+                'priority': df['id.source'].map(SOURCE_PRIORITY).fillna(len(SOURCE_PRIORITY)).to_numpy()[eligible],
+                'position': np.flatnonzero(eligible),
+            })
+            # Stable sort: within a group, best source first, then original order
+            candidates = candidates.sort_values(['url', 'market', 'priority', 'position'], kind='mergesort')
+            losers = candidates['position'].to_numpy()[candidates.duplicated(subset=['url', 'market'], keep='first').to_numpy()]
+            url_dupes[losers] = True
+        _mark_filtered(df, url_dupes, URL_STATUS)
+        stats['url'] = int(url_dupes.sum())
+    else:
+        print("⚠️  URL deduplication disabled by filter settings")
+
+    # Update stage after deduplication
+    df = df.assign(**{
+        'route.stage': 'deduped',
+        'sys.updated_at': datetime.now().isoformat()
+    })
+
+    # Remove filtered duplicates from the DataFrame (don't just mark them)
+    df_clean = df[df.get('route.filtered', False) != True]
+    stats['removed'] = len(df) - len(df_clean)
+    return df_clean, stats
@@ -0,0 +1,192 @@
+"""
+Description Compactor
+Shrinks job descriptions before they are sent to the AI classifiers.
+
+Scraped postings carry a lot of text that never changes a verdict: EEO and
+accommodation statements, "apply today" calls to action, company marketing,
+repeated headers and the same sentence posted twice. Each description is
+HTML-unescaped, split into sentences and bullet items (run-on lists are cut
+into CHUNK_CHARS pieces), stripped of known boilerplate and exact repeats,
+then held to a per-job token ceiling.
+
+Segments that mention background / record requirements, CDL, licence class,
+endorsements, experience, training, or route and home time are verdict
+signals; pay, schedule and equipment are summary details. Neither is ever
+dropped as boilerplate, and when the ceiling forces a cut the lead sentence,
+then record requirements, the other signals and the details are kept first.
+Kept segments stay in their original order.
+
+Only the text sent to the model changes - callers keep the original job
+dicts, so classification cache keys and stored descriptions are untouched.
+
+Environment:
+    FREEWORLD_DESCRIPTION_COMPACTION=off    send descriptions as scraped
+    FREEWORLD_DESCRIPTION_MAX_TOKENS=600    per-job description token ceiling
+"""
+
+import html
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from packed_classification import estimate_tokens
+from pipeline_performance_monitor import record_description_compaction
+
+DEFAULT_MAX_TOKENS = 600
+CHUNK_CHARS = 300  # Run-on bullet lists with no punctuation are cut into pieces this long
+
+# Sentence ends, bullet glyphs scraped postings use in place of line breaks, and Indeed's footer fields
+_SEGMENT_SPLIT = re.compile(
+    r'(?<=[.!?])\s+(?=["(\[$\w])|\s*[▪■●◦•·►✓✔➢]\s*'
+    r'|\s+(?=(?:Job Types?|Pay|Expected hours|Benefits|Schedule|Shift|Work Location|Work Days|License/Certification):)')
+# URLs / e-mail addresses with the space before them; trailing sentence punctuation is left in place
+_INLINE_NOISE = re.compile(r'\s*(?:(?:https?://|www\.)\S*[^\s.,;:!?)]|[\w.+-]+@[\w-]+(?:\.[\w-]+)+)')
+_WHITESPACE = re.compile(r'\s+')
+_NON_WORD = re.compile(r'[^a-z0-9$]+')
+
+# Background / record requirements (the fair_chance verdict) ...
+RECORD_PATTERN = re.compile(
+    r'background|criminal|felon|conviction|arrest|record|fair[- ]chance|second[- ]chance'
+    r'|\bmvr\b|violation|\bdui\b|\bdwi\b')
+
+# ... terms that decide the other verdicts (licence, endorsements, experience, route) ...
+SIGNAL_PATTERN = re.compile(
+    r'\bcdl|class[- ]?[abc]\b|commercial driver|learner.?s permit|\bclp\b|endorse|haz-?mat|tanker|doubles|triples'
+    r'|passenger|school bus|experience|training|trainee|student|apprentice|tuition|sponsor|non-cdl'
+    r'|\broutes?\b|home (?:daily|nightly|weekly|every|time)|\botr\b|over[- ]the[- ]road|on the road|work location|\blocal\b|regional'
+    r'|team driv|owner[- ]operator|\blease|1099')
+
+# ... and terms that feed the summary (pay, schedule, equipment, work setting)
+DETAIL_PATTERN = re.compile(
+    r'\$|\bpay|per (?:mile|hour|week|load)|\bcpm\b|salary|wage|bonus|benefit|401|\bw-?2\b|dedicated|solo'
+    r'|forklift|warehouse|\bdock|loader|box truck|flatbed|reefer|dry van|tractor|trailer'
+    r'|\bshifts?\b|schedule|\bhours\b|\bmiles\b|\bdot\b|medical card|years? old|\bage\b')
+
+BOILERPLATE_PATTERN = re.compile(
+    r'equal (?:employment )?opportunity|\beeo\b|without regard to|regardless of (?:race|age|sex|religion)'
+    r'|sexual orientation|gender identity|protected veteran|national origin|reasonable accommodation'
+    r'|e-?verify|at-?will|affirmative action'
+    r'|this (?:job )?description (?:is|does) not|not (?:intended|designed) to (?:be|cover)'
+    r'|other (?:related )?duties (?:as )?(?:assigned|required)|(?:apply|click) (?:now|today|here|below)|apply online'
+    r'|privacy (?:policy|notice)|follow us on|we look forward to|visit (?:us|our website)')
+
+
+def compaction_enabled() -> bool:
+    """False when FREEWORLD_DESCRIPTION_COMPACTION is off"""
+    return os.getenv('FREEWORLD_DESCRIPTION_COMPACTION', '').lower() not in ('off', '0', 'false')
+
+
+def _max_tokens() -> int:
+    try:
+        return int(os.getenv('FREEWORLD_DESCRIPTION_MAX_TOKENS', DEFAULT_MAX_TOKENS))
+    except ValueError:
+        return DEFAULT_MAX_TOKENS
+
+
+def _chunks(segment: str) -> List[str]:
+    """Word-boundary pieces of at most CHUNK_CHARS (longer single words stay whole)"""
+    if len(segment) <= CHUNK_CHARS:
+        return [segment]
+    pieces, current = [], ''
+    for word in segment.split(' '):
+        if current and len(current) + 1 + len(word) > CHUNK_CHARS:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    return pieces + [current]
+
+
+def split_segments(text: str) -> List[str]:
+    """Unescape HTML, drop URLs and e-mail addresses, split into sentences / bullet items"""
+    text = html.unescape(html.unescape(text or ''))
+    text = _WHITESPACE.sub(' ', _INLINE_NOISE.sub('', text))
+    return [chunk for segment in _SEGMENT_SPLIT.split(text) if segment.strip(' ;,-')
+            for chunk in _chunks(segment.strip(' ;,-'))]
+
+
+def signal_rank(segment: str) -> int:
+    """3: background / record, 2: other verdict signal, 1: summary detail, 0: neither"""
+    lower = segment.lower()
+    if RECORD_PATTERN.search(lower):
+        return 3
+    if SIGNAL_PATTERN.search(lower):
+        return 2
+    return 1 if DETAIL_PATTERN.search(lower) else 0
+
+
+def is_boilerplate(segment: str) -> bool:
+    """Known filler that carries no classification signal"""
+    return BOILERPLATE_PATTERN.search(segment.lower()) is not None and signal_rank(segment) == 0
+
+
+def compact_description(text: str, max_tokens: Optional[int] = None) -> str:
+    """
+    Compact one job description.
+
+    Args:
+        text: description as scraped or normalized
+        max_tokens: token ceiling for the result (default: FREEWORLD_DESCRIPTION_MAX_TOKENS)
+
+    Returns:
+        Kept segments, one per line, in their original order
+    """
+    if not text or not text.strip():
+        return text or ''
+    max_tokens = max_tokens or _max_tokens()
+
+    segments, seen = [], set()
+    for segment in split_segments(text):
+        key = _NON_WORD.sub(' ', segment.lower()).strip()
+        if not key or key in seen or is_boilerplate(segment):
+            continue
+        seen.add(key)
+        segments.append(segment)
+    if not segments:  # Nothing but boilerplate: let the model see (the start of) it
+        segments = split_segments(text)
+
+    tokens = [estimate_tokens(segment) + 1 for segment in segments]  # +1: the joining newline
+    if sum(tokens) > max_tokens:
+        # Lead sentence first, then record requirements, verdict signals, details and the rest
+        ranks = [signal_rank(segment) for segment in segments]
+        order = [0] + sorted(range(1, len(segments)), key=lambda i: -ranks[i])
+        keep, used = set(), 0
+        for index in order:
+            if used + tokens[index] <= max_tokens:
+                keep.add(index)
+                used += tokens[index]
+        segments = [segment for index, segment in enumerate(segments) if index in keep]
+    return '\n'.join(segments)
+
+
+def compact_jobs(jobs: List[Dict], max_tokens: Optional[int] = None) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Compacted copies of classifier job dicts (the originals are not modified).
+
+    Returns:
+        (jobs with compacted job_description, stats: jobs, tokens_before, tokens_after)
+    """
+    compacted, before, after = [], 0, 0
+    for job in jobs:
+        description = job.get('job_description') or ''
+        short = compact_description(description, max_tokens)
+        before += estimate_tokens(description)
+        after += estimate_tokens(short)
+        compacted.append({**job, 'job_description': short})
+    return compacted, {'jobs': len(jobs), 'tokens_before': before, 'tokens_after': after}
+
+
+def compact_for_classification(jobs: List[Dict]) -> List[Dict]:
+    """Jobs to send to a classifier: compacted and reported, or unchanged when compaction is off"""
+    if not compaction_enabled() or not jobs:
+        return jobs
+    try:
+        compacted, stats = compact_jobs(jobs)
+    except Exception as e:
+        print(f"⚠️ Description compaction failed, sending descriptions as scraped: {e}")
+        return jobs
+    saved = stats['tokens_before'] - stats['tokens_after']
+    print(f"✂️ Compacted {stats['jobs']} descriptions: {stats['tokens_before']:,} → {stats['tokens_after']:,} tokens "
+          f"({saved / max(1, stats['tokens_before']) * 100:.0f}% saved)")
+    record_description_compaction(stats['tokens_before'], stats['tokens_after'])
+    return compacted
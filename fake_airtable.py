@@ -0,0 +1,128 @@
+"""
+Fake Airtable Table
+Offline stand-in for a pyairtable Table so Airtable syncs can be exercised in
+tests and benchmarks without API keys:
+
+    table = FakeAirtableTable([{'Job ID': 'abc', 'Job Title': 'CDL-A Driver'}])
+    engine = AirtableSyncEngine(table)
+
+Implements the Table methods the syncs use (iterate, all, create, update,
+batch_create, batch_update, batch_delete) with the API's limits: list pages of
+at most 100 records and at most 10 records per batch call. all() understands
+the simple {Field} = 'value' formulas used for lookups. Every call is recorded
+in .calls so tests can count round-trips; fail_next_with_429(n) makes the next
+n calls raise like a rate-limited request.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 10
+
+_EQUALS_FORMULA = re.compile(r"^\{(.+)\}\s*=\s*'(.*)'$")
+
+
+class FakeAirtableTable:
+    """In-memory Airtable table"""
+
+    def __init__(self, records: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            records: Initial field dicts (record ids are assigned)
+        """
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self._next_id = 1
+        self._fail_next = 0
+        for fields in records or []:
+            self._insert(fields)
+
+    def _insert(self, fields: Dict[str, Any]) -> Dict:
+        record_id = f"rec{self._next_id:014d}"
+        self._next_id += 1
+        self.records[record_id] = {'id': record_id, 'createdTime': datetime.now(timezone.utc).isoformat(),
+                                   'fields': {k: v for k, v in fields.items() if v not in (None, '')}}
+        return self._copy(self.records[record_id])
+
+    @staticmethod
+    def _copy(record: Dict, fields: Optional[List[str]] = None) -> Dict:
+        values = record['fields']
+        if fields:
+            values = {k: v for k, v in values.items() if k in fields}
+        return {'id': record['id'], 'createdTime': record['createdTime'], 'fields': dict(values)}
+
+    def _record_call(self, method: str, count: int = 1) -> None:
+        self.calls.append({'method': method, 'records': count})
+        if self._fail_next:
+            self._fail_next -= 1
+            raise Exception("429 Client Error: Too Many Requests for url: https://api.airtable.com/v0/fake")
+
+    def fail_next_with_429(self, count: int = 1) -> None:
+        self._fail_next = count
+
+    @property
+    def call_count(self) -> int:
+        return len(self.calls)
+
+    def fields_by_key(self, key_field: str) -> Dict[str, Dict[str, Any]]:
+        return {r['fields'].get(key_field): dict(r['fields']) for r in self.records.values()}
+
+    # Reads
+
+    def iterate(self, page_size: int = MAX_PAGE_SIZE, fields: Optional[List[str]] = None,
+                **options) -> Iterator[List[Dict]]:
+        page_size = min(page_size or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+        records = list(self.records.values())
+        for i in range(0, max(len(records), 1), page_size):
+            self._record_call('list', len(records[i:i + page_size]))
+            yield [self._copy(r, fields) for r in records[i:i + page_size]]
+
+    def all(self, formula: Optional[str] = None, fields: Optional[List[str]] = None, **options) -> List[Dict]:
+        match = _EQUALS_FORMULA.match(formula.strip()) if formula else None
+        if formula and not match:
+            raise ValueError(f"FakeAirtableTable only supports {{Field}} = 'value' formulas: {formula}")
+        matches = [r for r in self.records.values()
+                   if not match or str(r['fields'].get(match.group(1), '')) == match.group(2)]
+        pages = -(-len(matches) // MAX_PAGE_SIZE) or 1
+        for _ in range(pages):
+            self._record_call('list')
+        return [self._copy(r, fields) for r in matches]
+
+    # Writes
+
+    def create(self, fields: Dict[str, Any], typecast: bool = False) -> Dict:
+        self._record_call('create')
+        return self._insert(fields)
+
+    def update(self, record_id: str, fields: Dict[str, Any], replace: bool = False, typecast: bool = False) -> Dict:
+        self._record_call('update')
+        return self._update(record_id, fields, replace)
+
+    def _update(self, record_id: str, fields: Dict[str, Any], replace: bool) -> Dict:
+        if record_id not in self.records:
+            raise Exception(f"404 Client Error: NOT_FOUND {record_id}")
+        record = self.records[record_id]
+        record['fields'] = {} if replace else record['fields']
+        record['fields'].update(fields)
+        return self._copy(record)
+
+    def _check_batch(self, items: List) -> None:
+        if len(items) > MAX_BATCH_SIZE:
+            raise Exception(f"422 Client Error: INVALID_RECORDS - at most {MAX_BATCH_SIZE} records per request")
+
+    def batch_create(self, records: List[Dict[str, Any]], typecast: bool = False) -> List[Dict]:
+        self._check_batch(records)
+        self._record_call('batch_create', len(records))
+        return [self._insert(fields) for fields in records]
+
+    def batch_update(self, records: List[Dict[str, Any]], replace: bool = False, typecast: bool = False) -> List[Dict]:
+        self._check_batch(records)
+        self._record_call('batch_update', len(records))
+        return [self._update(r['id'], r['fields'], replace) for r in records]
+
+    def batch_delete(self, record_ids: List[str]) -> List[Dict]:
+        self._check_batch(record_ids)
+        self._record_call('batch_delete', len(record_ids))
+        return [{'id': rid, 'deleted': self.records.pop(rid, None) is not None} for rid in record_ids]
@@ -0,0 +1,162 @@
+"""
+Feedback Exclusion Index - reported jobs to hide from memory searches
+
+Memory searches used to download the whole job_feedback table on every call and
+drop reported URLs client-side. FeedbackExclusionIndex keeps the reported
+URLs/job IDs in process and refreshes them incrementally:
+
+- the first load pages through job_feedback (job_url, job_id, created_at only)
+- later refreshes fetch only rows with created_at >= the newest one seen
+  (the watermark), at most once per refresh interval
+- a periodic full reload picks up deleted feedback rows
+
+apply_to_query() pushes the URL exclusion into the PostgREST query when the list
+is short enough for a request URL; filter_jobs() is the client-side pass that
+always runs (job IDs, and URL lists too long to push down).
+
+Environment:
+    FREEWORLD_FEEDBACK_REFRESH_SECONDS=60   minimum time between incremental refreshes
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from postgrest.utils import sanitize_param
+except ImportError:  # Older postgrest-py
+    def sanitize_param(param: Any) -> str:
+        param_str = str(param)
+        return f'"{param_str}"' if any(ch in param_str for ch in ',:()') else param_str
+
+FEEDBACK_COLUMNS = 'job_url,job_id,created_at'
+MAX_PUSHDOWN_CHARS = 8000  # Keep GET URLs well under common proxy limits (~16KB)
+
+
+class FeedbackExclusionIndex:
+    """In-process set of reported job URLs/IDs with watermark refresh"""
+
+    def __init__(self, refresh_seconds: Optional[float] = None, full_reload_seconds: float = 3600.0,
+                 page_size: int = 1000):
+        """
+        Args:
+            refresh_seconds: Minimum seconds between incremental refreshes
+            full_reload_seconds: Seconds between full reloads (picks up deletions)
+            page_size: Rows per job_feedback request
+        """
+        if refresh_seconds is None:
+            refresh_seconds = float(os.getenv('FREEWORLD_FEEDBACK_REFRESH_SECONDS', '60'))
+        self.refresh_seconds = refresh_seconds
+        self.full_reload_seconds = full_reload_seconds
+        self.page_size = page_size
+
+        self.urls: frozenset = frozenset()
+        self.job_ids: frozenset = frozenset()
+        self.watermark: Optional[str] = None
+        self._last_refresh = 0.0
+        self._last_full = 0.0
+        self._lock = threading.Lock()
+        self._clock = time.time
+        self.stats = {'refreshes': 0, 'full_reloads': 0, 'round_trips': 0, 'rows_fetched': 0,
+                      'pushdowns': 0, 'client_filtered': 0}
+
+    def refresh(self, client, force: bool = False) -> bool:
+        """
+        Bring the index up to date if the refresh interval has passed
+
+        Args:
+            client: Supabase client
+            force: Refresh even inside the interval
+
+        Returns:
+            True if job_feedback was queried
+        """
+        with self._lock:
+            now = self._clock()
+            if not force and self._last_refresh and now - self._last_refresh < self.refresh_seconds:
+                return False
+
+            full = self.watermark is None or now - self._last_full >= self.full_reload_seconds
+            try:
+                rows = self._fetch(client, None if full else self.watermark)
+            except Exception as e:
+                # Keep serving the last known set; retry on the next search
+                print(f"⚠️ Could not refresh reported jobs (table may not exist yet): {e}")
+                return False
+
+            urls = set() if full else set(self.urls)
+            job_ids = set() if full else set(self.job_ids)
+            watermark = None if full else self.watermark
+            for row in rows:
+                if row.get('job_url'):
+                    urls.add(row['job_url'])
+                if row.get('job_id'):
+                    job_ids.add(row['job_id'])
+                created = row.get('created_at')
+                if created and (watermark is None or str(created) > watermark):
+                    watermark = str(created)
+
+            self.urls, self.job_ids, self.watermark = frozenset(urls), frozenset(job_ids), watermark
+            self._last_refresh = now
+            self.stats['refreshes'] += 1
+            if full:
+                self._last_full = now
+                self.stats['full_reloads'] += 1
+            return True
+
+    def _fetch(self, client, since: Optional[str]) -> List[Dict]:
+        """Page through job_feedback (created_at >= since; boundary rows are re-read, sets dedupe)"""
+        rows, offset = [], 0
+        while True:
+            query = client.table('job_feedback').select(FEEDBACK_COLUMNS)
+            if since:
+                query = query.gte('created_at', since)
+            page = query.order('created_at').range(offset, offset + self.page_size - 1).execute().data or []
+            self.stats['round_trips'] += 1
+            self.stats['rows_fetched'] += len(page)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            offset += self.page_size
+
+    def apply_to_query(self, query, url_column: str = 'apply_url') -> Tuple[Any, bool]:
+        """
+        Exclude reported URLs server-side when the list fits in the request
+
+        Rows with a NULL URL are kept, matching the client-side filter.
+
+        Returns:
+            (query, pushed_down)
+        """
+        urls = self.urls
+        if not urls:
+            return query, True
+        values = ','.join(sanitize_param(url) for url in sorted(urls))
+        if len(values) > MAX_PUSHDOWN_CHARS:
+            return query, False
+        self.stats['pushdowns'] += 1
+        return query.or_(f"{url_column}.is.null,{url_column}.not.in.({values})"), True
+
+    def filter_jobs(self, jobs: List[Dict], url_field: str = 'apply_url', id_field: str = 'job_id') -> List[Dict]:
+        """Drop jobs whose URL or job ID has feedback"""
+        urls, job_ids = self.urls, self.job_ids
+        if not urls and not job_ids:
+            return jobs
+        kept = [job for job in jobs if job.get(url_field) not in urls and job.get(id_field) not in job_ids]
+        filtered = len(jobs) - len(kept)
+        self.stats['client_filtered'] += filtered
+        if filtered:
+            print(f"🚫 Filtered out {filtered} reported jobs")
+        return kept
+
+
+_shared_index: Optional[FeedbackExclusionIndex] = None
+
+
+def get_feedback_exclusions() -> FeedbackExclusionIndex:
+    """Process-wide exclusion index shared by all memory searches"""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = FeedbackExclusionIndex()
+    return _shared_index
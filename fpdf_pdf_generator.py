@@ -12,6 +12,8 @@ import os
 import sys
 import re
 
+from job_sorting_utils import apply_unified_sorting
+
 try:
     from link_tracker import LinkTracker
 except ImportError:
@@ -1012,43 +1014,7 @@ def generate_fpdf_job_cards(jobs_df, output_path, market="Unknown", coach_name:"
     print(f"  📄 Creating title page and {total_jobs} job cards with FPDF2")
     
     # Sort jobs by priority: Local→OTR→Unknown, then by quality within each route type
-    def get_sort_priority(row):
-        # Route type priority (most important)
-        route_type = str(row.get('ai.route_type', '')).lower()
-        if route_type == 'local':
-            route_priority = 0
-        elif route_type in ['otr', 'regional']:
-            route_priority = 1  
-        else:
-            route_priority = 2  # Unknown/other
-        
-        # Quality priority within route type
-        ai_match = row.get('ai.match', '')
-        fair_chance = row.get('ai.fair_chance', '').lower()
-        
-        is_excellent = ai_match == 'good'
-        is_possible = ai_match == 'so-so'  
-        has_fair_chance = 'fair_chance_employer' in fair_chance
-        
-        if is_excellent and has_fair_chance:
-            quality_priority = 1  # Highest quality
-        elif is_excellent:
-            quality_priority = 2  # Second quality  
-        elif is_possible and has_fair_chance:
-            quality_priority = 3  # Third quality
-        elif is_possible:
-            quality_priority = 4  # Fourth quality
-        else:
-            quality_priority = 5  # Lowest quality (bad/unknown matches)
-        
-        # Combine: route_priority * 10 + quality_priority for proper ordering
-        # This ensures Local jobs always come first, then OTR, then Unknown
-        return route_priority * 10 + quality_priority
-    
-    # Apply sorting
-    jobs_df = jobs_df.copy()
-    jobs_df['_sort_priority'] = jobs_df.apply(get_sort_priority, axis=1)
-    jobs_df = jobs_df.sort_values('_sort_priority').drop('_sort_priority', axis=1).reset_index(drop=True)
+    jobs_df = apply_unified_sorting(jobs_df)
 
     # Create beautiful title page first
     pdf.create_title_page(clean_market, total_jobs, coach_name if coach_name else "",)
@@ -5,12 +5,16 @@ Enhanced analytics and rollup functionality for Free Agent management
 """
 
 import os
+import hashlib
+import time
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 import json
 
+from rollup_state import load_rollup_state, rollup_state_path, save_rollup_state
+
 try:
     from supabase_utils import get_client
 except Exception:
@@ -201,6 +205,17 @@ def extract_market_from_agent_location(city: str, state: str) -> str:
 
     return "Unknown"
 
+def summarize_click_patterns(companies: Counter, routes: Counter, markets: Counter,
+                             qualities: Counter, total_clicks: int) -> Dict:
+    """Click-pattern fields of an agent's analytics row"""
+    return {
+        'companies_clicked': dict(companies.most_common(10)),
+        'route_types_clicked': dict(routes),
+        'markets_engaged': dict(markets),
+        'job_qualities_clicked': dict(qualities),
+        'total_clicks': total_clicks
+    }
+
 def analyze_agent_click_patterns(agent_uuid: str, days_back: int = 30) -> Dict:
     """Analyze click patterns for an agent"""
     client = get_client()
@@ -227,23 +242,121 @@ def analyze_agent_click_patterns(agent_uuid: str, days_back: int = 30) -> Dict:
             }
 
         # Analyze patterns
-        companies = Counter(click.get('company', 'Unknown') for click in clicks_data)
-        routes = Counter(click.get('route', 'Unknown') for click in clicks_data)
-        markets = Counter(click.get('market', 'Unknown') for click in clicks_data)
-        qualities = Counter(click.get('match', 'Unknown') for click in clicks_data)
-
-        return {
-            'companies_clicked': dict(companies.most_common(10)),
-            'route_types_clicked': dict(routes),
-            'markets_engaged': dict(markets),
-            'job_qualities_clicked': dict(qualities),
-            'total_clicks': len(clicks_data)
-        }
+        return summarize_click_patterns(
+            Counter(click.get('company', 'Unknown') for click in clicks_data),
+            Counter(click.get('route', 'Unknown') for click in clicks_data),
+            Counter(click.get('market', 'Unknown') for click in clicks_data),
+            Counter(click.get('match', 'Unknown') for click in clicks_data),
+            len(clicks_data),
+        )
 
     except Exception as e:
         print(f"Error analyzing click patterns for {agent_uuid}: {e}")
         return {}
 
+def build_agent_rollup_row(agent: Dict, click_patterns: Dict) -> Dict:
+    """
+    Build one free_agents_analytics row
+
+    Args:
+        agent: agent_profiles row
+        click_patterns: Output of summarize_click_patterns ({} when unavailable)
+
+    Returns:
+        Row dict ready for upsert
+    """
+    agent_uuid = agent.get('agent_uuid', '')
+
+    # Extract market from location
+    market = extract_market_from_agent_location(
+        agent.get('agent_city', ''),
+        agent.get('agent_state', '')
+    )
+
+    # Calculate engagement metrics
+    engagement_score = calculate_engagement_score(agent)
+
+    # Determine activity level
+    last_activity = agent.get('last_portal_visit') or agent.get('last_job_click')
+    days_since_activity = 0
+    if last_activity:
+        try:
+            last_dt = pd.to_datetime(last_activity)
+            days_since_activity = (datetime.now(timezone.utc) - last_dt.tz_convert('UTC')).days
+        except:
+            days_since_activity = 30
+
+    activity_level = determine_activity_level(engagement_score, days_since_activity)
+
+    # Parse route preferences
+    route_preferences = {}
+    preferred_routes = agent.get('preferred_routes', '')
+    if preferred_routes:
+        if preferred_routes.lower() in ['local', 'otr', 'regional']:
+            route_preferences['primary'] = preferred_routes.lower()
+        elif preferred_routes.lower() == 'both':
+            route_preferences['primary'] = 'flexible'
+
+    # Parse search config
+    search_config = agent.get('search_config', {})
+    if isinstance(search_config, str):
+        try:
+            search_config = json.loads(search_config)
+        except:
+            search_config = {}
+
+    # Calculate click-through rate
+    portal_visits = agent.get('portal_visits', 0) or 0
+    job_clicks = agent.get('job_clicks', 0) or 0
+    click_through_rate = (job_clicks / portal_visits * 100) if portal_visits > 0 else 0
+
+    return {
+        'agent_uuid': agent_uuid,
+        'agent_name': agent.get('agent_name', ''),
+        'coach_username': agent.get('coach_username', ''),
+        'agent_email': agent.get('agent_email', ''),
+        'agent_city': agent.get('agent_city', ''),
+        'agent_state': agent.get('agent_state', ''),
+        'market': market,
+
+        # Engagement metrics
+        'total_portal_visits': portal_visits,
+        'total_job_clicks': job_clicks,
+        'total_applications': agent.get('total_applications', 0) or 0,
+
+        # Dates
+        'first_portal_visit': None,  # Would need historical data
+        'last_portal_visit': agent.get('last_portal_visit'),
+        'last_job_click': agent.get('last_job_click'),
+        'last_application_at': agent.get('last_application_at'),
+
+        # Preferences
+        'route_preferences': route_preferences,
+        'pathway_preferences': agent.get('pathway_preferences', []) or [],
+        'search_config': search_config,
+
+        # Performance metrics
+        'click_through_rate': round(click_through_rate, 2),
+        'engagement_score': engagement_score,
+        'avg_jobs_per_search': 0,  # Would need search history
+
+        # Interaction patterns
+        'companies_clicked': click_patterns.get('companies_clicked', {}),
+        'route_types_clicked': click_patterns.get('route_types_clicked', {}),
+        'markets_engaged': click_patterns.get('markets_engaged', {}),
+        'job_qualities_clicked': click_patterns.get('job_qualities_clicked', {}),
+
+        # Status
+        'is_active': True,
+        'activity_level': activity_level,
+        'last_activity_at': last_activity,
+
+        # Coach relationship
+        'priority_level': agent.get('priority_level', 'normal'),
+        'notes': agent.get('notes', ''),
+        'tags': agent.get('tags', []) or [],
+    }
+
 def analyze_free_agents_for_rollup() -> pd.DataFrame:
     """Analyze agent profiles and click data to create analytics rollup"""
     client = get_client()
@@ -275,122 +388,175 @@ def analyze_free_agents_for_rollup() -> pd.DataFrame:
 
         # Get click patterns
         click_patterns = analyze_agent_click_patterns(agent_uuid, days_back=30)
+        agents_rollup.append(build_agent_rollup_row(agent.to_dict(), click_patterns))
 
-        # Extract market from location
-        market = extract_market_from_agent_location(
-            agent.get('agent_city', ''),
-            agent.get('agent_state', '')
-        )
+    return pd.DataFrame(agents_rollup)
 
-        # Calculate engagement metrics
-        engagement_score = calculate_engagement_score(agent.to_dict())
+ROLLUP_WINDOW_DAYS = 30
+CLICK_OVERLAP_SECONDS = 300  # Re-read window for clicks committed slightly out of order
+PATTERN_FIELDS = (('company', 'companies_clicked'), ('route', 'route_types_clicked'),
+                  ('market', 'markets_engaged'), ('match', 'job_qualities_clicked'))
 
-        # Determine activity level
-        last_activity = agent.get('last_portal_visit') or agent.get('last_job_click')
-        days_since_activity = 0
-        if last_activity:
-            try:
-                last_dt = pd.to_datetime(last_activity)
-                days_since_activity = (datetime.now(timezone.utc) - last_dt.tz_convert('UTC')).days
-            except:
-                days_since_activity = 30
-
-        activity_level = determine_activity_level(engagement_score, days_since_activity)
-
-        # Parse route preferences
-        route_preferences = {}
-        preferred_routes = agent.get('preferred_routes', '')
-        if preferred_routes:
-            if preferred_routes.lower() in ['local', 'otr', 'regional']:
-                route_preferences['primary'] = preferred_routes.lower()
-            elif preferred_routes.lower() == 'both':
-                route_preferences['primary'] = 'flexible'
-
-        # Parse search config
-        search_config = agent.get('search_config', {})
-        if isinstance(search_config, str):
-            try:
-                search_config = json.loads(search_config)
-            except:
-                search_config = {}
-
-        # Calculate click-through rate
-        portal_visits = agent.get('portal_visits', 0) or 0
-        job_clicks = agent.get('job_clicks', 0) or 0
-        click_through_rate = (job_clicks / portal_visits * 100) if portal_visits > 0 else 0
-
-        agents_rollup.append({
-            'agent_uuid': agent_uuid,
-            'agent_name': agent.get('agent_name', ''),
-            'coach_username': agent.get('coach_username', ''),
-            'agent_email': agent.get('agent_email', ''),
-            'agent_city': agent.get('agent_city', ''),
-            'agent_state': agent.get('agent_state', ''),
-            'market': market,
-
-            # Engagement metrics
-            'total_portal_visits': portal_visits,
-            'total_job_clicks': job_clicks,
-            'total_applications': agent.get('total_applications', 0) or 0,
-
-            # Dates
-            'first_portal_visit': None,  # Would need historical data
-            'last_portal_visit': agent.get('last_portal_visit'),
-            'last_job_click': agent.get('last_job_click'),
-            'last_application_at': agent.get('last_application_at'),
-
-            # Preferences
-            'route_preferences': route_preferences,
-            'pathway_preferences': agent.get('pathway_preferences', []) or [],
-            'search_config': search_config,
-
-            # Performance metrics
-            'click_through_rate': round(click_through_rate, 2),
-            'engagement_score': engagement_score,
-            'avg_jobs_per_search': 0,  # Would need search history
-
-            # Interaction patterns
-            'companies_clicked': click_patterns.get('companies_clicked', {}),
-            'route_types_clicked': click_patterns.get('route_types_clicked', {}),
-            'markets_engaged': click_patterns.get('markets_engaged', {}),
-            'job_qualities_clicked': click_patterns.get('job_qualities_clicked', {}),
-
-            # Status
-            'is_active': True,
-            'activity_level': activity_level,
-            'last_activity_at': last_activity,
-
-            # Coach relationship
-            'priority_level': agent.get('priority_level', 'normal'),
-            'notes': agent.get('notes', ''),
-            'tags': agent.get('tags', []) or [],
-        })
 
-    return pd.DataFrame(agents_rollup)
+def _click_key(click: Dict) -> str:
+    """Identity of a click event for de-duplicating the overlap re-read"""
+    return '|'.join(str(click.get(c)) for c in ('clicked_at', 'short_id', 'candidate_id', 'original_url'))
 
-def update_free_agents_analytics_table():
-    """Update the free agents analytics table with fresh data"""
-    client = get_client()
-    if not client:
-        raise Exception("Supabase client not available")
 
-    print("👥 UPDATING FREE AGENTS ANALYTICS TABLE")
-    print("=" * 50)
+def _row_hash(row: Dict) -> str:
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode('utf-8')).hexdigest()
 
-    # Analyze agents and create analytics data
-    agents_df = analyze_free_agents_for_rollup()
 
-    if agents_df.empty:
-        print("⚠️ No agents data to update")
-        return
+class IncrementalAgentRollup:
+    """
+    Free agent analytics folded incrementally from click_events
 
-    # Clear existing data and insert new data using upsert
-    print(f"📊 Upserting {len(agents_df)} agent analytics...")
+    Keeps per-agent, per-UTC-day click counters (company/route/market/match) for
+    the rollup window plus a clicked_at watermark in rollup_state. Each run:
 
-    # Convert DataFrame to list of dicts for Supabase
-    agents_data = agents_df.to_dict('records')
+    1. reads only click events newer than the watermark (one paginated query,
+       re-reading CLICK_OVERLAP_SECONDS and skipping clicks already folded in)
+    2. drops day buckets that left the window
+    3. rebuilds every active agent's row in memory and returns only the rows
+       whose content changed since the last successful upsert
+    """
 
-    # Use upsert to handle existing records
+    def __init__(self, client, state_path: Optional[str] = None, window_days: int = ROLLUP_WINDOW_DAYS,
+                 overlap_seconds: int = CLICK_OVERLAP_SECONDS):
+        """
+        Args:
+            client: Supabase client
+            state_path: Rollup state file (None = in-memory only, i.e. full rebuild)
+            window_days: Click-pattern window (matches analyze_agent_click_patterns)
+            overlap_seconds: Seconds before the watermark to re-read
+        """
+        self.client = client
+        self.state_path = state_path
+        self.window_days = window_days
+        self.overlap_seconds = overlap_seconds
+        self.state = load_rollup_state(state_path)
+        self.state.setdefault('buckets', {})
+        self.state.setdefault('overlap_keys', [])
+        self.state.setdefault('row_hashes', {})
+        self.stats = {'new_clicks': 0, 'agents': 0, 'changed_agents': 0, 'click_queries': 0}
+
+    def collect_clicks(self, now: Optional[datetime] = None) -> int:
+        """
+        Fold click events newer than the watermark into the day buckets
+
+        Returns:
+            Number of new click events
+        """
+        from supabase_utils import iter_click_events
+
+        now = now or datetime.now(timezone.utc)
+        window_start = (now - timedelta(days=self.window_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        watermark = self.state.get('watermark')
+        start = window_start
+        if watermark:
+            start = max(window_start, pd.Timestamp(watermark).to_pydatetime() - timedelta(seconds=self.overlap_seconds))
+
+        seen = set(self.state['overlap_keys'])
+        buckets = self.state['buckets']
+        newest = pd.Timestamp(watermark) if watermark else None
+        new_clicks = 0
+        recent = []
+
+        for chunk in iter_click_events(start, now, client=self.client):
+            self.stats['click_queries'] += 1
+            for click, ts in zip(chunk.to_dict('records'), chunk['timestamp']):
+                key = _click_key(click)
+                recent.append((ts, key))
+                if key in seen:
+                    continue
+                seen.add(key)
+                if newest is None or ts > newest:
+                    newest = ts
+                agent_uuid = click.get('candidate_id')
+                if not agent_uuid or pd.isna(agent_uuid):
+                    continue
+                day = buckets.setdefault(agent_uuid, {}).setdefault(ts.date().isoformat(), {'n': 0})
+                day['n'] += 1
+                for field, _ in PATTERN_FIELDS:
+                    value = click.get(field)
+                    # JSON object keys: NULL is stored as "null" (how the upsert serializes it anyway)
+                    value = 'null' if value is None or (isinstance(value, float) and pd.isna(value)) else str(value)
+                    counts = day.setdefault(field, {})
+                    counts[value] = counts.get(value, 0) + 1
+                new_clicks += 1
+
+        # Prune buckets that left the window
+        cutoff_day = window_start.date().isoformat()
+        for agent_uuid in list(buckets):
+            days = {day: counts for day, counts in buckets[agent_uuid].items() if day >= cutoff_day}
+            if days:
+                buckets[agent_uuid] = days
+            else:
+                del buckets[agent_uuid]
+
+        if newest is not None:
+            self.state['watermark'] = newest.isoformat()
+            overlap_start = newest - pd.Timedelta(seconds=self.overlap_seconds)
+            # Every click in the next overlap window was read by this run
+            self.state['overlap_keys'] = sorted({key for ts, key in recent if ts >= overlap_start})
+        self.stats['new_clicks'] = new_clicks
+        return new_clicks
+
+    def click_patterns(self, agent_uuid: str) -> Dict:
+        """Windowed click patterns for an agent (same shape as analyze_agent_click_patterns)"""
+        counters = {field: Counter() for field, _ in PATTERN_FIELDS}
+        total = 0
+        for counts in self.state['buckets'].get(agent_uuid, {}).values():
+            total += counts.get('n', 0)
+            for field, _ in PATTERN_FIELDS:
+                counters[field].update(counts.get(field, {}))
+        return summarize_click_patterns(counters['company'], counters['route'], counters['market'],
+                                        counters['match'], total)
+
+    def build_rows(self, agents: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Build analytics rows for the active agents
+
+        Returns:
+            (all_rows, changed_rows)
+        """
+        rows, changed = [], []
+        for agent in agents:
+            agent_uuid = agent.get('agent_uuid', '')
+            if not agent_uuid:
+                continue
+            row = build_agent_rollup_row(agent, self.click_patterns(agent_uuid))
+            rows.append(row)
+            if self.state['row_hashes'].get(agent_uuid) != _row_hash(row):
+                changed.append(row)
+        self.stats['agents'] = len(rows)
+        self.stats['changed_agents'] = len(changed)
+        return rows, changed
+
+    def mark_written(self, rows: List[Dict]) -> None:
+        """Remember the upserted rows so unchanged agents are skipped next time"""
+        for row in rows:
+            self.state['row_hashes'][row['agent_uuid']] = _row_hash(row)
+
+    def save(self) -> None:
+        save_rollup_state(self.state_path, self.state)
+
+
+def _fetch_active_agents(client, page_size: int = 1000) -> List[Dict]:
+    """All active agent_profiles rows (paged past the PostgREST row cap)"""
+    agents, offset = [], 0
+    while True:
+        page = (client.table('agent_profiles').select('*').eq('is_active', True)
+                .order('agent_uuid').range(offset, offset + page_size - 1).execute().data or [])
+        agents.extend(page)
+        if len(page) < page_size:
+            return agents
+        offset += page_size
+
+
+def _upsert_agent_rows(client, agents_data: List[Dict]) -> List[Dict]:
+    """Upsert analytics rows in batches; returns the rows that were written"""
+    written = []
     batch_size = 50
     for i in range(0, len(agents_data), batch_size):
         batch = agents_data[i:i + batch_size]
@@ -400,6 +566,7 @@ def update_free_agents_analytics_table():
                 batch,
                 on_conflict='agent_uuid'
             ).execute()
+            written.extend(batch)
             print(f"✅ Upserted batch {i//batch_size + 1}: {len(batch)} agents")
         except Exception as e:
             print(f"❌ Error in batch {i//batch_size + 1}: {e}")
@@ -410,10 +577,81 @@ def update_free_agents_analytics_table():
                         record,
                         on_conflict='agent_uuid'
                     ).execute()
+                    written.append(record)
                 except Exception as individual_error:
                     print(f"❌ Failed to upsert agent {record.get('agent_name', 'Unknown')}: {individual_error}")
+    return written
+
+
+def incremental_free_agents_rollup(client, state_path: Optional[str] = None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Refresh free_agents_analytics from click events newer than the stored watermark
+
+    Args:
+        client: Supabase client
+        state_path: Rollup state file (defaults to rollup_state_path('free_agents'))
+
+    Returns:
+        (all agent rows, stats)
+    """
+    if state_path is None:
+        state_path = rollup_state_path('free_agents')
+    started = time.perf_counter()
+    engine = IncrementalAgentRollup(client, state_path)
+
+    new_clicks = engine.collect_clicks()
+    print(f"🖱️ Folded {new_clicks} new click events into agent aggregates")
+
+    agents = _fetch_active_agents(client)
+    rows, changed = engine.build_rows(agents)
+    print(f"📊 {len(changed)} of {len(rows)} active agents changed")
+    if changed:
+        engine.mark_written(_upsert_agent_rows(client, changed))
+    engine.save()
+
+    engine.stats['seconds'] = round(time.perf_counter() - started, 3)
+    return pd.DataFrame(rows), engine.stats
+
+
+def update_free_agents_analytics_table(incremental: Optional[bool] = None):
+    """Update the free agents analytics table with fresh data
+
+    Args:
+        incremental: Fold in only new click events and upsert changed agents
+            (default; FREEWORLD_INCREMENTAL_ROLLUP=off forces a full rebuild)
+    """
+    client = get_client()
+    if not client:
+        raise Exception("Supabase client not available")
+
+    print("👥 UPDATING FREE AGENTS ANALYTICS TABLE")
+    print("=" * 50)
+
+    if incremental is None:
+        incremental = os.getenv('FREEWORLD_INCREMENTAL_ROLLUP', '').lower() not in ('off', '0', 'false')
+
+    if incremental:
+        agents_df, stats = incremental_free_agents_rollup(client)
+        if agents_df.empty:
+            print("⚠️ No agents data to update")
+            return
+        print(f"🎉 Free agents analytics updated incrementally in {stats['seconds']:.2f}s "
+              f"({stats['changed_agents']} agents upserted)")
+    else:
+        # Analyze agents and create analytics data
+        agents_df = analyze_free_agents_for_rollup()
+
+        if agents_df.empty:
+            print("⚠️ No agents data to update")
+            return
+
+        # Clear existing data and insert new data using upsert
+        print(f"📊 Upserting {len(agents_df)} agent analytics...")
+
+        # Convert DataFrame to list of dicts for Supabase
+        _upsert_agent_rows(client, agents_df.to_dict('records'))
 
-    print(f"🎉 Free agents analytics table updated successfully!")
+        print(f"🎉 Free agents analytics table updated successfully!")
 
     # Print summary
     total_agents = len(agents_df)
@@ -271,9 +271,8 @@ class HybridMemoryClassifier:
                     df.at[idx, 'route_type'] = memory_route
                 else:
                     # No good route data - run route classifier on memory job
-                    from route_classifier import RouteClassifier
-                    route_classifier = RouteClassifier()
-                    fresh_route = route_classifier.classify_route_type(
+                    from route_classifier import get_route_classifier
+                    fresh_route = get_route_classifier().classify_route_type(
                         row.get('job_title', ''),
                         row.get('job_description', ''),
                         row.get('company', '')
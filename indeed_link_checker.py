@@ -1,65 +1,336 @@
 """
 Indeed Link Expiration Checker
 Checks Indeed job links to verify they're still active
+
+check_multiple_links() runs the async checker: requests go out concurrently
+(max_concurrent overall, per_host_limit per host) with the politeness delay
+spacing link checks on each host. A HEAD request settles 404/410 pages
+without downloading them; anything else falls back to GET for the page content
+check, in the same politeness slot (the delay applies once per URL, as in the
+sequential checker). Definitive verdicts (404/410, and 200 pages that matched an
+active or expired marker) are cached per job URL for a TTL, so
+re-filtering the same jobs does not hit Indeed again.
+
+Environment:
+    FREEWORLD_LINK_CHECK_CACHE_TTL=21600   seconds to trust a verdict (off/0 = no cache)
 """
+import asyncio
+import os
 import requests
+import threading
 import time
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
 import re
 
+try:
+    import aiohttp
+except ImportError:  # Falls back to the sequential requests-based checker
+    aiohttp = None
+
+from async_runner import run_coroutine_sync
+
 logger = logging.getLogger(__name__)
 
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Common indicators that job is expired/removed
+EXPIRED_INDICATORS = [
+    'this job has expired',
+    'job has been removed',
+    'no longer available',
+    'job posting has expired',
+    'position has been filled',
+    'sorry, this job is no longer available',
+    'job not found',
+    'page not found'
+]
+
+# Positive indicators that job is active
+ACTIVE_INDICATORS = [
+    'apply now',
+    'submit application',
+    'job description',
+    'apply on company site'
+]
+
+# Status codes whose verdict is stable enough to cache (errors and throttling are retried)
+DEFINITE_STATUS_CODES = {200, 404, 410}
+
+# A 200 page with neither active nor expired markers (bot challenge, interstitial): not cached
+INCONCLUSIVE_PAGE_ERROR = 'Job content not found - may be expired'
+
+
+def extract_indeed_url(apply_url: str) -> str:
+    """
+    Extract the Indeed job URL from apply URL or redirect chain
+
+    Args:
+        apply_url: The apply URL (could be Indeed or external)
+
+    Returns:
+        Indeed job URL if found, otherwise original URL
+    """
+    if not apply_url or not isinstance(apply_url, str):
+        return apply_url
+
+    # If it's already an Indeed job URL, return as is
+    if 'indeed.com/job' in apply_url or 'indeed.com/viewjob' in apply_url:
+        return apply_url
+
+    # Try to extract jk (job key) parameter if it's an Indeed apply URL
+    parsed_url = urlparse(apply_url)
+    if 'indeed.com' in parsed_url.netloc:
+        query_params = parse_qs(parsed_url.query)
+        if 'jk' in query_params:
+            job_key = query_params['jk'][0]
+            return f"https://www.indeed.com/viewjob?jk={job_key}"
+
+    return apply_url
+
+
+def _new_result(job_url: str) -> Dict:
+    result = {
+        'original_url': job_url,
+        'is_active': False,
+        'status_code': None,
+        'error': None,
+        'indeed_url': None,
+        'job_key': None
+    }
+    indeed_url = extract_indeed_url(job_url)
+    result['indeed_url'] = indeed_url
+
+    # Extract job key for reference
+    if indeed_url and 'jk=' in indeed_url:
+        jk_match = re.search(r'jk=([a-zA-Z0-9]+)', indeed_url)
+        if jk_match:
+            result['job_key'] = jk_match.group(1)
+    return result
+
+
+def interpret_link_response(status_code: int, content: str) -> Tuple[bool, Optional[str]]:
+    """
+    Decide whether a job page is live from its status code and body
+
+    Args:
+        status_code: HTTP status of the job page
+        content: Page body ('' when only the status is known)
+
+    Returns:
+        Tuple of (is_active, error message or None)
+    """
+    if status_code == 200:
+        content = (content or '').lower()
+        is_expired = any(indicator in content for indicator in EXPIRED_INDICATORS)
+        has_active_content = any(indicator in content for indicator in ACTIVE_INDICATORS)
+
+        # Job is active if no expired indicators AND has active content
+        if is_expired:
+            return False, 'Job posting has expired or been removed'
+        if not has_active_content:
+            return False, INCONCLUSIVE_PAGE_ERROR
+        return True, None
+    if status_code == 404:
+        return False, 'Job not found (404)'
+    if status_code == 410:
+        return False, 'Job has been removed (410)'
+    return False, f'HTTP {status_code}'
+
+
+class LinkVerdictCache:
+    """Thread-safe TTL cache of link check results keyed by job URL"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            raw = os.getenv('FREEWORLD_LINK_CHECK_CACHE_TTL', '21600').strip().lower()
+            ttl_seconds = 0.0 if raw in ('off', 'false', 'none', '') else float(raw)
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, job_url: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(job_url)
+            if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                self.hits += 1
+                return dict(entry[1])
+            if entry:
+                del self._entries[job_url]
+            self.misses += 1
+            return None
+
+    def put(self, job_url: str, result: Dict) -> None:
+        if not self.enabled or result.get('status_code') not in DEFINITE_STATUS_CODES:
+            return
+        if result.get('error') == INCONCLUSIVE_PAGE_ERROR:
+            return  # The next check may get the real page
+        with self._lock:
+            self._entries[job_url] = (time.monotonic(), dict(result))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_verdict_cache: Optional[LinkVerdictCache] = None
+_verdict_cache_lock = threading.Lock()
+
+
+def get_link_verdict_cache() -> LinkVerdictCache:
+    """Process-wide verdict cache shared by all link checkers"""
+    global _verdict_cache
+    with _verdict_cache_lock:
+        if _verdict_cache is None:
+            _verdict_cache = LinkVerdictCache()
+        return _verdict_cache
+
+
+class AsyncIndeedLinkChecker:
+    """Concurrent link checker with per-host limits, politeness delays and HEAD-then-GET"""
+
+    def __init__(self, max_concurrent: int = 10, per_host_limit: int = 4, delay_between_requests: float = 1.0,
+                 timeout: float = 10.0, head_first: bool = True, cache: Optional[LinkVerdictCache] = None):
+        """
+        Args:
+            max_concurrent: Requests in flight across all hosts
+            per_host_limit: Link checks in flight to any one host
+            delay_between_requests: Minimum seconds between link checks started on one host
+            timeout: Per-request timeout in seconds
+            head_first: Try HEAD before GET (settles 404/410 without a body)
+            cache: Verdict cache (None = no caching)
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncIndeedLinkChecker")
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_host_limit = max(1, per_host_limit)
+        self.delay = max(0.0, delay_between_requests)
+        self.timeout = timeout
+        self.head_first = head_first
+        self.cache = cache
+        self.stats = {'checked': 0, 'cached': 0, 'head_requests': 0, 'get_requests': 0}
+
+    async def check_links(self, job_urls: List[str]) -> List[Dict]:
+        """
+        Check links concurrently
+
+        Args:
+            job_urls: Job URLs (duplicates are checked once)
+
+        Returns:
+            One result per input URL, in input order
+        """
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._done = 0
+        unique = list(dict.fromkeys(job_urls))
+        headers = dict(BROWSER_HEADERS, **{'Accept-Encoding': 'gzip, deflate'})
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent, limit_per_host=self.per_host_limit)
+        async with aiohttp.ClientSession(headers=headers, connector=connector,
+                                         timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            verdicts = await asyncio.gather(*(self._check(session, url, len(unique)) for url in unique))
+        by_url = dict(zip(unique, verdicts))
+        return [dict(by_url[url]) for url in job_urls]
+
+    async def _check(self, session, job_url: str, total: int) -> Dict:
+        cached = self.cache.get(job_url) if self.cache is not None else None
+        if cached is not None:
+            self.stats['cached'] += 1
+            return dict(cached, cached=True)
+
+        result = _new_result(job_url)
+        try:
+            status_code, content = await self._fetch(session, result['indeed_url'])
+            result['status_code'] = status_code
+            result['is_active'], result['error'] = interpret_link_response(status_code, content)
+        except asyncio.TimeoutError:
+            result['error'] = f'Request failed: timed out after {self.timeout:.0f}s'
+        except aiohttp.ClientError as e:
+            result['error'] = f'Request failed: {str(e)}'
+        except Exception as e:
+            result['error'] = f'Unexpected error: {str(e)}'
+
+        self.stats['checked'] += 1
+        if self.cache is not None:
+            self.cache.put(job_url, result)
+        self._done += 1
+        if self._done % 50 == 0:
+            logger.info(f"   Progress: {self._done}/{total} checked")
+        return dict(result, cached=False)
+
+    async def _fetch(self, session, url: str) -> Tuple[int, str]:
+        """HEAD then (unless it settled the link) GET, sharing one per-host politeness slot"""
+        host = urlparse(url).netloc.lower()
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        async with limit:
+            await self._polite_wait(host)
+            if self.head_first:
+                status_code, _ = await self._request(session, 'HEAD', url)
+                if status_code in (404, 410):
+                    return status_code, ''
+            return await self._request(session, 'GET', url)
+
+    async def _request(self, session, method: str, url: str) -> Tuple[int, str]:
+        async with self._global:
+            self.stats['head_requests' if method == 'HEAD' else 'get_requests'] += 1
+            async with session.request(method, url, allow_redirects=True) as response:
+                content = await response.text(errors='replace') if method == 'GET' else ''
+                return response.status, content
+
+    async def _polite_wait(self, host: str) -> None:
+        """Reserve the next start slot for a host and sleep until it comes up"""
+        if not self.delay:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self.delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
 class IndeedLinkChecker:
     """Check Indeed job links for expiration"""
     
-    def __init__(self, delay_between_requests: float = 1.0):
+    def __init__(self, delay_between_requests: float = 1.0, per_host_limit: int = 4,
+                 cache: Optional[LinkVerdictCache] = None):
         """
         Initialize link checker
         
         Args:
-            delay_between_requests: Seconds to wait between requests to avoid rate limiting
+            delay_between_requests: Minimum seconds between link checks started on one host
+            per_host_limit: Concurrent requests allowed to one host
+            cache: Verdict cache (default: the process-wide cache)
         """
         self.delay = delay_between_requests
+        self.per_host_limit = per_host_limit
+        self.cache = cache if cache is not None else get_link_verdict_cache()
         self.session = requests.Session()
         
         # Set user agent to avoid blocking
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        self.session.headers.update(BROWSER_HEADERS)
     
     def extract_indeed_url(self, apply_url: str) -> str:
-        """
-        Extract the Indeed job URL from apply URL or redirect chain
-        
-        Args:
-            apply_url: The apply URL (could be Indeed or external)
-            
-        Returns:
-            Indeed job URL if found, otherwise original URL
-        """
-        if not apply_url or not isinstance(apply_url, str):
-            return apply_url
-            
-        # If it's already an Indeed job URL, return as is
-        if 'indeed.com/job' in apply_url or 'indeed.com/viewjob' in apply_url:
-            return apply_url
-            
-        # Try to extract jk (job key) parameter if it's an Indeed apply URL
-        parsed_url = urlparse(apply_url)
-        if 'indeed.com' in parsed_url.netloc:
-            query_params = parse_qs(parsed_url.query)
-            if 'jk' in query_params:
-                job_key = query_params['jk'][0]
-                return f"https://www.indeed.com/viewjob?jk={job_key}"
-        
-        return apply_url
+        """Extract the Indeed job URL from an apply URL (see extract_indeed_url)"""
+        return extract_indeed_url(apply_url)
     
     def check_indeed_link(self, job_url: str) -> Dict:
         """
@@ -71,76 +342,20 @@ class IndeedLinkChecker:
         Returns:
             Dict with status information
         """
-        result = {
-            'original_url': job_url,
-            'is_active': False,
-            'status_code': None,
-            'error': None,
-            'indeed_url': None,
-            'job_key': None
-        }
+        cached = self.cache.get(job_url) if self.cache is not None else None
+        if cached is not None:
+            return cached
+
+        result = _new_result(job_url)
         
         try:
-            # Extract Indeed URL if needed
-            indeed_url = self.extract_indeed_url(job_url)
-            result['indeed_url'] = indeed_url
-            
-            # Extract job key for reference
-            if 'jk=' in indeed_url:
-                jk_match = re.search(r'jk=([a-zA-Z0-9]+)', indeed_url)
-                if jk_match:
-                    result['job_key'] = jk_match.group(1)
-            
             # Make request with timeout
-            response = self.session.get(indeed_url, timeout=10, allow_redirects=True)
+            response = self.session.get(result['indeed_url'], timeout=10, allow_redirects=True)
             result['status_code'] = response.status_code
-            
-            # Check if job is active based on response
-            if response.status_code == 200:
-                content = response.text.lower()
-                
-                # Common indicators that job is expired/removed
-                expired_indicators = [
-                    'this job has expired',
-                    'job has been removed',
-                    'no longer available',
-                    'job posting has expired',
-                    'position has been filled',
-                    'sorry, this job is no longer available',
-                    'job not found',
-                    'page not found'
-                ]
-                
-                # Check if any expired indicators are present
-                is_expired = any(indicator in content for indicator in expired_indicators)
-                
-                # Also check for positive indicators that job is active
-                active_indicators = [
-                    'apply now',
-                    'submit application',
-                    'job description',
-                    'apply on company site'
-                ]
-                
-                has_active_content = any(indicator in content for indicator in active_indicators)
-                
-                # Job is active if no expired indicators AND has active content
-                result['is_active'] = not is_expired and has_active_content
-                
-                if is_expired:
-                    result['error'] = 'Job posting has expired or been removed'
-                elif not has_active_content:
-                    result['error'] = 'Job content not found - may be expired'
-                    
-            elif response.status_code == 404:
-                result['error'] = 'Job not found (404)'
-                result['is_active'] = False
-            elif response.status_code == 410:
-                result['error'] = 'Job has been removed (410)'
-                result['is_active'] = False
-            else:
-                result['error'] = f'HTTP {response.status_code}'
-                result['is_active'] = False
+            content = response.text if response.status_code == 200 else ''
+            result['is_active'], result['error'] = interpret_link_response(response.status_code, content)
+            if self.cache is not None:
+                self.cache.put(job_url, result)
             
         except requests.exceptions.RequestException as e:
             result['error'] = f'Request failed: {str(e)}'
@@ -153,31 +368,33 @@ class IndeedLinkChecker:
     
     def check_multiple_links(self, job_urls: List[str], max_concurrent: int = 5) -> List[Dict]:
         """
-        Check multiple Indeed job links with rate limiting
+        Check multiple Indeed job links concurrently with per-host rate limiting
         
         Args:
             job_urls: List of job URLs to check
-            max_concurrent: Maximum number of concurrent requests (not used currently)
+            max_concurrent: Maximum number of concurrent requests across all hosts
             
         Returns:
-            List of check results
+            List of check results (same order as job_urls)
         """
-        results = []
         total_urls = len(job_urls)
+        if not total_urls:
+            return []
         
         logger.info(f"🔗 Checking {total_urls} Indeed job links for expiration...")
         
-        for i, url in enumerate(job_urls, 1):
-            if i > 1:
-                time.sleep(self.delay)  # Rate limiting
-            
-            result = self.check_indeed_link(url)
-            results.append(result)
-            
-            # Log progress every 10 jobs
-            if i % 10 == 0 or i == total_urls:
-                active_count = sum(1 for r in results if r['is_active'])
-                logger.info(f"   Progress: {i}/{total_urls} checked, {active_count} active jobs found")
+        if aiohttp is None:
+            results = []
+            for i, url in enumerate(job_urls, 1):
+                if i > 1:
+                    time.sleep(self.delay)  # Rate limiting
+                results.append(self.check_indeed_link(url))
+        else:
+            checker = AsyncIndeedLinkChecker(max_concurrent=max_concurrent, per_host_limit=self.per_host_limit,
+                                             delay_between_requests=self.delay, cache=self.cache)
+            results = run_coroutine_sync(checker.check_links(job_urls))
+            logger.info(f"   {checker.stats['cached']} verdicts from cache, "
+                        f"{checker.stats['head_requests']} HEAD / {checker.stats['get_requests']} GET requests")
         
         # Summary
         active_count = sum(1 for r in results if r['is_active'])
@@ -1,6 +1,8 @@
 import os
 import json
 import asyncio
+import contextlib
+import contextvars
 import aiohttp
 import time
 import concurrent.futures
@@ -8,9 +10,121 @@ import pandas as pd
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from classification_cache import get_classification_cache
+from description_compactor import compact_for_classification
+from pipeline_performance_monitor import record_external_call
+from classifier_runtime import AdaptiveLimiter, CLASSIFIER_TIMEOUT, classifier_connector, get_classifier_runtime
+from packed_classification import classify_packed, format_job, packed_enabled
+
 load_dotenv()
 
 class JobClassifier:
+    # Bump whenever the system prompt or schema changes - invalidates cached verdicts
+    CLASSIFIER_TYPE = "cdl"
+    PROMPT_VERSION = "cdl-2025-09"
+    # Shared by the async, packed and work-queue paths (byte-identical for prompt caching)
+    SYSTEM_PROMPT = """
+FreeWorld is a non-profit that helps Americans with low incomes get living wage jobs in the trucking industry.
+We send them to trucking school where they earn a CDL-A, which qualifies them to drive CDL-B jobs as well. They are trained on air brakes, combination vehicles (pulling trailers), and manual transmissions. Many have endorsements such as Hazmat, Airbrakes, Passenger, and Tanker. FreeWorld helps candidates obtain these endorsements if needed.
+Most have no previous professional driving experience, no personal vehicle, and limited access to professional equipment. Many have criminal records — ranging from misdemeanors to older or non-violent felonies. Our candidates know how to operate tractor-trailers, and are ready to work.
+
+We want to help connect them to jobs they have a strong chance of getting if they show up prepared, knowledgeable, and ready to demonstrate their skills in a road test. Assume they are ready to work — but must be hired into a role that does not require prior CDL driving experience or their own equipment.
+
+**CLASSIFICATION PRIORITY SYSTEM:**
+
+1. **RELEVANCE IS KING**: CDL driving jobs are the top priority. A CDL job with no experience requirements is always GOOD. CDL B OR A, just fine. DO NOT EXCLUDE CDL-B, or CLASS B CDL JOBS!
+
+2. **EXPERIENCE REQUIREMENTS** (the main filter) Good/So-So/Bad:
+Jobs should be classified as **so-so** if they:
+- Prefer experience but do not require it (unless there's a strong signal actively seeking new drivers)
+- Are non-CDL jobs or explicitly state "No CDL required" - these are backup options but not ideal for CDL holders
+- Have unclear requirements or mixed signals about experience needs
+- Are delivery/warehouse jobs that don't utilize CDL training
+
+Jobs should be classified as **good** if they:
+- Explicitly welcome new CDL drivers or state "no experience required"
+- Provide training
+- Are CDL-required positions that actively recruit entry-level drivers
+- Have clear entry-level pathways
+
+Jobs should be classified as **bad** if they:
+- Require ANY amount of truck driving experience, even one day. Our candidates know how to drive and hold CDLs, but they have no CDL or driving work history AT ALL
+
+3. **AUTOMATIC DISQUALIFIERS**:
+   - Owner-operator/1099 (must own truck/trailer) → BAD
+   - School bus driving → BAD  
+   - Requires "no felonies AND no misdemeanors" combined → BAD
+
+**ENDORSEMENT REQUIREMENTS:**
+FreeWorld candidates have CDL-A with basic training on air brakes, combination vehicles, and manual transmissions. ENDORSEMENTS ARE NOT A BARRIER. FreeWorld helps Free Agents get ANY endorsement they need to get work.
+
+IMPORTANT: For each job, you MUST create a detailed summary that is EXACTLY 6-8 sentences long. 
+
+- Don't make all jobs sound the same!**
+- Preserve specific phrases that detail the nature of the work.
+- Maintain their exact pay ranges, bonuses, and incentives as stated
+
+These elements are also very relevant to our job seekers and should be included IF there is actual text from the ad that mentions them:
+1) What the job role entails and main duties (using their language)
+2) Pay/benefits offered (their exact wording and specific numbers)
+3) Route and schedule information (preserve their exact terms: "home daily", "out 5 days", "weekends off", specific routes, territories, etc.)
+4) Physical demands of the job (mention if it's "no-touch freight", requires loading/unloading, heavy lifting, dock work, etc.)
+5) Key requirements and qualifications (including criminal background requirements if mentioned)
+7) Any training provided or growth opportunities (their exact promises)
+
+Don't standardize everything - each company should sound different! 
+
+**IMPORTANT DETAILS TO PRESERVE WHEN PRESENT:**
+- Route information
+- Schedule details
+- Physical demands
+
+If criminal background requirements are actually mentioned, include them clearly using the company's exact language when possible.
+
+Return your results as a JSON object with a "job_classifications" array like this:
+{
+  "job_classifications": [
+    { "job_id": "abc123", "match": "good", "reason": "Quote from job post", "summary": "This local delivery driver position offers $55,000-$65,000 annually with no prior experience required. The role involves delivering packages within the metro area using company-provided trucks and equipment. Benefits include full health insurance, dental, vision, and paid time off starting on day one. The company provides comprehensive 2-week training including vehicle operation and route planning. Drivers work Monday-Friday with occasional Saturday shifts and are typically home every night. This is an excellent opportunity for new CDL holders to gain experience while earning competitive wages.", "fair_chance": "no_requirements_mentioned", "endorsements": "none_required" },
+    { "job_id": "xyz456", "match": "bad", "reason": "Requires own truck", "summary": "This owner-operator position requires drivers to provide their own truck and trailer along with 5+ years of verifiable experience. Pay is percentage-based ranging from 70-85% of gross revenue with drivers responsible for fuel, maintenance, and insurance costs. The role involves long-haul routes covering 48 states with 2-3 weeks out and 2-3 days home. While earnings potential can reach $200,000+ annually for experienced operators, the significant equipment investment and experience requirements make this unsuitable for entry-level drivers.", "fair_chance": "no_requirements_mentioned", "endorsements": "none_required" },
+    { "job_id": "def789", "match": "bad", "reason": "Requires clean criminal record", "summary": "This regional trucking position offers $60,000-$70,000 annually for drivers to haul freight across multiple states. The company provides late-model equipment and offers health benefits after 90 days. However, the position requires a completely clean criminal background with no felonies or misdemeanors ever, making it unsuitable for many FreeWorld candidates. Routes typically involve 5 days out and 2 days home with some weekend work required. While the pay is competitive, the strict background requirements eliminate most candidates with criminal histories.", "fair_chance": "clean_record_required", "endorsements": "none_required" },
+    { "job_id": "ghi012", "match": "so-so", "reason": "Requires Hazmat endorsement", "summary": "This regional tanker driver position offers $70,000-$80,000 annually transporting liquid chemicals. The role requires a valid Hazmat endorsement in addition to CDL-A, which candidates can obtain with company support. Routes cover multiple states with 4-5 days out and 2-3 days home. The company provides specialized training for hazmat transport and safety protocols. While the endorsement requirement adds complexity, the company assists with testing and the pay is above average for the region.", "fair_chance": "no_requirements_mentioned", "endorsements": "hazmat" }
+  ]
+}
+
+**CLASSIFICATION STANDARDS - USE EXACT VALUES ONLY:**
+
+**FAIR CHANCE CLASSIFICATION (fair_chance field):**
+- "fair_chance_employer": Fair chance employer - welcomes applicants with criminal records
+- "background_check_required": Background check required - may disqualify applicants with records
+- "clean_record_required": Clean driving/criminal record explicitly required
+- "no_requirements_mentioned": No background check requirements mentioned
+
+**ENDORSEMENT CLASSIFICATION (endorsements field):**
+- "none_required": No special CDL endorsements required
+- "hazmat": Hazmat endorsement required
+- "passenger": Passenger endorsement required
+- "school_bus": School bus endorsement required
+- "tanker": Tanker endorsement required
+- "double_triple": Double/Triple trailer endorsement required
+- "combination": Multiple endorsements required
+
+**CLASSIFICATION RULES:**
+1. Use ONLY the exact values listed above
+2. For fair_chance: Look for explicit policies about criminal records/background checks
+3. For endorsements: Look for REQUIRED CDL endorsements (not preferred or helpful)
+4. If unclear or not mentioned, use appropriate default values
+5. Be conservative - only classify as fair_chance_employer if explicitly stated
+
+**EXAMPLES:**
+- "We welcome applicants with criminal records" → fair_chance: "fair_chance_employer"
+- "Clean criminal record required" or "no felonies" → fair_chance: "clean_record_required"
+- "Background check required" (criminal) → fair_chance: "background_check_required"
+- "Clean driving record required" → fair_chance: "no_requirements_mentioned" (driving record ≠ criminal background)
+- No mention of background → fair_chance: "no_requirements_mentioned"
+- "Hazmat endorsement required" → endorsements: "hazmat"
+- "No special endorsements needed" → endorsements: "none_required"
+"""
+
     def __init__(self):
         # OpenAI client with connection reuse (let OpenAI SDK handle HTTP pooling)
         self.client = OpenAI(
@@ -19,6 +133,8 @@ class JobClassifier:
             max_retries=0  # Handle retries manually for better control
         )
         self.model = "gpt-4o-mini"  # Single model constant
+        # Same env var the OpenAI SDK honours; lets tests point at mock_openai_server
+        self.api_base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
         
         # Retriable status codes
         self.RETRIABLE = {429, 500, 502, 503, 504}
@@ -489,9 +605,12 @@ Return your results as a JSON object with a "job_classifications" array like thi
         
         return df
 
-    def classify_jobs_in_batches(self, jobs_list, batch_size=25, max_parallel=2, max_retries=2):
+    def classify_jobs_in_batches(self, jobs_list, batch_size=25, max_parallel=2, max_retries=2, use_cache=True):
         """
         Process jobs using fast async implementation with backward compatibility
+
+        Jobs whose content is already in the local classification cache are answered
+        from disk; only cache misses are sent to the API (use_cache=False forces all).
         """
         
         # Validate jobs
@@ -506,25 +625,51 @@ Return your results as a JSON object with a "job_classifications" array like thi
             print("❌ No valid jobs to process")
             return []
             
+        cache = get_classification_cache() if use_cache else None
+        cached_results = {}
+        if cache:
+            cached_results, jobs_to_classify = cache.lookup_jobs(valid_jobs, self.CLASSIFIER_TYPE, self.PROMPT_VERSION)
+            if cached_results:
+                print(f"💾 Classification cache: {len(cached_results)} hits, {len(jobs_to_classify)} to classify")
+            if not jobs_to_classify:
+                return [cached_results[job['job_id']] for job in valid_jobs]
+        else:
+            jobs_to_classify = valid_jobs
+        
         # Use new async implementation for speed
-        print(f"🚀 Using async classification for {len(valid_jobs)} jobs...")
+        print(f"🚀 Using async classification for {len(jobs_to_classify)} jobs...")
+        # Compacted copies go to the model; the cache keeps keying on the original jobs
+        send_jobs = compact_for_classification(jobs_to_classify)
         try:
-            # Run async method in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                results = loop.run_until_complete(self._classify_jobs_async(valid_jobs, concurrency=50))
-                print("✅ Async classification completed successfully")
-                return results
-            finally:
-                loop.close()
+            runtime = get_classifier_runtime()
+            if runtime is not None:
+                # Shared background loop: pooled connections and the learned concurrency limit persist
+                results = runtime.run(lambda session, limiter: self._classify_jobs_async(
+                    send_jobs, concurrency=50, session=session, limiter=limiter))
+            else:
+                # Run async method in sync context
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    results = loop.run_until_complete(self._classify_jobs_async(send_jobs, concurrency=50))
+                finally:
+                    loop.close()
+            print("✅ Async classification completed successfully")
         except Exception as e:
             print(f"⚠️ Async classification failed: {e}")
             print("🔄 Falling back to original sync implementation...")
             # Fallback to original sync implementation
-            results = self._run_work_queue(valid_jobs, concurrency=50)
+            results = self._run_work_queue(send_jobs, concurrency=50)
             print("✅ Fallback sync classification completed")
-            return results
+        
+        if cache:
+            cache.store_results(jobs_to_classify, results, self.CLASSIFIER_TYPE, self.PROMPT_VERSION)
+            if cached_results:
+                fresh_results = {r.get('job_id'): r for r in results if isinstance(r, dict)}
+                results = [cached_results.get(job['job_id']) or fresh_results.get(job['job_id'])
+                           for job in valid_jobs]
+                results = [r for r in results if r is not None]
+        return results
     
     def _run_work_queue(self, jobs_list, concurrency=8):
         """
@@ -535,107 +680,7 @@ Return your results as a JSON object with a "job_classifications" array like thi
         # Shared system prompt and schema (byte-identical for prompt caching)
         # Single job per request for proper work queue
         # Use the good system prompt with explicit field mapping
-        system_prompt = """
-FreeWorld is a non-profit that helps Americans with low incomes get living wage jobs in the trucking industry.
-We send them to trucking school where they earn a CDL-A, which qualifies them to drive CDL-B jobs as well. They are trained on air brakes, combination vehicles (pulling trailers), and manual transmissions. Many have endorsements such as Hazmat, Airbrakes, Passenger, and Tanker. FreeWorld helps candidates obtain these endorsements if needed.
-Most have no previous professional driving experience, no personal vehicle, and limited access to professional equipment. Many have criminal records — ranging from misdemeanors to older or non-violent felonies. Our candidates know how to operate tractor-trailers, and are ready to work.
-
-We want to help connect them to jobs they have a strong chance of getting if they show up prepared, knowledgeable, and ready to demonstrate their skills in a road test. Assume they are ready to work — but must be hired into a role that does not require prior CDL driving experience or their own equipment.
-
-**CLASSIFICATION PRIORITY SYSTEM:**
-
-1. **RELEVANCE IS KING**: CDL driving jobs are the top priority. A CDL job with no experience requirements is always GOOD. CDL B OR A, just fine. DO NOT EXCLUDE CDL-B, or CLASS B CDL JOBS!
-
-2. **EXPERIENCE REQUIREMENTS** (the main filter) Good/So-So/Bad:
-Jobs should be classified as **so-so** if they:
-- Prefer experience but do not require it (unless there's a strong signal actively seeking new drivers)
-- Are non-CDL jobs or explicitly state "No CDL required" - these are backup options but not ideal for CDL holders
-- Have unclear requirements or mixed signals about experience needs
-- Are delivery/warehouse jobs that don't utilize CDL training
-
-Jobs should be classified as **good** if they:
-- Explicitly welcome new CDL drivers or state "no experience required"
-- Provide training
-- Are CDL-required positions that actively recruit entry-level drivers
-- Have clear entry-level pathways
-
-Jobs should be classified as **bad** if they:
-- Require ANY amount of truck driving experience, even one day. Our candidates know how to drive and hold CDLs, but they have no CDL or driving work history AT ALL
-
-3. **AUTOMATIC DISQUALIFIERS**:
-   - Owner-operator/1099 (must own truck/trailer) → BAD
-   - School bus driving → BAD  
-   - Requires "no felonies AND no misdemeanors" combined → BAD
-
-**ENDORSEMENT REQUIREMENTS:**
-FreeWorld candidates have CDL-A with basic training on air brakes, combination vehicles, and manual transmissions. ENDORSEMENTS ARE NOT A BARRIER. FreeWorld helps Free Agents get ANY endorsement they need to get work.
-
-IMPORTANT: For each job, you MUST create a detailed summary that is EXACTLY 6-8 sentences long. 
-
-- Don't make all jobs sound the same!**
-- Preserve specific phrases that detail the nature of the work.
-- Maintain their exact pay ranges, bonuses, and incentives as stated
-
-These elements are also very relevant to our job seekers and should be included IF there is actual text from the ad that mentions them:
-1) What the job role entails and main duties (using their language)
-2) Pay/benefits offered (their exact wording and specific numbers)
-3) Route and schedule information (preserve their exact terms: "home daily", "out 5 days", "weekends off", specific routes, territories, etc.)
-4) Physical demands of the job (mention if it's "no-touch freight", requires loading/unloading, heavy lifting, dock work, etc.)
-5) Key requirements and qualifications (including criminal background requirements if mentioned)
-7) Any training provided or growth opportunities (their exact promises)
-
-Don't standardize everything - each company should sound different! 
-
-**IMPORTANT DETAILS TO PRESERVE WHEN PRESENT:**
-- Route information
-- Schedule details
-- Physical demands
-
-If criminal background requirements are actually mentioned, include them clearly using the company's exact language when possible.
-
-Return your results as a JSON object with a "job_classifications" array like this:
-{
-  "job_classifications": [
-    { "job_id": "abc123", "match": "good", "reason": "Quote from job post", "summary": "This local delivery driver position offers $55,000-$65,000 annually with no prior experience required. The role involves delivering packages within the metro area using company-provided trucks and equipment. Benefits include full health insurance, dental, vision, and paid time off starting on day one. The company provides comprehensive 2-week training including vehicle operation and route planning. Drivers work Monday-Friday with occasional Saturday shifts and are typically home every night. This is an excellent opportunity for new CDL holders to gain experience while earning competitive wages.", "fair_chance": "no_requirements_mentioned", "endorsements": "none_required" },
-    { "job_id": "xyz456", "match": "bad", "reason": "Requires own truck", "summary": "This owner-operator position requires drivers to provide their own truck and trailer along with 5+ years of verifiable experience. Pay is percentage-based ranging from 70-85% of gross revenue with drivers responsible for fuel, maintenance, and insurance costs. The role involves long-haul routes covering 48 states with 2-3 weeks out and 2-3 days home. While earnings potential can reach $200,000+ annually for experienced operators, the significant equipment investment and experience requirements make this unsuitable for entry-level drivers.", "fair_chance": "no_requirements_mentioned", "endorsements": "none_required" },
-    { "job_id": "def789", "match": "bad", "reason": "Requires clean criminal record", "summary": "This regional trucking position offers $60,000-$70,000 annually for drivers to haul freight across multiple states. The company provides late-model equipment and offers health benefits after 90 days. However, the position requires a completely clean criminal background with no felonies or misdemeanors ever, making it unsuitable for many FreeWorld candidates. Routes typically involve 5 days out and 2 days home with some weekend work required. While the pay is competitive, the strict background requirements eliminate most candidates with criminal histories.", "fair_chance": "clean_record_required", "endorsements": "none_required" },
-    { "job_id": "ghi012", "match": "so-so", "reason": "Requires Hazmat endorsement", "summary": "This regional tanker driver position offers $70,000-$80,000 annually transporting liquid chemicals. The role requires a valid Hazmat endorsement in addition to CDL-A, which candidates can obtain with company support. Routes cover multiple states with 4-5 days out and 2-3 days home. The company provides specialized training for hazmat transport and safety protocols. While the endorsement requirement adds complexity, the company assists with testing and the pay is above average for the region.", "fair_chance": "no_requirements_mentioned", "endorsements": "hazmat" }
-  ]
-}
-
-**CLASSIFICATION STANDARDS - USE EXACT VALUES ONLY:**
-
-**FAIR CHANCE CLASSIFICATION (fair_chance field):**
-- "fair_chance_employer": Fair chance employer - welcomes applicants with criminal records
-- "background_check_required": Background check required - may disqualify applicants with records
-- "clean_record_required": Clean driving/criminal record explicitly required
-- "no_requirements_mentioned": No background check requirements mentioned
-
-**ENDORSEMENT CLASSIFICATION (endorsements field):**
-- "none_required": No special CDL endorsements required
-- "hazmat": Hazmat endorsement required
-- "passenger": Passenger endorsement required
-- "school_bus": School bus endorsement required
-- "tanker": Tanker endorsement required
-- "double_triple": Double/Triple trailer endorsement required
-- "combination": Multiple endorsements required
-
-**CLASSIFICATION RULES:**
-1. Use ONLY the exact values listed above
-2. For fair_chance: Look for explicit policies about criminal records/background checks
-3. For endorsements: Look for REQUIRED CDL endorsements (not preferred or helpful)
-4. If unclear or not mentioned, use appropriate default values
-5. Be conservative - only classify as fair_chance_employer if explicitly stated
-
-**EXAMPLES:**
-- "We welcome applicants with criminal records" → fair_chance: "fair_chance_employer"
-- "Clean criminal record required" or "no felonies" → fair_chance: "clean_record_required"
-- "Background check required" (criminal) → fair_chance: "background_check_required"
-- "Clean driving record required" → fair_chance: "no_requirements_mentioned" (driving record ≠ criminal background)
-- No mention of background → fair_chance: "no_requirements_mentioned"
-- "Hazmat endorsement required" → endorsements: "hazmat"
-- "No special endorsements needed" → endorsements: "none_required"
-"""
+        system_prompt = self.SYSTEM_PROMPT
         # Use shared schema object for prompt caching
         schema = self.CLASSIFICATION_SCHEMA
         
@@ -768,7 +813,8 @@ Job Description:
         # Start workers
         threads = []
         for i in range(min(concurrency, len(items))):
-            t = threading.Thread(target=worker, name=f"worker-{i}")
+            # Each worker runs in a copy of this context so API calls reach the run's monitor
+            t = threading.Thread(target=contextvars.copy_context().run, args=(worker,), name=f"worker-{i}")
             t.start()
             threads.append(t)
         
@@ -872,7 +918,7 @@ Job Description:
         Make async OpenAI API call with GUARD 5: Robust JSON parsing and fallback
         """
         async with semaphore:
-            api_url = "https://api.openai.com/v1/chat/completions"
+            api_url = f"{self.api_base_url}/chat/completions"
             headers = {
                 "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
                 "Content-Type": "application/json"
@@ -897,9 +943,12 @@ Job Description:
             }
             
             for attempt in range(max_retries):
+                call_start = time.time()
                 try:
                     async with session.post(api_url, headers=headers, json=payload, timeout=30) as response:
                         response_text = await response.text()
+                        record_external_call('openai', time.time() - call_start, error=response.status != 200)
+                        semaphore.record(response.status, time.time() - call_start)
                         
                         if response.status == 200:
                             data = await response.json()
@@ -969,168 +1018,65 @@ Job Description:
                                 wait_time = float(retry_after)
                             else:
                                 wait_time = (2 ** attempt) * 0.5
-                            await asyncio.sleep(wait_time)
+                            await semaphore.backoff(wait_time)
                         elif response.status in [500, 502, 503, 504]:
                             # Server errors - retry with backoff
                             wait_time = (2 ** attempt) * 0.5
-                            await asyncio.sleep(wait_time)
+                            await semaphore.backoff(wait_time)
                         else:
                             # Client errors - don't retry
                             raise Exception(f"OpenAI API error {response.status}: {response_text}")
                             
                 except asyncio.TimeoutError:
+                    record_external_call('openai', time.time() - call_start, error=True)
                     if attempt == max_retries - 1:
                         raise Exception("OpenAI API timeout after retries")
-                    await asyncio.sleep((2 ** attempt) * 0.5)
+                    await semaphore.backoff((2 ** attempt) * 0.5)
                 except aiohttp.ClientError as e:
+                    record_external_call('openai', time.time() - call_start, error=True)
                     if attempt == max_retries - 1:
                         raise Exception(f"Connection error: {e}")
-                    await asyncio.sleep((2 ** attempt) * 0.5)
+                    await semaphore.backoff((2 ** attempt) * 0.5)
             
             raise Exception("Max retries exceeded")
     
-    async def _classify_jobs_async(self, jobs_list, concurrency=50):
-        # Define the system prompt here for the async method  
-        # Use the good system prompt with explicit field mapping (same as line 137)
-        system_prompt = """
-FreeWorld is a non-profit that helps Americans with low incomes get living wage jobs in the trucking industry.
-We send them to trucking school where they earn a CDL-A, which qualifies them to drive CDL-B jobs as well. They are trained on air brakes, combination vehicles (pulling trailers), and manual transmissions. Many have endorsements such as Hazmat, Airbrakes, Passenger, and Tanker. FreeWorld helps candidates obtain these endorsements if needed.
-Most have no previous professional driving experience, no personal vehicle, and limited access to professional equipment. Many have criminal records — ranging from misdemeanors to older or non-violent felonies. Our candidates know how to operate tractor-trailers, and are ready to work.
-
-We want to help connect them to jobs they have a strong chance of getting if they show up prepared, knowledgeable, and ready to demonstrate their skills in a road test. Assume they are ready to work — but must be hired into a role that does not require prior CDL driving experience or their own equipment.
-
-**CLASSIFICATION PRIORITY SYSTEM:**
-
-1. **RELEVANCE IS KING**: CDL driving jobs are the top priority. A CDL job with no experience requirements is always GOOD. CDL B OR A, just fine. DO NOT EXCLUDE CDL-B, or CLASS B CDL JOBS!
-
-2. **EXPERIENCE REQUIREMENTS** (the main filter) Good/So-So/Bad:
-Jobs should be classified as **so-so** if they:
-- Prefer experience but do not require it (unless there's a strong signal actively seeking new drivers)
-- Are non-CDL jobs or explicitly state "No CDL required" - these are backup options but not ideal for CDL holders
-- Have unclear requirements or mixed signals about experience needs
-- Are delivery/warehouse jobs that don't utilize CDL training
-
-Jobs should be classified as **good** if they:
-- Explicitly welcome new CDL drivers or state "no experience required"
-- Provide training
-- Are CDL-required positions that actively recruit entry-level drivers
-- Have clear entry-level pathways
-
-Jobs should be classified as **bad** if they:
-- Require ANY amount of truck driving experience, even one day. Our candidates know how to drive and hold CDLs, but they have no CDL or driving work history AT ALL
-
-3. **AUTOMATIC DISQUALIFIERS**:
-   - Owner-operator/1099 (must own truck/trailer) → BAD
-   - School bus driving → BAD  
-   - Requires "no felonies AND no misdemeanors" combined → BAD
-
-**ENDORSEMENT REQUIREMENTS:**
-FreeWorld candidates have CDL-A with basic training on air brakes, combination vehicles, and manual transmissions. ENDORSEMENTS ARE NOT A BARRIER. FreeWorld helps Free Agents get ANY endorsement they need to get work.
-
-IMPORTANT: For each job, you MUST create a detailed summary that is EXACTLY 6-8 sentences long. 
-
-- Don't make all jobs sound the same!**
-- Preserve specific phrases that detail the nature of the work.
-- Maintain their exact pay ranges, bonuses, and incentives as stated
-
-These elements are also very relevant to our job seekers and should be included IF there is actual text from the ad that mentions them:
-1) What the job role entails and main duties (using their language)
-2) Pay/benefits offered (their exact wording and specific numbers)
-3) Route and schedule information (preserve their exact terms: "home daily", "out 5 days", "weekends off", specific routes, territories, etc.)
-4) Physical demands of the job (mention if it's "no-touch freight", requires loading/unloading, heavy lifting, dock work, etc.)
-5) Key requirements and qualifications (including criminal background requirements if mentioned)
-7) Any training provided or growth opportunities (their exact promises)
-
-Don't standardize everything - each company should sound different! 
-
-**IMPORTANT DETAILS TO PRESERVE WHEN PRESENT:**
-- Route information
-- Schedule details
-- Physical demands
-
-If criminal background requirements are actually mentioned, include them clearly using the company's exact language when possible.
-
-Return your results as a JSON object with a "job_classifications" array like this:
-{
-  "job_classifications": [
-    { "job_id": "abc123", "match": "good", "reason": "Quote from job post", "summary": "This local delivery driver position offers $55,000-$65,000 annually with no prior experience required. The role involves delivering packages within the metro area using company-provided trucks and equipment. Benefits include full health insurance, dental, vision, and paid time off starting on day one. The company provides comprehensive 2-week training including vehicle operation and route planning. Drivers work Monday-Friday with occasional Saturday shifts and are typically home every night. This is an excellent opportunity for new CDL holders to gain experience while earning competitive wages.", "fair_chance": "no_requirements_mentioned", "endorsements": "none_required" },
-    { "job_id": "xyz456", "match": "bad", "reason": "Requires own truck", "summary": "This owner-operator position requires drivers to provide their own truck and trailer along with 5+ years of verifiable experience. Pay is percentage-based ranging from 70-85% of gross revenue with drivers responsible for fuel, maintenance, and insurance costs. The role involves long-haul routes covering 48 states with 2-3 weeks out and 2-3 days home. While earnings potential can reach $200,000+ annually for experienced operators, the significant equipment investment and experience requirements make this unsuitable for entry-level drivers.", "fair_chance": "no_requirements_mentioned", "endorsements": "none_required" },
-    { "job_id": "def789", "match": "bad", "reason": "Requires clean criminal record", "summary": "This regional trucking position offers $60,000-$70,000 annually for drivers to haul freight across multiple states. The company provides late-model equipment and offers health benefits after 90 days. However, the position requires a completely clean criminal background with no felonies or misdemeanors ever, making it unsuitable for many FreeWorld candidates. Routes typically involve 5 days out and 2 days home with some weekend work required. While the pay is competitive, the strict background requirements eliminate most candidates with criminal histories.", "fair_chance": "clean_record_required", "endorsements": "none_required" },
-    { "job_id": "ghi012", "match": "so-so", "reason": "Requires Hazmat endorsement", "summary": "This regional tanker driver position offers $70,000-$80,000 annually transporting liquid chemicals. The role requires a valid Hazmat endorsement in addition to CDL-A, which candidates can obtain with company support. Routes cover multiple states with 4-5 days out and 2-3 days home. The company provides specialized training for hazmat transport and safety protocols. While the endorsement requirement adds complexity, the company assists with testing and the pay is above average for the region.", "fair_chance": "no_requirements_mentioned", "endorsements": "hazmat" }
-  ]
-}
-
-**CLASSIFICATION STANDARDS - USE EXACT VALUES ONLY:**
-
-**FAIR CHANCE CLASSIFICATION (fair_chance field):**
-- "fair_chance_employer": Fair chance employer - welcomes applicants with criminal records
-- "background_check_required": Background check required - may disqualify applicants with records
-- "clean_record_required": Clean driving/criminal record explicitly required
-- "no_requirements_mentioned": No background check requirements mentioned
-
-**ENDORSEMENT CLASSIFICATION (endorsements field):**
-- "none_required": No special CDL endorsements required
-- "hazmat": Hazmat endorsement required
-- "passenger": Passenger endorsement required
-- "school_bus": School bus endorsement required
-- "tanker": Tanker endorsement required
-- "double_triple": Double/Triple trailer endorsement required
-- "combination": Multiple endorsements required
-
-**CLASSIFICATION RULES:**
-1. Use ONLY the exact values listed above
-2. For fair_chance: Look for explicit policies about criminal records/background checks
-3. For endorsements: Look for REQUIRED CDL endorsements (not preferred or helpful)
-4. If unclear or not mentioned, use appropriate default values
-5. Be conservative - only classify as fair_chance_employer if explicitly stated
-
-**EXAMPLES:**
-- "We welcome applicants with criminal records" → fair_chance: "fair_chance_employer"
-- "Clean criminal record required" or "no felonies" → fair_chance: "clean_record_required"
-- "Background check required" (criminal) → fair_chance: "background_check_required"
-- "Clean driving record required" → fair_chance: "no_requirements_mentioned" (driving record ≠ criminal background)
-- No mention of background → fair_chance: "no_requirements_mentioned"
-- "Hazmat endorsement required" → endorsements: "hazmat"
-- "No special endorsements needed" → endorsements: "none_required"
-"""
+    async def _classify_jobs_async(self, jobs_list, concurrency=50, session=None, limiter=None, packed=None):
         """
         Fast async classification with 6 NON-NEGOTIABLE GUARDS to prevent job loss
+
+        packed=True (default: FREEWORLD_PACKED_CLASSIFICATION) sends several jobs per
+        request first; jobs a pack did not answer cleanly get their own request.
         """
-        # Connection pooling configuration  
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False  # Disable hostname verification
-        ssl_context.verify_mode = ssl.CERT_NONE  # Disable certificate verification
-        
-        connector = aiohttp.TCPConnector(
-            limit=200,
-            limit_per_host=100,
-            keepalive_timeout=30,
-            enable_cleanup_closed=True,
-            ssl=ssl_context
-        )
-        
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        semaphore = asyncio.Semaphore(concurrency)
+        system_prompt = self.SYSTEM_PROMPT
+        # Fixed limit unless the caller passes the runtime's shared adaptive limiter
+        semaphore = limiter or AdaptiveLimiter(concurrency, adaptive=False)
+        if packed is None:
+            packed = packed_enabled()
         
         # GUARD 1: Prepare input job IDs list for exact tracking
         input_job_ids = [job['job_id'] for job in jobs_list]
         print(f"🔒 GUARD 1: Tracking {len(input_job_ids)} input job IDs")
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Pooled runtime session when given; otherwise a session for this call only
+        session_scope = (contextlib.nullcontext(session) if session is not None else
+                         aiohttp.ClientSession(connector=classifier_connector(), timeout=CLASSIFIER_TIMEOUT))
+        async with session_scope as session:
+            # Packed mode: several jobs per request; anything missing or malformed falls through
+            packed_results = {}
+            if packed:
+                packed_items, _, pack_stats = await classify_packed(
+                    session, semaphore, jobs_list, system_prompt, self.CLASSIFICATION_SCHEMA,
+                    f"{self.api_base_url}/chat/completions", os.getenv('OPENAI_API_KEY'), self.model
+                )
+                packed_results = {job_id: self._job_result(job_id, item) for job_id, item in packed_items.items()}
+                print(f"📦 Packed: {len(packed_results)} jobs in {pack_stats['packs']} requests, "
+                      f"{pack_stats['requeued']} classified individually")
+            single_jobs = [job for job in jobs_list if job['job_id'] not in packed_results]
+
             # Prepare tasks - ONE JOB PER REQUEST (GUARD 6)
             tasks = []
-            for job in jobs_list:
-                job_content = f"""
-Job ID: {job['job_id']}
-Job Title: {job['job_title']}
-Company: {job['company']}
-Location: {job['location']}
-
-Job Description:
-{job['job_description']}
-"""
-                task = self._process_single_job_async(session, job, job_content.strip(), system_prompt, semaphore)
+            for job in single_jobs:
+                task = self._process_single_job_async(session, job, format_job(job), system_prompt, semaphore)
                 tasks.append(task)
             
             # Execute all tasks concurrently
@@ -1139,13 +1085,13 @@ Job Description:
             total_time = time.time() - start_time
             
             # GUARD 3: Key results by job_id from input list - dict keyed by job_id
-            results_by_job_id = {}
-            success_count = 0
+            results_by_job_id = dict(packed_results)
+            success_count = len(packed_results)
             error_count = 0
             latencies = []
             
             for i, result in enumerate(results):
-                job = jobs_list[i]  # Get the corresponding job
+                job = single_jobs[i]  # Get the corresponding job
                 job_id = job['job_id']  # Original job_id from input
                 
                 if isinstance(result, Exception):
@@ -1225,6 +1171,22 @@ Job Description:
             
             return final_results
     
+    def _job_result(self, job_id, api_result):
+        """Result record for one job from a parsed API answer (single or packed request)"""
+        return {
+            'job_id': job_id,  # GUARD 1: Always use original job_id
+            'match': api_result.get('match', 'error'),
+            'reason': api_result.get('reason', 'No reason provided'),
+            'summary': api_result.get('summary', 'No summary provided'),
+            'normalized_location': api_result.get('normalized_location', ''),
+            'route_type': 'Unknown',
+            'fair_chance': api_result.get('fair_chance', 'no_requirements_mentioned'),
+            'endorsements': api_result.get('endorsements', 'none_required'),
+            'career_pathway': 'cdl_pathway',
+            'training_provided': False,
+            'final_status': ''
+        }
+
     async def _process_single_job_async(self, session, job, job_content, system_prompt, semaphore):
         """
         Process a single job with GUARD 1 & 2: Never trust model's job_id, always return error record
@@ -1235,23 +1197,8 @@ Job Description:
         try:
             api_result = await self._call_openai_async(session, original_job_id, job_content, system_prompt, semaphore)
             latency = time.time() - start_time
-            
-            return {
-                'result': {
-                    'job_id': original_job_id,  # GUARD 1: Always use original job_id
-                    'match': api_result.get('match', 'error'),
-                    'reason': api_result.get('reason', 'No reason provided'),
-                    'summary': api_result.get('summary', 'No summary provided'),
-                    'normalized_location': api_result.get('normalized_location', ''),
-                    'route_type': 'Unknown',
-                    'fair_chance': api_result.get('fair_chance', 'no_requirements_mentioned'),
-                    'endorsements': api_result.get('endorsements', 'none_required'),
-                    'career_pathway': 'cdl_pathway',
-                    'training_provided': False,
-                    'final_status': ''
-                },
-                'latency': latency
-            }
+
+            return {'result': self._job_result(original_job_id, api_result), 'latency': latency}
         except Exception as e:
             # GUARD 2: Always return error record on failure - NEVER skip/drop jobs
             latency = time.time() - start_time
@@ -18,6 +18,7 @@ class JobMemoryDB:
         """Initialize Supabase connection"""
         self.supabase = None
         self._connection_healthy = False
+        self.last_store_stats = {}
         self._init_supabase()
     
     def _init_supabase(self):
@@ -158,121 +159,11 @@ class JobMemoryDB:
                 logger.warning(f"QC validation failed, proceeding without validation: {qc_error}")
                 
         try:
-            # Convert DataFrame to records for Supabase
-            records = []
-            skipped_jobs = []
-            for idx, job in jobs_df.iterrows():
-                # Handle jobs with different routing statuses
-                # Check both canonical (route.final_status) and Supabase field names (filter_reason)
-                final_status = job.get('route.final_status', '') or job.get('filter_reason', '')
-                job_id = job.get('id.job', job.get('job_id', f'job_{idx}'))
-                
-                # Try canonical fields first (ai.match, ai.reason, ai.summary), then fallback to legacy field names
-                match = job.get('ai.match', job.get('match_level', job.get('match', '')))
-                reason = job.get('ai.reason', job.get('match_reason', job.get('reason', '')))
-                summary = job.get('ai.summary', job.get('summary', ''))
-                
-                # If route.final_status is included or passed_all_filters, ALWAYS store to Supabase
-                if final_status == 'passed_all_filters' or final_status.startswith('included'):
-                    # Debug: Log job being stored
-                    logger.debug(f"✅ Storing job {job_id[:8]}... with final_status='{final_status}', match='{match}'")
-                    # Provide default AI values if missing (required by Supabase schema)
-                    if not match or str(match) in ['', 'nan', 'None', 'null']:
-                        if final_status.startswith('included'):
-                            match = 'good' if 'good' in final_status.lower() else 'so-so'
-                        else:
-                            match = 'pending'
-                    if not reason or str(reason) in ['', 'nan', 'None', 'null']:
-                        reason = final_status  # Use the routing status as reason
-                    if not summary or str(summary) in ['', 'nan', 'None', 'null']:
-                        summary = f'Job with status: {final_status}'
-                else:
-                    # For other statuses (filtered, error, etc.), skip uploading to Supabase
-                    logger.debug(f"⏭️ Skipping job {job_id[:8]}... with final_status='{final_status}', match='{match}' (not included/passed_all_filters)")
-                    skipped_jobs.append({'job_id': job_id, 'final_status': final_status, 'match': str(match), 'reason': 'Status not included/passed_all_filters', 'summary': str(summary)[:50]})
-                    continue
-                    
-                # Market sanitization: ensure no state abbreviations and map representative cities
-                def _sanitize_market(val: str) -> str:
-                    try:
-                        from shared_search import MARKET_TO_LOCATION
-                        std = {m: m for m in MARKET_TO_LOCATION.keys()}
-                        inv = {v: k for k, v in MARKET_TO_LOCATION.items()}  # City, ST -> Market
-                        city_map = {v.split(',')[0].strip().lower(): k for k, v in MARKET_TO_LOCATION.items()}
-                    except Exception:
-                        std, inv, city_map = {}, {}, {}
-                    s = str(val or '').strip()
-                    if not s:
-                        return ''
-                    if s in std:
-                        return s
-                    if s in inv:
-                        return inv[s]
-                    if ',' in s:
-                        s = s.split(',')[0].strip()
-                    if s.lower() in city_map:
-                        return city_map[s.lower()]
-                    if s.lower() == 'berkeley':
-                        return 'Bay Area'
-                    if s.lower() == 'ontario':
-                        return 'Inland Empire'
-                    return s
-
-                # Convert all values to strings as expected by RPC function
-                def safe_str(val):
-                    """Convert value to string, handling None/empty cases"""
-                    if val is None or val == '':
-                        return ''
-                    return str(val)
-
-                record = {
-                    # Core job information (all TEXT as per RPC function)
-                    'job_id': safe_str(job.get('id.job', job.get('job_id', ''))),
-                    'job_title': safe_str(job.get('source.title', job.get('job_title', ''))),
-                    'company': safe_str(job.get('source.company', job.get('company', ''))),
-                    'location': safe_str(job.get('source.location_raw', job.get('location', ''))),
-                    'job_description': safe_str(job.get('source.description_raw', job.get('job_description', '')))[:5000],
-                    'apply_url': safe_str(job.get('source.indeed_url', job.get('apply_url', ''))),
-                    'salary': safe_str(job.get('source.salary_raw', job.get('salary', ''))),
-
-                    # AI Classification results (all TEXT)
-                    'match_level': safe_str(match),
-                    'match_reason': safe_str(reason),
-                    'summary': safe_str(summary),
-                    'fair_chance': safe_str(job.get('ai.fair_chance', job.get('fair_chance', 'unknown'))),
-                    'endorsements': safe_str(job.get('ai.endorsements', job.get('endorsements', 'unknown'))),
-                    'route_type': safe_str(job.get('ai.route_type', job.get('route_type', ''))),
+            from job_memory_store import BulkJobWriter, build_job_records
 
-                    # Career pathway fields (new for pathway classifier)
-                    'career_pathway': safe_str(job.get('ai.career_pathway', job.get('career_pathway', 'cdl_pathway'))),
-                    'training_provided': str(job.get('ai.training_provided', job.get('training_provided', False))).lower(),
+            # Build all records column by column (same fields/defaults as the RPC expects)
+            records, skipped_jobs = build_job_records(jobs_df)
 
-                    # Organization and tracking (all TEXT)
-                    'market': safe_str(_sanitize_market(job.get('meta.market', job.get('market', '')))),
-                    'tracked_url': safe_str(job.get('meta.tracked_url', job.get('tracked_url', ''))),
-
-                    # Recall context fields (all TEXT)
-                    'indeed_job_url': safe_str(job.get('source.indeed_url', job.get('indeed_job_url', ''))),
-                    'search_query': safe_str(job.get('meta.query', job.get('search_query', ''))),
-                    'source': safe_str(job.get('id.source', job.get('source', 'outscraper'))),
-                    'filter_reason': safe_str(job.get('route.final_status', job.get('filter_reason', ''))),
-
-                    # System metadata (all TEXT)
-                    'classification_source': safe_str(job.get('sys.classification_source', 'ai_classification')),
-                    'classified_at': datetime.now().isoformat(),
-                    'created_at': datetime.now().isoformat(),
-                    'updated_at': datetime.now().isoformat(),
-
-                    # Deduplication fields (all TEXT) - these are critical for the RPC function
-                    'rules_duplicate_r1': safe_str(job.get('rules.duplicate_r1', '')),
-                    'rules_duplicate_r2': safe_str(job.get('rules.duplicate_r2', '')),
-                    'clean_apply_url': safe_str(job.get('clean_apply_url', '')),
-                    'job_id_hash': safe_str(job.get('sys.hash', ''))
-                }
-                
-                if record['job_id']:  # Only store if we have a job_id
-                    records.append(record)
-            
             # Log debug information about processing
             logger.info(f"🔍 SUPABASE UPLOAD DEBUG: Processed {len(jobs_df)} jobs")
             logger.info(f"   - Records created: {len(records)}")
@@ -289,50 +180,17 @@ class JobMemoryDB:
                 logger.warning("❌ No valid records to store in memory database - all jobs were skipped")
                 return False
             
-            # Use batch processing to avoid timeouts with large datasets
-            batch_size = 100
-            total_stored = 0
-            total_batches = (len(records) + batch_size - 1) // batch_size
+            # Size-bounded batches sent concurrently; failing batches are bisected down to the bad rows
+            stats = BulkJobWriter(self.supabase).write(records)
+            self.last_store_stats = stats
+            logger.info(f"✅ Stored {stats['stored']}/{stats['rows']} job classifications in {stats['batches']} batches "
+                        f"({stats['requests']} requests, {stats['rows_per_second']:.0f} rows/s)")
 
-            logger.info(f"🔄 Processing {len(records)} records in {total_batches} batches of {batch_size}")
-
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                batch_num = i // batch_size + 1
-
-                try:
-                    # Try RPC first for deduplication
-                    result = self.supabase.rpc('batch_insert_jobs_with_dedup', {'p_jobs_data': batch}).execute()
-
-                    if result.data is not None:  # RPC returns count or error
-                        count = result.data if isinstance(result.data, int) else len(batch)
-                        total_stored += count
-                        logger.info(f"✅ Stored {count} job classifications (batch {batch_num}/{total_batches}) with deduplication")
-                        continue
-                    else:
-                        logger.warning(f"⚠️ RPC failed for batch {batch_num}, trying fallback upsert")
-                        raise Exception("RPC returned no data")
-
-                except Exception as rpc_error:
-                    logger.warning(f"Database deduplication failed for batch {batch_num}, falling back to upsert: {rpc_error}")
-
-                    try:
-                        # Fallback to upsert for this batch
-                        result = self.supabase.table('jobs').upsert(batch).execute()
-
-                        if result.data:
-                            batch_count = len(result.data)
-                            total_stored += batch_count
-                            logger.info(f"✅ Stored {batch_count} job classifications (batch {batch_num}/{total_batches}) using fallback upsert")
-                        else:
-                            logger.error(f"❌ Failed to store batch {batch_num} using fallback upsert")
-                            return False
-
-                    except Exception as upsert_error:
-                        logger.error(f"❌ Both RPC and upsert failed for batch {batch_num}: {upsert_error}")
-                        return False
-
-            logger.info(f"✅ Successfully stored {total_stored} total job classifications across {total_batches} batches")
+            if stats['failed_job_ids']:
+                failed = stats['failed_job_ids']
+                logger.error(f"❌ {len(failed)} jobs could not be stored: {', '.join(failed[:10])}"
+                             f"{' ...' if len(failed) > 10 else ''}")
+                return False
             return True
                 
         except Exception as e:
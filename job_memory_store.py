@@ -0,0 +1,345 @@
+"""
+Job Memory Store - columnar record building and batched, concurrent writes for JobMemoryDB
+
+JobMemoryDB.store_classifications used to build one record per iterrows() row
+(re-importing MARKET_TO_LOCATION and rebuilding three market maps for every
+job), then send fixed batches of 100 to the batch_insert_jobs_with_dedup RPC
+one after another, falling back to upsert, and gave up on the first batch that
+failed both. This module splits that into:
+
+- build_job_records(): the same records built column by column; market
+  sanitization runs once per distinct market value
+- plan_batches(): batches packed by JSON payload size (and a row cap) instead
+  of a fixed count, so long descriptions don't produce oversized requests
+- BulkJobWriter: sends batches on a bounded thread pool (RPC first, upsert
+  fallback; a project without the RPC is detected once instead of per batch).
+  A batch that still fails is bisected until the bad rows are isolated, so one
+  malformed job no longer blocks the other 99
+
+Environment:
+    FREEWORLD_MEMORY_STORE_WORKERS=4              concurrent batch requests
+    FREEWORLD_MEMORY_STORE_BATCH_BYTES=1000000    JSON payload budget per batch
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEDUP_RPC = 'batch_insert_jobs_with_dedup'
+JOBS_TABLE = 'jobs'
+MAX_BATCH_ROWS = 500
+MAX_DESCRIPTION_CHARS = 5000
+MISSING_TEXT = ('', 'nan', 'None', 'null')
+RPC_MISSING_MARKERS = ('PGRST202', 'Could not find the function')
+
+# record field -> (source columns in order of preference, default when none exist)
+RECORD_FIELDS = [
+    ('job_id', ('id.job', 'job_id'), ''),
+    ('job_title', ('source.title', 'job_title'), ''),
+    ('company', ('source.company', 'company'), ''),
+    ('location', ('source.location_raw', 'location'), ''),
+    ('job_description', ('source.description_raw', 'job_description'), ''),
+    ('apply_url', ('source.indeed_url', 'apply_url'), ''),
+    ('salary', ('source.salary_raw', 'salary'), ''),
+    ('match_level', ('ai.match', 'match_level', 'match'), ''),
+    ('match_reason', ('ai.reason', 'match_reason', 'reason'), ''),
+    ('summary', ('ai.summary', 'summary'), ''),
+    ('fair_chance', ('ai.fair_chance', 'fair_chance'), 'unknown'),
+    ('endorsements', ('ai.endorsements', 'endorsements'), 'unknown'),
+    ('route_type', ('ai.route_type', 'route_type'), ''),
+    ('career_pathway', ('ai.career_pathway', 'career_pathway'), 'cdl_pathway'),
+    ('training_provided', ('ai.training_provided', 'training_provided'), False),
+    ('market', ('meta.market', 'market'), ''),
+    ('tracked_url', ('meta.tracked_url', 'tracked_url'), ''),
+    ('indeed_job_url', ('source.indeed_url', 'indeed_job_url'), ''),
+    ('search_query', ('meta.query', 'search_query'), ''),
+    ('source', ('id.source', 'source'), 'outscraper'),
+    ('filter_reason', ('route.final_status', 'filter_reason'), ''),
+    ('classification_source', ('sys.classification_source',), 'ai_classification'),
+    ('classified_at', (), None),
+    ('created_at', (), None),
+    ('updated_at', (), None),
+    ('rules_duplicate_r1', ('rules.duplicate_r1',), ''),
+    ('rules_duplicate_r2', ('rules.duplicate_r2',), ''),
+    ('clean_apply_url', ('clean_apply_url',), ''),
+    ('job_id_hash', ('sys.hash',), ''),
+]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _column(df: pd.DataFrame, names, default) -> pd.Series:
+    """First existing column of `names` (like chained row.get calls), else a constant column"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """str() of every value with None/NA/'' as '' (the RPC expects TEXT everywhere)"""
+    return pd.Series(['' if v is None or v is pd.NA or (isinstance(v, str) and not v) else str(v)
+                      for v in values.tolist()],
+                     index=values.index, dtype=object)
+
+
+def _is_missing(values: pd.Series) -> pd.Series:
+    """Values that count as "no AI output": falsy or a null-like string"""
+    return pd.Series([not v or str(v) in MISSING_TEXT for v in values.tolist()], index=values.index, dtype=bool)
+
+
+@lru_cache(maxsize=1)
+def _market_maps() -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    try:
+        from shared_search import MARKET_TO_LOCATION
+    except Exception:
+        return {}, {}, {}
+    std = {m: m for m in MARKET_TO_LOCATION}
+    inv = {v: k for k, v in MARKET_TO_LOCATION.items()}  # City, ST -> Market
+    city_map = {v.split(',')[0].strip().lower(): k for k, v in MARKET_TO_LOCATION.items()}
+    return std, inv, city_map
+
+
+def sanitize_market(value) -> str:
+    """Market name for a market or representative "City, ST" (no state abbreviations)"""
+    std, inv, city_map = _market_maps()
+    s = str(value or '').strip()
+    if not s:
+        return ''
+    if s in std:
+        return s
+    if s in inv:
+        return inv[s]
+    if ',' in s:
+        s = s.split(',')[0].strip()
+    if s.lower() in city_map:
+        return city_map[s.lower()]
+    if s.lower() == 'berkeley':
+        return 'Bay Area'
+    if s.lower() == 'ontario':
+        return 'Inland Empire'
+    return s
+
+
+def build_job_records(jobs_df: pd.DataFrame, now: Optional[datetime] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Supabase job records for included jobs, built column by column
+
+    Jobs whose final status (route.final_status, else filter_reason) is
+    'passed_all_filters' or starts with 'included' are stored; missing AI fields
+    get status-based defaults. Everything else is returned as skipped.
+
+    Args:
+        jobs_df: Canonical (or Supabase-named) jobs DataFrame
+        now: Timestamp for classified_at/created_at/updated_at (default: now)
+
+    Returns:
+        (records, skipped) where skipped holds job_id/final_status/match/reason/summary dicts
+    """
+    if len(jobs_df) == 0:
+        return [], []
+    labels = list(jobs_df.index)
+    df = jobs_df.reset_index(drop=True)
+    stamp = (now or datetime.now()).isoformat()
+
+    primary = _column(df, ('route.final_status',), '')
+    fallback = _column(df, ('filter_reason',), '')
+    final_status = primary.where([bool(v) for v in primary.tolist()], fallback)
+    status_text = final_status.map(lambda v: v if isinstance(v, str) else '')
+    included = (status_text == 'passed_all_filters') | status_text.str.startswith('included')
+
+    columns = {}
+    for field, names, default in RECORD_FIELDS:
+        if names:
+            columns[field] = _column(df, names, default)
+
+    match, summary = columns['match_level'], columns['summary']
+    skipped = []
+    if not included.all():
+        has_id = 'id.job' in df.columns or 'job_id' in df.columns
+        job_ids = columns['job_id'] if has_id else pd.Series([f'job_{label}' for label in labels])
+        excluded = ~included
+        skipped = [{'job_id': job_id, 'final_status': status, 'match': str(m),
+                    'reason': 'Status not included/passed_all_filters', 'summary': str(s)[:50]}
+                   for job_id, status, m, s in zip(job_ids[excluded], final_status[excluded],
+                                                   match[excluded], summary[excluded])]
+
+    keep = included.to_numpy()
+    status_text = status_text[keep]
+    default_match = pd.Series('pending', index=status_text.index, dtype=object)
+    is_included_status = status_text.str.startswith('included')
+    default_match[is_included_status] = ['good' if 'good' in s.lower() else 'so-so'
+                                         for s in status_text[is_included_status]]
+    fills = {
+        'match_level': default_match,
+        'match_reason': status_text,
+        'summary': 'Job with status: ' + status_text,
+    }
+
+    out = {}
+    for field, names, _ in RECORD_FIELDS:
+        if not names:
+            out[field] = stamp
+            continue
+        values = columns[field][keep]
+        if field in fills:
+            values = values.where(~_is_missing(values), fills[field])
+        if field == 'training_provided':
+            out[field] = values.map(lambda v: str(None if v is pd.NA else v).lower())
+        elif field == 'market':
+            codes, distinct = pd.factorize(values, use_na_sentinel=False)
+            sanitized = pd.Series([sanitize_market(v) for v in distinct], dtype=object)
+            out[field] = _text(pd.Series(sanitized.to_numpy()[codes], index=values.index))
+        elif field == 'job_description':
+            out[field] = _text(values).str[:MAX_DESCRIPTION_CHARS]
+        else:
+            out[field] = _text(values)
+
+    records = pd.DataFrame(out, index=status_text.index)
+    records = records[records['job_id'] != '']
+    return records.to_dict('records'), skipped
+
+
+def payload_bytes(record: Dict) -> int:
+    """Size of a record in the JSON request body"""
+    return len(json.dumps(record).encode('utf-8')) + 1
+
+
+def plan_batches(records: List[Dict], max_bytes: Optional[int] = None, max_rows: int = MAX_BATCH_ROWS,
+                 sizes: Optional[List[int]] = None) -> List[List[Dict]]:
+    """
+    Pack records, in order, into batches under a JSON byte budget and a row cap
+
+    A record larger than the budget on its own still gets a batch of one.
+
+    Args:
+        records: Job records
+        max_bytes: Payload budget per batch (FREEWORLD_MEMORY_STORE_BATCH_BYTES)
+        max_rows: Row cap per batch
+        sizes: payload_bytes() of each record, if already known
+    """
+    max_bytes = max_bytes or _env_int('FREEWORLD_MEMORY_STORE_BATCH_BYTES', 1_000_000)
+    sizes = sizes if sizes is not None else [payload_bytes(r) for r in records]
+    batches, current, size = [], [], 2
+    for record, record_size in zip(records, sizes):
+        if current and (size + record_size > max_bytes or len(current) >= max_rows):
+            batches.append(current)
+            current, size = [], 2
+        current.append(record)
+        size += record_size
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BulkJobWriter:
+    """Concurrent batched writes of job records with RPC/upsert fallback and bisection"""
+
+    def __init__(self, client, max_workers: Optional[int] = None, max_batch_bytes: Optional[int] = None,
+                 max_batch_rows: int = MAX_BATCH_ROWS, rpc_name: str = DEDUP_RPC, table: str = JOBS_TABLE):
+        """
+        Args:
+            client: supabase-py client
+            max_workers: Concurrent batch requests (FREEWORLD_MEMORY_STORE_WORKERS)
+            max_batch_bytes: JSON payload budget per batch (FREEWORLD_MEMORY_STORE_BATCH_BYTES)
+            max_batch_rows: Row cap per batch
+            rpc_name: Deduplicating batch insert function (skipped once the project reports it missing)
+            table: Upsert fallback table
+        """
+        self.client = client
+        self.max_workers = max(1, max_workers or _env_int('FREEWORLD_MEMORY_STORE_WORKERS', 4))
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_rows = max_batch_rows
+        self.rpc_name = rpc_name
+        self.table = table
+        self.rpc_available = True
+        self._lock = threading.Lock()
+
+    def _upsert(self, batch: List[Dict]):
+        try:
+            from postgrest.types import ReturnMethod
+            returning = ReturnMethod.minimal
+        except ImportError:
+            returning = 'minimal'
+        # The caller already has the rows; don't ship them back
+        return self.client.table(self.table).upsert(batch, on_conflict='job_id', returning=returning).execute()
+
+    def _send(self, batch: List[Dict], stats: Dict, retry: bool = False) -> int:
+        """Write one batch (RPC, then upsert); raises when both fail"""
+        log_fallback = logger.debug if retry else logger.warning
+        if self.rpc_available:
+            try:
+                with self._lock:
+                    stats['requests'] += 1
+                result = self.client.rpc(self.rpc_name, {'p_jobs_data': batch}).execute()
+                if result.data is not None:
+                    return result.data if isinstance(result.data, int) else len(batch)
+                log_fallback("⚠️ RPC returned no data, trying fallback upsert")
+            except Exception as rpc_error:
+                if any(marker in str(rpc_error) for marker in RPC_MISSING_MARKERS):
+                    logger.warning(f"⚠️ {self.rpc_name} is not deployed - using upsert for all batches")
+                    self.rpc_available = False
+                else:
+                    log_fallback(f"Database deduplication failed, falling back to upsert: {rpc_error}")
+        with self._lock:
+            stats['requests'] += 1
+        self._upsert(batch)
+        return len(batch)
+
+    def _store(self, batch: List[Dict], stats: Dict, retry: bool = False) -> int:
+        """Write a batch; on failure bisect it until the failing rows are isolated"""
+        try:
+            return self._send(batch, stats, retry)
+        except Exception as e:
+            if len(batch) == 1:
+                job_id = batch[0].get('job_id', '')
+                logger.error(f"❌ Job {job_id} could not be stored: {e}")
+                with self._lock:
+                    stats['failed_job_ids'].append(job_id)
+                return 0
+            with self._lock:
+                stats['bisections'] += 1
+            middle = len(batch) // 2
+            if not retry:
+                logger.warning(f"⚠️ Batch of {len(batch)} failed ({e}) - bisecting to isolate bad rows")
+            return self._store(batch[:middle], stats, True) + self._store(batch[middle:], stats, True)
+
+    def write(self, records: List[Dict]) -> Dict:
+        """
+        Store records
+
+        Returns:
+            Stats dict: rows, stored, failed_job_ids, batches, requests, bisections,
+            payload_bytes, seconds, rows_per_second, rpc_available
+        """
+        started = time.perf_counter()
+        sizes = [payload_bytes(r) for r in records]
+        batches = plan_batches(records, self.max_batch_bytes, self.max_batch_rows, sizes)
+        stats = {'rows': len(records), 'stored': 0, 'failed_job_ids': [], 'batches': len(batches),
+                 'requests': 0, 'bisections': 0, 'payload_bytes': sum(sizes)}
+        if batches:
+            # The first batch runs alone so a missing RPC is found before the rest fan out
+            stored = self._store(batches[0], stats)
+            if len(batches) > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    stored += sum(pool.map(lambda b: self._store(b, stats), batches[1:]))
+            stats['stored'] = stored
+        stats['seconds'] = time.perf_counter() - started
+        stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        stats['rpc_available'] = self.rpc_available
+        return stats
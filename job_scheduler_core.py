@@ -0,0 +1,342 @@
+"""
+Job Scheduler Core - due-job polling, atomic claims and a bounded worker pool
+
+The background scheduler used to select every 'scheduled' row in
+async_job_queue each minute, filter scheduled_run_at in Python and run the due
+jobs one after another. SchedulerCore does one poll at a time:
+
+- asks the queue only for due rows (status='scheduled' AND scheduled_run_at <= now),
+  oldest first, limited to the number of free worker slots
+- claims each row with a conditional update (scheduled -> processing where the
+  row is still 'scheduled'); a row another process claimed first is skipped,
+  so two schedulers never run the same job
+- runs claimed jobs on a bounded thread pool; a job running past its timeout is
+  marked failed and its slot stays reserved until the thread actually returns
+- writes a final status only while the row is still claimed (processing ->
+  final where the row is still 'processing'), so a timed-out job's late result
+  cannot overwrite the failure, and a timeout cannot overwrite a finished job
+- picks the next poll interval: short while there is a backlog, backing off
+  while idle but never sleeping past the next scheduled_run_at
+
+Queue backends share a small interface (fetch_due, claim, finish, count_due,
+next_due_at): SupabaseJobQueue for async_job_queue, InMemoryJobQueue for tests
+and local runs.
+
+Environment:
+    FREEWORLD_SCHEDULER_WORKERS=4            concurrent jobs per process
+    FREEWORLD_SCHEDULER_JOB_TIMEOUT=3600     seconds before a running job is failed
+    FREEWORLD_SCHEDULER_MIN_INTERVAL=5       poll interval while jobs are due
+    FREEWORLD_SCHEDULER_MAX_INTERVAL=60      poll interval ceiling while idle
+"""
+
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUE_TABLE = 'async_job_queue'
+CLAIMED_STATUS = 'processing'
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Parse a timestamptz value (ISO string or datetime) as an aware UTC datetime"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SupabaseJobQueue:
+    """async_job_queue access through PostgREST"""
+
+    def __init__(self, client, table: str = QUEUE_TABLE):
+        self.client = client
+        self.table = table
+
+    def _due_query(self, columns: str, now: datetime, **kwargs):
+        return (self.client.table(self.table).select(columns, **kwargs)
+                .eq('status', 'scheduled')
+                .lte('scheduled_run_at', now.isoformat()))
+
+    def fetch_due(self, now: datetime, limit: int) -> List[Dict]:
+        """Due rows, oldest scheduled_run_at first"""
+        result = self._due_query('*', now).order('scheduled_run_at').limit(limit).execute()
+        return result.data or []
+
+    def claim(self, job_id: Any, now: datetime) -> bool:
+        """Move a row from scheduled to processing; False if someone else got it first"""
+        result = (self.client.table(self.table)
+                  .update({'status': CLAIMED_STATUS, 'submitted_at': now.isoformat()})
+                  .eq('id', job_id)
+                  .eq('status', 'scheduled')
+                  .execute())
+        return bool(result.data)
+
+    def finish(self, job_id: Any, updates: Dict) -> bool:
+        """Write a claimed row's final status; False if it is no longer processing (e.g. timed out)"""
+        result = (self.client.table(self.table)
+                  .update(updates)
+                  .eq('id', job_id)
+                  .eq('status', CLAIMED_STATUS)
+                  .execute())
+        return bool(result.data)
+
+    def count_due(self, now: datetime) -> int:
+        result = self._due_query('id', now, count='exact').limit(1).execute()
+        return int(result.count or 0)
+
+    def next_due_at(self, now: datetime) -> Optional[datetime]:
+        """Earliest scheduled_run_at still in the future"""
+        result = (self.client.table(self.table).select('scheduled_run_at')
+                  .eq('status', 'scheduled')
+                  .gt('scheduled_run_at', now.isoformat())
+                  .order('scheduled_run_at').limit(1).execute())
+        return _as_datetime(result.data[0]['scheduled_run_at']) if result.data else None
+
+
+class InMemoryJobQueue:
+    """Thread-safe list of async_job_queue-shaped rows with the same semantics"""
+
+    def __init__(self, rows: Optional[List[Dict]] = None):
+        self.rows: List[Dict] = [dict(r) for r in (rows or [])]
+        self._lock = threading.Lock()
+        self._next_id = max([r.get('id', 0) for r in self.rows] or [0]) + 1
+
+    def add(self, row: Dict) -> Dict:
+        with self._lock:
+            row = dict(row)
+            row.setdefault('id', self._next_id)
+            row.setdefault('status', 'scheduled')
+            self._next_id = max(self._next_id, row['id']) + 1
+            self.rows.append(row)
+            return row
+
+    def get(self, job_id: Any) -> Optional[Dict]:
+        with self._lock:
+            return next((dict(r) for r in self.rows if r.get('id') == job_id), None)
+
+    def _due(self, now: datetime) -> List[Dict]:
+        due = [(run_at, r) for r in self.rows if r.get('status') == 'scheduled'
+               for run_at in [_as_datetime(r.get('scheduled_run_at'))] if run_at is not None and run_at <= now]
+        return [r for _, r in sorted(due, key=lambda pair: pair[0])]
+
+    def fetch_due(self, now: datetime, limit: int) -> List[Dict]:
+        with self._lock:
+            return [dict(r) for r in self._due(now)[:limit]]
+
+    def claim(self, job_id: Any, now: datetime) -> bool:
+        with self._lock:
+            for row in self.rows:
+                if row.get('id') == job_id and row.get('status') == 'scheduled':
+                    row.update(status=CLAIMED_STATUS, submitted_at=now.isoformat())
+                    return True
+            return False
+
+    def finish(self, job_id: Any, updates: Dict) -> bool:
+        with self._lock:
+            for row in self.rows:
+                if row.get('id') == job_id and row.get('status') == CLAIMED_STATUS:
+                    row.update(updates)
+                    return True
+            return False
+
+    def count_due(self, now: datetime) -> int:
+        with self._lock:
+            return len(self._due(now))
+
+    def next_due_at(self, now: datetime) -> Optional[datetime]:
+        with self._lock:
+            upcoming = [_as_datetime(r.get('scheduled_run_at')) for r in self.rows
+                        if r.get('status') == 'scheduled']
+            upcoming = [t for t in upcoming if t is not None and t > now]
+            return min(upcoming) if upcoming else None
+
+
+class SchedulerCore:
+    """Polls a job queue and runs due jobs on a bounded worker pool"""
+
+    def __init__(self, queue, run_job: Callable[[Dict], Any], max_workers: Optional[int] = None,
+                 job_timeout: Optional[float] = None, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None, clock: Callable[[], datetime] = _utcnow,
+                 logger=None):
+        """
+        Args:
+            queue: Queue backend (SupabaseJobQueue, InMemoryJobQueue)
+            run_job: Called on a worker thread with the claimed row; it records the
+                job's own outcome through queue.finish(), which refuses once the
+                row has been failed for a timeout. A raised exception marks the row failed.
+            max_workers: Concurrent jobs (FREEWORLD_SCHEDULER_WORKERS, default 4)
+            job_timeout: Seconds before a running job is marked failed
+                (FREEWORLD_SCHEDULER_JOB_TIMEOUT, default 3600)
+            min_interval: Poll interval while a backlog exists
+            max_interval: Poll interval ceiling while idle
+            clock: Current UTC time (injectable for tests)
+            logger: Optional logging.Logger; falls back to print
+        """
+        self.queue = queue
+        self.run_job = run_job
+        self.max_workers = max(1, int(max_workers or _env_float('FREEWORLD_SCHEDULER_WORKERS', 4)))
+        self.job_timeout = job_timeout if job_timeout is not None else _env_float('FREEWORLD_SCHEDULER_JOB_TIMEOUT', 3600)
+        self.min_interval = min_interval if min_interval is not None else _env_float('FREEWORLD_SCHEDULER_MIN_INTERVAL', 5)
+        self.max_interval = max_interval if max_interval is not None else _env_float('FREEWORLD_SCHEDULER_MAX_INTERVAL', 60)
+        self.clock = clock
+        self.logger = logger
+        self.next_interval = self.min_interval
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler-job')
+        self._running: Dict[Any, Dict] = {}  # future -> {'row', 'started'}
+        self._abandoned: Dict[Any, Dict] = {}  # timed-out futures still holding a thread
+        self._lock = threading.Lock()
+        self.stats = {
+            'polls': 0,
+            'claimed': 0,
+            'claim_conflicts': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'queue_depth': 0,
+            'lag_seconds': 0.0,
+            'max_start_lag_seconds': 0.0,
+            'last_poll_at': None,
+        }
+
+    def _log(self, message: str, level: str = 'info') -> None:
+        if self.logger is not None:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    @property
+    def busy_slots(self) -> int:
+        with self._lock:
+            return len(self._running) + len(self._abandoned)
+
+    def _execute(self, row: Dict) -> None:
+        try:
+            self.run_job(row)
+        except Exception as e:
+            self._log(f"❌ Scheduled job {row.get('id')} raised: {e}", 'error')
+            self._log(traceback.format_exc(), 'error')
+            self._mark_failed(row, str(e))
+            raise
+
+    def _mark_failed(self, row: Dict, message: str) -> None:
+        try:
+            if not self.queue.finish(row.get('id'), {
+                'status': 'failed',
+                'completed_at': self.clock().isoformat(),
+                'error_message': message,
+            }):
+                self._log(f"⚠️ Job {row.get('id')} already left processing - not marking it failed", 'warning')
+        except Exception as e:
+            self._log(f"⚠️ Could not mark job {row.get('id')} failed: {e}", 'warning')
+
+    def reap(self) -> None:
+        """Collect finished jobs and fail the ones past their timeout"""
+        with self._lock:
+            for future in [f for f in self._abandoned if f.done()]:
+                del self._abandoned[future]
+            finished = [(f, info) for f, info in self._running.items() if f.done()]
+            overdue = [(f, info) for f, info in self._running.items()
+                       if not f.done() and time.monotonic() - info['started'] > self.job_timeout]
+            for future, _ in finished + overdue:
+                del self._running[future]
+            for future, info in overdue:
+                self._abandoned[future] = info
+
+        for future, _ in finished:
+            self.stats['failed' if future.exception() else 'completed'] += 1
+        for _, info in overdue:
+            self.stats['timed_out'] += 1
+            self._log(f"⏱️ Job {info['row'].get('id')} exceeded {self.job_timeout:.0f}s - marking failed", 'warning')
+            self._mark_failed(info['row'], f"Timed out after {self.job_timeout:.0f}s")
+
+    def poll_once(self) -> int:
+        """
+        Claim and start due jobs up to the free worker capacity
+
+        Returns:
+            Number of jobs started by this poll
+        """
+        self.reap()
+        now = self.clock()
+        self.stats['polls'] += 1
+        self.stats['last_poll_at'] = now.isoformat()
+
+        free = self.max_workers - self.busy_slots
+        rows = self.queue.fetch_due(now, max(free, 1))
+        backlog = len(rows) >= max(free, 1)
+        self.stats['queue_depth'] = self.queue.count_due(now) if backlog else len(rows)
+        oldest = _as_datetime(rows[0].get('scheduled_run_at')) if rows else None
+        self.stats['lag_seconds'] = max(0.0, (now - oldest).total_seconds()) if oldest else 0.0
+
+        started = 0
+        for row in rows[:max(free, 0)]:
+            if not self.queue.claim(row['id'], now):
+                self.stats['claim_conflicts'] += 1
+                continue
+            self.stats['claimed'] += 1
+            run_at = _as_datetime(row.get('scheduled_run_at'))
+            if run_at:
+                self.stats['max_start_lag_seconds'] = max(self.stats['max_start_lag_seconds'],
+                                                          (now - run_at).total_seconds())
+            row = dict(row, status=CLAIMED_STATUS)
+            with self._lock:
+                future = self._executor.submit(self._execute, row)
+                self._running[future] = {'row': row, 'started': time.monotonic()}
+            started += 1
+
+        self.next_interval = self._choose_interval(now, backlog)
+        return started
+
+    def _choose_interval(self, now: datetime, backlog: bool) -> float:
+        if backlog:
+            return self.min_interval
+        interval = min(self.max_interval, max(self.min_interval, self.next_interval * 2))
+        next_due = self.queue.next_due_at(now)
+        if next_due is not None:
+            interval = min(interval, max(self.min_interval, (next_due - now).total_seconds()))
+        return interval
+
+    def metrics(self) -> Dict:
+        """Queue depth, lag and counters from the most recent poll"""
+        with self._lock:
+            running, abandoned = len(self._running), len(self._abandoned)
+        return dict(self.stats, running=running, timed_out_running=abandoned,
+                    max_workers=self.max_workers, next_interval=self.next_interval)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no job is running (reaping as they finish); False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.reap()
+            with self._lock:
+                if not self._running:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        self.reap()
@@ -6,9 +6,22 @@ from dotenv import load_dotenv
 from job_classifier import JobClassifier
 from hybrid_memory_classifier import HybridMemoryClassifier
 from job_filters import JobFilters
+from pipeline_performance_monitor import record_external_call
+from outscraper_async_client import OutscraperAsyncClient, async_ingest_enabled
 import hashlib
+import time
 import re
 
+# Radius expansion queries the nearest mapped cities, at most this many. Every city is
+# another billed query, so expansion is opt-in (FREEWORLD_GOOGLE_RADIUS_CITIES=on) and
+# never issues more queries than the pages the job limit needs.
+MAX_RADIUS_CITIES = 20
+
+
+def radius_cities_enabled() -> bool:
+    """True if FREEWORLD_GOOGLE_RADIUS_CITIES is on (Google radius searches expand to nearby cities)"""
+    return os.getenv('FREEWORLD_GOOGLE_RADIUS_CITIES', '').lower() in ('on', '1', 'true')
+
 load_dotenv()
 
 class FreeWorldJobScraper:
@@ -21,6 +34,17 @@ class FreeWorldJobScraper:
         self.hybrid_classifier = HybridMemoryClassifier()  # New hybrid system
         self.filters = JobFilters()
     
+    def _outscraper_get(self, url, params, timeout=None):
+        """GET against the Outscraper API, reporting latency to the pipeline telemetry"""
+        start = time.time()
+        try:
+            response = requests.get(url, headers=self.headers, params=params, timeout=timeout)
+        except Exception:
+            record_external_call('outscraper', time.time() - start, error=True)
+            raise
+        record_external_call('outscraper', time.time() - start, error=response.status_code != 200)
+        return response
+    
     def search_indeed_jobs(self, indeed_url_or_urls, limit=50, location=None, disable_optimization=False):
         """Search Indeed using single URL or multiple URLs with cost optimization"""
         
@@ -78,91 +102,118 @@ class FreeWorldJobScraper:
             effective_limit = actual_limit
             print(f"🔍 Searching Indeed for {actual_limit} jobs...")
 
-        url = "https://api.outscraper.cloud/indeed-search"
-        params = {
-            'query': query_urls,  # Can be string or list - requests handles both
-            'limit': effective_limit,
-            'async': 'false'
-        }
-        
-        response = requests.get(url, headers=self.headers, params=params)
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-            except Exception as json_error:
-                print(f"❌ JSON parsing failed: {json_error}")
-                print(f"📋 Response headers: {dict(response.headers)}")
-                print(f"📋 Response content type: {response.headers.get('content-type', 'Unknown')}")
-                print(f"📋 Response encoding: {response.encoding}")
-                
-                # Try to get raw text to debug
-                try:
-                    raw_text = response.text[:500] + "..." if len(response.text) > 500 else response.text
-                    print(f"📋 Raw response (first 500 chars): {raw_text}")
-                except Exception as text_error:
-                    print(f"❌ Could not decode response text: {text_error}")
-                
-                # Return existing jobs if available
-                if not existing_jobs.empty:
-                    existing_jobs_list = self._process_existing_airtable_jobs(existing_jobs)
-                    print(f"📋 Returning {len(existing_jobs_list)} existing jobs (JSON parsing failed)")
-                    return existing_jobs_list
-                return []
-            
-            if data.get('data') and len(data['data']) > 0:
-                # Handle multiple queries - flatten all results
-                all_jobs = []
-                for i, query_result in enumerate(data['data']):
-                    if isinstance(query_result, list):
-                        all_jobs.extend(query_result)
-                        print(f"   Query {i+1}: {len(query_result)} jobs")
+        data = self._fetch_indeed_data(query_urls, effective_limit)
+        if data is None:
+            # Return existing jobs even if scraping failed
+            if not existing_jobs.empty:
+                existing_jobs_list = self._process_existing_airtable_jobs(existing_jobs)
+                print(f"📋 Returning {len(existing_jobs_list)} existing jobs (API error)")
+                return existing_jobs_list
+            return []
 
-                jobs = all_jobs
-                if isinstance(indeed_url_or_urls, list) and len(indeed_url_or_urls) > 1:
-                    num_queries = len(indeed_url_or_urls)
-                    expected_total = actual_limit * num_queries  # Each query gets the limit automatically
-                    print(f"✅ Found {len(jobs)} total Indeed jobs from {num_queries} queries (requested {actual_limit} × {num_queries} = {expected_total})")
-                    if len(jobs) < expected_total * 0.5:  # Allow for some variance in API results
-                        print(f"⚠️  API returned fewer jobs than expected ({len(jobs)} < {int(expected_total * 0.5)})")
-                        print("   This might be an API limit or search result limit")
-                else:
-                    print(f"✅ Found {len(jobs)} total Indeed jobs from {len(data['data'])} queries (requested {actual_limit})")
-                    if len(jobs) < actual_limit:
-                        print(f"⚠️  API returned fewer jobs than requested ({len(jobs)} < {actual_limit})")
-                        print("   This might be an API limit or search result limit")
-                
-                scraped_jobs = self._process_indeed_jobs(jobs)
-                
-                # Only combine with existing jobs if optimization is NOT disabled
-                if not existing_jobs.empty and not disable_optimization:
-                    existing_jobs_list = self._process_existing_airtable_jobs(existing_jobs)
-                    combined_jobs = existing_jobs_list + scraped_jobs
-                    print(f"🔗 Combined {len(existing_jobs_list)} existing + {len(scraped_jobs)} scraped = {len(combined_jobs)} total jobs")
-                    return combined_jobs
-                else:
-                    return scraped_jobs
+        if data.get('data') and len(data['data']) > 0:
+            # Handle multiple queries - flatten all results
+            all_jobs = []
+            for i, query_result in enumerate(data['data']):
+                if isinstance(query_result, list):
+                    all_jobs.extend(query_result)
+                    print(f"   Query {i+1}: {len(query_result)} jobs")
+
+            jobs = all_jobs
+            if isinstance(indeed_url_or_urls, list) and len(indeed_url_or_urls) > 1:
+                num_queries = len(indeed_url_or_urls)
+                expected_total = actual_limit * num_queries  # Each query gets the limit automatically
+                print(f"✅ Found {len(jobs)} total Indeed jobs from {num_queries} queries (requested {actual_limit} × {num_queries} = {expected_total})")
+                if len(jobs) < expected_total * 0.5:  # Allow for some variance in API results
+                    print(f"⚠️  API returned fewer jobs than expected ({len(jobs)} < {int(expected_total * 0.5)})")
+                    print("   This might be an API limit or search result limit")
             else:
-                print("❌ No jobs found")
-                if data.get('data'):
-                    print(f"📊 Data structure: {type(data['data'])}, length: {len(data['data']) if hasattr(data['data'], '__len__') else 'N/A'}")
-                
-                # Return existing jobs even if scraping failed
-                if not existing_jobs.empty:
-                    existing_jobs_list = self._process_existing_airtable_jobs(existing_jobs)
-                    print(f"📋 Returning {len(existing_jobs_list)} existing jobs (scraping failed)")
-                    return existing_jobs_list
-                return []
+                print(f"✅ Found {len(jobs)} total Indeed jobs from {len(data['data'])} queries (requested {actual_limit})")
+                if len(jobs) < actual_limit:
+                    print(f"⚠️  API returned fewer jobs than requested ({len(jobs)} < {actual_limit})")
+                    print("   This might be an API limit or search result limit")
+
+            scraped_jobs = self._process_indeed_jobs(jobs)
+
+            # Only combine with existing jobs if optimization is NOT disabled
+            if not existing_jobs.empty and not disable_optimization:
+                existing_jobs_list = self._process_existing_airtable_jobs(existing_jobs)
+                combined_jobs = existing_jobs_list + scraped_jobs
+                print(f"🔗 Combined {len(existing_jobs_list)} existing + {len(scraped_jobs)} scraped = {len(combined_jobs)} total jobs")
+                return combined_jobs
+            else:
+                return scraped_jobs
         else:
-            print(f"❌ Error: {response.status_code} - {response.text}")
-            
+            print("❌ No jobs found")
+            if data.get('data'):
+                print(f"📊 Data structure: {type(data['data'])}, length: {len(data['data']) if hasattr(data['data'], '__len__') else 'N/A'}")
+
             # Return existing jobs even if scraping failed
             if not existing_jobs.empty:
                 existing_jobs_list = self._process_existing_airtable_jobs(existing_jobs)
-                print(f"📋 Returning {len(existing_jobs_list)} existing jobs (API error)")
+                print(f"📋 Returning {len(existing_jobs_list)} existing jobs (scraping failed)")
                 return existing_jobs_list
             return []
-    
+
+    def _fetch_indeed_data(self, query_urls, limit, use_async=True):
+        """
+        Fetch Indeed results as {'data': [jobs per query]}, or None on an API error.
+
+        Each query runs as its own concurrent async Outscraper request
+        (outscraper_async_client) unless FREEWORLD_OUTSCRAPER_ASYNC=off or
+        use_async is False, in which case all queries go out in one synchronous
+        request. Async queries that fail are retried in one synchronous request.
+        """
+        if use_async and async_ingest_enabled():
+            try:
+                client = OutscraperAsyncClient(self.api_key)
+                queries = query_urls if isinstance(query_urls, list) else [query_urls]
+                print(f"⚡ Async Outscraper: {len(queries)} queries, {client.max_concurrent} in flight")
+                pages = client.fetch_indeed_results(queries, limit)
+                print(f"   ⏱️ {client.stats['seconds']:.1f}s, {client.stats['polls']} polls, "
+                      f"{client.stats['failed']} failed queries")
+                failed = client.stats['failed_queries']
+                if failed:
+                    print(f"⚠️ Retrying {len(failed)} failed async queries in a synchronous request")
+                    retried = self._fetch_indeed_data(failed, limit, use_async=False)
+                    if retried is None:
+                        return None if len(failed) == len(queries) else {'data': pages}
+                    failed_indexes = [i for i, query in enumerate(queries) if query in failed]
+                    for i, page in zip(failed_indexes, retried.get('data') or []):
+                        pages[i] = page
+                return {'data': pages}
+            except Exception as e:
+                print(f"⚠️ Async Outscraper ingestion unavailable ({e}), using a synchronous request")
+
+        url = "https://api.outscraper.cloud/indeed-search"
+        params = {
+            'query': query_urls,  # Can be string or list - requests handles both
+            'limit': limit,
+            'async': 'false'
+        }
+
+        response = self._outscraper_get(url, params)
+
+        if response.status_code != 200:
+            print(f"❌ API Error: {response.status_code} - {response.text}")
+            return None
+
+        try:
+            return response.json()
+        except Exception as json_error:
+            print(f"❌ JSON parsing failed: {json_error}")
+            print(f"📋 Response headers: {dict(response.headers)}")
+            print(f"📋 Response content type: {response.headers.get('content-type', 'Unknown')}")
+            print(f"📋 Response encoding: {response.encoding}")
+
+            # Try to get raw text to debug
+            try:
+                raw_text = response.text[:500] + "..." if len(response.text) > 500 else response.text
+                print(f"📋 Raw response (first 500 chars): {raw_text}")
+            except Exception as text_error:
+                print(f"❌ Could not decode response text: {text_error}")
+            return None
+
     def search_google_jobs(self, job_terms, location):
         """Search Google for job postings using targeted approach"""
         # Use Google Jobs search directly - this might be what creates the outscraper files
@@ -182,7 +233,7 @@ class FreeWorldJobScraper:
         
         try:
             # Direct synchronous request to Google search API
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self._outscraper_get(url, params, timeout=30)
             
             if response.status_code == 200:
                 try:
@@ -557,7 +608,8 @@ class FreeWorldJobScraper:
         indeed_queries = search_params.get('indeed_urls') or search_params.get('indeed_url')
         raw_jobs = self._fetch_raw_indeed_jobs(
             indeed_queries,
-            mode_info['indeed_limit']
+            mode_info['indeed_limit'],
+            use_async=search_params.get('outscraper_async', True)  # False: one synchronous request
         )
         
         if not raw_jobs:
@@ -567,7 +619,7 @@ class FreeWorldJobScraper:
         print(f"✅ Retrieved {len(raw_jobs)} raw jobs from Indeed")
         return raw_jobs
 
-    def _fetch_raw_indeed_jobs(self, indeed_url_or_urls, limit):
+    def _fetch_raw_indeed_jobs(self, indeed_url_or_urls, limit, use_async=True):
         """Fetch raw job data from Indeed API without any processing"""
 
         # Handle multiple URLs or single URL
@@ -598,23 +650,8 @@ class FreeWorldJobScraper:
         else:
             effective_limit = limit
 
-        url = "https://api.outscraper.cloud/indeed-search"
-        params = {
-            'query': query_urls,  # Can be string or list - requests handles both
-            'limit': effective_limit,
-            'async': 'false'
-        }
-        
-        response = requests.get(url, headers=self.headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"❌ API Error: {response.status_code} - {response.text}")
-            return []
-            
-        try:
-            data = response.json()
-        except Exception as json_error:
-            print(f"❌ JSON parsing failed: {json_error}")
+        data = self._fetch_indeed_data(query_urls, effective_limit, use_async=use_async)
+        if data is None:
             return []
             
         if not (data.get('data') and len(data['data']) > 0):
@@ -638,13 +675,25 @@ class FreeWorldJobScraper:
         """Search Google Jobs API with radius-based city expansion
         
         When radius=0, searches exact location only (faster, more stable).
-        When radius>0, expands to nearby cities (slower, may timeout).
+        When radius>0, searches the location with more pages; with
+        FREEWORLD_GOOGLE_RADIUS_CITIES=on it expands to nearby cities instead,
+        one page per city query and no more queries than pages needed.
         Now supports comma-separated search terms.
         """
         
         # Handle comma-separated search terms
         search_terms_list = [term.strip() for term in search_terms.split(',') if term.strip()]
         
+        # Calculate pages needed: Google typically returns ~20 jobs per page
+        # Use fewer pages for exact location to match working test script behavior
+        jobs_per_page = 20
+        if radius == 0:
+            # Exact location: limit to 2 pages max (nginx gateway timeout prevents more)
+            total_pages_needed = min(2, max(1, (limit + jobs_per_page - 1) // jobs_per_page))
+        else:
+            # Radius expansion: can use more pages
+            total_pages_needed = max(1, min(10, (limit + jobs_per_page - 1) // jobs_per_page))
+        
         if radius == 0:
             # Exact location search - much faster and more stable
             # Format: "CDL Driver Dallas TX" (no comma, matches test script format)
@@ -657,30 +706,15 @@ class FreeWorldJobScraper:
             
             print(f"📍 Using exact location search: '{location_formatted}' (radius=0, stable mode)")
             print(f"🔍 Search terms: {len(search_terms_list)} terms - {', '.join(search_terms_list)}")
-        else:
-            # Radius-based city expansion (may cause timeouts)
+        elif radius_cities_enabled():
+            # Radius-based city expansion (may cause timeouts); at most one page per city query
             print(f"⚠️ Using radius expansion mode ({radius}mi) - may be slower or timeout")
-            try:
-                import pandas as pd
-                df = pd.read_csv('market_cities.csv')
-            except Exception as e:
-                print(f"⚠️ Failed to load market_cities.csv: {e}")
-                # Fallback to single location query for each term
-                queries = []
-                for term in search_terms_list:
-                    queries.append(f"{term} {location}")
-            else:
-                queries = self._build_google_queries(search_terms_list, location, radius, df)
-        
-        # Calculate pages needed: Google typically returns ~20 jobs per page
-        # Use fewer pages for exact location to match working test script behavior
-        jobs_per_page = 20
-        if radius == 0:
-            # Exact location: limit to 2 pages max (nginx gateway timeout prevents more)
-            total_pages_needed = min(2, max(1, (limit + jobs_per_page - 1) // jobs_per_page))
+            max_cities = min(MAX_RADIUS_CITIES, max(1, total_pages_needed // max(1, len(search_terms_list))))
+            queries = self._build_google_queries(search_terms_list, location, radius, max_cities=max_cities)
         else:
-            # Radius expansion: can use more pages
-            total_pages_needed = max(1, min(10, (limit + jobs_per_page - 1) // jobs_per_page))
+            # One query per term; the radius widens pages, not query count
+            queries = [f"{term} {location}" for term in search_terms_list]
+            print(f"📍 Radius search: '{location}' ({radius}mi), {len(queries)} queries")
         
         pages_per_query = max(1, total_pages_needed // max(1, len(queries)))
         
@@ -714,7 +748,7 @@ class FreeWorldJobScraper:
             try:
                 # Use 5-minute timeout for exact location (testing 50 pages), longer for radius expansion
                 timeout = 300 if radius == 0 else 90
-                response = requests.get(url, headers=self.headers, params=batch_params, timeout=timeout)
+                response = self._outscraper_get(url, batch_params, timeout=timeout)
                 
                 if response.status_code == 200:
                     try:
@@ -753,39 +787,41 @@ class FreeWorldJobScraper:
             'cost': len(queries) * 0.005  # $0.005 per query
         }
     
-    def _build_google_queries(self, search_terms_list, location, radius, df):
-        """Build queries based on radius from CSV with multiple search terms"""
+    def _build_google_queries(self, search_terms_list, location, radius, max_cities=MAX_RADIUS_CITIES):
+        """Build queries for the mapped cities within the radius (nearest first) for each search term"""
         
-        # Extract market name (could be "Houston, TX" or just "Houston")
+        # Location could be "Houston, TX" or just the market name "Houston"
         market_key = location.split(',')[0].strip()
+        try:
+            from market_geo_index import get_market_geo_index
+            geo_index = get_market_geo_index()
+            market = market_key if market_key in geo_index.markets else None
+            nearby = geo_index.cities_within(location, radius, market=market)[:max_cities]
+        except Exception as e:
+            print(f"⚠️ Market geo index unavailable: {e}")
+            nearby = []
         
-        # Filter cities based on radius
-        radius_column = f'within_{radius}'
-        
-        # Get cities for this market within the radius
-        market_cities = df[
-            (df['market'] == market_key) & 
-            (df[radius_column] == True)
-        ]
-        
-        if len(market_cities) == 0:
-            print(f"⚠️ No cities found for market '{market_key}' with radius {radius}mi")
+        if len(nearby) == 0:
+            print(f"⚠️ No cities found for '{location}' within {radius}mi")
             # Fallback: create queries for each search term with the original location
             queries = []
             for term in search_terms_list:
                 queries.append(f"{term} {location}")
             return queries
         
-        # Build queries: each search term × each city
+        # Build queries: each search term × each city ("CDL Driver Irving TX")
+        city_names = []
+        for city_key, _ in nearby:
+            city, _, state = city_key.rpartition(', ')
+            city_names.append(f"{city.title()} {state.upper()}")
         queries = []
         for term in search_terms_list:
-            for _, row in market_cities.iterrows():
-                query = f"{term} {row['city']} {row['state']}"
-                queries.append(query)
+            for city_name in city_names:
+                queries.append(f"{term} {city_name}")
         
         print(f"📍 Market: {location}, Radius: {radius}mi")
-        print(f"🔍 Search terms: {len(search_terms_list)} terms × {len(market_cities)} cities = {len(queries)} queries")
-        print(f"   Cities: {', '.join([row['city'] for _, row in market_cities.head(3).iterrows()])}{'...' if len(market_cities) > 3 else ''}")
+        print(f"🔍 Search terms: {len(search_terms_list)} terms × {len(nearby)} cities = {len(queries)} queries")
+        print(f"   Cities: {', '.join(city_names[:3])}{'...' if len(city_names) > 3 else ''}")
         
         return queries
     
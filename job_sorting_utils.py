@@ -2,18 +2,38 @@
 """
 Unified Job Sorting Utilities
 Based on the working FPDF sorting implementation
+
+unified_sort_key() computes the priority for a whole DataFrame at once:
+ai.route_type, ai.match and ai.fair_chance are factorized, each distinct
+value is lower-cased and mapped to a categorical code once, and np.select
+turns the codes into route and quality tiers. unified_sort_order() returns
+a stable ordering (ties keep their input order) that the portal, the PDF
+generators and the memory-only search all share. get_unified_sort_priority()
+is the row-wise reference for the same rules.
 """
 
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
+ROUTE_CATEGORIES = ['local', 'otr', 'regional']
+MATCH_CATEGORIES = ['good', 'so-so']
+FAIR_CHANCE_FLAGS = ['true', 'yes', '1']  # Legacy boolean-style ai.fair_chance values
+
+
+def _is_fair_chance(value: str) -> bool:
+    return 'fair_chance_employer' in value or value in FAIR_CHANCE_FLAGS
+
+
 def get_unified_sort_priority(row):
     """
     Unified sorting priority function that matches the working FPDF implementation.
-    
+
     Priority order:
-    1. Route type: Local (0) → OTR/Regional (1) → Unknown (2)  
+    1. Route type: Local (0) → OTR/Regional (1) → Unknown (2)
     2. Quality within route: Excellent+Fair (1) → Excellent (2) → Possible+Fair (3) → Possible (4) → Other (5)
-    
+
     Returns combined priority score where route_priority * 10 + quality_priority
     """
     # Route type priority (most important) - EXACTLY as FPDF does it
@@ -21,44 +41,95 @@ def get_unified_sort_priority(row):
     if route_type == 'local':
         route_priority = 0
     elif route_type in ['otr', 'regional']:
-        route_priority = 1  
+        route_priority = 1
     else:
         route_priority = 2  # Unknown/other
-    
+
     # Quality priority within route type - EXACTLY as FPDF does it
-    ai_match = row.get('ai.match', '')
-    fair_chance = row.get('ai.fair_chance', '').lower()
-    
+    ai_match = str(row.get('ai.match', '')).lower()
+    fair_chance = row.get('ai.fair_chance', '')
+    fair_chance = str(fair_chance).lower() if pd.notna(fair_chance) else ''
+
     is_excellent = ai_match == 'good'
-    is_possible = ai_match == 'so-so'  
-    has_fair_chance = 'fair_chance_employer' in fair_chance
-    
+    is_possible = ai_match == 'so-so'
+    has_fair_chance = _is_fair_chance(fair_chance)
+
     if is_excellent and has_fair_chance:
         quality_priority = 1  # Highest quality
     elif is_excellent:
-        quality_priority = 2  # Second quality  
+        quality_priority = 2  # Second quality
     elif is_possible and has_fair_chance:
         quality_priority = 3  # Third quality
     elif is_possible:
         quality_priority = 4  # Fourth quality
     else:
         quality_priority = 5  # Lowest quality (bad/unknown matches)
-    
+
     # Combine: route_priority * 10 + quality_priority for proper ordering
     # This ensures Local jobs always come first, then OTR, then Unknown
     return route_priority * 10 + quality_priority
 
+def _lowered_codes(df: pd.DataFrame, column: str):
+    """(per-row codes into the distinct values, the distinct values lower-cased); missing values are -1"""
+    if column not in df.columns:
+        return np.full(len(df), -1, dtype=np.intp), pd.Index([], dtype=object)
+    codes, uniques = pd.factorize(df[column])
+    return codes, pd.Index(uniques).astype(str).str.lower()
+
+def _category_codes(df: pd.DataFrame, column: str, categories) -> np.ndarray:
+    """Code of each row's lower-cased value in categories (-1 for anything else or missing)"""
+    codes, lowered = _lowered_codes(df, column)
+    lookup = np.append(pd.Categorical(lowered, categories=categories).codes, -1)  # [-1] -> missing
+    return lookup[codes]
+
+def unified_sort_key(df: pd.DataFrame, by_route: bool = True) -> np.ndarray:
+    """
+    Vectorized get_unified_sort_priority for every row of df.
+
+    Args:
+        df: jobs with ai.route_type / ai.match / ai.fair_chance (missing columns count as empty)
+        by_route: include the route tier (False: quality tier 1-5 only)
+
+    Returns:
+        int8 array, lower sorts first
+    """
+    route = _category_codes(df, 'ai.route_type', ROUTE_CATEGORIES)
+    match = _category_codes(df, 'ai.match', MATCH_CATEGORIES)
+    fair_codes, fair_values = _lowered_codes(df, 'ai.fair_chance')
+    fair_lookup = np.append([_is_fair_chance(value) for value in fair_values], False).astype(bool)
+    fair = fair_lookup[fair_codes]
+
+    good, so_so = match == 0, match == 1
+    quality = np.select([good & fair, good, so_so & fair, so_so], [1, 2, 3, 4], default=5).astype(np.int8)
+    if not by_route:
+        return quality
+    route_priority = np.select([route == 0, route > 0], [0, 1], default=2).astype(np.int8)
+    return route_priority * 10 + quality
+
+def unified_sort_order(df: pd.DataFrame, by_route: bool = True, newest_first: Optional[str] = None) -> np.ndarray:
+    """
+    Stable row positions that sort df by unified_sort_key.
+
+    Args:
+        df: jobs DataFrame
+        by_route: include the route tier in the key
+        newest_first: optional timestamp column breaking ties newest first (missing values last)
+
+    Returns:
+        Positions for df.iloc[...]; rows with equal keys keep their input order
+    """
+    key = unified_sort_key(df, by_route=by_route)
+    if newest_first and newest_first in df.columns:
+        recency = df[newest_first].rank(method='dense', ascending=False, na_option='bottom').to_numpy()
+        return np.lexsort((recency, key))  # Last key is primary; lexsort is stable
+    return np.argsort(key, kind='stable')
+
 def apply_unified_sorting(df):
     """
     Apply the unified sorting to a DataFrame.
-    Returns sorted DataFrame with the _sort_priority column removed.
+    Returns a sorted copy with a fresh index; rows with equal priority keep their order.
     """
     if df is None or df.empty:
         return df
-    
-    # Apply sorting - exactly as FPDF does it
-    df_sorted = df.copy()
-    df_sorted['_sort_priority'] = df_sorted.apply(get_unified_sort_priority, axis=1)
-    df_sorted = df_sorted.sort_values('_sort_priority').drop('_sort_priority', axis=1).reset_index(drop=True)
-    
-    return df_sorted
\ No newline at end of file
+
+    return df.iloc[unified_sort_order(df)].reset_index(drop=True)
@@ -5,6 +5,11 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 
+from short_link_engine import (
+    AsyncShortLinkCreator, build_shortio_payload, get_short_link_cache, get_zapier_queue
+)
+from pipeline_performance_monitor import track_external_call
+
 load_dotenv()
 
 class LinkTracker:
@@ -106,20 +111,11 @@ class LinkTracker:
         self.zapier_webhook_url = os.getenv('ZAPIER_WEBHOOK_URL', '').strip()
 
     def _notify_zapier(self, event: str, payload: Dict[str, Any]) -> None:
-        """Best-effort Zapier notification (non-blocking)."""
+        """Best-effort Zapier notification (queued; sent by a background worker)."""
         try:
             if not getattr(self, 'zapier_webhook_url', ''):
                 return
-            body = {
-                "event": event,
-                "timestamp": datetime.utcnow().isoformat(),
-                "payload": payload,
-            }
-            # Fire-and-forget; ignore network errors
-            try:
-                requests.post(self.zapier_webhook_url, json=body, timeout=5)
-            except Exception:
-                pass
+            get_zapier_queue(self.zapier_webhook_url).enqueue(event, payload)
         except Exception:
             pass
 
@@ -377,33 +373,22 @@ class LinkTracker:
     def _create_shortio_link_internal(self, original_url: str, title: Optional[str] = None, 
                                     tags: Optional[list] = None, expires_hours: int = 0) -> Optional[str]:
         """Internal method to create Short.io links"""
-        payload = {
-            "originalURL": original_url.strip(),
-            "domain": self.domain,
-            "allowDuplicates": False  # Reuse existing short links for same URL
-        }
-        
-        # Add automatic expiration (Short.io Pro feature)
-        if expires_hours and expires_hours > 0:
-            expiration_time = datetime.now() + timedelta(hours=expires_hours)
-            expires_at = int(expiration_time.timestamp() * 1000)  # Convert to milliseconds
-            
-            payload["expiresAt"] = expires_at
-            payload["expiredURL"] = "https://freeworld.org/job-expired"  # Redirect after expiration
-            
-            self.logger.info(f"Link will expire in {expires_hours} hours: {expiration_time.isoformat()}")
+        # Identical permanent targets are answered from the local cache
+        cache = get_short_link_cache() if not expires_hours else None
+        if cache:
+            cached_url = cache.get(self.domain, original_url)
+            if cached_url:
+                return cached_url
+
+        payload = build_shortio_payload(original_url, self.domain, title, tags, expires_hours)
+        if "expiresAt" in payload:
+            self.logger.info(f"Link will expire in {expires_hours} hours: {datetime.fromtimestamp(payload['expiresAt'] / 1000).isoformat()}")
         else:
             self.logger.info("Creating permanent link with no expiration")
         
-        # Add optional metadata
-        if title:
-            payload["title"] = title[:100]  # Limit title length
-        
-        if tags:
-            payload["tags"] = tags[:5]  # Limit number of tags
-        
         try:
-            response = self.session.post(f"{self.base_url}/links", json=payload)
+            with track_external_call('shortio'):
+                response = self.session.post(f"{self.base_url}/links", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -415,21 +400,10 @@ class LinkTracker:
                     self.domain_id = data["DomainId"]
                     self.logger.info(f"Found domain ID: {self.domain_id}")
                 
-                # Log link creation for analytics
-                if self.analytics_dashboard and short_url:
-                    metadata = {
-                        "title": title,
-                        "tags": tags
-                    }
-                    self.analytics_dashboard.log_link_creation(original_url, short_url, metadata)
-                
-                # Also notify Zapier on creation
-                self._notify_zapier("shortio_created", {
-                    "short_url": short_url,
-                    "original_url": original_url,
-                    "title": title,
-                    "tags": tags or [],
-                })
+                if short_url:
+                    self._record_shortio_created(original_url, short_url, title, tags)
+                    if cache:
+                        cache.put(self.domain, original_url, short_url)
                 return short_url
             
             elif response.status_code == 409:
@@ -448,6 +422,18 @@ class LinkTracker:
         except Exception as e:
             self.logger.error(f"Unexpected error creating short link: {e}")
             return original_url
+
+    def _record_shortio_created(self, original_url: str, short_url: str, title: Optional[str] = None,
+                                tags: Optional[list] = None) -> None:
+        """Analytics log + Zapier event for a newly created Short.io link"""
+        if self.analytics_dashboard:
+            self.analytics_dashboard.log_link_creation(original_url, short_url, {"title": title, "tags": tags})
+        self._notify_zapier("shortio_created", {
+            "short_url": short_url,
+            "original_url": original_url,
+            "title": title,
+            "tags": tags or [],
+        })
     
     def _get_existing_link(self, original_url: str) -> Optional[str]:
         """
@@ -637,29 +623,85 @@ class LinkTracker:
             self.logger.error(f"Error updating short link {short_url}: {e}")
             return False
 
-    def bulk_create_links(self, urls_with_metadata: list) -> Dict[str, str]:
+    def create_short_links(self, items: List[Dict[str, Any]], concurrency: int = 8,
+                           rate_per_second: float = 5.0) -> List[str]:
         """
-        Create multiple short links in bulk for efficiency
+        Batch version of create_short_link (concurrent, rate limited, cached)
         
         Args:
-            urls_with_metadata: List of dicts with 'url', 'title', 'tags' keys
+            items: List of dicts with 'url' and optional 'title', 'tags', 'candidate_id', 'expires_hours'
+            concurrency: Max Short.io requests in flight
+            rate_per_second: Short.io request rate limit
             
         Returns:
-            Dictionary mapping original URLs to short URLs
+            Tracked URL per item in input order (original/edge URL when shortening is unavailable)
         """
-        result_map = {}
+        results: List[Optional[str]] = [None] * len(items)
+        pending = []  # (index, Short.io request, Zapier event)
         
-        # Short.io supports bulk creation but for simplicity, 
-        # we'll create links individually with error handling
-        for item in urls_with_metadata:
+        for i, item in enumerate(items):
             original_url = item.get('url')
             title = item.get('title')
-            tags = item.get('tags', [])
+            tags = list(item.get('tags') or [])
+            candidate_id = item.get('candidate_id')
+            
+            if not self.is_available and not self.use_supabase_edge_function:
+                results[i] = original_url
+                continue
+            if not original_url or not original_url.strip() or not original_url.startswith(('http://', 'https://')):
+                self.logger.warning(f"Invalid URL provided to create_short_links: {original_url}")
+                results[i] = original_url
+                continue
+            
+            if self.use_supabase_edge_function:
+                target = self.generate_edge_function_url(original_url, candidate_id, tags)
+                event = {"mode": "supabase+shortio", "original_url": original_url, "edge_url": target,
+                         "title": title, "tags": tags, "candidate_id": candidate_id}
+                if not self.api_key:
+                    results[i] = target
+                    self._notify_zapier("link_created", {**event, "mode": "supabase-edge", "short_url": target})
+                    continue
+            else:
+                # Ensure a candidate tag is present so Short.io webhook can identify the agent
+                if candidate_id and not any(str(t).startswith('candidate:') for t in tags):
+                    tags.append(f"candidate:{candidate_id}")
+                target = original_url
+                event = {"mode": "shortio", "original_url": original_url, "title": title, "tags": tags}
             
-            short_url = self.create_short_link(original_url, title, tags)
-            result_map[original_url] = short_url
+            request = {'url': target, 'title': title, 'tags': tags, 'expires_hours': item.get('expires_hours', 0)}
+            pending.append((i, request, event))
         
-        return result_map
+        if pending:
+            engine = AsyncShortLinkCreator(
+                self.api_key, self.domain, base_url=self.base_url,
+                concurrency=concurrency, rate_per_second=rate_per_second,
+                cache=get_short_link_cache(), on_created=self._record_shortio_created
+            )
+            try:
+                shorts = engine.create_links_sync([request for _, request, _ in pending])
+            except Exception as e:
+                self.logger.warning(f"Batch link creation failed: {e}")
+                shorts = [None] * len(pending)
+            self.logger.info(f"Batch link creation stats: {engine.stats}")
+            
+            for (i, request, event), short_url in zip(pending, shorts):
+                results[i] = short_url or request['url']
+                self._notify_zapier("link_created", {**event, "short_url": results[i]})
+        
+        return results
+
+    def bulk_create_links(self, urls_with_metadata: list) -> Dict[str, str]:
+        """
+        Create multiple short links in bulk for efficiency
+        
+        Args:
+            urls_with_metadata: List of dicts with 'url', 'title', 'tags' keys
+            
+        Returns:
+            Dictionary mapping original URLs to short URLs
+        """
+        short_urls = self.create_short_links(urls_with_metadata)
+        return {item.get('url'): short_url for item, short_url in zip(urls_with_metadata, short_urls)}
     
     def _validate_domain(self):
         """Validate domain by creating a test link"""
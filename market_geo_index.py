@@ -0,0 +1,259 @@
+"""
+Market Geo Index - constant-time market lookups, radius queries and fuzzy city matching
+
+MarketMapper.market_lookup is a ~1,400-entry "city, st" -> markets dict. Its
+helpers used to scan the whole dict per call (get_cities_in_market,
+search_markets) and had no notion of distance. MarketGeoIndex precomputes:
+
+- normalized city key -> markets ("Mt. Laurel Township, NJ, US" and
+  "mount laurel, nj" resolve to the same entry)
+- market -> sorted cities and the sorted market list
+- a coordinate grid (cells of GRID_CELL_DEGREES) over the bundled city table,
+  so "all cities within 50 miles of Dallas" only measures nearby cells
+- per-state name buckets for fuzzy matching of misspelled cities
+
+Coordinates come from market_geo_cities.csv (city key, lat, lon), generated
+offline by tools/build_market_geo_table.py; cities missing from it still map
+to markets, they just can't take part in radius queries.
+"""
+
+import csv
+import difflib
+import math
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MARKET_GEO_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'market_geo_cities.csv')
+GRID_CELL_DEGREES = 0.5
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+
+_WORD_REPLACEMENTS = {'mt': 'mount', 'ft': 'fort', 'st': 'saint', 'twp': 'township'}
+_CITY_NOISE = re.compile(r'^(township|city|village|borough|town) of |( township| village| borough)$')
+
+
+def normalize_location(location: str) -> str:
+    """
+    Canonical "city, st" key for a location string
+
+    Lowercases, drops a trailing country, expands Mt/Ft/St, removes
+    punctuation and "Township of"/"... Township" wrappers.
+
+    Args:
+        location: e.g. "Mt. Laurel Township, NJ, US"
+
+    Returns:
+        e.g. "mount laurel, nj" ('' for non-strings)
+    """
+    if not isinstance(location, str):
+        return ''
+    parts = [p.strip() for p in location.lower().split(',') if p.strip()]
+    if len(parts) > 2 and parts[-1] in ('us', 'usa', 'united states'):
+        parts = parts[:-1]
+    if not parts:
+        return ''
+    city = re.sub(r'[.\']', '', parts[0])
+    city = re.sub(r'[-/]', ' ', city)
+    words = [_WORD_REPLACEMENTS.get(w, w) for w in city.split()]
+    city = _CITY_NOISE.sub('', ' '.join(words)).strip()
+    if len(parts) == 1:
+        return city
+    return f"{city}, {parts[1].replace('.', '').strip()}"
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in miles"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+@lru_cache(maxsize=4)
+def load_city_coordinates(path: str = MARKET_GEO_TABLE) -> Dict[str, Tuple[float, float]]:
+    """Bundled city coordinate table (normalized city key -> (lat, lon)); {} if missing"""
+    coords = {}
+    try:
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                coords[row['city']] = (float(row['lat']), float(row['lon']))
+    except FileNotFoundError:
+        print(f"⚠️ City coordinate table not found: {path} - radius queries disabled")
+    except Exception as e:
+        print(f"⚠️ Could not load city coordinate table {path}: {e}")
+    return coords
+
+
+class MarketGeoIndex:
+    """Precomputed market maps plus a coordinate grid over mapped cities"""
+
+    def __init__(self, market_lookup: Dict[str, Sequence[str]], table_path: str = MARKET_GEO_TABLE,
+                 cell_degrees: float = GRID_CELL_DEGREES):
+        """
+        Args:
+            market_lookup: "city, st" -> markets (MarketMapper.market_lookup)
+            table_path: City coordinate CSV
+            cell_degrees: Grid cell size in degrees
+        """
+        self.cell_degrees = cell_degrees
+        self.markets_by_city: Dict[str, List[str]] = {}
+        self.raw_markets: Dict[str, List[str]] = {}
+        cities_by_market: Dict[str, set] = {}
+        for raw_key, markets in market_lookup.items():
+            self.raw_markets[raw_key.lower().strip()] = list(markets)
+            key = normalize_location(raw_key)
+            merged = self.markets_by_city.setdefault(key, [])
+            merged.extend(m for m in markets if m not in merged)
+            for market in markets:
+                cities_by_market.setdefault(market, set()).add(raw_key)
+        self.cities_by_market = {m: sorted(cities) for m, cities in cities_by_market.items()}
+        self.markets = sorted(self.cities_by_market)
+
+        coords = load_city_coordinates(table_path)
+        self.coordinates = {key: coords[key] for key in self.markets_by_city if key in coords}
+        self.grid: Dict[Tuple[int, int], List[str]] = {}
+        for key, (lat, lon) in self.coordinates.items():
+            self.grid.setdefault(self._cell(lat, lon), []).append(key)
+
+        self.names_by_state: Dict[str, List[str]] = {}
+        for key in self.markets_by_city:
+            city, _, state = key.rpartition(', ')
+            self.names_by_state.setdefault(state if city else '', []).append(city or key)
+        self._fuzzy_cache: Dict[Tuple[str, float], Optional[str]] = {}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    # Lookups
+
+    def markets_for(self, location: str, fuzzy: bool = False) -> List[str]:
+        """Markets for a location string (exact, then normalized, then optionally fuzzy)"""
+        if not isinstance(location, str):
+            return []
+        raw = self.raw_markets.get(location.lower().strip())
+        if raw is not None:
+            return list(raw)
+        key = normalize_location(location)
+        if key in self.markets_by_city:
+            return list(self.markets_by_city[key])
+        if fuzzy:
+            match = self.fuzzy_match(location)
+            if match:
+                return list(self.markets_by_city[match])
+        return []
+
+    def market_for(self, location: str, fuzzy: bool = False) -> str:
+        markets = self.markets_for(location, fuzzy=fuzzy)
+        return markets[0] if markets else ''
+
+    def cities_in_market(self, market: str) -> List[str]:
+        return list(self.cities_by_market.get(market, []))
+
+    def search_markets(self, search_term: str) -> List[str]:
+        term = (search_term or '').lower()
+        return [m for m in self.markets if term in m.lower()]
+
+    def fuzzy_match(self, location: str, cutoff: float = 0.85) -> Optional[str]:
+        """
+        Closest known city key for a misspelled location ("Dalas, TX" -> "dallas, tx")
+
+        Candidates are limited to the same state when one is given.
+
+        Returns:
+            Normalized city key, or None when nothing is close enough
+        """
+        key = normalize_location(location)
+        if not key:
+            return None
+        if key in self.markets_by_city:
+            return key
+        cache_key = (key, cutoff)
+        if cache_key not in self._fuzzy_cache:
+            city, _, state = key.rpartition(', ')
+            if not city:
+                city, state = key, None
+            match = None
+            states = [state] if state in self.names_by_state else list(self.names_by_state)
+            best = 0.0
+            for st in states:
+                for name in difflib.get_close_matches(city, self.names_by_state[st], n=1, cutoff=cutoff):
+                    score = difflib.SequenceMatcher(None, city, name).ratio()
+                    if score > best:
+                        best, match = score, (f"{name}, {st}" if st else name)
+            self._fuzzy_cache[cache_key] = match
+        return self._fuzzy_cache[cache_key]
+
+    # Geography
+
+    def coordinates_for(self, location: str) -> Optional[Tuple[float, float]]:
+        """(lat, lon) for a city, or the center of a market given by name"""
+        if not isinstance(location, str):
+            return None
+        key = normalize_location(location)
+        if key in self.coordinates:
+            return self.coordinates[key]
+        return self.market_center(location.split(',')[0].strip())
+
+    def market_center(self, market: str) -> Optional[Tuple[float, float]]:
+        """The market's namesake city if known, else the centroid of its cities"""
+        market = next((m for m in self.markets if m.lower() == (market or '').lower()), None)
+        if market is None:
+            return None
+        keys = [normalize_location(c) for c in self.cities_by_market[market]]
+        located = [k for k in keys if k in self.coordinates]
+        namesake = [k for k in located if k.rpartition(', ')[0] == normalize_location(market)]
+        if namesake:
+            return self.coordinates[namesake[0]]
+        if not located:
+            return None
+        return (sum(self.coordinates[k][0] for k in located) / len(located),
+                sum(self.coordinates[k][1] for k in located) / len(located))
+
+    def cities_within(self, center, radius_miles: float, market: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Mapped cities within a radius
+
+        Args:
+            center: Location string, market name, or (lat, lon)
+            radius_miles: Search radius
+            market: Only return cities mapped to this market
+
+        Returns:
+            [(city key, distance in miles)] nearest first ([] if the center is unknown)
+        """
+        point = center if isinstance(center, tuple) else self.coordinates_for(center)
+        if point is None:
+            return []
+        lat, lon = point
+        lat_span = radius_miles / MILES_PER_DEGREE_LAT
+        lon_span = radius_miles / (MILES_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lon_lo = self._cell(lat - lat_span, lon - lon_span)
+        lat_hi, lon_hi = self._cell(lat + lat_span, lon + lon_span)
+
+        found = []
+        for i in range(lat_lo, lat_hi + 1):
+            for j in range(lon_lo, lon_hi + 1):
+                for key in self.grid.get((i, j), ()):
+                    if market and market not in self.markets_by_city[key]:
+                        continue
+                    distance = haversine_miles(lat, lon, *self.coordinates[key])
+                    if distance <= radius_miles:
+                        found.append((key, distance))
+        return sorted(found, key=lambda item: (item[1], item[0]))
+
+
+_index: Optional[MarketGeoIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_market_geo_index() -> MarketGeoIndex:
+    """Process-wide index over the default MarketMapper lookup"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from market_mapper import MarketMapper
+            _index = MarketGeoIndex(MarketMapper().market_lookup)
+        return _index
@@ -1,7 +1,11 @@
+from market_geo_index import MarketGeoIndex
+
+
 class MarketMapper:
     """Maps cities to major metropolitan markets for job clustering"""
     
     def __init__(self):
+        self._geo_index = None
         # Comprehensive market lookup from Colab version
         self.market_lookup = {
             "acampo, ca": ["Stockton"],
@@ -1375,12 +1379,18 @@ class MarketMapper:
             "zumbro falls, mn": ['Rochester'],
 }
     
-    def map_market(self, location_string):
-        """Map a location string to its primary market"""
+    @property
+    def geo_index(self) -> MarketGeoIndex:
+        """Precomputed lookups, radius queries and fuzzy matching over market_lookup"""
+        if self._geo_index is None:
+            self._geo_index = MarketGeoIndex(self.market_lookup)
+        return self._geo_index
+    
+    def map_market(self, location_string, fuzzy=False):
+        """Map a location string to its primary market (fuzzy=True also tries close misspellings)"""
         if not isinstance(location_string, str):
             return ""
-        location_string = location_string.lower().strip()
-        return self.market_lookup.get(location_string, [""])[0]
+        return self.geo_index.market_for(location_string, fuzzy=fuzzy)
     
     def map_markets(self, df):
         """Map markets for a DataFrame of jobs"""
@@ -1388,33 +1398,36 @@ class MarketMapper:
         if not isinstance(df, pd.DataFrame):
             return df
         
-        # Add market column by mapping each location
-        df['market'] = df['location'].apply(self.map_market)
+        # Add market column by mapping each distinct location once
+        df['market'] = df['location'].map({loc: self.map_market(loc) for loc in df['location'].dropna().unique()})
+        df['market'] = df['market'].fillna("")
         return df
     
     def get_all_markets(self):
         """Get a list of all unique markets"""
-        all_markets = set()
-        for markets in self.market_lookup.values():
-            all_markets.update(markets)
-        return sorted(list(all_markets))
+        return list(self.geo_index.markets)
     
     def get_cities_in_market(self, market_name):
         """Get all cities mapped to a specific market"""
-        cities = []
-        for city, markets in self.market_lookup.items():
-            if market_name in markets:
-                cities.append(city)
-        return sorted(cities)
+        return self.geo_index.cities_in_market(market_name)
     
     def search_markets(self, search_term):
         """Search for markets containing the search term"""
-        search_term = search_term.lower()
-        matching_markets = []
-        for market in self.get_all_markets():
-            if search_term in market.lower():
-                matching_markets.append(market)
-        return sorted(matching_markets)
+        return self.geo_index.search_markets(search_term)
+    
+    def get_cities_within(self, location, radius_miles, market=None):
+        """
+        Mapped cities within a radius of a city or market
+
+        Args:
+            location: "City, ST" or a market name ("Dallas")
+            radius_miles: Search radius in miles
+            market: Only include cities mapped to this market
+
+        Returns:
+            [(city key, distance in miles)] nearest first
+        """
+        return self.geo_index.cities_within(location, radius_miles, market=market)
 
 if __name__ == "__main__":
     # Test the market mapper
@@ -1436,4 +1449,6 @@ if __name__ == "__main__":
     print(f"First 10 markets: {mapper.get_all_markets()[:10]}")
     
     print(f"\nCities in Dallas market: {len(mapper.get_cities_in_market('Dallas'))}")
+    print(f"Cities within 50 miles of Dallas: {len(mapper.get_cities_within('Dallas, TX', 50))}")
+    print(f"Fuzzy 'Pheonix, AZ' → '{mapper.map_market('Pheonix, AZ', fuzzy=True)}'")
     print(f"First 5 Dallas cities: {mapper.get_cities_in_market('Dallas')[:5]}")
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Mock Job Site Server
+Local stand-in for Indeed job pages so link checking can be exercised offline
+(tests, throughput benchmarks) with deterministic latency and verdicts:
+
+    with MockJobSiteServer({'abc': 'active', 'def': 'expired'}, latency=0.05) as site:
+        checker.check_multiple_links([site.job_url('abc'), site.job_url('def', host='localhost')])
+
+GET/HEAD /viewjob?jk=<key> answers according to the key's state:
+    active    200 with an apply button
+    expired   200 with an "this job has expired" page
+    missing   404        removed   410        error   500
+Unknown keys are 404. head_allowed=False answers HEAD with 405 (GET fallback).
+The same server is reachable as 127.0.0.1 and localhost, which gives tests two
+distinct hosts for per-host limits. Every request is recorded with its host,
+method and start time, and the peak number of in-flight requests per host is
+tracked.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+PAGES = {
+    'active': (200, '<html><h1>CDL-A Driver</h1><div>Job description</div><button>Apply now</button></html>'),
+    'expired': (200, '<html><h1>Sorry, this job is no longer available</h1></html>'),
+    'missing': (404, '<html>Page not found</html>'),
+    'removed': (410, '<html>Gone</html>'),
+    'error': (500, '<html>Internal error</html>'),
+    'challenge': (200, '<html><h1>Verifying you are human</h1></html>'),  # Bot check: no job markup
+}
+
+
+class MockJobSiteServer:
+    """aiohttp server on a background thread serving fake job pages"""
+
+    def __init__(self, jobs: Optional[Dict[str, str]] = None, latency: float = 0.0, port: int = 0,
+                 head_allowed: bool = True):
+        """
+        Args:
+            jobs: job key -> state (active, expired, missing, removed, error)
+            latency: seconds to sleep before answering each request
+            port: port to bind (0 = any free port)
+            head_allowed: False answers HEAD with 405 Method Not Allowed
+        """
+        self.jobs: Dict[str, str] = dict(jobs or {})
+        self.latency = latency
+        self.port = port
+        self.head_allowed = head_allowed
+        self.requests: List[Dict] = []
+        self.peak_in_flight: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    def job_url(self, job_key: str, host: str = '127.0.0.1') -> str:
+        return f"http://{host}:{self.port}/viewjob?jk={job_key}"
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = []
+            self.peak_in_flight = {}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        host = request.host.split(':')[0]
+        with self._lock:
+            self.requests.append({'method': request.method, 'host': host,
+                                  'job_key': request.query.get('jk'), 'started': time.monotonic()})
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+            self.peak_in_flight[host] = max(self.peak_in_flight.get(host, 0), self._in_flight[host])
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if request.method == 'HEAD' and not self.head_allowed:
+                return web.Response(status=405)
+            status, body = PAGES.get(self.jobs.get(request.query.get('jk', '')), PAGES['missing'])
+            if request.method == 'HEAD':
+                return web.Response(status=status, content_type='text/html')
+            return web.Response(text=body, status=status, content_type='text/html')
+        finally:
+            with self._lock:
+                self._in_flight[host] -= 1
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        app = web.Application()
+        app.router.add_route('*', '/viewjob', self._handle)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> str:
+        """Start serving; returns the base URL"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Mock job site server failed to start")
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    server = MockJobSiteServer({'active1': 'active', 'expired1': 'expired'})
+    print(f"🧪 Mock job site listening at {server.start()}/viewjob?jk=active1")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
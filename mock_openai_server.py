@@ -0,0 +1,212 @@
+"""
+Mock OpenAI Chat Completions Server
+Local stand-in for POST /v1/chat/completions so the classifiers can be exercised
+offline (tests, benchmarks). Point a classifier at it with:
+
+    with MockOpenAIServer() as server:
+        os.environ['OPENAI_BASE_URL'] = server.base_url
+        JobClassifier().classify_jobs_in_batches(jobs)
+
+Responses are deterministic: every property of the request's json_schema is
+filled from a simple keyword rule set, so the same job content always gets the
+same verdict. Packed requests (a "results" array schema) get one answer per
+"Job ID:" block of the user message.
+
+max_concurrency emulates a rate limit: requests arriving while that many are
+already in flight get a 429 (with Retry-After when retry_after is set).
+Client connections are counted by peer address, so connection reuse across
+batches is visible in `connections`.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from aiohttp import web
+
+_JOB_ID_RE = re.compile(r'Job ID:\s*(\S+)')
+
+
+def default_classification(content: str, schema: Dict) -> Dict:
+    """Fill every schema property for one job from keyword rules"""
+    text = content.lower()
+    job_id_match = _JOB_ID_RE.search(content)
+
+    if 'owner operator' in text or 'owner-operator' in text or 'years experience' in text:
+        match = 'bad'
+    elif 'no experience' in text or 'training provided' in text:
+        match = 'good'
+    else:
+        match = 'so-so'
+
+    result = {}
+    for name, spec in schema.get('properties', {}).items():
+        enum = spec.get('enum')
+        if name == 'job_id':
+            result[name] = job_id_match.group(1) if job_id_match else ''
+        elif name == 'match' and enum and match in enum:
+            result[name] = match
+        elif name == 'training_provided':
+            result[name] = 'training provided' in text
+        elif enum:
+            result[name] = enum[-1] if name == 'route_type' else enum[0]
+        elif spec.get('type') == 'boolean':
+            result[name] = False
+        elif spec.get('type') == 'array':
+            result[name] = []
+        else:
+            result[name] = f"mock {name}"
+    return result
+
+
+def default_packed_classification(content: str, schema: Dict) -> Dict:
+    """Answer a packed request ({"results": [...]}): one classification per "Job ID:" block"""
+    starts = [m.start() for m in _JOB_ID_RE.finditer(content)] + [len(content)]
+    item_schema = schema['properties']['results']['items']
+    return {'results': [default_classification(content[a:b], item_schema) for a, b in zip(starts, starts[1:])]}
+
+
+class MockOpenAIServer:
+    """aiohttp server on a background thread answering chat completion calls"""
+
+    def __init__(self, responder: Optional[Callable[[Dict], Dict]] = None, latency: float = 0.0,
+                 status_script: Optional[List[int]] = None, max_concurrency: Optional[int] = None,
+                 retry_after: Optional[float] = None, port: int = 0):
+        """
+        Args:
+            responder: payload -> parsed JSON answer (defaults to default_classification)
+            latency: seconds to sleep before answering each request
+            status_script: HTTP statuses returned (in order) before normal answers, e.g. [429, 429]
+            max_concurrency: answer 429 to requests beyond this many in flight
+            retry_after: Retry-After seconds sent with capacity 429s
+            port: port to bind (0 = any free port)
+        """
+        self.responder = responder
+        self.latency = latency
+        self.status_script = list(status_script or [])
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+        self.port = port
+        self.requests: List[Dict] = []
+        self.max_in_flight = 0
+        self.throttled = 0
+        self.connections = set()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _handle_chat(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        with self._lock:
+            self.requests.append(payload)
+            self.connections.add(request.transport.get_extra_info('peername'))
+            scripted_status = self.status_script.pop(0) if self.status_script else None
+            over_capacity = self.max_concurrency is not None and self._in_flight >= self.max_concurrency
+            if over_capacity:
+                self.throttled += 1
+            else:
+                self._in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        if over_capacity:
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else None
+            return web.json_response({'error': {'message': 'Rate limit reached'}}, status=429, headers=headers)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if scripted_status and scripted_status != 200:
+                return web.json_response({'error': {'message': 'scripted failure'}}, status=scripted_status)
+
+            if self.responder:
+                answer = self.responder(payload)
+            else:
+                user_content = next((m['content'] for m in payload.get('messages', []) if m.get('role') == 'user'), '')
+                schema = payload.get('response_format', {}).get('json_schema', {}).get('schema', {})
+                if 'results' in schema.get('properties', {}):
+                    answer = default_packed_classification(user_content, schema)
+                else:
+                    answer = default_classification(user_content, schema)
+
+            prompt_chars = sum(len(m.get('content', '')) for m in payload.get('messages', []))
+            content = json.dumps(answer)
+            return web.json_response({
+                'id': f"chatcmpl-mock-{self.request_count}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': payload.get('model', 'mock'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': content},
+                    'finish_reason': 'stop',
+                }],
+                'usage': {
+                    'prompt_tokens': prompt_chars // 4,
+                    'completion_tokens': len(content) // 4,
+                    'total_tokens': (prompt_chars + len(content)) // 4,
+                },
+            })
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', self._handle_chat)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> str:
+        """Start serving; returns the base URL (use as OPENAI_BASE_URL)"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Mock OpenAI server failed to start")
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    server = MockOpenAIServer()
+    print(f"🧪 Mock OpenAI server listening at {server.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,177 @@
+"""
+Mock Outscraper Server
+Local stand-in for the Outscraper Indeed API so ingestion can be exercised
+offline (tests, throughput/latency benchmarks) with deterministic timings:
+
+    with MockOutscraperServer(processing_time=0.5) as server:
+        client = OutscraperAsyncClient('key', base_url=server.base_url)
+
+GET /indeed-search?query=<url>&limit=N
+    async=false   waits processing_time per query (Outscraper works through a
+                  query list back to back) and answers {"data": [[jobs], ...]}
+    async=true    answers {"id", "status": "Pending"} at once; the request
+                  completes processing_time later
+GET /requests/{id}
+    {"status": "Pending"} until done, then {"status": "Success", "data": [[jobs]]}
+    (or "Error" for queries listed in fail_queries)
+
+on_complete(request_id, payload) is called when an async request finishes, the
+way Outscraper POSTs to a webhook. Jobs are generated per query (stable keys,
+Indeed field names). Every request is recorded with its path and time, and the
+peak number of async requests processing at once is tracked.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from aiohttp import web
+
+
+def fake_indeed_jobs(query: str, count: int) -> List[Dict]:
+    """Deterministic Indeed-style job rows for a query URL"""
+    digest = hashlib.md5(query.encode()).hexdigest()[:8]
+    return [{
+        'jobkey': f'{digest}{i:05d}',
+        'title': f'CDL-A Driver {digest}-{i}',
+        'company': f'Carrier {i % 17}',
+        'formattedLocation': 'Houston, TX',
+        'snippet': 'Home daily. $28/hour. Paid CDL training available.',
+        'viewJobLink': f'https://www.indeed.com/viewjob?jk={digest}{i:05d}',
+        'salarySnippet': {'text': '$28 an hour'},
+    } for i in range(count)]
+
+
+class MockOutscraperServer:
+    """aiohttp server on a background thread emulating Outscraper's sync and async Indeed search"""
+
+    def __init__(self, processing_time: float = 0.2, jobs_per_query: Optional[int] = None, latency: float = 0.0,
+                 fail_queries: Optional[set] = None, on_complete: Optional[Callable] = None, port: int = 0):
+        """
+        Args:
+            processing_time: seconds Outscraper spends scraping one query
+            jobs_per_query: jobs returned per query (default: the requested limit)
+            latency: seconds added to every HTTP response
+            fail_queries: query URLs whose async request ends with status "Error"
+            on_complete: webhook stand-in, called as on_complete(request_id, payload)
+            port: port to bind (0 = any free port)
+        """
+        self.processing_time = processing_time
+        self.jobs_per_query = jobs_per_query
+        self.latency = latency
+        self.fail_queries = set(fail_queries or ())
+        self.on_complete = on_complete
+        self.port = port
+        self.requests: List[Dict] = []
+        self.async_requests: Dict[str, Dict] = {}
+        self.peak_processing = 0
+        self._processing = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    def count(self, path_prefix: str) -> int:
+        return sum(1 for r in self.requests if r['path'].startswith(path_prefix))
+
+    def _jobs_for(self, query: str, limit: int) -> List[Dict]:
+        return fake_indeed_jobs(query, self.jobs_per_query if self.jobs_per_query is not None else limit)
+
+    async def _search(self, request: web.Request) -> web.Response:
+        self._record(request)
+        queries = request.query.getall('query', [])
+        limit = int(request.query.get('limit', 10))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.query.get('async', 'true').lower() == 'false':
+            await asyncio.sleep(self.processing_time * len(queries))
+            return web.json_response({'data': [self._jobs_for(q, limit) for q in queries]})
+
+        request_id = uuid.uuid4().hex
+        entry = {'id': request_id, 'status': 'Pending', 'queries': queries, 'limit': limit}
+        with self._lock:
+            self.async_requests[request_id] = entry
+        asyncio.get_running_loop().create_task(self._process(entry))
+        return web.json_response({'id': request_id, 'status': 'Pending',
+                                  'results_location': f'{self.base_url}/requests/{request_id}'})
+
+    async def _process(self, entry: Dict) -> None:
+        with self._lock:
+            self._processing += 1
+            self.peak_processing = max(self.peak_processing, self._processing)
+        try:
+            await asyncio.sleep(self.processing_time * len(entry['queries']))
+            if any(q in self.fail_queries for q in entry['queries']):
+                entry.update(status='Error', error='Scraping failed')
+            else:
+                entry.update(status='Success', data=[self._jobs_for(q, entry['limit']) for q in entry['queries']])
+        finally:
+            with self._lock:
+                self._processing -= 1
+        if self.on_complete:
+            self.on_complete(entry['id'], {k: v for k, v in entry.items() if k != 'queries'})
+
+    async def _result(self, request: web.Request) -> web.Response:
+        self._record(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        entry = self.async_requests.get(request.match_info['request_id'])
+        if entry is None:
+            return web.json_response({'error': 'Request not found'}, status=404)
+        return web.json_response({k: v for k, v in entry.items() if k not in ('queries', 'limit')})
+
+    def _record(self, request: web.Request) -> None:
+        with self._lock:
+            self.requests.append({'path': request.path, 'query': dict(request.query), 'at': time.monotonic()})
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        app = web.Application()
+        app.router.add_get('/indeed-search', self._search)
+        app.router.add_get('/requests/{request_id}', self._result)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> str:
+        """Start serving; returns the base URL (use as the Outscraper API base)"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Mock Outscraper server failed to start")
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -0,0 +1,436 @@
+"""
+Mock PostgREST Server
+Local stand-in for Supabase's REST API (/rest/v1/{table}) so Supabase-backed code
+can be exercised offline (tests, benchmarks) with the real supabase-py client:
+
+    with MockPostgrestServer({'jobs': rows, 'job_feedback': feedback}) as server:
+        client = server.client()
+        client.table('jobs').select('*').eq('market', 'Houston').execute()
+
+Supports select/HEAD with column projection, the common filters (eq, neq, gt,
+gte, lt, lte, like, ilike, is, in, not.*), or=/and= groups, order, limit/offset,
+Prefer count=exact (Content-Range), POST insert/upsert, PATCH and DELETE, and
+POST /rpc/{function} for functions registered in rpc_functions (unknown functions
+answer PGRST202 like a real project without the function).
+max_rows emulates PostgREST's db-max-rows cap on responses, max_body_bytes the
+gateway's request size limit (413), and, like Postgres text columns, writes
+containing NUL characters are rejected (22P05).
+Every request is recorded with its response size, so benchmarks can report
+round-trips and bytes transferred.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+# A syntactically valid JWT; supabase-py only checks the shape of the key
+MOCK_ANON_KEY = 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.bW9jaw'
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not inside parentheses or double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append(''.join(current))
+    return parts
+
+
+def _unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+def _coerce_pair(row_value: Any, raw: str):
+    """Bring a row value and a URL value to comparable types"""
+    if isinstance(row_value, bool):
+        return row_value, raw.lower() == 'true'
+    if isinstance(row_value, (int, float)):
+        try:
+            return row_value, float(raw)
+        except ValueError:
+            return str(row_value), raw
+    text = '' if row_value is None else str(row_value)
+    try:
+        return _as_utc(text), _as_utc(raw)
+    except (ValueError, TypeError):
+        return text, raw
+
+
+@lru_cache(maxsize=200_000)
+def _as_utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=1024)
+def _in_values(raw: str) -> frozenset:
+    """Parse an in.(a,b,"c,d") list once per distinct filter"""
+    return frozenset(_unquote(v) for v in _split_top_level(raw.strip()[1:-1])) if raw.strip() else frozenset()
+
+
+def _looks_like_datetime(value: str) -> bool:
+    try:
+        _as_utc(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def _like(pattern: str, value: Any, flags: int = 0) -> bool:
+    if value is None:
+        return False
+    regex = '^' + '.*'.join(re.escape(part) for part in re.split(r'[*%]', pattern)) + '$'
+    return re.match(regex, str(value), flags | re.DOTALL) is not None
+
+
+def _compare(row_value: Any, op: str, raw: str) -> bool:
+    if op == 'is':
+        target = {'null': None, 'true': True, 'false': False}.get(raw.lower(), raw)
+        return row_value is target if target is None or isinstance(target, bool) else row_value == target
+    if op == 'in':
+        values = _in_values(raw)
+        if row_value is None:
+            return False
+        if isinstance(row_value, str) and not _looks_like_datetime(row_value):
+            return row_value in values
+        return any(_compare(row_value, 'eq', v) for v in values)
+    if op == 'like':
+        return _like(raw, row_value)
+    if op == 'ilike':
+        return _like(raw, row_value, re.IGNORECASE)
+    if row_value is None:
+        return False
+    try:
+        left, right = _coerce_pair(row_value, _unquote(raw))
+        if op == 'eq':
+            return left == right
+        if op == 'neq':
+            return left != right
+        if op == 'gt':
+            return left > right
+        if op == 'gte':
+            return left >= right
+        if op == 'lt':
+            return left < right
+        if op == 'lte':
+            return left <= right
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+def _filter_matches(row: Dict, column: str, expr: str) -> bool:
+    """column + 'op.value' / 'not.op.value'"""
+    negate = expr.startswith('not.')
+    if negate:
+        expr = expr[4:]
+    op, _, raw = expr.partition('.')
+    result = _compare(row.get(column), op, raw)
+    return not result if negate else result
+
+
+def _logic_matches(row: Dict, kind: str, body: str) -> bool:
+    """Evaluate an or(...)/and(...) group"""
+    results = (_condition_matches(row, part) for part in _split_top_level(body))
+    return any(results) if kind == 'or' else all(results)
+
+
+def _condition_matches(row: Dict, condition: str) -> bool:
+    condition = condition.strip()
+    negate = condition.startswith('not.') and condition[4:].startswith(('or(', 'and('))
+    if negate:
+        condition = condition[4:]
+    for kind in ('or', 'and'):
+        if condition.startswith(f'{kind}(') and condition.endswith(')'):
+            result = _logic_matches(row, kind, condition[len(kind) + 1:-1])
+            return not result if negate else result
+    column, _, expr = condition.partition('.')
+    return _filter_matches(row, column, expr)
+
+
+def _row_matches(row: Dict, filters: List[tuple]) -> bool:
+    for key, value in filters:
+        if key in ('or', 'and', 'not.or', 'not.and'):
+            negate = key.startswith('not.')
+            result = _logic_matches(row, key.split('.')[-1], value.strip()[1:-1])
+            if result == negate:
+                return False
+        elif not _filter_matches(row, key, value):
+            return False
+    return True
+
+
+class MockPostgrestServer:
+    """aiohttp server on a background thread serving in-memory tables over PostgREST"""
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict]]] = None, latency: float = 0.0, port: int = 0,
+                 max_rows: Optional[int] = None, rpc_functions: Optional[Dict[str, Callable]] = None,
+                 max_body_bytes: Optional[int] = None):
+        """
+        Args:
+            tables: table name -> list of row dicts (mutated by writes)
+            latency: seconds to sleep before answering each request
+            port: port to bind (0 = any free port)
+            max_rows: cap on rows per response (Supabase defaults to 1000)
+            rpc_functions: function name -> handler(server, params) returning the JSON result
+            max_body_bytes: reject larger request bodies with 413
+        """
+        self.tables: Dict[str, List[Dict]] = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.latency = latency
+        self.max_rows = max_rows
+        self.rpc_functions = dict(rpc_functions or {})
+        self.max_body_bytes = max_body_bytes
+        self.port = port
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(r['bytes'] for r in self.requests)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def client(self):
+        """supabase-py client pointed at this server"""
+        from supabase import create_client
+        return create_client(self.base_url, MOCK_ANON_KEY)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = []
+
+    def _select(self, table: str, params) -> tuple:
+        filters = [(k, v) for k, v in params.items() if k not in RESERVED_PARAMS]
+        rows = [row for row in self.tables.get(table, []) if _row_matches(row, filters)]
+
+        for spec in reversed([s for s in params.get('order', '').split(',') if s]):
+            parts = spec.split('.')
+            column, desc = parts[0], 'desc' in parts[1:]
+            rows.sort(key=lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else ''),
+                      reverse=desc)
+
+        total = len(rows)
+        offset = int(params.get('offset', 0))
+        limit = params.get('limit')
+        rows = rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+        if self.max_rows is not None:
+            rows = rows[:self.max_rows]
+
+        select = params.get('select', '*')
+        if select and select != '*':
+            columns = [c.strip() for c in select.split(',') if c.strip()]
+            rows = [{c: row.get(c) for c in columns} for row in rows]
+        return rows, total, offset
+
+    def _write(self, method: str, table: str, params, prefer: str, body: Any) -> List[Dict]:
+        rows = self.tables.setdefault(table, [])
+        filters = [(k, v) for k, v in params.items() if k not in RESERVED_PARAMS]
+        if method == 'DELETE':
+            removed = [row for row in rows if _row_matches(row, filters)]
+            self.tables[table] = [row for row in rows if not _row_matches(row, filters)]
+            return removed
+        if method == 'PATCH':
+            updated = [row for row in rows if _row_matches(row, filters)]
+            for row in updated:
+                row.update(body or {})
+            return updated
+
+        records = body if isinstance(body, list) else [body]
+        # PostgREST resolves upserts on the primary key unless on_conflict is given
+        conflict = [c for c in params.get('on_conflict', '').split(',') if c] or ['id']
+        merge = 'merge-duplicates' in prefer
+        key_of = lambda row: tuple(row.get(c) for c in conflict)
+        by_key = {key_of(row): row for row in rows} if merge else {}
+        written = []
+        for record in records:
+            existing = by_key.get(key_of(record))
+            if existing is not None:
+                existing.update(record)
+                written.append(existing)
+            else:
+                row = dict(record)
+                row.setdefault('id', len(rows) + 1)
+                rows.append(row)
+                if merge:
+                    by_key.setdefault(key_of(row), row)
+                written.append(row)
+        return written
+
+    def _record(self, method: str, table: str, params, text: str) -> None:
+        with self._lock:
+            self.requests.append({
+                'method': method,
+                'table': table,
+                'params': list(params.items()),
+                'bytes': len(text.encode('utf-8')),
+            })
+
+    @staticmethod
+    def _error(status: int, code: str, message: str) -> web.Response:
+        body = {'code': code, 'message': message, 'details': None, 'hint': None}
+        return web.json_response(body, status=status)
+
+    async def _read_body(self, request: web.Request):
+        """(body, error response) for a write request"""
+        if not request.can_read_body:
+            return None, None
+        raw = await request.read()
+        if self.max_body_bytes is not None and len(raw) > self.max_body_bytes:
+            return None, web.Response(status=413, text='Request Entity Too Large')
+        if b'\\u0000' in raw:
+            return None, self._error(400, '22P05', 'unsupported Unicode escape sequence')
+        return json.loads(raw), None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        table = request.match_info['table']
+        params = request.rel_url.query
+        prefer = request.headers.get('Prefer', '')
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        headers = {}
+        status = 200
+        body, error = await self._read_body(request)
+        if error is not None:
+            self._record(request.method, table, params, '')
+            return error
+        with self._lock:
+            if request.method in ('GET', 'HEAD'):
+                rows, total, offset = self._select(table, params)
+                end = offset + len(rows) - 1 if rows else offset
+                headers['Content-Range'] = f"{offset}-{end}/{total if 'count=' in prefer else '*'}"
+                payload = rows
+            else:
+                payload = self._write(request.method, table, params, prefer, body)
+                status = 201 if request.method == 'POST' else 200
+                if 'return=representation' not in prefer:
+                    payload, status = None, (201 if request.method == 'POST' else 204)
+
+        text = '' if payload is None or request.method == 'HEAD' else json.dumps(payload, default=str)
+        self._record(request.method, table, params, text)
+        if status == 204:
+            return web.Response(status=204, headers=headers)
+        return web.Response(text=text, status=status, headers=headers, content_type='application/json')
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        name = request.match_info['function']
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        body, error = await self._read_body(request)
+        if error is None and name not in self.rpc_functions:
+            error = self._error(404, 'PGRST202', f"Could not find the function public.{name} in the schema cache")
+        if error is not None:
+            self._record('POST', f'rpc/{name}', request.rel_url.query, '')
+            return error
+        try:
+            with self._lock:
+                result = self.rpc_functions[name](self, body or {})
+        except Exception as e:
+            self._record('POST', f'rpc/{name}', request.rel_url.query, '')
+            return self._error(400, 'P0001', str(e))
+        text = json.dumps(result, default=str)
+        self._record('POST', f'rpc/{name}', request.rel_url.query, text)
+        return web.Response(text=text, content_type='application/json')
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        app = web.Application()
+        app.router.add_route('POST', '/rest/v1/rpc/{function}', self._handle_rpc)
+        app.router.add_route('*', '/rest/v1/{table}', self._handle)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> str:
+        """Start serving; returns the base URL (use as SUPABASE_URL)"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Mock PostgREST server failed to start")
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    server = MockPostgrestServer()
+    print(f"🧪 Mock PostgREST server listening at {server.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+def upsert_rows_rpc(table: str, key: str, param: str) -> Callable:
+    """
+    RPC handler that upserts the rows passed in `param` into `table` on `key` and
+    returns how many it wrote, like a batch-insert-with-dedup database function
+
+        MockPostgrestServer(rpc_functions={
+            'batch_insert_jobs_with_dedup': upsert_rows_rpc('jobs', 'job_id', 'p_jobs_data')})
+    """
+    def handler(server: MockPostgrestServer, params: Dict) -> int:
+        rows = server.tables.setdefault(table, [])
+        by_key = {row.get(key): row for row in rows}
+        records = params.get(param) or []
+        for record in records:
+            if record.get(key) in by_key:
+                by_key[record.get(key)].update(record)
+            else:
+                row = dict(record)
+                rows.append(row)
+                by_key[row.get(key)] = row
+        return len(records)
+    return handler
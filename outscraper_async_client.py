@@ -0,0 +1,335 @@
+"""
+Async Outscraper Ingestion Client
+Submits Indeed searches to Outscraper in async mode and collects the results
+concurrently instead of holding one synchronous request open for every query.
+
+Each query (one search term in one location) becomes its own async request:
+submit with async=true, then wait for completion by polling
+/requests/{id} with exponential backoff, or by a webhook completion handed
+to notify_complete(). At most max_concurrent requests are in flight at once
+(Outscraper bills and throttles per running task), and each finished page is
+handed on immediately, so ingest_indeed() transforms the first query's jobs
+while the others are still scraping.
+
+A failed query (status Error, timeout, HTTP error) yields an empty page, is
+counted in stats['failed'] and listed in stats['failed_queries']; it never
+fails the other queries. Callers retry the listed queries synchronously.
+
+Environment:
+    FREEWORLD_OUTSCRAPER_ASYNC=off          use the legacy single synchronous request
+    FREEWORLD_OUTSCRAPER_CONCURRENCY=4      async requests in flight at once
+"""
+
+import asyncio
+import contextvars
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import aiohttp
+except ImportError:  # Callers fall back to the synchronous request
+    aiohttp = None
+
+from async_runner import run_coroutine_sync
+from pipeline_performance_monitor import record_external_call
+
+OUTSCRAPER_API = 'https://api.outscraper.cloud'
+DEFAULT_CONCURRENCY = 4
+NO_EXPERIENCE_FILTER = '&sc=0kf%3Aattr%28D7S5D%29%3B'
+PENDING_STATUSES = ('Pending', 'In Progress')
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def async_ingest_enabled() -> bool:
+    """True unless FREEWORLD_OUTSCRAPER_ASYNC is off (or aiohttp is missing)"""
+    if aiohttp is None:
+        return False
+    return os.getenv('FREEWORLD_OUTSCRAPER_ASYNC', '').lower() not in ('off', '0', 'false')
+
+
+def indeed_search_url(term: str, location: str, radius: int = 50, no_experience: bool = False) -> str:
+    """Indeed search URL in the form the pipeline sends to Outscraper"""
+    encoded_location = location.replace(' ', '+').replace(',', '%2C')
+    url = f"https://www.indeed.com/jobs?q={term.strip().replace(' ', '+')}&l={encoded_location}&radius={int(radius)}"
+    return url + NO_EXPERIENCE_FILTER if no_experience else url
+
+
+def indeed_queries(terms: List[str], locations: List[str], radius: int = 50, no_experience: bool = False) -> List[str]:
+    """One search URL per term × location combination (locations outer, terms inner)"""
+    return [indeed_search_url(term, location, radius, no_experience)
+            for location, term in itertools.product(locations, terms)]
+
+
+class OutscraperRequestError(Exception):
+    """An async Outscraper request that could not be submitted or did not succeed"""
+
+
+class OutscraperAsyncClient:
+    """Concurrent async-mode Indeed searches against the Outscraper API"""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = OUTSCRAPER_API,
+                 max_concurrent: Optional[int] = None, poll_initial: float = 2.0, poll_max: float = 30.0,
+                 poll_factor: float = 2.0, job_timeout: float = 900.0, request_timeout: float = 60.0,
+                 webhook_url: Optional[str] = None, max_retries: int = 3):
+        """
+        Args:
+            api_key: Outscraper API key (default: OUTSCRAPER_API_KEY)
+            base_url: API base URL (a MockOutscraperServer URL in tests)
+            max_concurrent: async requests in flight at once (default: FREEWORLD_OUTSCRAPER_CONCURRENCY)
+            poll_initial: first delay before polling a submitted request
+            poll_max: cap on the delay between polls
+            poll_factor: backoff multiplier between polls
+            job_timeout: seconds to wait for one request before giving up on it
+            request_timeout: seconds for a single HTTP call
+            webhook_url: sent with each submission; completions then arrive through
+                notify_complete() and polling only runs at poll_max as a safety net
+            max_retries: retries for a submission answered 429/5xx
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async Outscraper ingestion")
+        self.api_key = api_key or os.getenv('OUTSCRAPER_API_KEY')
+        if not self.api_key:
+            raise ValueError("OUTSCRAPER_API_KEY environment variable not set")
+        self.base_url = base_url.rstrip('/')
+        if max_concurrent is None:
+            try:
+                max_concurrent = int(os.getenv('FREEWORLD_OUTSCRAPER_CONCURRENCY', DEFAULT_CONCURRENCY))
+            except ValueError:
+                max_concurrent = DEFAULT_CONCURRENCY
+        self.max_concurrent = max(1, max_concurrent)
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.job_timeout = job_timeout
+        self.request_timeout = request_timeout
+        self.webhook_url = webhook_url
+        self.max_retries = max_retries
+        self._waiters: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._early: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict:
+        return {'queries': 0, 'submitted': 0, 'polls': 0, 'webhook_completions': 0, 'retries': 0,
+                'failed': 0, 'failed_queries': [], 'jobs': 0, 'seconds': 0.0, 'first_page_seconds': None}
+
+    # --- Webhook path -------------------------------------------------------
+
+    def notify_complete(self, request_id: str, payload: Dict) -> None:
+        """
+        Hand a webhook completion to the request waiting on it (thread-safe).
+
+        Args:
+            request_id: Outscraper request id from the webhook payload
+            payload: webhook body (status, and data when Outscraper includes it)
+        """
+        with self._lock:
+            waiter = self._waiters.get(request_id)
+            if waiter is None:
+                # Completion raced ahead of the submit response
+                self._early[request_id] = payload
+                return
+        loop, future = waiter
+        loop.call_soon_threadsafe(lambda: future.done() or future.set_result(payload))
+
+    # --- HTTP ---------------------------------------------------------------
+
+    async def _get_json(self, session, url: str, params: Optional[Dict] = None) -> Tuple[int, Dict]:
+        start = time.time()
+        try:
+            async with session.get(url, params=params) as response:
+                try:
+                    body = await response.json(content_type=None)
+                except Exception:
+                    body = {'error': (await response.text())[:500]}
+        except Exception:
+            record_external_call('outscraper', time.time() - start, error=True)
+            raise
+        record_external_call('outscraper', time.time() - start, error=response.status != 200)
+        return response.status, body if isinstance(body, dict) else {'data': body}
+
+    async def _submit(self, session, query: str, limit: int) -> str:
+        params = {'query': query, 'limit': str(limit), 'async': 'true'}
+        if self.webhook_url:
+            params['webhook'] = self.webhook_url
+        delay = self.poll_initial
+        for attempt in range(self.max_retries + 1):
+            status, body = await self._get_json(session, f"{self.base_url}/indeed-search", params)
+            if status in RETRY_STATUSES and attempt < self.max_retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * self.poll_factor, self.poll_max)
+                continue
+            request_id = body.get('id') or body.get('request_id')
+            if status not in (200, 202) or not request_id:
+                raise OutscraperRequestError(f"submit failed ({status}): {body.get('error') or body}")
+            self.stats['submitted'] += 1
+            return request_id
+        raise OutscraperRequestError("submit retries exhausted")
+
+    async def _poll(self, session, request_id: str) -> Dict:
+        self.stats['polls'] += 1
+        status, body = await self._get_json(session, f"{self.base_url}/requests/{request_id}")
+        if status in RETRY_STATUSES:
+            return {'status': 'Pending'}
+        if status != 200:
+            raise OutscraperRequestError(f"poll failed ({status}): {body.get('error') or body}")
+        return body
+
+    async def _wait(self, session, request_id: str) -> List:
+        """Wait for a submitted request (webhook or backoff polling) and return its data"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            early = self._early.pop(request_id, None)
+            self._waiters[request_id] = (loop, future)
+        if early is not None:
+            future.set_result(early)
+
+        deadline = loop.time() + self.job_timeout
+        delay = self.poll_max if self.webhook_url else self.poll_initial
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise OutscraperRequestError(f"request {request_id} timed out after {self.job_timeout:.0f}s")
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(future), timeout=min(delay, remaining))
+                    self.stats['webhook_completions'] += 1
+                    if result.get('status') == 'Success' and 'data' not in result:
+                        result = await self._poll(session, request_id)  # Webhook without results inline
+                    future = loop.create_future()
+                    with self._lock:
+                        self._waiters[request_id] = (loop, future)
+                except asyncio.TimeoutError:
+                    result = await self._poll(session, request_id)
+                    delay = min(delay * self.poll_factor, self.poll_max)
+
+                status = result.get('status')
+                if status == 'Success':
+                    return result.get('data') or []
+                if status not in PENDING_STATUSES:
+                    raise OutscraperRequestError(f"request {request_id} ended with status {status}: "
+                                                 f"{result.get('error', '')}")
+        finally:
+            with self._lock:
+                self._waiters.pop(request_id, None)
+
+    async def _run_query(self, session, budget: asyncio.Semaphore, query: str, limit: int) -> List[Dict]:
+        async with budget:
+            request_id = await self._submit(session, query, limit)
+            data = await self._wait(session, request_id)
+        # data is one list of jobs per query in the request (one here)
+        jobs = []
+        for page in data:
+            jobs.extend(page if isinstance(page, list) else [page])
+        return jobs
+
+    # --- Fan-out ------------------------------------------------------------
+
+    async def fetch_pages(self, queries: List[str], limit: int,
+                          on_page: Optional[Callable[[int, List[Dict]], object]] = None) -> List[List[Dict]]:
+        """
+        Run every query as its own async request, max_concurrent at a time.
+
+        Args:
+            queries: Indeed search URLs
+            limit: jobs requested per query
+            on_page: called as on_page(query_index, jobs) the moment a query
+                finishes (may be a coroutine function)
+
+        Returns:
+            One list of raw jobs per query, in query order ([] for failed queries,
+            which are listed in stats['failed_queries'])
+        """
+        self.stats = self._new_stats()
+        self.stats['queries'] = len(queries)
+        start = time.perf_counter()
+        budget = asyncio.Semaphore(self.max_concurrent)
+        pages: List[List[Dict]] = [[] for _ in queries]
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+
+        async with aiohttp.ClientSession(headers={'X-API-KEY': self.api_key}, timeout=timeout) as session:
+            async def one(index: int, query: str) -> None:
+                try:
+                    jobs = await self._run_query(session, budget, query, limit)
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    self.stats['failed_queries'].append(query)
+                    print(f"   ❌ Query {index + 1} failed: {e}")
+                    return
+                pages[index] = jobs
+                self.stats['jobs'] += len(jobs)
+                if self.stats['first_page_seconds'] is None:
+                    self.stats['first_page_seconds'] = time.perf_counter() - start
+                print(f"   Query {index + 1}: {len(jobs)} jobs")
+                if on_page is not None:
+                    outcome = on_page(index, jobs)
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+
+            await asyncio.gather(*(one(i, q) for i, q in enumerate(queries)))
+
+        self.stats['seconds'] = time.perf_counter() - start
+        return pages
+
+    def fetch_indeed_results(self, queries, limit: int) -> List[List[Dict]]:
+        """Blocking fetch_pages(): one list of raw jobs per query, in query order"""
+        queries = queries if isinstance(queries, list) else [queries]
+        return run_coroutine_sync(self.fetch_pages(queries, limit))
+
+    async def ingest_pages(self, queries: List[str], limit: int, run_id: str,
+                           search_location: str = '') -> Tuple[pd.DataFrame, List[Dict]]:
+        """
+        Fetch the queries and transform each page as soon as it arrives.
+
+        Returns:
+            (canonical DataFrame, raw jobs), both in query order
+        """
+        from canonical_transforms import transform_ingest_outscraper
+        from jobs_schema import build_empty_df
+
+        loop = asyncio.get_running_loop()
+        frames: Dict[int, asyncio.Future] = {}
+        # One worker: pages transform in arrival order while later queries are still scraping
+        with ThreadPoolExecutor(max_workers=1) as transformer:
+            def on_page(index: int, jobs: List[Dict]) -> None:
+                if jobs:
+                    frames[index] = loop.run_in_executor(
+                        transformer, transform_ingest_outscraper, jobs, run_id, search_location)
+
+            pages = await self.fetch_pages(queries, limit, on_page=on_page)
+            ordered = [await frames[i] for i in sorted(frames)]
+
+        raw_jobs = [job for page in pages for job in page]
+        if not ordered:
+            return build_empty_df(), raw_jobs
+        df = pd.concat(ordered, ignore_index=True) if len(ordered) > 1 else ordered[0]
+        df['id.source_row'] = range(len(df))
+        return df, raw_jobs
+
+    def ingest_indeed(self, queries, limit: int, run_id: str,
+                      search_location: str = '') -> Tuple[pd.DataFrame, List[Dict]]:
+        """Blocking ingest_pages()"""
+        queries = queries if isinstance(queries, list) else [queries]
+        return run_coroutine_sync(self.ingest_pages(queries, limit, run_id, search_location))
+
+    def start_ingestion(self, queries, limit: int, run_id: str, search_location: str = '') -> Future:
+        """Run ingest_indeed() on a background thread; the Future resolves to (DataFrame, raw jobs)"""
+        future: Future = Future()
+
+        def runner():
+            try:
+                future.set_result(self.ingest_indeed(queries, limit, run_id, search_location))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=contextvars.copy_context().run, args=(runner,), daemon=True).start()
+        return future
@@ -0,0 +1,290 @@
+"""
+Packed Classification
+Several jobs per chat-completion request for the AI classifiers.
+
+One job per request re-sends the multi-thousand-token system prompt with
+every job, so prompt tokens dominate classification cost. Packed mode sends
+N jobs per request and asks for {"results": [...]}, an array of the
+classifier's own CLASSIFICATION_SCHEMA objects. N is chosen per request so
+that prompt + expected completion tokens fit FREEWORLD_PACKED_TOKEN_BUDGET:
+short postings pack densely and long ones pack sparsely.
+
+Every returned item is validated against the pack it came from (known job_id,
+not repeated, every required field present with an allowed value). Items
+that are missing or malformed, and all items of a request that failed or was
+truncated, are handed back so the caller classifies them with the regular
+one-job request. No job is lost to a bad pack.
+
+Environment:
+    FREEWORLD_PACKED_CLASSIFICATION=on      enable packed mode (default: one job per request)
+    FREEWORLD_PACKED_TOKEN_BUDGET=16000     prompt + completion tokens allowed per request
+    FREEWORLD_PACKED_MAX_JOBS=10            most jobs in one request
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+from pipeline_performance_monitor import record_external_call
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding('o200k_base')
+except Exception:  # Optional: fall back to the 4-characters-per-token estimate
+    _ENCODING = None
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 12        # chat formatting per request
+OUTPUT_TOKENS_PER_JOB = 350         # one result object with a full summary
+PACK_TIMEOUT_PER_JOB = 10           # extra seconds per packed job (completion length grows with N)
+DEFAULT_TOKEN_BUDGET = 16000
+DEFAULT_MAX_JOBS = 10
+
+# USD per 1M tokens
+MODEL_PRICES = {
+    'gpt-4o-mini': {'input': 0.15, 'cached_input': 0.075, 'output': 0.60},
+}
+
+PACKED_INSTRUCTIONS = """
+
+**BATCH FORMAT:**
+The user message contains several jobs, each starting with a line "=== JOB n ===".
+Classify every job independently, exactly as if it were the only job you were given.
+Return {"results": [...]} with exactly one object per job, in the same order, and copy
+each job's Job ID character for character into job_id.
+"""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def packed_enabled() -> bool:
+    """True when FREEWORLD_PACKED_CLASSIFICATION is on"""
+    return os.getenv('FREEWORLD_PACKED_CLASSIFICATION', '').lower() in ('on', '1', 'true')
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count (tiktoken when installed, else characters / 4)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def format_job(job: Dict) -> str:
+    """User-message text for one job (the same text single-job requests send)"""
+    return f"""Job ID: {job['job_id']}
+Job Title: {job['job_title']}
+Company: {job['company']}
+Location: {job['location']}
+
+Job Description:
+{job['job_description']}"""
+
+
+def packed_schema(item_schema: Dict) -> Dict:
+    """Response schema for a pack: an object holding an array of item_schema objects"""
+    return {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {"results": {"type": "array", "items": item_schema}},
+        "required": ["results"],
+    }
+
+
+def pack_user_content(contents: Sequence[str]) -> str:
+    return "\n\n".join(f"=== JOB {n} ===\n{content}" for n, content in enumerate(contents, 1))
+
+
+def plan_packs(job_tokens: Sequence[int], prompt_tokens: int, token_budget: int, max_jobs: int,
+               output_tokens_per_job: int = OUTPUT_TOKENS_PER_JOB) -> List[List[int]]:
+    """
+    Group consecutive jobs into requests that fit the token budget.
+
+    Args:
+        job_tokens: estimated tokens of each job's content
+        prompt_tokens: tokens of the (packed) system prompt and message overhead
+        token_budget: prompt + expected completion tokens allowed per request
+        max_jobs: most jobs in one request
+        output_tokens_per_job: expected completion tokens per job
+
+    Returns:
+        Lists of job indexes, in order; a job too large to share a request gets its own
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    used = prompt_tokens
+    for index, tokens in enumerate(job_tokens):
+        cost = tokens + 8 + output_tokens_per_job  # 8: the "=== JOB n ===" marker
+        if current and (len(current) >= max_jobs or used + cost > token_budget):
+            packs.append(current)
+            current, used = [], prompt_tokens
+        current.append(index)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _valid_value(value, spec: Dict) -> bool:
+    if 'enum' in spec:
+        return value in spec['enum']
+    kind = spec.get('type')
+    if kind == 'string':
+        return isinstance(value, str)
+    if kind == 'boolean':
+        return isinstance(value, bool)
+    return True
+
+
+def validate_items(expected_ids: Sequence[str], items, item_schema: Dict) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Match returned items to the pack's job ids.
+
+    Args:
+        expected_ids: job ids sent in the pack
+        items: the "results" array from the model
+        item_schema: the classifier's CLASSIFICATION_SCHEMA
+
+    Returns:
+        (valid items by job_id, job ids to re-queue) - re-queued ids are those
+        missing, repeated, or whose item lacks a field or has a disallowed value
+    """
+    expected = set(expected_ids)
+    properties = item_schema.get('properties', {})
+    required = item_schema.get('required', list(properties))
+    valid: Dict[str, Dict] = {}
+    rejected = set()
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        job_id = item.get('job_id')
+        if job_id not in expected or job_id in rejected:
+            continue
+        if job_id in valid:  # Two answers for one job: trust neither
+            del valid[job_id]
+            rejected.add(job_id)
+            continue
+        if all(field in item and _valid_value(item[field], properties.get(field, {})) for field in required):
+            valid[job_id] = item
+        else:
+            rejected.add(job_id)
+    return valid, [job_id for job_id in expected_ids if job_id not in valid]
+
+
+def request_cost(prompt_tokens: int, completion_tokens: int, model: str = 'gpt-4o-mini',
+                 cached_tokens: int = 0) -> float:
+    """USD cost of one request (cached_tokens: prompt tokens served from OpenAI's prompt cache)"""
+    prices = MODEL_PRICES[model]
+    return ((prompt_tokens - cached_tokens) * prices['input'] + cached_tokens * prices['cached_input']
+            + completion_tokens * prices['output']) / 1_000_000
+
+
+async def _post(session, limiter, api_url: str, headers: Dict, payload: Dict, timeout: float,
+                max_retries: int = 3) -> Dict:
+    """POST one pack, retrying 429/5xx/network errors off the limiter slot; returns the response JSON"""
+    async with limiter:
+        for attempt in range(max_retries):
+            call_start = time.time()
+            try:
+                async with session.post(api_url, headers=headers, json=payload,
+                                        timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    text = await response.text()
+                    record_external_call('openai', time.time() - call_start, error=response.status != 200)
+                    limiter.record(response.status, time.time() - call_start)
+                    if response.status == 200:
+                        return json.loads(text)
+                    if response.status not in (429, 500, 502, 503, 504):
+                        raise Exception(f"OpenAI API error {response.status}: {text[:200]}")
+                    retry_after = response.headers.get('Retry-After') if response.status == 429 else None
+                    wait_time = float(retry_after) if retry_after else (2 ** attempt) * 0.5
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                record_external_call('openai', time.time() - call_start, error=True)
+                if attempt == max_retries - 1:
+                    raise Exception(f"Connection error: {e}")
+                wait_time = (2 ** attempt) * 0.5
+            if attempt < max_retries - 1:
+                await limiter.backoff(wait_time)
+    raise Exception("Max retries exceeded")
+
+
+async def classify_packed(session, limiter, jobs: List[Dict], system_prompt: str, item_schema: Dict,
+                          api_url: str, api_key: str, model: str, token_budget: Optional[int] = None,
+                          max_jobs: Optional[int] = None) -> Tuple[Dict[str, Dict], List[Dict], Dict]:
+    """
+    Classify jobs several per request.
+
+    Args:
+        session: aiohttp session
+        limiter: AdaptiveLimiter (one slot per request)
+        jobs: job dicts with job_id, job_title, company, location, job_description
+        system_prompt: the classifier's single-job system prompt
+        item_schema: the classifier's CLASSIFICATION_SCHEMA
+        api_url: chat completions URL
+        api_key: OpenAI API key
+        model: model name
+        token_budget: prompt + completion tokens per request (default: FREEWORLD_PACKED_TOKEN_BUDGET)
+        max_jobs: most jobs per request (default: FREEWORLD_PACKED_MAX_JOBS)
+
+    Returns:
+        (parsed items by job_id, jobs to classify individually, stats)
+    """
+    token_budget = token_budget or _env_int('FREEWORLD_PACKED_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+    max_jobs = max_jobs or _env_int('FREEWORLD_PACKED_MAX_JOBS', DEFAULT_MAX_JOBS)
+    packed_prompt = system_prompt + PACKED_INSTRUCTIONS
+    contents = [format_job(job) for job in jobs]
+    packs = plan_packs([estimate_tokens(c) for c in contents],
+                       estimate_tokens(packed_prompt) + MESSAGE_OVERHEAD_TOKENS, token_budget, max_jobs)
+    schema = packed_schema(item_schema)
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    stats = {'packs': 0, 'packed_jobs': 0, 'requeued': 0, 'failed_packs': 0, 'truncated': 0,
+             'prompt_tokens': 0, 'completion_tokens': 0}
+    results: Dict[str, Dict] = {}
+
+    async def run_pack(indexes: List[int]) -> None:
+        ids = [jobs[i]['job_id'] for i in indexes]
+        payload = {
+            "model": model,
+            "temperature": 0,
+            "max_tokens": min(16384, OUTPUT_TOKENS_PER_JOB * 2 * len(indexes)),
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "job_classification_batch", "schema": schema, "strict": True}
+            },
+            "messages": [
+                {"role": "system", "content": packed_prompt},
+                {"role": "user", "content": pack_user_content([contents[i] for i in indexes])}
+            ],
+        }
+        stats['packs'] += 1
+        try:
+            data = await _post(session, limiter, api_url, headers, payload,
+                               timeout=30 + PACK_TIMEOUT_PER_JOB * len(indexes))
+            usage = data.get('usage') or {}
+            stats['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            stats['completion_tokens'] += usage.get('completion_tokens', 0)
+            choice = data['choices'][0]
+            if choice.get('finish_reason') == 'length':
+                stats['truncated'] += 1
+                return
+            items = json.loads(choice['message']['content']).get('results')
+        except Exception as e:
+            stats['failed_packs'] += 1
+            print(f"⚠️ Packed request for {len(ids)} jobs failed: {str(e)[:120]} - classifying them individually")
+            return
+        valid, _ = validate_items(ids, items, item_schema)
+        results.update(valid)
+
+    await asyncio.gather(*(run_pack(pack) for pack in packs if len(pack) > 1))
+
+    requeue = [job for job in jobs if job['job_id'] not in results]
+    stats['packed_jobs'] = len(results)
+    stats['requeued'] = len(requeue)
+    return results, requeue, stats
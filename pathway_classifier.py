@@ -1,6 +1,8 @@
 import os
 import json
 import asyncio
+import contextlib
+import contextvars
 import aiohttp
 import time
 import queue
@@ -9,9 +11,131 @@ import pandas as pd
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from classification_cache import get_classification_cache
+from description_compactor import compact_for_classification
+from pipeline_performance_monitor import record_external_call
+from classifier_runtime import AdaptiveLimiter, CLASSIFIER_TIMEOUT, classifier_connector, get_classifier_runtime
+from packed_classification import classify_packed, format_job, packed_enabled
+
 load_dotenv()
 
 class PathwayClassifier:
+    # Bump whenever the system prompt or schema changes - invalidates cached verdicts
+    CLASSIFIER_TYPE = "pathway"
+    PROMPT_VERSION = "pathway-2025-09"
+    # Shared by the async, packed and work-queue paths (byte-identical for prompt caching)
+    SYSTEM_PROMPT = """
+FreeWorld is a non-profit that helps Americans with low incomes find career pathway jobs that lead to living wage opportunities in transportation and logistics.
+Our candidates are looking for entry-level positions that provide clear advancement opportunities, especially pathways to CDL driving careers. Many have limited work experience, criminal backgrounds, and need employers who provide training and career development.
+We focus on connecting candidates to jobs that offer genuine career growth potential - from warehouse/dock work to driving, from non-CDL delivery to CDL opportunities, and logistics roles that provide industry experience.
+
+**CLASSIFICATION PRIORITY SYSTEM:**
+
+1. **CAREER PATHWAY POTENTIAL**: Jobs with clear advancement paths are top priority
+2. **TRAINING PROVIDED**: Jobs that offer CDL training, skills development, or advancement opportunities
+3. **ENTRY-LEVEL FRIENDLY**: Jobs that hire candidates with limited experience or criminal backgrounds
+
+**PATHWAY CATEGORIES:**
+- **dock_to_driver**: Warehouse/dock positions with explicit CDL training or driver advancement
+- **internal_cdl_training**: Companies offering paid CDL training programs
+- **warehouse_to_driver**: General warehouse roles at transportation companies with driver pathways
+- **logistics_progression**: Dispatcher, coordinator roles that lead to management opportunities
+- **non_cdl_driving**: Delivery, local driving that doesn't require CDL but provides driving experience
+- **general_warehouse**: Standard warehouse work at logistics companies (stepping stone potential)
+- **construction_apprentice**: Construction, trade, or apprenticeship programs that develop transferable skills
+- **stepping_stone**: Other roles that provide industry experience and advancement potential
+- **no_pathway**: Jobs without clear career advancement opportunities
+
+Jobs should be classified as **good** if they:
+- Explicitly offer CDL training or driver pathways
+- Provide clear advancement opportunities
+- Are entry-level friendly with training provided
+
+Jobs should be classified as **so-so** if they:
+- Prefer experience but do not require it
+
+Jobs should be classified as **bad** if they:
+- Require ANY amount of truck driving experience. Our candidates know how to drive and hold CDLs, but they have no CDL or driving work history AT ALL
+- Mention any hard experience requirements that would disqualify entry-level candidates
+
+3. **AUTOMATIC DISQUALIFIERS**:
+   - Owner-operator/1099 (must own truck/trailer) → BAD
+   - School bus driving → BAD
+   - Requires non-CDL certifications or licenses (except CDL endorsements) → BAD
+   - Professional licenses required (nursing, electrician, plumbing, etc.) → BAD
+   - Industry-specific certifications required (forklift, OSHA, safety certs) → BAD
+   - ANY truck driving experience requirements (6 months, 1 year, 2+ years, etc.) → BAD
+   - Hard experience requirements for entry-level positions → BAD
+
+**ENDORSEMENT REQUIREMENTS:**
+FreeWorld candidates have CDL-A with basic training on air brakes, combination vehicles, and manual transmissions. ENDORSEMENTS ARE NOT A BARRIER. FreeWorld helps Free Agents get ANY endorsement they need to get work.
+
+IMPORTANT: For each job, you MUST create a detailed summary that is EXACTLY 6-8 sentences long.
+
+- Don't make all jobs sound the same!**
+- Preserve specific phrases that detail the nature of the work.
+- Maintain their exact pay ranges, bonuses, and incentives as stated
+
+These elements are also very relevant to our job seekers and should be included IF there is actual text from the ad that mentions them:
+1) What the job role entails and main duties (using their language)
+2) Pay/benefits offered (their exact wording and specific numbers)
+3) Route and schedule information (preserve their exact terms: "home daily", "out 5 days", "weekends off", specific routes, territories, etc.)
+4) Physical demands of the job (mention if it's "no-touch freight", requires loading/unloading, heavy lifting, dock work, etc.)
+5) Key requirements and qualifications (including criminal background requirements if mentioned)
+7) Any training provided or growth opportunities (their exact promises)
+
+Don't standardize everything - each company should sound different!
+
+**IMPORTANT DETAILS TO PRESERVE WHEN PRESENT:**
+- Route information
+- Schedule details
+- Physical demands
+
+If criminal background requirements are actually mentioned, include them clearly using the company's exact language when possible.
+
+**CLASSIFICATION STANDARDS - USE EXACT VALUES ONLY:**
+
+**FAIR CHANCE CLASSIFICATION (fair_chance field):**
+- "fair_chance_employer": Fair chance employer - welcomes applicants with criminal records
+- "background_check_required": Background check required - may disqualify applicants with records
+- "clean_record_required": Clean driving/criminal record explicitly required
+- "no_requirements_mentioned": No background check requirements mentioned
+
+**CAREER PATHWAY CLASSIFICATION (career_pathway field):**
+- "dock_to_driver": Warehouse/dock positions with explicit CDL training or driver advancement
+- "internal_cdl_training": Companies offering paid CDL training programs
+- "warehouse_to_driver": General warehouse roles at transportation companies with driver pathways
+- "logistics_progression": Dispatcher, coordinator roles that lead to management opportunities
+- "non_cdl_driving": Delivery, local driving that doesn't require CDL but provides driving experience
+- "general_warehouse": Standard warehouse work at logistics companies (stepping stone potential)
+- "construction_apprentice": Construction, trade, or apprenticeship programs that develop transferable skills
+- "stepping_stone": Other roles that provide industry experience and advancement potential
+- "no_pathway": Jobs without clear career advancement opportunities
+
+**TRAINING PROVIDED (training_provided field):**
+- true: Job explicitly mentions training, skills development, or advancement programs
+- false: No training or development opportunities mentioned
+
+**CLASSIFICATION RULES:**
+1. Use ONLY the exact values listed above
+2. For fair_chance: Look for explicit policies about criminal records/background checks
+3. For career_pathway: Identify the PRIMARY pathway type that best matches the job
+4. For training_provided: Look for ANY mention of training, skills development, or advancement
+5. Be conservative - only classify as fair_chance_employer if explicitly stated
+
+**EXAMPLES:**
+- "We welcome applicants with criminal records" → fair_chance: "fair_chance_employer"
+- "Clean criminal record required" or "no felonies" → fair_chance: "clean_record_required"
+- "Background check required" (criminal) → fair_chance: "background_check_required"
+- "Clean driving record required" → fair_chance: "no_requirements_mentioned" (driving record ≠ criminal background)
+- No mention of background → fair_chance: "no_requirements_mentioned"
+- "Warehouse position with opportunity to become a driver" → career_pathway: "dock_to_driver"
+- "CDL training provided" → career_pathway: "internal_cdl_training", training_provided: true
+- "Dispatcher role with management track" → career_pathway: "logistics_progression"
+
+**NOTE:** Location normalization is handled by the pipeline, focus on job quality and requirements assessment.
+"""
+
     def __init__(self):
         # Get API key from Streamlit secrets or environment
         api_key = None
@@ -37,6 +161,8 @@ class PathwayClassifier:
             max_retries=0  # Handle retries manually for better control
         )
         self.model = "gpt-4o-mini"  # Single model constant
+        # Same env var the OpenAI SDK honours; lets tests point at mock_openai_server
+        self.api_base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
 
         # Retriable status codes
         self.RETRIABLE = {429, 500, 502, 503, 504}
@@ -163,9 +289,12 @@ class PathwayClassifier:
 
         return df
 
-    def classify_jobs_in_batches(self, jobs_list, batch_size=25, max_parallel=2, max_retries=2):
+    def classify_jobs_in_batches(self, jobs_list, batch_size=25, max_parallel=2, max_retries=2, use_cache=True):
         """
         Process jobs using fast async implementation with backward compatibility
+
+        Jobs whose content is already in the local classification cache are answered
+        from disk; only cache misses are sent to the API (use_cache=False forces all).
         """
 
         # Validate jobs
@@ -180,25 +309,51 @@ class PathwayClassifier:
             print("❌ No valid jobs to process")
             return []
 
+        cache = get_classification_cache() if use_cache else None
+        cached_results = {}
+        if cache:
+            cached_results, jobs_to_classify = cache.lookup_jobs(valid_jobs, self.CLASSIFIER_TYPE, self.PROMPT_VERSION)
+            if cached_results:
+                print(f"💾 Classification cache: {len(cached_results)} hits, {len(jobs_to_classify)} to classify")
+            if not jobs_to_classify:
+                return [cached_results[job['job_id']] for job in valid_jobs]
+        else:
+            jobs_to_classify = valid_jobs
+
         # Use new async implementation for speed
-        print(f"🚀 Using async pathway classification for {len(valid_jobs)} jobs...")
+        print(f"🚀 Using async pathway classification for {len(jobs_to_classify)} jobs...")
+        # Compacted copies go to the model; the cache keeps keying on the original jobs
+        send_jobs = compact_for_classification(jobs_to_classify)
         try:
-            # Run async method in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                results = loop.run_until_complete(self._classify_jobs_async(valid_jobs, concurrency=50))
-                print("✅ Async pathway classification completed successfully")
-                return results
-            finally:
-                loop.close()
+            runtime = get_classifier_runtime()
+            if runtime is not None:
+                # Shared background loop: pooled connections and the learned concurrency limit persist
+                results = runtime.run(lambda session, limiter: self._classify_jobs_async(
+                    send_jobs, concurrency=50, session=session, limiter=limiter))
+            else:
+                # Run async method in sync context
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    results = loop.run_until_complete(self._classify_jobs_async(send_jobs, concurrency=50))
+                finally:
+                    loop.close()
+            print("✅ Async pathway classification completed successfully")
         except Exception as e:
             print(f"⚠️ Async pathway classification failed: {e}")
             print("🔄 Falling back to original sync implementation...")
             # Fallback to original sync implementation
-            results = self._run_work_queue(valid_jobs, concurrency=50)
+            results = self._run_work_queue(send_jobs, concurrency=50)
             print("✅ Fallback sync pathway classification completed")
-            return results
+
+        if cache:
+            cache.store_results(jobs_to_classify, results, self.CLASSIFIER_TYPE, self.PROMPT_VERSION)
+            if cached_results:
+                fresh_results = {r.get('job_id'): r for r in results if isinstance(r, dict)}
+                results = [cached_results.get(job['job_id']) or fresh_results.get(job['job_id'])
+                           for job in valid_jobs]
+                results = [r for r in results if r is not None]
+        return results
 
     def _run_work_queue(self, jobs_list, concurrency=8):
         """
@@ -209,114 +364,7 @@ class PathwayClassifier:
         # Shared system prompt and schema (byte-identical for prompt caching)
         # Single job per request for proper work queue
         # Use the good system prompt with explicit field mapping
-        system_prompt = """
-FreeWorld is a non-profit that helps Americans with low incomes find career pathway jobs that lead to living wage opportunities in transportation and logistics.
-Our candidates are looking for entry-level positions that provide clear advancement opportunities, especially pathways to CDL driving careers. Many have limited work experience, criminal backgrounds, and need employers who provide training and career development.
-We focus on connecting candidates to jobs that offer genuine career growth potential - from warehouse/dock work to driving, from non-CDL delivery to CDL opportunities, and logistics roles that provide industry experience.
-
-**CLASSIFICATION PRIORITY SYSTEM:**
-
-1. **CAREER PATHWAY POTENTIAL**: Jobs with clear advancement paths are top priority
-2. **TRAINING PROVIDED**: Jobs that offer CDL training, skills development, or advancement opportunities
-3. **ENTRY-LEVEL FRIENDLY**: Jobs that hire candidates with limited experience or criminal backgrounds
-
-**PATHWAY CATEGORIES:**
-- **dock_to_driver**: Warehouse/dock positions with explicit CDL training or driver advancement
-- **internal_cdl_training**: Companies offering paid CDL training programs
-- **warehouse_to_driver**: General warehouse roles at transportation companies with driver pathways
-- **logistics_progression**: Dispatcher, coordinator roles that lead to management opportunities
-- **non_cdl_driving**: Delivery, local driving that doesn't require CDL but provides driving experience
-- **general_warehouse**: Standard warehouse work at logistics companies (stepping stone potential)
-- **construction_apprentice**: Construction, trade, or apprenticeship programs that develop transferable skills
-- **stepping_stone**: Other roles that provide industry experience and advancement potential
-- **no_pathway**: Jobs without clear career advancement opportunities
-
-Jobs should be classified as **good** if they:
-- Explicitly offer CDL training or driver pathways
-- Provide clear advancement opportunities
-- Are entry-level friendly with training provided
-
-Jobs should be classified as **so-so** if they:
-- Prefer experience but do not require it
-
-Jobs should be classified as **bad** if they:
-- Require ANY amount of truck driving experience. Our candidates know how to drive and hold CDLs, but they have no CDL or driving work history AT ALL
-- Mention any hard experience requirements that would disqualify entry-level candidates
-
-3. **AUTOMATIC DISQUALIFIERS**:
-   - Owner-operator/1099 (must own truck/trailer) → BAD
-   - School bus driving → BAD
-   - Professional licenses required (nursing, electrician, plumbing, etc.) → BAD
-   - Industry-specific certifications required (forklift, OSHA, safety certs) → BAD
-   - ANY truck driving experience requirements (6 months, 1 year, 2+ years, etc.) → BAD
-   - Hard experience requirements for entry-level positions → BAD
-
-
-IMPORTANT: For each job, you MUST create a detailed summary that is EXACTLY 6-8 sentences long.
-
-- Don't make all jobs sound the same!**
-- Preserve specific phrases that detail the nature of the work.
-- Maintain their exact pay ranges, bonuses, and incentives as stated
-
-These elements are also very relevant to our job seekers and should be included IF there is actual text from the ad that mentions them:
-1) What the job role entails and main duties (using their language)
-2) Pay/benefits offered (their exact wording and specific numbers)
-3) Route and schedule information (preserve their exact terms: "home daily", "out 5 days", "weekends off", specific routes, territories, etc.)
-4) Physical demands of the job (mention if it's "no-touch freight", requires loading/unloading, heavy lifting, dock work, etc.)
-5) Key requirements and qualifications (including criminal background requirements if mentioned)
-7) Any training provided or growth opportunities (their exact promises)
-
-Don't standardize everything - each company should sound different!
-
-**IMPORTANT DETAILS TO PRESERVE WHEN PRESENT:**
-- Route information
-- Schedule details
-- Physical demands
-
-If criminal background requirements are actually mentioned, include them clearly using the company's exact language when possible.
-
-**CLASSIFICATION STANDARDS - USE EXACT VALUES ONLY:**
-
-**FAIR CHANCE CLASSIFICATION (fair_chance field):**
-- "fair_chance_employer": Fair chance employer - welcomes applicants with criminal records
-- "background_check_required": Background check required - may disqualify applicants with records
-- "clean_record_required": Clean driving/criminal record explicitly required
-- "no_requirements_mentioned": No background check requirements mentioned
-
-**CAREER PATHWAY CLASSIFICATION (career_pathway field):**
-- "dock_to_driver": Warehouse/dock positions with explicit CDL training or driver advancement
-- "internal_cdl_training": Companies offering paid CDL training programs
-- "warehouse_to_driver": General warehouse roles at transportation companies with driver pathways
-- "logistics_progression": Dispatcher, coordinator roles that lead to management opportunities
-- "non_cdl_driving": Delivery, local driving that doesn't require CDL but provides driving experience
-- "general_warehouse": Standard warehouse work at logistics companies (stepping stone potential)
-- "construction_apprentice": Construction, trade, or apprenticeship programs that develop transferable skills
-- "stepping_stone": Other roles that provide industry experience and advancement potential
-- "no_pathway": Jobs without clear career advancement opportunities
-
-**TRAINING PROVIDED (training_provided field):**
-- true: Job explicitly mentions training, skills development, or advancement programs
-- false: No training or development opportunities mentioned
-
-**CLASSIFICATION RULES:**
-1. Use ONLY the exact values listed above
-2. For fair_chance: Look for explicit policies about criminal records/background checks
-3. For career_pathway: Identify the PRIMARY pathway type that best matches the job
-4. For training_provided: Look for ANY mention of training, skills development, or advancement
-5. Be conservative - only classify as fair_chance_employer if explicitly stated
-
-**EXAMPLES:**
-- "We welcome applicants with criminal records" → fair_chance: "fair_chance_employer"
-- "Clean criminal record required" or "no felonies" → fair_chance: "clean_record_required"
-- "Background check required" (criminal) → fair_chance: "background_check_required"
-- "Clean driving record required" → fair_chance: "no_requirements_mentioned" (driving record ≠ criminal background)
-- No mention of background → fair_chance: "no_requirements_mentioned"
-- "Warehouse position with opportunity to become a driver" → career_pathway: "dock_to_driver"
-- "CDL training provided" → career_pathway: "internal_cdl_training", training_provided: true
-- "Dispatcher role with management track" → career_pathway: "logistics_progression"
-
-**NOTE:** Location normalization is handled by the pipeline, focus on job quality and requirements assessment.
-"""
+        system_prompt = self.SYSTEM_PROMPT
         # Use shared schema object for prompt caching
         schema = self.CLASSIFICATION_SCHEMA
 
@@ -446,7 +494,8 @@ Job Description:
         # Start workers
         threads = []
         for i in range(min(concurrency, len(items))):
-            t = threading.Thread(target=worker, name=f"worker-{i}")
+            # Each worker runs in a copy of this context so API calls reach the run's monitor
+            t = threading.Thread(target=contextvars.copy_context().run, args=(worker,), name=f"worker-{i}")
             t.start()
             threads.append(t)
 
@@ -550,7 +599,7 @@ Job Description:
         Make async OpenAI API call with GUARD 5: Robust JSON parsing and fallback
         """
         async with semaphore:
-            api_url = "https://api.openai.com/v1/chat/completions"
+            api_url = f"{self.api_base_url}/chat/completions"
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
@@ -575,9 +624,12 @@ Job Description:
             }
 
             for attempt in range(max_retries):
+                call_start = time.time()
                 try:
                     async with session.post(api_url, headers=headers, json=payload, timeout=30) as response:
                         response_text = await response.text()
+                        record_external_call('openai', time.time() - call_start, error=response.status != 200)
+                        semaphore.record(response.status, time.time() - call_start)
 
                         if response.status == 200:
                             data = await response.json()
@@ -649,178 +701,65 @@ Job Description:
                                 wait_time = float(retry_after)
                             else:
                                 wait_time = (2 ** attempt) * 0.5
-                            await asyncio.sleep(wait_time)
+                            await semaphore.backoff(wait_time)
                         elif response.status in [500, 502, 503, 504]:
                             # Server errors - retry with backoff
                             wait_time = (2 ** attempt) * 0.5
-                            await asyncio.sleep(wait_time)
+                            await semaphore.backoff(wait_time)
                         else:
                             # Client errors - don't retry
                             raise Exception(f"OpenAI API error {response.status}: {response_text}")
 
                 except asyncio.TimeoutError:
+                    record_external_call('openai', time.time() - call_start, error=True)
                     if attempt == max_retries - 1:
                         raise Exception("OpenAI API timeout after retries")
-                    await asyncio.sleep((2 ** attempt) * 0.5)
+                    await semaphore.backoff((2 ** attempt) * 0.5)
                 except aiohttp.ClientError as e:
+                    record_external_call('openai', time.time() - call_start, error=True)
                     if attempt == max_retries - 1:
                         raise Exception(f"Connection error: {e}")
-                    await asyncio.sleep((2 ** attempt) * 0.5)
+                    await semaphore.backoff((2 ** attempt) * 0.5)
 
             raise Exception("Max retries exceeded")
 
-    async def _classify_jobs_async(self, jobs_list, concurrency=50):
-        # Define the system prompt here for the async method
-        # Use the good system prompt with explicit field mapping (same as sync version)
-        system_prompt = """
-FreeWorld is a non-profit that helps Americans with low incomes find career pathway jobs that lead to living wage opportunities in transportation and logistics.
-Our candidates are looking for entry-level positions that provide clear advancement opportunities, especially pathways to CDL driving careers. Many have limited work experience, criminal backgrounds, and need employers who provide training and career development.
-We focus on connecting candidates to jobs that offer genuine career growth potential - from warehouse/dock work to driving, from non-CDL delivery to CDL opportunities, and logistics roles that provide industry experience.
-
-**CLASSIFICATION PRIORITY SYSTEM:**
-
-1. **CAREER PATHWAY POTENTIAL**: Jobs with clear advancement paths are top priority
-2. **TRAINING PROVIDED**: Jobs that offer CDL training, skills development, or advancement opportunities
-3. **ENTRY-LEVEL FRIENDLY**: Jobs that hire candidates with limited experience or criminal backgrounds
-
-**PATHWAY CATEGORIES:**
-- **dock_to_driver**: Warehouse/dock positions with explicit CDL training or driver advancement
-- **internal_cdl_training**: Companies offering paid CDL training programs
-- **warehouse_to_driver**: General warehouse roles at transportation companies with driver pathways
-- **logistics_progression**: Dispatcher, coordinator roles that lead to management opportunities
-- **non_cdl_driving**: Delivery, local driving that doesn't require CDL but provides driving experience
-- **general_warehouse**: Standard warehouse work at logistics companies (stepping stone potential)
-- **construction_apprentice**: Construction, trade, or apprenticeship programs that develop transferable skills
-- **stepping_stone**: Other roles that provide industry experience and advancement potential
-- **no_pathway**: Jobs without clear career advancement opportunities
-
-Jobs should be classified as **good** if they:
-- Explicitly offer CDL training or driver pathways
-- Provide clear advancement opportunities
-- Are entry-level friendly with training provided
-
-Jobs should be classified as **so-so** if they:
-- Prefer experience but do not require it
-
-Jobs should be classified as **bad** if they:
-- Require ANY amount of truck driving experience. Our candidates know how to drive and hold CDLs, but they have no CDL or driving work history AT ALL
-- Mention any hard experience requirements that would disqualify entry-level candidates
-
-3. **AUTOMATIC DISQUALIFIERS**:
-   - Owner-operator/1099 (must own truck/trailer) → BAD
-   - School bus driving → BAD
-   - Requires non-CDL certifications or licenses (except CDL endorsements) → BAD
-   - Professional licenses required (nursing, electrician, plumbing, etc.) → BAD
-   - Industry-specific certifications required (forklift, OSHA, safety certs) → BAD
-   - ANY truck driving experience requirements (6 months, 1 year, 2+ years, etc.) → BAD
-   - Hard experience requirements for entry-level positions → BAD
-
-**ENDORSEMENT REQUIREMENTS:**
-FreeWorld candidates have CDL-A with basic training on air brakes, combination vehicles, and manual transmissions. ENDORSEMENTS ARE NOT A BARRIER. FreeWorld helps Free Agents get ANY endorsement they need to get work.
-
-IMPORTANT: For each job, you MUST create a detailed summary that is EXACTLY 6-8 sentences long.
-
-- Don't make all jobs sound the same!**
-- Preserve specific phrases that detail the nature of the work.
-- Maintain their exact pay ranges, bonuses, and incentives as stated
-
-These elements are also very relevant to our job seekers and should be included IF there is actual text from the ad that mentions them:
-1) What the job role entails and main duties (using their language)
-2) Pay/benefits offered (their exact wording and specific numbers)
-3) Route and schedule information (preserve their exact terms: "home daily", "out 5 days", "weekends off", specific routes, territories, etc.)
-4) Physical demands of the job (mention if it's "no-touch freight", requires loading/unloading, heavy lifting, dock work, etc.)
-5) Key requirements and qualifications (including criminal background requirements if mentioned)
-7) Any training provided or growth opportunities (their exact promises)
-
-Don't standardize everything - each company should sound different!
-
-**IMPORTANT DETAILS TO PRESERVE WHEN PRESENT:**
-- Route information
-- Schedule details
-- Physical demands
-
-If criminal background requirements are actually mentioned, include them clearly using the company's exact language when possible.
-
-**CLASSIFICATION STANDARDS - USE EXACT VALUES ONLY:**
-
-**FAIR CHANCE CLASSIFICATION (fair_chance field):**
-- "fair_chance_employer": Fair chance employer - welcomes applicants with criminal records
-- "background_check_required": Background check required - may disqualify applicants with records
-- "clean_record_required": Clean driving/criminal record explicitly required
-- "no_requirements_mentioned": No background check requirements mentioned
-
-**CAREER PATHWAY CLASSIFICATION (career_pathway field):**
-- "dock_to_driver": Warehouse/dock positions with explicit CDL training or driver advancement
-- "internal_cdl_training": Companies offering paid CDL training programs
-- "warehouse_to_driver": General warehouse roles at transportation companies with driver pathways
-- "logistics_progression": Dispatcher, coordinator roles that lead to management opportunities
-- "non_cdl_driving": Delivery, local driving that doesn't require CDL but provides driving experience
-- "general_warehouse": Standard warehouse work at logistics companies (stepping stone potential)
-- "construction_apprentice": Construction, trade, or apprenticeship programs that develop transferable skills
-- "stepping_stone": Other roles that provide industry experience and advancement potential
-- "no_pathway": Jobs without clear career advancement opportunities
-
-**TRAINING PROVIDED (training_provided field):**
-- true: Job explicitly mentions training, skills development, or advancement programs
-- false: No training or development opportunities mentioned
-
-**CLASSIFICATION RULES:**
-1. Use ONLY the exact values listed above
-2. For fair_chance: Look for explicit policies about criminal records/background checks
-3. For career_pathway: Identify the PRIMARY pathway type that best matches the job
-4. For training_provided: Look for ANY mention of training, skills development, or advancement
-5. Be conservative - only classify as fair_chance_employer if explicitly stated
-
-**EXAMPLES:**
-- "We welcome applicants with criminal records" → fair_chance: "fair_chance_employer"
-- "Clean criminal record required" or "no felonies" → fair_chance: "clean_record_required"
-- "Background check required" (criminal) → fair_chance: "background_check_required"
-- "Clean driving record required" → fair_chance: "no_requirements_mentioned" (driving record ≠ criminal background)
-- No mention of background → fair_chance: "no_requirements_mentioned"
-- "Warehouse position with opportunity to become a driver" → career_pathway: "dock_to_driver"
-- "CDL training provided" → career_pathway: "internal_cdl_training", training_provided: true
-- "Dispatcher role with management track" → career_pathway: "logistics_progression"
-
-**NOTE:** Location normalization is handled by the pipeline, focus on job quality and requirements assessment.
-"""
+    async def _classify_jobs_async(self, jobs_list, concurrency=50, session=None, limiter=None, packed=None):
         """
         Fast async classification with 6 NON-NEGOTIABLE GUARDS to prevent job loss
-        """
-        # Connection pooling configuration
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False  # Disable hostname verification
-        ssl_context.verify_mode = ssl.CERT_NONE  # Disable certificate verification
-
-        connector = aiohttp.TCPConnector(
-            limit=200,
-            limit_per_host=100,
-            keepalive_timeout=30,
-            enable_cleanup_closed=True,
-            ssl=ssl_context
-        )
 
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        semaphore = asyncio.Semaphore(concurrency)
+        packed=True (default: FREEWORLD_PACKED_CLASSIFICATION) sends several jobs per
+        request first; jobs a pack did not answer cleanly get their own request.
+        """
+        system_prompt = self.SYSTEM_PROMPT
+        # Fixed limit unless the caller passes the runtime's shared adaptive limiter
+        semaphore = limiter or AdaptiveLimiter(concurrency, adaptive=False)
+        if packed is None:
+            packed = packed_enabled()
 
         # GUARD 1: Prepare input job IDs list for exact tracking
         input_job_ids = [job['job_id'] for job in jobs_list]
         print(f"🔒 GUARD 1: Tracking {len(input_job_ids)} input job IDs")
 
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Pooled runtime session when given; otherwise a session for this call only
+        session_scope = (contextlib.nullcontext(session) if session is not None else
+                         aiohttp.ClientSession(connector=classifier_connector(), timeout=CLASSIFIER_TIMEOUT))
+        async with session_scope as session:
+            # Packed mode: several jobs per request; anything missing or malformed falls through
+            packed_results = {}
+            if packed:
+                packed_items, _, pack_stats = await classify_packed(
+                    session, semaphore, jobs_list, system_prompt, self.CLASSIFICATION_SCHEMA,
+                    f"{self.api_base_url}/chat/completions", os.getenv('OPENAI_API_KEY'), self.model
+                )
+                packed_results = {job_id: self._job_result(job_id, item) for job_id, item in packed_items.items()}
+                print(f"📦 Packed: {len(packed_results)} jobs in {pack_stats['packs']} requests, "
+                      f"{pack_stats['requeued']} classified individually")
+            single_jobs = [job for job in jobs_list if job['job_id'] not in packed_results]
+
             # Prepare tasks - ONE JOB PER REQUEST (GUARD 6)
             tasks = []
-            for job in jobs_list:
-                job_content = f"""
-Job ID: {job['job_id']}
-Job Title: {job['job_title']}
-Company: {job['company']}
-Location: {job['location']}
-
-Job Description:
-{job['job_description']}
-"""
-                task = self._process_single_job_async(session, job, job_content.strip(), system_prompt, semaphore)
+            for job in single_jobs:
+                task = self._process_single_job_async(session, job, format_job(job), system_prompt, semaphore)
                 tasks.append(task)
 
             # Execute all tasks concurrently
@@ -829,13 +768,13 @@ Job Description:
             total_time = time.time() - start_time
 
             # GUARD 3: Key results by job_id from input list - dict keyed by job_id
-            results_by_job_id = {}
-            success_count = 0
+            results_by_job_id = dict(packed_results)
+            success_count = len(packed_results)
             error_count = 0
             latencies = []
 
             for i, result in enumerate(results):
-                job = jobs_list[i]  # Get the corresponding job
+                job = single_jobs[i]  # Get the corresponding job
                 job_id = job['job_id']  # Original job_id from input
 
                 if isinstance(result, Exception):
@@ -911,6 +850,21 @@ Job Description:
 
             return final_results
 
+    def _job_result(self, job_id, api_result):
+        """Result record for one job from a parsed API answer (single or packed request)"""
+        return {
+            'job_id': job_id,  # GUARD 1: Always use original job_id
+            'match': api_result.get('match', 'error'),
+            'reason': api_result.get('reason', 'No reason provided'),
+            'summary': api_result.get('summary', 'No summary provided'),
+            'normalized_location': api_result.get('normalized_location', ''),
+            'route_type': 'Unknown',
+            'fair_chance': api_result.get('fair_chance', 'no_requirements_mentioned'),
+            'career_pathway': api_result.get('career_pathway', 'no_pathway'),
+            'training_provided': api_result.get('training_provided', False),
+            'final_status': ''
+        }
+
     async def _process_single_job_async(self, session, job, job_content, system_prompt, semaphore):
         """
         Process a single job with GUARD 1 & 2: Never trust model's job_id, always return error record
@@ -922,21 +876,7 @@ Job Description:
             api_result = await self._call_openai_async(session, original_job_id, job_content, system_prompt, semaphore)
             latency = time.time() - start_time
 
-            return {
-                'result': {
-                    'job_id': original_job_id,  # GUARD 1: Always use original job_id
-                    'match': api_result.get('match', 'error'),
-                    'reason': api_result.get('reason', 'No reason provided'),
-                    'summary': api_result.get('summary', 'No summary provided'),
-                    'normalized_location': api_result.get('normalized_location', ''),
-                    'route_type': 'Unknown',
-                    'fair_chance': api_result.get('fair_chance', 'no_requirements_mentioned'),
-                    'career_pathway': api_result.get('career_pathway', 'no_pathway'),
-                    'training_provided': api_result.get('training_provided', False),
-                    'final_status': ''
-                },
-                'latency': latency
-            }
+            return {'result': self._job_result(original_job_id, api_result), 'latency': latency}
         except Exception as e:
             # GUARD 2: Always return error record on failure - NEVER skip/drop jobs
             latency = time.time() - start_time
@@ -0,0 +1,258 @@
+# pdf/browser_pool.py
+"""
+Long-lived Chromium pool for HTML -> PDF export.
+
+export_pdf_playwright used to launch and tear down a full browser per PDF. The
+pool keeps one browser alive on a dedicated thread (Playwright objects are bound
+to the loop that created them, while Streamlit calls us from many threads) and
+hands out reusable page slots:
+
+- max_pages slots, each its own BrowserContext + Page, recycled after
+  max_uses_per_page renders
+- callers queue for a slot (bounded by max_queue; beyond that render_pdf raises)
+- a render that times out is cancelled and its page closed; PDFs are written to
+  a temp file and renamed into place (atomic_output), so a late or fallback
+  render never leaves a half-written file at output_path
+- browser disconnects/crashes are detected and the browser is relaunched on the
+  next render; health_check() reports liveness
+- shutdown() (also registered with atexit) closes everything cleanly
+
+Configuration:
+    FREEWORLD_PDF_BROWSER_POOL  "off" to always cold-launch
+    FREEWORLD_PDF_POOL_PAGES    concurrent render slots (default 2)
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+PDF_OPTIONS = {
+    "format": "Letter",
+    "print_background": True,
+    "margin": {"top": "0", "right": "0", "bottom": "0", "left": "0"},
+}
+
+
+class PoolQueueFull(RuntimeError):
+    """Raised when more renders are waiting than the pool accepts"""
+
+
+@contextmanager
+def atomic_output(output_path: str) -> Iterator[str]:
+    """Yield a temp path next to output_path; rename it over output_path only if the block succeeds"""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(output_path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class BrowserPool:
+    def __init__(self, max_pages: int = 2, max_queue: int = 32, render_timeout: float = 60.0,
+                 max_uses_per_page: int = 100, launch_args: Optional[list] = None):
+        self.max_pages = max_pages
+        self.max_queue = max_queue
+        self.render_timeout = render_timeout
+        self.max_uses_per_page = max_uses_per_page
+        self.launch_args = launch_args or []
+        self.stats = {"renders": 0, "failures": 0, "launches": 0, "page_recycles": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._start_lock = threading.Lock()
+        self._admission = threading.BoundedSemaphore(max_pages + max_queue)
+
+        # Owned by the pool thread
+        self._playwright = None
+        self._browser = None
+        self._slots: Optional[asyncio.Queue] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def start(self) -> "BrowserPool":
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return self
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run_loop, name="pdf-browser-pool", daemon=True)
+            self._thread.start()
+        if not self._started.wait(timeout=30):
+            raise RuntimeError("PDF browser pool failed to start")
+        return self
+
+    def _run_loop(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._slots = asyncio.Queue()
+        self._launch_lock = asyncio.Lock()
+        for _ in range(self.max_pages):
+            self._slots.put_nowait({"context": None, "page": None, "uses": 0})
+        self._started.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    def _submit(self, coro, timeout: Optional[float]):
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # Stop the work on the pool thread rather than let it finish behind the caller
+            raise
+
+    def shutdown(self) -> None:
+        """Close pages, browser and Playwright, then stop the pool thread"""
+        if not self._loop or not self._thread or not self._thread.is_alive():
+            return
+        try:
+            self._submit(self._close_browser(), timeout=15)
+        except Exception as e:
+            print(f"⚠️ PDF browser pool shutdown: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=15)
+        self._thread = None
+
+    # ---- browser management (pool thread) ---------------------------------
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._browser is not None:
+                print("🔁 PDF browser disconnected - relaunching")
+                await self._close_browser(stop_playwright=False)
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(args=self.launch_args)
+            self.stats["launches"] += 1
+            return self._browser
+
+    async def _close_browser(self, stop_playwright: bool = True) -> None:
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if stop_playwright and self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    async def _reset_slot(self, slot) -> None:
+        context = slot.get("context")
+        slot.update({"context": None, "page": None, "uses": 0})
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _render(self, html: str, output_path: str) -> str:
+        slot = await self._slots.get()
+        try:
+            browser = await self._ensure_browser()
+            page = slot["page"]
+            stale = (
+                page is None
+                or page.is_closed()
+                or slot["context"].browser is not browser
+                or slot["uses"] >= self.max_uses_per_page
+            )
+            if stale:
+                if slot["page"] is not None:
+                    self.stats["page_recycles"] += 1
+                await self._reset_slot(slot)
+                slot["context"] = await browser.new_context()
+                slot["page"] = page = await slot["context"].new_page()
+
+            with tempfile.TemporaryDirectory() as tmp, atomic_output(output_path) as pdf_path:
+                p = Path(tmp) / "report.html"
+                p.write_text(html, encoding="utf-8")
+                await page.goto(p.as_uri(), wait_until="networkidle")
+                await page.pdf(path=pdf_path, **PDF_OPTIONS)
+            slot["uses"] += 1
+            self.stats["renders"] += 1
+            return output_path
+        except (Exception, asyncio.CancelledError):
+            self.stats["failures"] += 1
+            await self._reset_slot(slot)  # Never hand a half-broken (or timed-out) page to the next caller
+            raise
+        finally:
+            self._slots.put_nowait(slot)
+
+    async def _health(self) -> bool:
+        browser = await self._ensure_browser()
+        return browser.is_connected()
+
+    # ---- public API (any thread) ------------------------------------------
+
+    def render_pdf(self, html: str, output_path: str, timeout: Optional[float] = None) -> str:
+        """
+        Render HTML to a PDF file using a pooled page
+
+        Args:
+            html: Full HTML document
+            output_path: Destination PDF path
+            timeout: Seconds to wait for a slot plus render (defaults to render_timeout);
+                on expiry the render is cancelled and TimeoutError raised
+
+        Returns:
+            output_path
+        """
+        if not self._admission.acquire(blocking=False):
+            raise PoolQueueFull(f"PDF render queue full ({self.max_queue} waiting)")
+        try:
+            self.start()
+            return self._submit(self._render(html, output_path), timeout or self.render_timeout)
+        finally:
+            self._admission.release()
+
+    def health_check(self, timeout: float = 30.0) -> bool:
+        """True when the browser is up (relaunching it if it had crashed)"""
+        try:
+            self.start()
+            return self._submit(self._health(), timeout)
+        except Exception as e:
+            print(f"⚠️ PDF browser pool unhealthy: {e}")
+            return False
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def pool_enabled() -> bool:
+    return os.getenv("FREEWORLD_PDF_BROWSER_POOL", "on").strip().lower() not in ("off", "false", "0")
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool, created on first use and shut down at interpreter exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(max_pages=int(os.getenv("FREEWORLD_PDF_POOL_PAGES", "2")))
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def shutdown_browser_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -1,5 +1,6 @@
 # pdf/html_pdf_generator.py
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
 from pathlib import Path
 from typing import List, Dict
 import datetime as _dt
@@ -15,15 +16,48 @@ STATIC = BASE / "static"
 ASSETS = BASE / "assets"
 OUTFIT_FONT_DIR = BASE / "Outfit" / "static"
 
+# auto_reload is off so the per-job {% include %} doesn't stat the template on every
+# card; _refresh_template_cache() checks the templates/ mtimes once per render instead.
 env = Environment(
     loader=FileSystemLoader(str(TEMPLATES)),
-    autoescape=select_autoescape()
+    autoescape=select_autoescape(),
+    auto_reload=False,
 )
 
+# Process-wide render caches, invalidated by file mtime
+_asset_cache: Dict[Path, tuple] = {}
+_template_mtimes: Dict[str, int] = {}
+
+def _refresh_template_cache() -> None:
+    """Drop compiled templates when any file in templates/ has changed."""
+    global _template_mtimes
+    try:
+        mtimes = {p.name: p.stat().st_mtime_ns for p in TEMPLATES.glob("*.html")}
+    except OSError:
+        mtimes = {}
+    if mtimes != _template_mtimes:
+        if env.cache is not None:
+            env.cache.clear()
+        _template_mtimes = mtimes
+
+def clear_render_caches() -> None:
+    """Forget cached assets and compiled templates (benchmarks / tests)."""
+    global _template_mtimes
+    _asset_cache.clear()
+    _template_mtimes = {}
+    if env.cache is not None:
+        env.cache.clear()
+
 def _encode_asset_base64(path: Path) -> str:
-    """Reads an asset file and returns its base64 encoded string."""
-    if not path.exists():
+    """Reads an asset file and returns its base64 encoded string (cached until the file changes)."""
+    try:
+        stat = path.stat()
+    except OSError:
         return ""
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _asset_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
     try:
         mime_types = {
             ".jpg": "image/jpeg",
@@ -36,9 +70,11 @@ def _encode_asset_base64(path: Path) -> str:
         
         with open(path, "rb") as asset_file:
             encoded_string = base64.b64encode(asset_file.read()).decode("utf-8")
-        return f"data:{mime};base64,{encoded_string}"
+        encoded = f"data:{mime};base64,{encoded_string}"
     except Exception:
         return ""
+    _asset_cache[path] = (key, encoded)
+    return encoded
 
 def jobs_dataframe_to_dicts(df, candidate_id: str = None) -> List[Dict]:
     def _sanitize_html(val: str) -> str:
@@ -246,8 +282,17 @@ def jobs_dataframe_to_dicts(df, candidate_id: str = None) -> List[Dict]:
         })
     return rows
 
-def render_jobs_html(jobs: List[Dict], agent_params=None, *, fragment: bool = False) -> str:
-    """Renders the full report with header + multiple .page job cards."""
+def render_jobs_html(jobs: List[Dict], agent_params=None, *, fragment: bool = False,
+                     debug_payload: bool = None) -> str:
+    """Renders the full report with header + multiple .page job cards.
+
+    Args:
+        jobs: Job dicts from jobs_dataframe_to_dicts
+        agent_params: Agent/coach settings for the title page
+        fragment: Return <style> + body markup + <script> for portal injection
+        debug_payload: Prefix fragments with a DEBUG_JOBS_DATA comment listing every job
+            (defaults to FREEWORLD_HTML_DEBUG_JOBS=1)
+    """
     agent_params = agent_params or {}
     location = agent_params.get("location") or "Unknown"
     
@@ -323,6 +368,8 @@ def render_jobs_html(jobs: List[Dict], agent_params=None, *, fragment: bool = Fa
         "wordmark_logo": wordmark,
         "icon_logo": icon,
     }
+    # base64 data URIs never contain escapable characters; Markup skips autoescaping megabytes per render
+    assets = {name: Markup(uri) for name, uri in assets.items()}
 
     # Optionally hide job cards entirely via env flag (for quick QA/lockdown)
     if os.getenv('FREEWORLD_PORTAL_HIDE_JOBS', '0') == '1':
@@ -332,51 +379,71 @@ def render_jobs_html(jobs: List[Dict], agent_params=None, *, fragment: bool = Fa
     # The Free Agent portal must only show the canonical tracked link provided by the pipeline.
     # If a job does not have meta.tracked_url, we intentionally leave the link blank.
 
+    _refresh_template_cache()
+    context = dict(
+        location=location,
+        generated_on=generated_on,
+        total_jobs=total,
+        jobs=jobs,
+        assets=assets,
+        agent_name=agent_first,
+        coach_name=coach_first,
+        candidate_id=candidate_id,
+        agent_params=agent_params,
+    )
+
+    if fragment:
+        if debug_payload is None:
+            debug_payload = os.getenv('FREEWORLD_HTML_DEBUG_JOBS', '0') == '1'
+        try:
+            return _render_fragment(context, debug_payload)
+        except Exception as e:
+            print(f"Error rendering report fragment: {e}")
+            return f"<h1>Error rendering report</h1><p>{e}</p>"
+
     tmpl = env.get_template("report.html")
     try:
-        html = tmpl.render(
-            location=location,
-            generated_on=generated_on,
-            total_jobs=total,
-            jobs=jobs,
-            assets=assets,
-            agent_name=agent_first,
-            coach_name=coach_first,
-            candidate_id=candidate_id,
-            agent_params=agent_params,
-        )
+        return tmpl.render(**context)
     except Exception as e:
         print(f"Error rendering report.html template: {e}")
         return f"<h1>Error rendering report</h1><p>{e}</p>"
 
-    if not fragment:
-        return html
 
-    # Extract CSS from <style> tags
-    style_match = re.search(r"<style>(.*?)</style>", html, flags=re.DOTALL|re.IGNORECASE)
-    css_content = style_match.group(1).strip() if style_match else ""
+def _render_fragment(context: Dict, debug_payload: bool) -> str:
+    """Portal fragment built from the report partials (no regex over the rendered document)."""
+    css_content = env.get_template("_report_styles.html").render(**context).strip()
+    body_content = env.get_template("_report_body.html").render(**context).strip()
+    js_content = env.get_template("_report_scripts.html").render(**context).strip()
 
-    # Extract JavaScript from <script> tags
-    script_matches = re.findall(r"<script[^>]*>(.*?)</script>", html, flags=re.DOTALL|re.IGNORECASE)
-    js_content = "\n".join(match.strip() for match in script_matches if match.strip())
-
-    # Return only what's inside <body>...</body> for portal injection
-    body_match = re.search(r"<body[^>]*>(.*)</body>", html, flags=re.DOTALL|re.IGNORECASE)
-    body_content = body_match.group(1).strip() if body_match else html
-
-    # Add debug comment with jobs data
-    debug_jobs_comment = f"<!-- DEBUG_JOBS_DATA: {jobs} -->"
-    body_content = f"{debug_jobs_comment}\n{body_content}"
-
-    # Include CSS and JavaScript in fragment
-    result = f"<style>{css_content}</style>"
+    parts = ["<style>", css_content, "</style>"]
+    if debug_payload:
+        parts.append(f"\n<!-- DEBUG_JOBS_DATA: {context['jobs']} -->")
+    parts += ["\n", body_content]
+    # Script goes after the cards (as in the full report) and is emitted once
     if js_content:
-        result += f"\n<script>{js_content}</script>"
-    result += body_content
-    return result
+        parts += ["\n<script>", js_content, "</script>"]
+    return "".join(parts)
 
 
 def export_pdf_playwright(html: str, output_path: str):
+    """Render HTML to PDF on the shared browser pool, cold-launching Chromium if the pool fails"""
+    try:
+        from pdf.browser_pool import atomic_output, get_browser_pool, pool_enabled
+    except ImportError:
+        from browser_pool import atomic_output, get_browser_pool, pool_enabled
+
+    if pool_enabled():
+        try:
+            get_browser_pool().render_pdf(html, output_path)
+            return
+        except Exception as e:
+            print(f"⚠️ Pooled PDF render failed ({e}) - falling back to a fresh browser")
+    # Own temp file, renamed into place: a cancelled pooled render can't interleave with this one
+    with atomic_output(output_path) as pdf_path:
+        export_pdf_playwright_cold(html, pdf_path)
+
+def export_pdf_playwright_cold(html: str, output_path: str):
+    """Launch a dedicated Chromium for one PDF (pre-pool behaviour; also the benchmark baseline)"""
     from playwright.sync_api import sync_playwright
     from pathlib import Path
     import tempfile
@@ -3,18 +3,77 @@ Pipeline Performance Monitor
 
 Tracks timing, cost, and performance metrics for the FreeWorld job processing pipeline.
 Provides detailed logging, memory usage optimization, and API rate limiting.
+
+FreeWorldPipelineV3 registers its monitor with set_active_monitor(); API clients
+(Outscraper, OpenAI, Supabase, Short.io) report through track_external_call() /
+record_external_call(), which are no-ops when no run is being monitored. The
+active monitor is a context variable, so concurrent runs in one process keep
+their calls apart; worker threads a run starts run in a copy of its context.
 """
 
 import time
-import psutil
 import os
 import json
+import contextvars
 import logging
+import statistics
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 
+try:
+    import psutil
+except ImportError:  # Optional: fall back to /proc for RSS, no CPU percent
+    psutil = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: history updates are serialized within the process only
+    fcntl = None
+
+METRICS_DIR = Path('logs/metrics')
+HISTORY_FILE = METRICS_DIR / 'history.jsonl'
+HISTORY_LIMIT = 200  # Rolling window of runs kept for trend analysis
+_history_lock = threading.Lock()
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (0.0 if unavailable)"""
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_info().rss / 1024 / 1024
+        except Exception:
+            pass
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except Exception:
+        return 0.0
+
+
+class _PeakRssSampler:
+    """Background thread sampling RSS so short allocation spikes inside a stage are seen"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def stop(self) -> float:
+        self._stop.set()
+        self._thread.join(timeout=1)
+        return max(self.peak, current_rss_mb())
+
 @dataclass
 class StageMetrics:
     """Metrics for a single pipeline stage"""
@@ -29,6 +88,12 @@ class StageMetrics:
     jobs_processed: int
     errors_count: int
     success_rate: float
+    rows_in: int = 0
+    rows_out: int = 0
+    peak_rss_delta_mb: float = 0.0
+    checkpoint_seconds: float = 0.0
+    # service -> {'calls', 'errors', 'total_seconds'}
+    external_calls: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
 @dataclass  
 class PipelineRunMetrics:
@@ -47,6 +112,75 @@ class PipelineRunMetrics:
     mode: str
     success: bool
     error_message: Optional[str] = None
+    external_calls: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    checkpoint_seconds: float = 0.0
+    # Classifier description tokens before / after compaction
+    description_tokens: Dict[str, int] = field(default_factory=dict)
+
+    def stage_table(self) -> str:
+        """One line per stage: time, rows, memory, checkpoint and external calls"""
+        lines = []
+        for st in self.stages:
+            calls = ', '.join(
+                f"{svc} {int(c['calls'])}x/{c['total_seconds']:.1f}s" for svc, c in st.external_calls.items()
+            )
+            lines.append(
+                f"{st.stage_name:<22} {st.duration_seconds:>7.2f}s  rows {st.rows_in:>5} → {st.rows_out:<5} "
+                f"rss +{st.peak_rss_delta_mb:>6.1f}MB  ckpt {st.checkpoint_seconds:>5.2f}s  {calls}"
+            )
+        return '\n'.join(lines)
+
+
+# Per run, not per process: concurrent runs (Streamlit sessions run on their own threads)
+# each report to their own monitor. Threads a run starts must run in contextvars.copy_context()
+_active_monitor: contextvars.ContextVar = contextvars.ContextVar('freeworld_active_monitor', default=None)
+
+
+def set_active_monitor(monitor: Optional['PerformanceMonitor']) -> contextvars.Token:
+    """Route record_external_call() in this thread / asyncio task to this monitor (None to detach)
+
+    Returns:
+        Token for reset_active_monitor()
+    """
+    return _active_monitor.set(monitor)
+
+
+def reset_active_monitor(token: contextvars.Token) -> None:
+    """Restore the monitor that was active before set_active_monitor() returned token"""
+    try:
+        _active_monitor.reset(token)
+    except ValueError:  # Token from another context: just detach this one
+        _active_monitor.set(None)
+
+
+def get_active_monitor() -> Optional['PerformanceMonitor']:
+    return _active_monitor.get()
+
+
+def record_external_call(service: str, seconds: float, error: bool = False, cost: float = 0.0) -> None:
+    """Report one external API call to the active monitor, if any"""
+    monitor = _active_monitor.get()
+    if monitor is not None:
+        monitor.record_external_call(service, seconds, error=error, cost=cost)
+
+
+def record_description_compaction(tokens_before: int, tokens_after: int) -> None:
+    """Report classifier description tokens before / after compaction to the active monitor, if any"""
+    monitor = _active_monitor.get()
+    if monitor is not None:
+        monitor.record_description_compaction(tokens_before, tokens_after)
+
+
+@contextmanager
+def track_external_call(service: str):
+    """Time the wrapped call and report it (an exception counts as an error)"""
+    start = time.time()
+    try:
+        yield
+    except Exception:
+        record_external_call(service, time.time() - start, error=True)
+        raise
+    record_external_call(service, time.time() - start)
 
 class PerformanceMonitor:
     """Performance monitoring and optimization for pipeline runs"""
@@ -60,6 +194,18 @@ class PerformanceMonitor:
         self.run_start_datetime = datetime.now(timezone.utc)
         
         # Performance tracking
+        self._lock = threading.Lock()
+        self._stage_api_calls = 0
+        self._stage_cost = 0.0
+        self._stage_errors = 0
+        self._stage_calls: Dict[str, Dict[str, float]] = {}
+        self._stage_rows_in = 0
+        self._stage_rss_start = 0.0
+        self._stage_checkpoint_seconds = 0.0
+        self._rss_sampler: Optional[_PeakRssSampler] = None
+        self.external_calls: Dict[str, Dict[str, float]] = {}
+        self.checkpoint_seconds = 0.0
+        self.description_tokens = {'before': 0, 'after': 0}
         self.memory_peak = 0.0
         self.total_api_calls = 0
         self.total_cost = 0.0
@@ -81,10 +227,11 @@ class PerformanceMonitor:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         ))
         self.logger.addHandler(file_handler)
+        self._file_handler = file_handler
         
         self.logger.info(f"Performance monitoring started for run: {self.run_id}")
     
-    def start_stage(self, stage_name: str) -> None:
+    def start_stage(self, stage_name: str, rows_in: int = 0) -> None:
         """Start monitoring a pipeline stage"""
         if self.current_stage:
             self.logger.warning(f"Stage {self.current_stage} not properly ended before starting {stage_name}")
@@ -94,14 +241,20 @@ class PerformanceMonitor:
         self.stage_start_time = time.time()
         
         # Reset stage-specific counters
-        self._stage_api_calls = 0
-        self._stage_cost = 0.0
-        self._stage_errors = 0
+        with self._lock:
+            self._stage_api_calls = 0
+            self._stage_cost = 0.0
+            self._stage_errors = 0
+            self._stage_calls = {}
+            self._stage_checkpoint_seconds = 0.0
+        self._stage_rows_in = rows_in
+        self._stage_rss_start = current_rss_mb()
+        self._rss_sampler = _PeakRssSampler()
         
         self.logger.info(f"Started stage: {stage_name}")
         print(f"🔄 Starting {stage_name}...")
     
-    def end_stage(self, jobs_processed: int = 0) -> StageMetrics:
+    def end_stage(self, jobs_processed: int = 0, rows_out: Optional[int] = None) -> StageMetrics:
         """End monitoring current stage and record metrics"""
         if not self.current_stage or not self.stage_start_time:
             raise ValueError("No stage currently being monitored")
@@ -110,12 +263,13 @@ class PerformanceMonitor:
         duration = end_time - self.stage_start_time
         
         # Get current system metrics
-        process = psutil.Process()
-        memory_mb = process.memory_info().rss / 1024 / 1024
-        cpu_percent = process.cpu_percent()
+        memory_mb = current_rss_mb()
+        cpu_percent = psutil.Process().cpu_percent() if psutil is not None else 0.0
+        stage_peak = self._rss_sampler.stop() if self._rss_sampler else memory_mb
+        self._rss_sampler = None
         
         # Update peak memory
-        self.memory_peak = max(self.memory_peak, memory_mb)
+        self.memory_peak = max(self.memory_peak, memory_mb, stage_peak)
         
         # Calculate success rate
         success_rate = 1.0 if self._stage_errors == 0 else max(0.0, 1.0 - (self._stage_errors / max(1, jobs_processed)))
@@ -131,7 +285,12 @@ class PerformanceMonitor:
             api_cost_usd=self._stage_cost,
             jobs_processed=jobs_processed,
             errors_count=self._stage_errors,
-            success_rate=success_rate
+            success_rate=success_rate,
+            rows_in=self._stage_rows_in,
+            rows_out=jobs_processed if rows_out is None else rows_out,
+            peak_rss_delta_mb=max(0.0, stage_peak - self._stage_rss_start),
+            checkpoint_seconds=self._stage_checkpoint_seconds,
+            external_calls={svc: dict(c) for svc, c in self._stage_calls.items()}
         )
         
         self.stages.append(stage_metrics)
@@ -152,11 +311,36 @@ class PerformanceMonitor:
     
     def log_api_call(self, service: str, cost: float = 0.0) -> None:
         """Log an API call and its cost"""
-        if self.current_stage:
-            self._stage_api_calls += 1
-            self._stage_cost += cost
-        
-        self.logger.debug(f"API call to {service}: ${cost:.4f}")
+        self.record_external_call(service, 0.0, cost=cost)
+    
+    def record_external_call(self, service: str, seconds: float, error: bool = False, cost: float = 0.0) -> None:
+        """Count an external call and its latency (thread-safe; clients call this concurrently)"""
+        with self._lock:
+            for bucket in (self.external_calls, self._stage_calls if self.current_stage else None):
+                if bucket is None:
+                    continue
+                stats = bucket.setdefault(service, {'calls': 0, 'errors': 0, 'total_seconds': 0.0})
+                stats['calls'] += 1
+                stats['errors'] += int(error)
+                stats['total_seconds'] += seconds
+            if self.current_stage:
+                self._stage_api_calls += 1
+                self._stage_cost += cost
+        
+        self.logger.debug(f"API call to {service}: {seconds * 1000:.0f}ms ${cost:.4f}")
+    
+    def record_checkpoint_write(self, seconds: float) -> None:
+        """Add checkpoint (parquet) write time to the current stage"""
+        with self._lock:
+            self.checkpoint_seconds += seconds
+            if self.current_stage:
+                self._stage_checkpoint_seconds += seconds
+    
+    def record_description_compaction(self, tokens_before: int, tokens_after: int) -> None:
+        """Add one classifier call's description tokens before / after compaction"""
+        with self._lock:
+            self.description_tokens['before'] += tokens_before
+            self.description_tokens['after'] += tokens_after
     
     def log_error(self, error_msg: str, stage: Optional[str] = None) -> None:
         """Log an error occurrence"""
@@ -195,11 +379,15 @@ class PerformanceMonitor:
             market=market,
             mode=mode,
             success=success,
-            error_message=error_message
+            error_message=error_message,
+            external_calls={svc: dict(c) for svc, c in self.external_calls.items()},
+            checkpoint_seconds=self.checkpoint_seconds,
+            description_tokens=dict(self.description_tokens)
         )
         
-        # Save metrics to file
+        # Save metrics to file and the rolling history
         self._save_metrics(metrics)
+        self._append_history(metrics)
         
         # Log summary
         self.logger.info(f"Pipeline run completed: {total_duration:.2f}s total")
@@ -213,12 +401,20 @@ class PerformanceMonitor:
         print(f"   💰 Cost: ${self.total_cost:.4f}")
         print(f"   🧠 Peak memory: {self.memory_peak:.1f}MB")
         print(f"   🔄 API calls: {self.total_api_calls}")
-        
+        for service, stats in self.external_calls.items():
+            avg_ms = stats['total_seconds'] / max(1, stats['calls']) * 1000
+            print(f"      {service}: {int(stats['calls'])} calls, {int(stats['errors'])} errors, avg {avg_ms:.0f}ms")
+        if self.description_tokens['before']:
+            saved = self.description_tokens['before'] - self.description_tokens['after']
+            print(f"   ✂️  Description tokens saved: {saved:,} of {self.description_tokens['before']:,}")
+        
+        self.logger.removeHandler(self._file_handler)
+        self._file_handler.close()
         return metrics
     
     def _save_metrics(self, metrics: PipelineRunMetrics) -> None:
         """Save metrics to JSON file"""
-        metrics_dir = Path('logs/metrics')
+        metrics_dir = METRICS_DIR
         metrics_dir.mkdir(parents=True, exist_ok=True)
         
         metrics_file = metrics_dir / f'{self.run_id}_metrics.json'
@@ -226,14 +422,119 @@ class PerformanceMonitor:
             json.dump(asdict(metrics), f, indent=2, default=str)
         
         print(f"📈 Metrics saved: {metrics_file}")
+    
+    def _append_history(self, metrics: PipelineRunMetrics) -> None:
+        """
+        Append to logs/metrics/history.jsonl, keeping the last HISTORY_LIMIT runs
+
+        Concurrent runs (threads, or processes via a lock file) take turns at the
+        read-trim-write, and the trimmed file replaces the old one atomically so a
+        crash never leaves a truncated history.
+        """
+        try:
+            METRICS_DIR.mkdir(parents=True, exist_ok=True)
+            with _history_lock, open(HISTORY_FILE.with_suffix('.lock'), 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)  # Released when lock_file closes
+                lines = HISTORY_FILE.read_text().splitlines() if HISTORY_FILE.exists() else []
+                lines.append(json.dumps(asdict(metrics), default=str))
+                tmp_path = HISTORY_FILE.with_name(f'{HISTORY_FILE.name}.{os.getpid()}.tmp')
+                tmp_path.write_text('\n'.join(lines[-HISTORY_LIMIT:]) + '\n')
+                os.replace(tmp_path, HISTORY_FILE)
+        except Exception as e:
+            self.logger.warning(f"Could not update metrics history: {e}")
 
 class PerformanceAnalyzer:
     """Analyze historical performance data"""
     
+    @staticmethod
+    def _from_dict(data: Dict[str, Any]) -> PipelineRunMetrics:
+        data = dict(data)
+        data['stages'] = [StageMetrics(**stage) for stage in data.get('stages', [])]
+        return PipelineRunMetrics(**data)
+    
+    @staticmethod
+    def load_history(limit: int = 50) -> List[PipelineRunMetrics]:
+        """Load the rolling run history (oldest first)"""
+        if not HISTORY_FILE.exists():
+            return []
+        runs = []
+        for line in HISTORY_FILE.read_text().splitlines()[-limit:]:
+            try:
+                runs.append(PerformanceAnalyzer._from_dict(json.loads(line)))
+            except Exception as e:
+                print(f"Skipping unreadable history entry: {e}")
+        return runs
+    
+    @staticmethod
+    def stage_trends(runs: List[PipelineRunMetrics]) -> Dict[str, Dict[str, Any]]:
+        """Per-stage duration series and median across successful runs"""
+        series: Dict[str, List[float]] = {}
+        for run in runs:
+            if not run.success:
+                continue
+            for stage in run.stages:
+                series.setdefault(stage.stage_name, []).append(stage.duration_seconds)
+        return {
+            name: {
+                'durations': values,
+                'median': statistics.median(values),
+                'latest': values[-1],
+            }
+            for name, values in series.items()
+        }
+    
+    @staticmethod
+    def detect_regressions(latest: PipelineRunMetrics, history: List[PipelineRunMetrics],
+                           threshold: float = 1.5, min_seconds: float = 0.5,
+                           min_runs: int = 3) -> List[str]:
+        """
+        Flag stages (and external services) that got slower than their history
+        
+        Args:
+            latest: Run to check
+            history: Earlier runs (latest is excluded by run_id)
+            threshold: Ratio over the historical median that counts as a regression
+            min_seconds: Ignore absolute slowdowns smaller than this
+            min_runs: Minimum comparable runs before flagging
+        
+        Returns:
+            Human-readable regression messages
+        """
+        baseline = [r for r in history if r.success and r.run_id != latest.run_id]
+        flags = []
+        
+        stage_history = PerformanceAnalyzer.stage_trends(baseline)
+        for stage in latest.stages:
+            past = stage_history.get(stage.stage_name)
+            if not past or len(past['durations']) < min_runs:
+                continue
+            median = past['median']
+            if stage.duration_seconds > median * threshold and stage.duration_seconds - median > min_seconds:
+                flags.append(
+                    f"{stage.stage_name}: {stage.duration_seconds:.2f}s vs median {median:.2f}s "
+                    f"({stage.duration_seconds / max(median, 1e-9):.1f}x)"
+                )
+        
+        for service, stats in latest.external_calls.items():
+            past_avgs = [
+                r.external_calls[service]['total_seconds'] / r.external_calls[service]['calls']
+                for r in baseline
+                if r.external_calls.get(service, {}).get('calls')
+            ]
+            if len(past_avgs) < min_runs or not stats.get('calls'):
+                continue
+            avg = stats['total_seconds'] / stats['calls']
+            median = statistics.median(past_avgs)
+            if median > 0 and avg > median * threshold:
+                flags.append(f"{service} latency: {avg * 1000:.0f}ms/call vs median {median * 1000:.0f}ms")
+        
+        return flags
+    
     @staticmethod
     def load_recent_runs(limit: int = 10) -> List[PipelineRunMetrics]:
         """Load recent pipeline run metrics"""
-        metrics_dir = Path('logs/metrics')
+        metrics_dir = METRICS_DIR
         if not metrics_dir.exists():
             return []
         
@@ -243,11 +544,7 @@ class PerformanceAnalyzer:
         for file_path in metrics_files:
             try:
                 with open(file_path) as f:
-                    data = json.load(f)
-                    # Convert stages back to StageMetrics objects
-                    stages = [StageMetrics(**stage) for stage in data['stages']]
-                    data['stages'] = stages
-                    runs.append(PipelineRunMetrics(**data))
+                    runs.append(PerformanceAnalyzer._from_dict(json.load(f)))
             except Exception as e:
                 print(f"Failed to load {file_path}: {e}")
         
@@ -377,10 +674,24 @@ if __name__ == '__main__':
     parser.add_argument('--benchmark', action='store_true', help='Run performance benchmark')
     parser.add_argument('--analyze', action='store_true', help='Analyze recent performance data')
     parser.add_argument('--report', action='store_true', help='Generate performance report')
+    parser.add_argument('--regressions', action='store_true', help='Check the latest run against the rolling history')
     
     args = parser.parse_args()
     
-    if args.benchmark:
+    if args.regressions:
+        history = PerformanceAnalyzer.load_history()
+        if not history:
+            print("No run history found. Run the pipeline first.")
+        else:
+            latest = history[-1]
+            print(f"📊 Latest run {latest.run_id} vs {len(history) - 1} previous runs")
+            print(latest.stage_table())
+            flags = PerformanceAnalyzer.detect_regressions(latest, history[:-1])
+            for flag in flags:
+                print(f"  ⚠️ {flag}")
+            if not flags:
+                print("  ✅ No regressions detected")
+    elif args.benchmark:
         benchmark_pipeline(args.market)
     elif args.analyze or args.report:
         analyzer = PerformanceAnalyzer()
@@ -10,6 +10,7 @@ import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 import uuid
+from dataclasses import asdict
 
 # Cache refresh marker - September 5, 2025 - Supabase filtering fix
 PIPELINE_CACHE_VERSION = "v3.1-supabase-filter-fix-20250905"
@@ -33,14 +34,7 @@ except ImportError:
 
 # Import existing modules (preserve all functionality) - with fallbacks for Streamlit Cloud
 try:
-    from job_scraper import FreeWorldJobScraper
-    from job_classifier import JobClassifier
-    from pathway_classifier import PathwayClassifier
-    from job_memory_db import JobMemoryDB
     from cost_calculator import CostCalculator
-    from simple_bypass_system import SimpleBypassSystem
-    from route_classifier import RouteClassifier
-    from free_agent_lookup import FreeAgentLookup
     from jobs_schema import (
         build_empty_df, ensure_schema, validate_dataframe, 
         prepare_for_supabase, get_schema_info, SUPABASE_FIELDS
@@ -52,16 +46,19 @@ try:
         apply_market_assignment, apply_tracked_urls,
         merge_dataframes, view_ready_for_ai, view_exportable, view_fresh_quality
     )
+    from vectorized_transforms import transform_normalize_vectorized, transform_business_rules_vectorized
+    from dedup_engine import deduplicate_jobs, extract_clean_url
     from shared_search import QUERY_LOCATION_OVERRIDES, MARKET_TO_LOCATION
+    from pipeline_performance_monitor import (
+        PerformanceMonitor, reset_active_monitor, set_active_monitor, track_external_call
+    )
+    from checkpoint_store import CheckpointWriter, load_checkpoint
+    from component_registry import ComponentRegistry, LazyComponent, get_component_registry
+    from outscraper_async_client import OutscraperAsyncClient, async_ingest_enabled, indeed_queries
+    from job_sorting_utils import unified_sort_order
 except ImportError:
     # Fallback imports for Streamlit Cloud (all files in same directory)
-    from job_scraper import FreeWorldJobScraper
-    from job_classifier import JobClassifier
-    from pathway_classifier import PathwayClassifier
-    from job_memory_db import JobMemoryDB
     from cost_calculator import CostCalculator
-    from simple_bypass_system import SimpleBypassSystem
-    from route_classifier import RouteClassifier
     from jobs_schema import (
         build_empty_df, ensure_schema, validate_dataframe, 
         prepare_for_supabase, get_schema_info, SUPABASE_FIELDS
@@ -73,7 +70,61 @@ except ImportError:
         apply_market_assignment, apply_tracked_urls,
         merge_dataframes, view_ready_for_ai, view_exportable, view_fresh_quality
     )
+    from vectorized_transforms import transform_normalize_vectorized, transform_business_rules_vectorized
+    from dedup_engine import deduplicate_jobs, extract_clean_url
     from shared_search import QUERY_LOCATION_OVERRIDES, MARKET_TO_LOCATION
+    from pipeline_performance_monitor import (
+        PerformanceMonitor, reset_active_monitor, set_active_monitor, track_external_call
+    )
+    from checkpoint_store import CheckpointWriter, load_checkpoint
+    from component_registry import ComponentRegistry, LazyComponent, get_component_registry
+    from outscraper_async_client import OutscraperAsyncClient, async_ingest_enabled, indeed_queries
+    from job_sorting_utils import unified_sort_order
+
+# Pipeline dependencies are built on first use through the component registry.
+# Imports live in the factories so memory-only searches skip the scraper/OpenAI stack.
+def _build_scraper():
+    from job_scraper import FreeWorldJobScraper
+    return FreeWorldJobScraper()
+
+def _build_cdl_classifier():
+    from job_classifier import JobClassifier
+    return JobClassifier()
+
+def _build_pathway_classifier():
+    from pathway_classifier import PathwayClassifier
+    return PathwayClassifier()
+
+def _build_memory_db():
+    from job_memory_db import JobMemoryDB
+    return JobMemoryDB()
+
+def _build_bypass_system():
+    from simple_bypass_system import SimpleBypassSystem
+    return SimpleBypassSystem()
+
+def _build_route_classifier():
+    from route_classifier import get_route_classifier
+    return get_route_classifier()
+
+def _build_free_agent_lookup():
+    from free_agent_lookup import FreeAgentLookup
+    return FreeAgentLookup()
+
+PIPELINE_COMPONENTS = {
+    'scraper': _build_scraper,
+    'cdl_classifier': _build_cdl_classifier,
+    'pathway_classifier': _build_pathway_classifier,
+    'memory_db': _build_memory_db,
+    'bypass_system': _build_bypass_system,
+    'route_classifier': _build_route_classifier,
+    'free_agent_lookup': _build_free_agent_lookup,
+}
+
+# Components each entry point touches (used by warm_start and the startup benchmark)
+MEMORY_ONLY_COMPONENTS = ('memory_db', 'free_agent_lookup')
+COMPLETE_PIPELINE_COMPONENTS = tuple(PIPELINE_COMPONENTS)
+
 
 class FreeWorldPipelineV3:
     """
@@ -86,10 +137,25 @@ class FreeWorldPipelineV3:
     - Views instead of copies for filtering
     - Parquet storage for performance
     - Supabase for paid data only
+    - Components built lazily and shared across instances in one process
     """
     
-    def __init__(self):
-        """Initialize pipeline with all existing modules"""
+    # Existing modules (preserve functionality), constructed on first access
+    scraper = LazyComponent('scraper')
+    cdl_classifier = LazyComponent('cdl_classifier')
+    pathway_classifier = LazyComponent('pathway_classifier')
+    memory_db = LazyComponent('memory_db')
+    bypass_system = LazyComponent('bypass_system')
+    route_classifier = LazyComponent('route_classifier')
+    free_agent_lookup = LazyComponent('free_agent_lookup')
+    
+    def __init__(self, components: Optional[ComponentRegistry] = None):
+        """
+        Initialize pipeline (components are constructed on first use)
+        
+        Args:
+            components: Registry to resolve dependencies from (default: process-wide)
+        """
 
         # Generate unique run ID for this pipeline execution
         self.run_id = f"pipeline_v3_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
@@ -100,19 +166,28 @@ class FreeWorldPipelineV3:
         # Track Supabase upload count for UI display
         self.supabase_upload_count = 0
         
-        # Initialize all existing modules (preserve functionality)
-        self.scraper = FreeWorldJobScraper()
-        self.cdl_classifier = JobClassifier()
-        self.pathway_classifier = PathwayClassifier()
-        self.memory_db = JobMemoryDB()
+        # Stage telemetry (created per run in run_complete_pipeline)
+        self.perf_monitor = None
+        self._monitor_token = None
+        
+        # Background checkpoint writer (created per run in run_complete_pipeline)
+        self.checkpoint_writer = None
+        
+        # Existing modules resolve lazily from the registry (see PIPELINE_COMPONENTS)
         # Airtable upload disabled: pipeline only writes to Supabase (memory store)
-        self.bypass_system = SimpleBypassSystem()
-        self.route_classifier = RouteClassifier()
-        self.free_agent_lookup = FreeAgentLookup()
+        self.components = components or get_component_registry()
+        for name, factory in PIPELINE_COMPONENTS.items():
+            self.components.register(name, factory)
         
         # Cost tracking for different sources
         self.google_api_cost = 0.0
         
+        # Shared classification cache counters at run start (stats report this run's lookups only)
+        self._cache_stats_at_start: Dict[str, int] = {}
+        
+        # Indeed queries that failed async and returned nothing on the synchronous retry
+        self.indeed_failed_queries: List[str] = []
+        
         # Output directory setup
         self.output_dir = self._get_output_path()
         os.makedirs(self.output_dir, exist_ok=True)
@@ -124,13 +199,9 @@ class FreeWorldPipelineV3:
         # Schema info for provenance
         self.schema_info = get_schema_info()
         
-        # Get Free Agent data once during initialization (from environment)
-        self.agent_data = self.free_agent_lookup.get_agent_data_from_environment()
-        if self.agent_data:
-            agent_name = self.agent_data.get('agent.name', 'Unknown Agent')
-            print(f"👤 Free Agent integrated: {agent_name}")
-        else:
-            print("👤 No Free Agent specified (set FREEWORLD_CANDIDATE_ID/NAME for personalization)")
+        # Free Agent data is looked up from the environment on first access
+        self._agent_data_loaded = False
+        self._agent_data = None
         
         # Initialize query location overrides
         self._query_location_overrides = QUERY_LOCATION_OVERRIDES
@@ -159,6 +230,41 @@ class FreeWorldPipelineV3:
         current_dir = os.getcwd()
         return os.path.join(current_dir, "FreeWorld_Jobs")
     
+    @property
+    def agent_data(self) -> Optional[Dict[str, str]]:
+        """Free Agent data from the environment, looked up on first access"""
+        if not self._agent_data_loaded:
+            self._agent_data_loaded = True
+            self._agent_data = self.free_agent_lookup.get_agent_data_from_environment()
+            if self._agent_data:
+                agent_name = self._agent_data.get('agent.name', 'Unknown Agent')
+                print(f"👤 Free Agent integrated: {agent_name}")
+            else:
+                print("👤 No Free Agent specified (set FREEWORLD_CANDIDATE_ID/NAME for personalization)")
+        return self._agent_data
+    
+    @agent_data.setter
+    def agent_data(self, value: Optional[Dict[str, str]]) -> None:
+        self._agent_data_loaded = True
+        self._agent_data = value
+    
+    def warm_start(self, memory_only: bool = False) -> Dict[str, float]:
+        """
+        Construct the components an entry point needs before the first search
+        
+        Args:
+            memory_only: Only warm what run_memory_only_search uses
+        
+        Returns:
+            Construction time per component built by this call
+        """
+        names = MEMORY_ONLY_COMPONENTS if memory_only else COMPLETE_PIPELINE_COMPONENTS
+        try:
+            return self.components.warm(names)
+        except Exception as e:
+            print(f"⚠️ Warm start failed: {e}")
+            return {}
+    
     def run_memory_only_search(
         self,
         location: str,
@@ -322,39 +428,9 @@ class FreeWorldPipelineV3:
             
             # Sort by quality, fair chance, and recency (newest good + fair chance jobs first)
             if 'ai.match' in filtered_df.columns:
-                # Create priority score: Good + Fair Chance = highest priority
-                def get_priority_score(row):
-                    ai_match = str(row.get('ai.match', '')).lower()
-                    fair_chance = str(row.get('ai.fair_chance', '')).lower()
-                    
-                    is_good = ai_match == 'good'
-                    is_soso = ai_match == 'so-so'  
-                    is_fair = 'fair_chance_employer' in fair_chance or fair_chance in ['true', 'yes', '1']
-                    
-                    if is_good and is_fair:
-                        return 1  # Highest priority
-                    elif is_good:
-                        return 2
-                    elif is_soso and is_fair:
-                        return 3
-                    elif is_soso:
-                        return 4
-                    else:
-                        return 5  # Lowest priority
-                
-                filtered_df['_priority'] = filtered_df.apply(get_priority_score, axis=1)
-                
-                # Sort by priority, then by recency (use created_at or sys.scraped_at)
+                # Priority: Good + Fair Chance first (no route tier), then by recency (created_at or sys.scraped_at)
                 time_col = 'sys.created_at' if 'sys.created_at' in filtered_df.columns else 'created_at' if 'created_at' in filtered_df.columns else 'sys.scraped_at'
-                if time_col in filtered_df.columns:
-                    filtered_df = filtered_df.sort_values(
-                        by=['_priority', time_col],
-                        ascending=[True, False]  # Lower priority score = higher priority, newest first
-                    )
-                else:
-                    filtered_df = filtered_df.sort_values(by='_priority', ascending=True)
-                
-                filtered_df.drop(columns=['_priority'], inplace=True)
+                filtered_df = filtered_df.iloc[unified_sort_order(filtered_df, by_route=False, newest_first=time_col)]
                 print(f"📊 Sorted by priority: newest good + fair chance jobs first")
             
             # Take top N jobs for output
@@ -387,8 +463,9 @@ class FreeWorldPipelineV3:
                         print(f"🔗 Generating tracking URLs for {len(jobs_to_process)} memory jobs without tracking")
                     
                     if link_tracker.is_available:
+                        link_rows = []
+                        link_requests = []
                         for idx, row in jobs_to_process.iterrows():
-                            job_id = row['id.job']
                             original_url = row.get('source.url', '')
                             
                             if original_url and original_url.startswith('http'):
@@ -406,19 +483,23 @@ class FreeWorldPipelineV3:
                                     tags.append(f"route:{row.get('ai.route_type')}")
                                 
                                 job_title = row.get('source.title', 'CDL Position')[:50]
-                                tracked_url = link_tracker.create_short_link(
-                                    original_url,
-                                    title=f"Memory: {job_title}",
-                                    tags=tags,
-                                    candidate_id=candidate_id
-                                )
-                                
-                                if tracked_url and tracked_url != original_url:
-                                    final_df.at[idx, 'meta.tracked_url'] = tracked_url
-                                    print(f"🔗 Generated tracking URL for {job_id[:8]}")
-                                else:
-                                    final_df.at[idx, 'meta.tracked_url'] = original_url
-                                    print(f"⚠️ Using original URL for {job_id[:8]}")
+                                link_rows.append((idx, row['id.job'], original_url))
+                                link_requests.append({
+                                    'url': original_url,
+                                    'title': f"Memory: {job_title}",
+                                    'tags': tags,
+                                    'candidate_id': candidate_id,
+                                })
+                        
+                        # One concurrent, rate-limited batch instead of a POST per row
+                        tracked_urls = link_tracker.create_short_links(link_requests)
+                        for (idx, job_id, original_url), tracked_url in zip(link_rows, tracked_urls):
+                            if tracked_url and tracked_url != original_url:
+                                final_df.at[idx, 'meta.tracked_url'] = tracked_url
+                                print(f"🔗 Generated tracking URL for {job_id[:8]}")
+                            else:
+                                final_df.at[idx, 'meta.tracked_url'] = original_url
+                                print(f"⚠️ Using original URL for {job_id[:8]}")
                         
                         print(f"✅ Link generation complete for memory search")
                         
@@ -678,8 +759,23 @@ class FreeWorldPipelineV3:
         # Initialize canonical DataFrame
         canonical_df = build_empty_df()
         
+        self._cache_stats_at_start = CostCalculator.shared_classification_cache_stats()
+        
+        # Stage telemetry: wall time, rows, RSS, external calls, checkpoint time
+        try:
+            self.perf_monitor = PerformanceMonitor(run_id=self.run_id)
+            self._monitor_token = set_active_monitor(self.perf_monitor)
+        except Exception as e:
+            print(f"⚠️ Performance telemetry disabled: {e}")
+            self.perf_monitor = None
+        
+        # Checkpoints are serialized off the pipeline thread as column-group deltas
+        self.checkpoint_writer = CheckpointWriter(self.parquet_dir, self.run_id, prepare=ensure_schema)
+        
+        error_message = None
         try:
             # STAGE 1: INGESTION
+            self._stage_start("01_ingestion", 0)
             canonical_df = self._stage1_ingestion(
                 canonical_df, location, mode_info, search_terms,
                 route_filter, force_fresh, force_memory_only,
@@ -689,68 +785,82 @@ class FreeWorldPipelineV3:
                 search_sources=search_sources,
                 search_strategy=search_strategy
             )
-            self._checkpoint_data(canonical_df, "01_ingestion")
-            
-            # SAFETY: Export CSV after ingestion to prevent job loss
-            if not canonical_df.empty:
-                ingestion_csv = os.path.join(self.parquet_dir, f"SAFETY_01_ingestion_{self.run_id}.csv")
-                canonical_df.to_csv(ingestion_csv, index=False)
-                print(f"💾 Safety export: {len(canonical_df)} jobs saved to {os.path.basename(ingestion_csv)}")
+            # SAFETY: Export CSV after ingestion to prevent job loss (written before the checkpoint is queued)
+            ingestion_csv = os.path.join(self.parquet_dir, f"SAFETY_01_ingestion_{self.run_id}.csv")
+            self._checkpoint_data(canonical_df, "01_ingestion", safety_csv=ingestion_csv)
+            self._stage_end(canonical_df)
             
             # STAGE 1.5: UPDATE JOB IDS WITH CLASSIFIER TYPE
+            self._stage_start("01_5_job_ids", len(canonical_df))
             canonical_df = self._update_job_ids_for_classifier(canonical_df, classifier_type)
             self._checkpoint_data(canonical_df, "01_5_job_ids")
+            self._stage_end(canonical_df)
 
             # STAGE 2: NORMALIZATION
+            self._stage_start("02_normalization", len(canonical_df))
             canonical_df = self._stage2_normalization(canonical_df)
             self._checkpoint_data(canonical_df, "02_normalization")
+            self._stage_end(canonical_df)
             
             # STAGE 3: BUSINESS RULES
+            self._stage_start("03_business_rules", len(canonical_df))
             canonical_df = self._stage3_business_rules(canonical_df, hardcoded_market or location, filter_settings)
             self._checkpoint_data(canonical_df, "03_business_rules")
+            self._stage_end(canonical_df)
             
             # STAGE 4: DEDUPLICATION
+            self._stage_start("04_deduplication", len(canonical_df))
             canonical_df = self._stage4_deduplication(canonical_df, filter_settings=filter_settings)
             self._checkpoint_data(canonical_df, "04_deduplication")
+            self._stage_end(canonical_df)
             
             # STAGE 5: AI CLASSIFICATION
+            self._stage_start("05_classification", len(canonical_df))
             canonical_df = self._stage5_ai_classification(canonical_df, force_fresh_classification, classifier_type)
-            self._checkpoint_data(canonical_df, "05_classification")
             
             # SAFETY: Export CSV after classification - CRITICAL for paid jobs!
+            classification_csv = os.path.join(self.parquet_dir, f"SAFETY_05_classified_{self.run_id}.csv")
+            self._checkpoint_data(canonical_df, "05_classification", safety_csv=classification_csv)
             if not canonical_df.empty:
-                classification_csv = os.path.join(self.parquet_dir, f"SAFETY_05_classified_{self.run_id}.csv")
-                canonical_df.to_csv(classification_csv, index=False)
-                quality_count = len(canonical_df[canonical_df['ai.match'].isin(['good', 'so-so'])])
+                quality_count = int(canonical_df['ai.match'].isin(['good', 'so-so']).sum())
                 print(f"💾 CRITICAL SAFETY: {len(canonical_df)} total jobs ({quality_count} quality) saved to {os.path.basename(classification_csv)}")
+            self._stage_end(canonical_df)
             
             # STAGE 5.5: ROUTE (RULES) - derive route type via rules-based classifier
+            self._stage_start("05_5_route_rules", len(canonical_df))
             canonical_df = self._stage5_5_route_rules(canonical_df)
             self._checkpoint_data(canonical_df, "05_5_route_rules")
+            self._stage_end(canonical_df)
 
             # STAGE 6: ROUTING
+            self._stage_start("06_routing", len(canonical_df))
             canonical_df = self._stage6_routing(canonical_df, route_filter)
-            self._checkpoint_data(canonical_df, "06_routing")
             
             # SAFETY: Export final processed CSV BEFORE output generation
+            final_csv = os.path.join(self.parquet_dir, f"SAFETY_FINAL_{self.run_id}.csv")
+            self._checkpoint_data(canonical_df, "06_routing", safety_csv=final_csv)
             if not canonical_df.empty:
-                final_csv = os.path.join(self.parquet_dir, f"SAFETY_FINAL_{self.run_id}.csv")
-                canonical_df.to_csv(final_csv, index=False)
-                quality_final = len(canonical_df[canonical_df['ai.match'].isin(['good', 'so-so'])])
+                quality_final = int(canonical_df['ai.match'].isin(['good', 'so-so']).sum())
                 print(f"💾 FINAL SAFETY BACKUP: {len(canonical_df)} jobs ({quality_final} quality) → {os.path.basename(final_csv)}")
+            self._stage_end(canonical_df)
             
             # STAGE 7: OUTPUT GENERATION
+            self._stage_start("07_output", len(canonical_df))
             results = self._stage7_output(
                 canonical_df, hardcoded_market or location, custom_location,
                 generate_pdf, generate_csv, generate_html, force_memory_only,
                 show_prepared_for
             )
+            self._stage_end(canonical_df)
             
             # STAGE 8: DATA STORAGE
+            self._stage_start("08_storage", len(canonical_df))
             self._stage8_storage(canonical_df, push_to_airtable)
             
-            # Final checkpoint - complete pipeline state
+            # Final checkpoint - complete pipeline state (always a full snapshot)
             self._checkpoint_data(canonical_df, "99_complete")
+            self._close_checkpoint_writer()
+            self._stage_end(canonical_df, rows_out=self.supabase_upload_count)
             
             # Calculate pipeline timing
             pipeline_end_time = time.time()
@@ -766,6 +876,11 @@ class FreeWorldPipelineV3:
             except Exception:
                 pass
             
+            results['performance'] = self._finalize_telemetry(
+                hardcoded_market or location, mode_info, results.get('total_jobs', len(canonical_df)),
+                len(canonical_df), success=True
+            )
+            
             print(f"✅ PIPELINE V3 COMPLETE: {results['summary']}")
             # Format processing time as minutes and seconds
             if processing_time >= 60:
@@ -781,46 +896,84 @@ class FreeWorldPipelineV3:
             
         except Exception as e:
             print(f"❌ Pipeline v3 failed: {e}")
+            error_message = str(e)
             # Save error state for debugging
-            self._checkpoint_data(canonical_df, "error")
+            try:
+                self._checkpoint_data(canonical_df, "error")
+            finally:
+                self._close_checkpoint_writer()
             raise
+        finally:
+            # The success path finalizes above; a failed run is recorded even if the error checkpoint raises
+            if self.perf_monitor is not None:
+                self._finalize_telemetry(
+                    hardcoded_market or location, mode_info, 0, len(canonical_df),
+                    success=False, error_message=error_message or 'Pipeline interrupted'
+                )
     
-    def _extract_clean_url(self, url: str) -> str:
-        """Extract clean URL for deduplication (remove tracking params)"""
-        import pandas as pd
-        if pd.isna(url) or not url or url == '':
-            return ''
+    def _stage_start(self, stage_name: str, rows_in: int) -> None:
+        """Begin telemetry for a stage (no-op when telemetry is unavailable)"""
+        if self.perf_monitor is None:
+            return
+        try:
+            self.perf_monitor.start_stage(stage_name, rows_in=rows_in)
+        except Exception as e:
+            print(f"⚠️ Telemetry start_stage failed: {e}")
+    
+    def _stage_end(self, df: pd.DataFrame, rows_out: Optional[int] = None) -> None:
+        """Close telemetry for the current stage with its output row count"""
+        if self.perf_monitor is None or not self.perf_monitor.current_stage:
+            return
+        try:
+            out = len(df) if rows_out is None else rows_out
+            self.perf_monitor.end_stage(jobs_processed=len(df), rows_out=out)
+        except Exception as e:
+            print(f"⚠️ Telemetry end_stage failed: {e}")
+    
+    def _finalize_telemetry(
+        self,
+        market: str,
+        mode_info: Dict[str, Any],
+        jobs_input: int,
+        jobs_output: int,
+        success: bool,
+        error_message: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Close the run's telemetry and append it to the rolling history
         
+        Returns:
+            Run report as a dict (stages, external calls, checkpoint time), or None
+        """
+        monitor = self.perf_monitor
+        if monitor is None:
+            return None
         try:
-            from urllib.parse import urlparse, parse_qs, urlencode
-            
-            # For Indeed URLs, extract job key
-            if 'indeed.com' in url and 'jk=' in url:
-                import re
-                match = re.search(r'jk=([a-zA-Z0-9]+)', url)
-                if match:
-                    return f"indeed_{match.group(1)}"
-            
-            # For other URLs, use the full path without query params
-            parsed = urlparse(url)
-            
-            # Keep only essential params (like job ID)
-            if parsed.query:
-                params = parse_qs(parsed.query)
-                essential_params = ['jk', 'jobid', 'id', 'job_id']
-                clean_params = {k: v for k, v in params.items() 
-                               if k.lower() in essential_params}
-                
-                if clean_params:
-                    clean_query = urlencode(clean_params, doseq=True)
-                    return f"{parsed.netloc}{parsed.path}?{clean_query}"
-            
-            # Return netloc + path (without query)
-            return f"{parsed.netloc}{parsed.path}"
-            
-        except Exception:
-            # Fallback: return original URL if parsing fails
-            return url
+            # A failed stage is still recorded so the report shows where time went
+            if monitor.current_stage:
+                monitor.end_stage(jobs_processed=0, rows_out=0)
+            report = monitor.finalize_run(
+                market=market,
+                mode=str(mode_info.get('mode', mode_info.get('limit', ''))),
+                jobs_input=jobs_input,
+                jobs_output=jobs_output,
+                success=success,
+                error_message=error_message
+            )
+            print(report.stage_table())
+            return asdict(report)
+        except Exception as e:
+            print(f"⚠️ Telemetry finalize failed: {e}")
+            return None
+        finally:
+            if self._monitor_token is not None:
+                reset_active_monitor(self._monitor_token)
+                self._monitor_token = None
+            self.perf_monitor = None
+    
+    def _extract_clean_url(self, url: str) -> str:
+        """Extract clean URL for deduplication (remove tracking params)"""
+        return extract_clean_url(url)
     
     def _stage1_ingestion(
         self,
@@ -958,6 +1111,8 @@ class FreeWorldPipelineV3:
         fresh_jobs = []
         google_jobs = []
         memory_jobs = []
+        indeed_streamed_df = None
+        self.indeed_failed_queries = []
         
         # Set default sources if not provided
         if search_sources is None:
@@ -999,16 +1154,8 @@ class FreeWorldPipelineV3:
                 if num_queries > 1:
                     print(f"   📊 Each query will get {effective_limit} jobs = up to {effective_limit * num_queries} total jobs")
 
-                encoded_location = query_location.replace(' ', '+').replace(',', '%2C')
-                indeed_urls = []
-
-                for term in search_terms_list:
-                    encoded_term = term.replace(' ', '+')
-                    indeed_url = f"https://www.indeed.com/jobs?q={encoded_term}&l={encoded_location}&radius={int(radius)}"
-                    if no_experience:
-                        # Add "no experience" search context
-                        indeed_url += "&sc=0kf%3Aattr%28D7S5D%29%3B"
-                    indeed_urls.append(indeed_url)
+                # One URL per term; no_experience adds Indeed's "no experience" search context
+                indeed_urls = indeed_queries(search_terms_list, [query_location], radius, no_experience)
 
                 search_params = {
                     'location': query_location,
@@ -1025,13 +1172,43 @@ class FreeWorldPipelineV3:
                     'limit': effective_limit
                 }
                 
-                result = self.scraper.run_full_search(search_params, scraper_mode_info)
-                # Handle list of raw Indeed jobs from scraper
-                if isinstance(result, list):
-                    fresh_jobs = result  # Already raw Indeed jobs
-                else:
+                def sync_search(urls):
+                    # One synchronous Outscraper request (the scraper's own async path is skipped)
+                    params = dict(search_params, indeed_urls=urls, outscraper_async=False)
+                    result = self.scraper.run_full_search(params, scraper_mode_info)
+                    # Handle list of raw Indeed jobs from scraper
+                    if isinstance(result, list):
+                        return result  # Already raw Indeed jobs
                     # Fallback for other formats
-                    fresh_jobs = result.get('jobs', []) if isinstance(result, dict) else []
+                    return result.get('jobs', []) if isinstance(result, dict) else []
+
+                if async_ingest_enabled():
+                    # Concurrent async requests; each page is transformed as soon as it lands
+                    try:
+                        client = OutscraperAsyncClient(self.scraper.api_key)
+                        print(f"⚡ Async Outscraper: {len(indeed_urls)} queries, {client.max_concurrent} in flight")
+                        indeed_streamed_df, fresh_jobs = client.ingest_indeed(
+                            indeed_urls, effective_limit, self.run_id, query_location
+                        )
+                        print(f"   ⏱️ {client.stats['seconds']:.1f}s (first page {client.stats['first_page_seconds'] or 0:.1f}s), "
+                              f"{client.stats['polls']} polls, {client.stats['failed']} failed queries")
+                        failed_queries = client.stats['failed_queries']
+                    except Exception as e:
+                        print(f"⚠️ Async Outscraper ingestion failed ({e}), using a synchronous request")
+                        indeed_streamed_df, fresh_jobs = None, sync_search(indeed_urls)
+                    else:
+                        if failed_queries:
+                            print(f"⚠️ Retrying {len(failed_queries)} failed async queries in a synchronous request")
+                            retried = sync_search(failed_queries)
+                            if retried:
+                                # Transform the combined raw jobs below instead of the streamed pages
+                                indeed_streamed_df, fresh_jobs = None, fresh_jobs + retried
+                            else:
+                                self.indeed_failed_queries = list(failed_queries)
+                                for query in failed_queries:
+                                    print(f"   ❌ No Indeed results for failed query: {query}")
+                else:
+                    fresh_jobs = sync_search(indeed_urls)
                 print(f"✅ Retrieved {len(fresh_jobs)} jobs from Indeed")
             except Exception as e:
                 print(f"⚠️ Indeed API failed: {e}")
@@ -1045,7 +1222,8 @@ class FreeWorldPipelineV3:
         memory_lookup = {}
         if all_fresh_jobs:
             job_ids = [self._generate_job_id_from_raw(job, classifier_type) for job in all_fresh_jobs]
-            memory_lookup = self.memory_db.check_job_memory(job_ids, hours=72)
+            with track_external_call('supabase'):
+                memory_lookup = self.memory_db.check_job_memory(job_ids, hours=72)
 
             if memory_lookup:
                 memory_jobs = list(memory_lookup.values())
@@ -1062,7 +1240,10 @@ class FreeWorldPipelineV3:
                     pass
         
         # Transform and merge data from all sources
-        indeed_df = transform_ingest_outscraper(fresh_jobs, self.run_id, query_location) if fresh_jobs else build_empty_df()
+        if indeed_streamed_df is not None:
+            indeed_df = indeed_streamed_df
+        else:
+            indeed_df = transform_ingest_outscraper(fresh_jobs, self.run_id, query_location) if fresh_jobs else build_empty_df()
         google_df = transform_ingest_google(google_jobs, self.run_id, query_location) if google_jobs else build_empty_df()
         memory_df = transform_ingest_memory(memory_jobs, self.run_id) if memory_jobs else build_empty_df()
         
@@ -1163,7 +1344,11 @@ class FreeWorldPipelineV3:
             print("✅ No jobs to normalize")
             return df
         # Normalize entire DataFrame to ensure norm.* fields exist for business rules/dedup
-        df = transform_normalize(df)
+        try:
+            df = transform_normalize_vectorized(df)
+        except Exception as e:
+            print(f"⚠️ Vectorized normalization failed ({e}), falling back to row-wise transform")
+            df = transform_normalize(df)
         print(f"✅ Normalized job data and extracted structured fields")
         return df
     
@@ -1180,7 +1365,11 @@ class FreeWorldPipelineV3:
         df = apply_market_assignment(df, market, is_custom_location=self._is_custom_location)
         
         # Apply business rules
-        df = transform_business_rules(df, filter_settings=filter_settings or {})
+        try:
+            df = transform_business_rules_vectorized(df, filter_settings=filter_settings or {})
+        except Exception as e:
+            print(f"⚠️ Vectorized business rules failed ({e}), falling back to row-wise transform")
+            df = transform_business_rules(df, filter_settings=filter_settings or {})
         
         # Count rule violations
         rules_stats = {
@@ -1203,8 +1392,6 @@ class FreeWorldPipelineV3:
         
         print("🔄 STAGE 4: DEDUPLICATION") 
         
-        initial_count = len(df)
-        
         # Debug job IDs before deduplication
         job_id_counts = df['id.job'].value_counts()
         unique_job_ids = len(job_id_counts)
@@ -1213,108 +1400,18 @@ class FreeWorldPipelineV3:
         if most_common_id > 10:  # If any job_id appears more than 10 times, show it
             print(f"🔍 Most common job_id: {job_id_counts.index[0]} (appears {most_common_id} times)")
         
-        # Generate clean URLs for deduplication
-        print("🔗 Generating clean URLs for deduplication")
-        df.loc[:, 'clean_apply_url'] = df.apply(lambda x: self._extract_clean_url(
-            x.get('source.url', '')
-        ), axis=1)
-        
-        # Remove exact duplicates by job_id (fresh wins over memory)
-        df = df.drop_duplicates(subset=['id.job'], keep='last')
-        exact_dupes_removed = initial_count - len(df)
-        
-        # R1 Deduplication (company + title + market)
-        r1_dupes_removed = 0
-        if filter_settings.get('r1_dedup', True):
-            r1_groups = df.groupby('rules.duplicate_r1')
-            
-            for group_key, group_df in r1_groups:
-                if len(group_df) > 1:
-                    # Keep one representative, mark others as filtered
-                    keep_idx = group_df.index[0]  # Keep first
-                    dupe_indices = group_df.index[1:]
-                    
-                    df.loc[dupe_indices, 'route.final_status'] = 'filtered: R1 collapse (company+title+market)'
-                    df.loc[dupe_indices, 'route.filtered'] = True
-                    df.loc[dupe_indices, 'route.ready_for_ai'] = False  # Duplicates don't need classification
-                    r1_dupes_removed += len(dupe_indices)
-        else:
-            print("⚠️  R1 deduplication disabled by filter settings")
-        
-        # R2 Deduplication (company + market - same company, same market, different titles)
-        r2_dupes_removed = 0
-        if filter_settings.get('r2_dedup', True):
-            r2_groups = df.groupby('rules.duplicate_r2')
-
-            for group_key, group_df in r2_groups:
-                if len(group_df) > 1:
-                    # Only dedupe if not already filtered by R1
-                    unfiltered = group_df[group_df['route.filtered'] != True]
-                    if len(unfiltered) > 1:
-                        keep_idx = unfiltered.index[0]
-                        dupe_indices = unfiltered.index[1:]
-
-                        df.loc[dupe_indices, 'route.final_status'] = 'filtered: R2 collapse (company+market)'
-                        df.loc[dupe_indices, 'route.filtered'] = True
-                        df.loc[dupe_indices, 'route.ready_for_ai'] = False  # Duplicates don't need classification
-                        r2_dupes_removed += len(dupe_indices)
-        else:
-            print("⚠️  R2 deduplication disabled by filter settings")
-        
-        # URL-based deduplication (NEW - to catch same job from different sources)
-        url_dupes_removed = 0
-        if filter_settings.get('url_dedup', True):
-            # Extract clean URLs for comparison
-            df.loc[:, 'clean_apply_url'] = df.apply(lambda x: self._extract_clean_url(
-                x.get('source.url', '')
-            ), axis=1)
-            
-            # Group by clean URL + market (same URL can appear in different markets)
-            url_groups = df[df['clean_apply_url'] != ''].groupby(['clean_apply_url', 'meta.market'])
-
-            for (url, market), group_df in url_groups:
-                if len(group_df) > 1:
-                    # Only dedupe if not already filtered
-                    unfiltered = group_df[group_df['route.filtered'] != True]
-                    if len(unfiltered) > 1:
-                        # Sort by source preference: Indeed first (richer data)
-                        sorted_df = unfiltered.sort_values(['id.source'], key=lambda x: x.map({'indeed': 0, 'google': 1}))
-                        
-                        keep_idx = sorted_df.index[0]  # Keep Indeed version if available
-                        dupe_indices = sorted_df.index[1:]
-                        
-                        df.loc[dupe_indices, 'route.final_status'] = 'filtered: URL duplicate (same job posting)'
-                        df.loc[dupe_indices, 'route.filtered'] = True
-                        df.loc[dupe_indices, 'route.ready_for_ai'] = False
-                        url_dupes_removed += len(dupe_indices)
-        else:
-            print("⚠️  URL deduplication disabled by filter settings")
+        df, dedup_stats = deduplicate_jobs(df, filter_settings)
         
         print(f"✅ Deduplication complete:")
-        print(f"   🗑️ Exact duplicates: {exact_dupes_removed}")
-        print(f"   🗑️ R1 duplicates: {r1_dupes_removed}")
-        print(f"   🗑️ R2 duplicates: {r2_dupes_removed}")
-        print(f"   🗑️ URL duplicates: {url_dupes_removed}")
+        print(f"   🗑️ Exact duplicates: {dedup_stats['exact']}")
+        print(f"   🗑️ R1 duplicates: {dedup_stats['r1']}")
+        print(f"   🗑️ R2 duplicates: {dedup_stats['r2']}")
+        print(f"   🗑️ URL duplicates: {dedup_stats['url']}")
         
-        # Update stage after deduplication
-        try:
-            df = df.assign(**{
-                'route.stage': 'deduped',
-                'sys.updated_at': datetime.now().isoformat()
-            })
-        except Exception:
-            pass
-        
-        # ACTUALLY REMOVE filtered duplicates from DataFrame (don't just mark them)
-        initial_total = len(df)
-        df_clean = df[df.get('route.filtered', False) != True]  # Keep only non-filtered jobs
-        final_total = len(df_clean)
-        actually_removed = initial_total - final_total
-        
-        if actually_removed > 0:
-            print(f"🗑️ REMOVED {actually_removed} filtered duplicate jobs from DataFrame")
+        if dedup_stats['removed'] > 0:
+            print(f"🗑️ REMOVED {dedup_stats['removed']} filtered duplicate jobs from DataFrame")
         
-        return df_clean
+        return df
     
     def _stage5_ai_classification(self, df: pd.DataFrame, force_fresh_classification: bool = False, classifier_type: str = "cdl") -> pd.DataFrame:
         """Stage 5: AI classification of jobs"""
@@ -1332,7 +1429,8 @@ class FreeWorldPipelineV3:
         if len(fresh_unclassified) > 0 and not force_fresh_classification:
             try:
                 job_ids_to_check = list(fresh_unclassified['id.job'].dropna().astype(str).unique())
-                memory_lookup = self.memory_db.check_job_memory(job_ids_to_check, hours=720)  # 30 days window
+                with track_external_call('supabase'):
+                    memory_lookup = self.memory_db.check_job_memory(job_ids_to_check, hours=720)  # 30 days window
                 if memory_lookup:
                     # Transform memory records and merge to reuse AI fields
                     memory_jobs = list(memory_lookup.values())
@@ -1434,7 +1532,10 @@ class FreeWorldPipelineV3:
                 selected_classifier = self.cdl_classifier
                 print(f"🎯 Using CDL Classifier for traditional CDL jobs")
 
-            ai_results = selected_classifier.classify_jobs_in_batches(jobs_for_ai)
+            # force_fresh also bypasses the local content-hash classification cache
+            ai_results = selected_classifier.classify_jobs_in_batches(
+                jobs_for_ai, use_cache=not force_fresh_classification
+            )
             
             # Convert results to lookup dictionary
             ai_lookup = {result['job_id']: result for result in ai_results}
@@ -1591,6 +1692,8 @@ class FreeWorldPipelineV3:
                     print("⚠️ LinkTracker class not available, will use original URLs")
                 
                 url_mapping = {}
+                link_jobs = []
+                link_requests = []
                 for _, job in quality_jobs_df.iterrows():
                     # Get the best available URL
                     original_url = (
@@ -1604,55 +1707,55 @@ class FreeWorldPipelineV3:
                     
                     if original_url and len(original_url) > 10:
                         if link_tracker:
-                            try:
-                                # Create shortened tracked URL
-                                # Get coach/candidate info from environment (set by Streamlit wrapper or terminal script)
-                                # Prefer canonical agent.* fields in the DataFrame; fall back to environment
-                                coach_username = (
-                                    str(job.get('agent.coach_username') or '').strip()
-                                    or os.getenv('FREEWORLD_COACH_USERNAME', 'demo_coach')
-                                )
-                                candidate_name = (
-                                    str(job.get('agent.name') or '').strip()
-                                    or os.getenv('FREEWORLD_CANDIDATE_NAME', 'Demo Free Agent')
-                                )
-                                candidate_id = (
-                                    str(job.get('agent.uuid') or '').strip()
-                                    or os.getenv('FREEWORLD_CANDIDATE_ID', 'demo_agent_001')
-                                )
-
-                                # Prepare tags for Short.io
-                                tags = []
-                                if coach_username:
-                                    tags.append(f"coach:{coach_username}")
-                                if candidate_id:
-                                    tags.append(f"candidate:{candidate_id}")
-                                if candidate_name:
-                                    tags.append(f"agent:{candidate_name.replace(' ', '-')}") # Short.io tags prefer dashes
-                                if market:
-                                    tags.append(f"market:{market}")
-                                
-                                # Use actual job title for better tracking context
-                                job_title_for_tracking = job.get('source.title', f"Job {job_id[:8]}")
-
-                                tracked_url = link_tracker.create_short_link(
-                                    original_url,
-                                    title=job_title_for_tracking,
-                                    tags=tags
-                                )
-                                if tracked_url and tracked_url != original_url:
-                                    url_mapping[job_id] = tracked_url
-                                    print(f"✅ Created tracked URL for {job_id[:8]}: {tracked_url}")
-                                else:
-                                    print(f"❌ Link shortening returned invalid URL for {job_id[:8]}: expected new URL, got {tracked_url}")
-                                    url_mapping[job_id] = original_url
-                            except Exception as e:
-                                print(f"❌ Link shortening failed for {job_id[:8]}: {e}")
-                                url_mapping[job_id] = original_url
+                            # Get coach/candidate info from environment (set by Streamlit wrapper or terminal script)
+                            # Prefer canonical agent.* fields in the DataFrame; fall back to environment
+                            coach_username = (
+                                str(job.get('agent.coach_username') or '').strip()
+                                or os.getenv('FREEWORLD_COACH_USERNAME', 'demo_coach')
+                            )
+                            candidate_name = (
+                                str(job.get('agent.name') or '').strip()
+                                or os.getenv('FREEWORLD_CANDIDATE_NAME', 'Demo Free Agent')
+                            )
+                            candidate_id = (
+                                str(job.get('agent.uuid') or '').strip()
+                                or os.getenv('FREEWORLD_CANDIDATE_ID', 'demo_agent_001')
+                            )
+
+                            # Prepare tags for Short.io
+                            tags = []
+                            if coach_username:
+                                tags.append(f"coach:{coach_username}")
+                            if candidate_id:
+                                tags.append(f"candidate:{candidate_id}")
+                            if candidate_name:
+                                tags.append(f"agent:{candidate_name.replace(' ', '-')}") # Short.io tags prefer dashes
+                            if market:
+                                tags.append(f"market:{market}")
+                            
+                            # Use actual job title for better tracking context
+                            job_title_for_tracking = job.get('source.title', f"Job {job_id[:8]}")
+                            link_jobs.append((job_id, original_url))
+                            link_requests.append({'url': original_url, 'title': job_title_for_tracking, 'tags': tags})
                         else:
                             print(f"❌ LinkTracker not available for job {job_id[:8]}")
                             url_mapping[job_id] = original_url
                 
+                # Shorten all quality jobs in one concurrent, rate-limited batch
+                if link_requests:
+                    try:
+                        tracked_urls = link_tracker.create_short_links(link_requests)
+                    except Exception as e:
+                        print(f"❌ Link shortening failed: {e}")
+                        tracked_urls = [original_url for _, original_url in link_jobs]
+                    for (job_id, original_url), tracked_url in zip(link_jobs, tracked_urls):
+                        if tracked_url and tracked_url != original_url:
+                            url_mapping[job_id] = tracked_url
+                            print(f"✅ Created tracked URL for {job_id[:8]}: {tracked_url}")
+                        else:
+                            print(f"❌ Link shortening returned invalid URL for {job_id[:8]}: expected new URL, got {tracked_url}")
+                            url_mapping[job_id] = original_url
+                
                 # Apply tracked URLs to both main dataframe and quality subset
                 df = apply_tracked_urls(df, url_mapping)
                 quality_jobs_df = apply_tracked_urls(quality_jobs_df, url_mapping)  # FIX: Update quality_jobs_df too!
@@ -1772,18 +1875,24 @@ class FreeWorldPipelineV3:
             descs = df.get('norm.description', df.get('source.description_raw', pd.Series([''] * len(df))))
             companies = df.get('norm.company', df.get('source.company', pd.Series([''] * len(df))))
             
+            def column(values):
+                values = [v or '' for v in values.tolist()[:len(df)]]
+                return values + [''] * (len(df) - len(values))
+
+            titles, descs, companies = column(titles), column(descs), column(companies)
+
             def classify_row(t, d, c):
                 try:
-                    return self.route_classifier.classify_route_type(t or '', d or '', c or '')
+                    return self.route_classifier.classify_route_type(t, d, c)
                 except Exception:
                     return 'Unknown'
-            
-            route_series = [
-                classify_row(titles.iloc[i] if i < len(titles) else '',
-                             descs.iloc[i] if i < len(descs) else '',
-                             companies.iloc[i] if i < len(companies) else '')
-                for i in range(len(df))
-            ]
+
+            classify_series = getattr(self.route_classifier, 'classify_series', None)
+            try:
+                # One pass over the whole batch (CompiledRouteClassifier)
+                route_series = classify_series(titles, descs, companies)['route_type'].tolist()
+            except Exception:
+                route_series = [classify_row(t, d, c) for t, d, c in zip(titles, descs, companies)]
             df = df.assign(**{'ai.route_type': pd.Series(route_series, index=df.index)})
             return df
         except Exception:
@@ -1814,7 +1923,8 @@ class FreeWorldPipelineV3:
                     supabase_df = prepare_for_supabase(truly_fresh_jobs)
                     print(f"🔍 Fresh jobs Supabase DF shape: {supabase_df.shape}, columns: {len(supabase_df.columns)}")
                     
-                    success = self.memory_db.store_classifications(supabase_df)
+                    with track_external_call('supabase'):
+                        success = self.memory_db.store_classifications(supabase_df)
                     if success:
                         self.supabase_upload_count = len(supabase_df)
                         print(f"✅ Stored {len(supabase_df)} truly fresh jobs in Supabase")
@@ -1832,7 +1942,8 @@ class FreeWorldPipelineV3:
                 try:
                     job_ids_to_refresh = memory_reused_jobs['id.job'].dropna().astype(str).tolist()
                     if job_ids_to_refresh:
-                        success = self.memory_db.refresh_existing_jobs(job_ids_to_refresh)
+                        with track_external_call('supabase'):
+                            success = self.memory_db.refresh_existing_jobs(job_ids_to_refresh)
                         if success:
                             print(f"✅ Refreshed timestamps for {len(job_ids_to_refresh)} memory-reused jobs")
                         else:
@@ -2152,34 +2263,27 @@ class FreeWorldPipelineV3:
         else:
             return f"{base_hash}_cdl"
     
-    def _checkpoint_data(self, df: pd.DataFrame, stage: str) -> None:
-        """Save checkpoint data for debugging"""
+    def _checkpoint_data(self, df: pd.DataFrame, stage: str, safety_csv: Optional[str] = None) -> None:
+        """Save checkpoint data for debugging (queued to the background writer when active)"""
         
         # Always save checkpoints even for empty data (for testing)
         try:
-            checkpoint_path = os.path.join(
-                self.parquet_dir, 
-                f"{self.run_id}_{stage}.parquet"
-            )
-            
-            # Ensure DataFrame has schema even if empty
-            df = ensure_schema(df)
-            df.to_parquet(checkpoint_path, index=False)
-            try:
+            submit_start = time.time()
+            if self.checkpoint_writer is not None:
+                self.checkpoint_writer.submit(df, stage, safety_csv=safety_csv)
+            else:
+                checkpoint_path = os.path.join(
+                    self.parquet_dir, 
+                    f"{self.run_id}_{stage}.parquet"
+                )
+                # Ensure DataFrame has schema even if empty
+                df = ensure_schema(df)
+                df.to_parquet(checkpoint_path, index=False)
                 print(f"✅ Checkpoint saved: {checkpoint_path}")
-            except Exception:
-                pass
-            
-            # Validate data integrity (temporarily disabled for debugging)
-            # validation = validate_dataframe(df)
-            # if not validation['valid']:
-            #     print(f"⚠️ Stage {stage}: {len(validation['errors'])} validation errors")
-            #     # Show first few errors for debugging
-            #     for i, error in enumerate(validation['errors'][:3]):
-            #         print(f"   Error {i+1}: {error}")
-            #     if len(validation['errors']) > 3:
-            #         print(f"   ... and {len(validation['errors']) - 3} more errors")
-            print(f"✅ Stage {stage}: Validation temporarily disabled for debugging")
+                if safety_csv and not df.empty:
+                    df.to_csv(safety_csv, index=False)
+            if self.perf_monitor is not None:
+                self.perf_monitor.record_checkpoint_write(time.time() - submit_start)
             
         except Exception as e:
             try:
@@ -2188,6 +2292,24 @@ class FreeWorldPipelineV3:
             except Exception:
                 pass
     
+    def _close_checkpoint_writer(self) -> None:
+        """Wait for queued checkpoints, then apply retention (compaction + disk cap)"""
+        writer = self.checkpoint_writer
+        if writer is None:
+            return
+        self.checkpoint_writer = None
+        flush_start = time.time()
+        try:
+            writer.close()
+            stats = writer.stats
+            print(f"📦 Checkpoints: {stats['full']} full, {stats['delta']} delta, "
+                  f"{stats['groups_skipped']} unchanged column groups skipped, "
+                  f"{stats['bytes'] / 1024 / 1024:.1f} MB in {stats['write_seconds']:.1f}s (background)")
+        except Exception as e:
+            print(f"⚠️ Checkpoint writer close failed: {e}")
+        if self.perf_monitor is not None:
+            self.perf_monitor.record_checkpoint_write(time.time() - flush_start)
+    
     def _populate_agent_fields(self, df: pd.DataFrame) -> pd.DataFrame:
         """Populate agent.* fields in canonical DataFrame from Free Agent data"""
         if not self.agent_data:
@@ -2242,6 +2364,9 @@ class FreeWorldPipelineV3:
         # Calculate cost per quality job
         cost_per_quality_job = total_cost / max(1, quality_jobs) if quality_jobs > 0 else 0
         
+        # Local classification cache (content-hash hits never reach OpenAI), this run only
+        cache_savings = cost_calculator.calculate_classification_cache_savings(since=self._cache_stats_at_start)
+        
         # Count route types
         local_routes = (df['ai.route_type'] == 'Local').sum() if 'ai.route_type' in df.columns else 0
         otr_routes = (df['ai.route_type'] == 'OTR').sum() if 'ai.route_type' in df.columns else 0
@@ -2273,12 +2398,17 @@ class FreeWorldPipelineV3:
             'total_cost': total_cost,
             'cost_per_quality_job': cost_per_quality_job,
             'memory_efficiency': memory_efficiency,
+            'classification_cache_hits': cache_savings['hits'],
+            'classification_cache_misses': cache_savings['misses'],
+            'classification_cache_savings': cache_savings['saved_usd'],
             
             # System info
             'run_id': self.run_id,
             'schema_version': self.schema_info['version'],
             'completed_at': datetime.now().isoformat(),
-            'supabase_upload_count': self.supabase_upload_count
+            'supabase_upload_count': self.supabase_upload_count,
+            'indeed_failed_queries': list(self.indeed_failed_queries),
+            'component_init_seconds': dict(self.components.init_seconds)
         }
         
         # Create summary string
@@ -2291,16 +2421,10 @@ class FreeWorldPipelineV3:
         return stats
     
     def load_checkpoint(self, stage: str) -> Optional[pd.DataFrame]:
-        """Load checkpoint data for debugging"""
-        
-        checkpoint_path = os.path.join(
-            self.parquet_dir,
-            f"{self.run_id}_{stage}.parquet"
-        )
-        
-        if os.path.exists(checkpoint_path):
-            return pd.read_parquet(checkpoint_path)
-        return None
+        """Load checkpoint data for debugging (rebuilt from full snapshot + deltas)"""
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.flush()
+        return load_checkpoint(self.parquet_dir, self.run_id, stage)
 
 if __name__ == "__main__":
     # Test pipeline v3
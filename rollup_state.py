@@ -0,0 +1,71 @@
+"""
+Rollup State - persisted watermarks and aggregates for incremental rollups
+
+The analytics rollups (free agents, companies) used to rebuild every row from
+the full click/job history on each refresh. Incremental rollups keep what they
+have already folded in a small JSON document per rollup:
+
+    {"version": 1, "watermark": "<newest source timestamp folded in>", ...}
+
+Missing, unreadable or version-mismatched state simply means "rebuild": the
+next run starts from an empty state, so deleting the file is always safe.
+
+Environment:
+    FREEWORLD_ROLLUP_STATE_DIR=FreeWorld_Jobs/cache/rollups   state directory
+                                                            (off = always rebuild)
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+STATE_VERSION = 1
+DEFAULT_STATE_DIR = os.path.join('FreeWorld_Jobs', 'cache', 'rollups')
+
+_write_lock = threading.Lock()
+
+
+def rollup_state_path(name: str) -> Optional[str]:
+    """State file for a rollup, or None when persistence is disabled"""
+    state_dir = os.getenv('FREEWORLD_ROLLUP_STATE_DIR', DEFAULT_STATE_DIR)
+    if state_dir.strip().lower() in ('off', 'false', '0', 'none', ''):
+        return None
+    return os.path.join(state_dir, f"{name}.json")
+
+
+def load_rollup_state(path: Optional[str]) -> Dict:
+    """
+    Load persisted rollup state
+
+    Args:
+        path: State file (None = persistence disabled)
+
+    Returns:
+        The stored state, or an empty state when there is nothing usable
+    """
+    empty = {'version': STATE_VERSION, 'watermark': None}
+    if not path or not os.path.exists(path):
+        return empty
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable rollup state {path} ({e}) - rebuilding")
+        return empty
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return empty
+    return state
+
+
+def save_rollup_state(path: Optional[str], state: Dict) -> None:
+    """Atomically replace the state file (no-op when persistence is disabled)"""
+    if not path:
+        return
+    state = dict(state, version=STATE_VERSION)
+    with _write_lock:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, default=str)
+        os.replace(tmp_path, path)
@@ -0,0 +1,371 @@
+"""
+Short Link Engine
+Batched, concurrent Short.io link creation used by LinkTracker.create_short_links.
+
+- AsyncShortLinkCreator: aiohttp POST /links with bounded concurrency, a token
+  bucket (Short.io throttles link creation) and retry/backoff on 429/5xx
+- ShortLinkCache: persistent target-URL -> short-URL map, so identical targets
+  never hit the API twice (across batches and across runs)
+- ZapierBatchQueue: background worker that drains webhook events off the
+  link-creation path and posts them as one JSON array per batch
+
+Configuration:
+    FREEWORLD_SHORT_LINK_CACHE  path to the SQLite file, or "off" to disable
+"""
+
+import asyncio
+import hashlib
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+import requests
+
+from async_runner import run_coroutine_sync
+from pipeline_performance_monitor import record_external_call
+
+DEFAULT_CACHE_PATH = os.path.join('FreeWorld_Jobs', 'cache', 'short_links.sqlite')
+RETRIABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def build_shortio_payload(original_url: str, domain: str, title: Optional[str] = None,
+                          tags: Optional[list] = None, expires_hours: int = 0) -> Dict[str, Any]:
+    """Short.io POST /links body (shared by the sync and async paths)"""
+    payload = {
+        "originalURL": original_url.strip(),
+        "domain": domain,
+        "allowDuplicates": False  # Reuse existing short links for same URL
+    }
+
+    # Add automatic expiration (Short.io Pro feature)
+    if expires_hours and expires_hours > 0:
+        expiration_time = datetime.now() + timedelta(hours=expires_hours)
+        payload["expiresAt"] = int(expiration_time.timestamp() * 1000)  # Milliseconds
+        payload["expiredURL"] = "https://freeworld.org/job-expired"  # Redirect after expiration
+
+    if title:
+        payload["title"] = title[:100]  # Limit title length
+    if tags:
+        payload["tags"] = tags[:5]  # Limit number of tags
+    return payload
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = max(rate, 0.001)
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ShortLinkCache:
+    """SQLite map of (domain, target URL) -> short URL"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS short_links (
+                link_key TEXT PRIMARY KEY,
+                original_url TEXT NOT NULL,
+                short_url TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _key(domain: str, original_url: str) -> str:
+        return hashlib.sha256(f"{domain}\x1f{original_url.strip()}".encode('utf-8')).hexdigest()
+
+    def get_many(self, domain: str, urls: List[str]) -> Dict[str, str]:
+        """Cached short URLs for the given targets (missing ones are omitted)"""
+        keys = {self._key(domain, u): u for u in dict.fromkeys(urls)}
+        found = {}
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for key, short_url in self._conn.execute(
+                    f"SELECT link_key, short_url FROM short_links WHERE link_key IN ({placeholders})", chunk
+                ):
+                    found[keys[key]] = short_url
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def get(self, domain: str, original_url: str) -> Optional[str]:
+        return self.get_many(domain, [original_url]).get(original_url)
+
+    def put_many(self, domain: str, mapping: Dict[str, str]) -> None:
+        if not mapping:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO short_links (link_key, original_url, short_url, created_at) VALUES (?, ?, ?, ?)",
+                [(self._key(domain, url), url, short, now) for url, short in mapping.items()]
+            )
+            self._conn.commit()
+        self.stats['stores'] += len(mapping)
+
+    def put(self, domain: str, original_url: str, short_url: str) -> None:
+        self.put_many(domain, {original_url: short_url})
+
+
+_shared_link_caches: Dict[str, ShortLinkCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_short_link_cache() -> Optional[ShortLinkCache]:
+    """Process-wide cache instance, or None when disabled via FREEWORLD_SHORT_LINK_CACHE=off"""
+    path = os.getenv('FREEWORLD_SHORT_LINK_CACHE', DEFAULT_CACHE_PATH)
+    if path.strip().lower() in ('off', 'false', '0', 'none', ''):
+        return None
+
+    with _shared_lock:
+        cache = _shared_link_caches.get(path)
+        if cache is None:
+            try:
+                cache = ShortLinkCache(path)
+            except Exception as e:
+                print(f"⚠️ Short link cache unavailable ({e}) - continuing without it")
+                return None
+            _shared_link_caches[path] = cache
+        return cache
+
+
+class AsyncShortLinkCreator:
+    """Concurrent Short.io link creation with rate limiting, retries and caching"""
+
+    def __init__(self, api_key: str, domain: str, base_url: str = "https://api.short.io",
+                 concurrency: int = 8, rate_per_second: float = 5.0, max_retries: int = 3,
+                 cache: Optional[ShortLinkCache] = None,
+                 on_created: Optional[Callable[[str, str, Optional[str], Optional[list]], None]] = None):
+        """
+        Args:
+            api_key: Short.io secret key
+            domain: Short.io domain for new links
+            base_url: API base (overridable for tests)
+            concurrency: max requests in flight
+            rate_per_second: token bucket refill rate (burst = 2x rate)
+            max_retries: retries after the first attempt for 429/5xx/network errors
+            cache: optional ShortLinkCache consulted before and filled after the API
+            on_created: callback(original_url, short_url, title, tags) for each new link
+        """
+        self.api_key = api_key
+        self.domain = domain
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.rate_per_second = rate_per_second
+        self.max_retries = max_retries
+        self.cache = cache
+        self.on_created = on_created
+        self.stats = {'requested': 0, 'cache_hits': 0, 'batch_duplicates': 0,
+                      'api_calls': 0, 'retries': 0, 'failures': 0}
+
+    async def _post_link(self, session: aiohttp.ClientSession, bucket: TokenBucket,
+                         semaphore: asyncio.Semaphore, item: Dict[str, Any]) -> str:
+        """Create one link; returns the original URL on failure (same as the sync path)"""
+        original_url = item['url']
+        payload = build_shortio_payload(original_url, self.domain, item.get('title'),
+                                        item.get('tags'), item.get('expires_hours', 0))
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            retry_after = None
+            try:
+                async with semaphore:
+                    self.stats['api_calls'] += 1
+                    call_start = time.time()
+                    async with session.post(f"{self.base_url}/links", json=payload) as response:
+                        record_external_call('shortio', time.time() - call_start,
+                                             error=response.status not in (200, 409))
+                        if response.status == 200:
+                            data = await response.json(content_type=None)
+                            short_url = data.get('shortURL')
+                            if short_url and self.on_created:
+                                try:
+                                    self.on_created(original_url, short_url, item.get('title'), item.get('tags'))
+                                except Exception:
+                                    pass
+                            return short_url or original_url
+                        if response.status == 409:
+                            # Link already exists; Short.io has no lookup by original URL
+                            return original_url
+                        if response.status not in RETRIABLE_STATUS:
+                            print(f"❌ Short.io error {response.status} for {original_url[:60]}")
+                            self.stats['failures'] += 1
+                            return original_url
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                record_external_call('shortio', time.time() - call_start, error=True)
+                if attempt == self.max_retries:
+                    print(f"❌ Short.io network error for {original_url[:60]}: {e}")
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                try:
+                    delay = float(retry_after) if retry_after else 0.5 * (2 ** attempt)
+                except ValueError:
+                    delay = 0.5 * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, 0.25))
+
+        self.stats['failures'] += 1
+        return original_url
+
+    async def create_links(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Shorten many targets at once
+
+        Args:
+            items: dicts with 'url' and optional 'title', 'tags', 'expires_hours'
+
+        Returns:
+            Short URL (or the original URL on failure) per item, in input order
+        """
+        self.stats['requested'] += len(items)
+        results: List[Optional[str]] = [None] * len(items)
+
+        # Expiring links are per-request by design; everything else is cacheable
+        cacheable = [i for i, item in enumerate(items) if not item.get('expires_hours')]
+        cached = self.cache.get_many(self.domain, [items[i]['url'] for i in cacheable]) if self.cache else {}
+
+        to_create: Dict[str, List[int]] = {}
+        uncacheable: List[int] = []
+        for i, item in enumerate(items):
+            if item.get('expires_hours'):
+                uncacheable.append(i)
+            elif item['url'] in cached:
+                results[i] = cached[item['url']]
+                self.stats['cache_hits'] += 1
+            else:
+                to_create.setdefault(item['url'], []).append(i)
+        self.stats['batch_duplicates'] += sum(len(ix) - 1 for ix in to_create.values())
+
+        if to_create or uncacheable:
+            headers = {'authorization': self.api_key, 'Content-Type': 'application/json', 'accept': '*/*'}
+            timeout = aiohttp.ClientTimeout(total=30, connect=10)
+            bucket = TokenBucket(self.rate_per_second, capacity=max(1.0, self.rate_per_second * 2))
+            semaphore = asyncio.Semaphore(self.concurrency)
+            async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+                work = [(indices, items[indices[0]]) for indices in to_create.values()]
+                work += [([i], items[i]) for i in uncacheable]
+                shorts = await asyncio.gather(*[
+                    self._post_link(session, bucket, semaphore, item) for _, item in work
+                ])
+
+            new_links = {}
+            for (indices, item), short_url in zip(work, shorts):
+                for i in indices:
+                    results[i] = short_url
+                if short_url and short_url != item['url'] and not item.get('expires_hours'):
+                    new_links[item['url']] = short_url
+            if self.cache:
+                self.cache.put_many(self.domain, new_links)
+
+        return results
+
+    def create_links_sync(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Blocking wrapper around create_links"""
+        if not items:
+            return []
+        return run_coroutine_sync(self.create_links(items))
+
+
+class ZapierBatchQueue:
+    """Background worker that posts webhook events in batches off the caller's thread"""
+
+    def __init__(self, webhook_url: str, batch_size: int = 25, flush_interval: float = 2.0):
+        self.webhook_url = webhook_url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.failed = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._session = requests.Session()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def enqueue(self, event: str, payload: Dict[str, Any]) -> None:
+        self._queue.put({
+            "event": event,
+            "timestamp": datetime.utcnow().isoformat(),
+            "payload": payload,
+        })
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Zapier catch hooks run the Zap once per element of a top-level
+            # array, so existing Zaps still see one event body per run
+            try:
+                response = self._session.post(self.webhook_url, json=batch, timeout=10)
+                response.raise_for_status()
+                self.sent += len(batch)
+            except Exception:
+                self.failed += len(batch)  # Best effort, same as the old fire-and-forget call
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until queued events are sent; returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+_zapier_queues: Dict[str, ZapierBatchQueue] = {}
+
+
+def get_zapier_queue(webhook_url: str) -> ZapierBatchQueue:
+    """Shared background queue per webhook URL"""
+    with _shared_lock:
+        zq = _zapier_queues.get(webhook_url)
+        if zq is None:
+            zq = ZapierBatchQueue(webhook_url)
+            _zapier_queues[webhook_url] = zq
+        return zq
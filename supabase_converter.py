@@ -6,10 +6,12 @@ MAJOR FIX: Route type filtering now works correctly at database query level
 CACHE_BUSTER: supabase_filter_fix_262d9f9_sept5
 """
 
+import os
 import pandas as pd
 from typing import List, Dict
 from datetime import datetime, timedelta
 from jobs_schema import ensure_schema
+from feedback_exclusions import get_feedback_exclusions
 
 def supabase_to_canonical_df(supabase_rows: List[Dict], 
                                agent_params: Dict = None, 
@@ -229,17 +231,18 @@ def search_memory_jobs(location: str, limit: int = 100, days_back: int = 7,
         if agent_params:
             print(f"🎯 Applying filters: fair_chance_only={agent_params.get('fair_chance_only', False)}, route_types={agent_params.get('route_type_filter', [])}, match_quality={agent_params.get('match_quality_filter', ['good', 'so-so'])}")
         
-        # DEBUG: Let's also check what's actually in the database
-        try:
-            debug_query = supabase_client.table('jobs').select('route_type', count='exact').eq('market', market_name).gte('created_at', cutoff_date)
-            debug_result = debug_query.execute()
-            print(f"🔍 DEBUG: Total jobs in {market_name} since {cutoff_date}: {debug_result.count}")
-            
-            # Check specifically for local jobs
-            local_debug = supabase_client.table('jobs').select('route_type', count='exact').eq('market', market_name).ilike('route_type', '%local%').gte('created_at', cutoff_date).execute()
-            print(f"🔍 DEBUG: Local jobs in {market_name}: {local_debug.count}")
-        except Exception as e:
-            print(f"🔍 DEBUG query failed: {e}")
+        # DEBUG: Count queries cost two extra round-trips per search; opt in with FREEWORLD_MEMORY_SEARCH_DEBUG=1
+        if os.getenv('FREEWORLD_MEMORY_SEARCH_DEBUG', '').lower() in ('1', 'true', 'yes'):
+            try:
+                debug_query = supabase_client.table('jobs').select('route_type', count='exact', head=True).eq('market', market_name).gte('created_at', cutoff_date)
+                debug_result = debug_query.execute()
+                print(f"🔍 DEBUG: Total jobs in {market_name} since {cutoff_date}: {debug_result.count}")
+                
+                # Check specifically for local jobs
+                local_debug = supabase_client.table('jobs').select('route_type', count='exact', head=True).eq('market', market_name).ilike('route_type', '%local%').gte('created_at', cutoff_date).execute()
+                print(f"🔍 DEBUG: Local jobs in {market_name}: {local_debug.count}")
+            except Exception as e:
+                print(f"🔍 DEBUG query failed: {e}")
         
         # Simplified approach: Skip the complex CASE statement that's causing parsing errors
         # We'll handle priority sorting in Python instead of SQL
@@ -259,14 +262,12 @@ def search_memory_jobs(location: str, limit: int = 100, days_back: int = 7,
             .gte('created_at', cutoff_date)
         )
         
-        # Get reported job URLs to exclude them
-        try:
-            reported_jobs_result = supabase_client.table('job_feedback').select('job_url').execute()
-            reported_urls = {job['job_url'] for job in (reported_jobs_result.data or [])}
-            print(f"🚫 Excluding {len(reported_urls)} reported jobs from memory search")
-        except Exception as e:
-            print(f"⚠️ Could not fetch reported jobs (table may not exist yet): {e}")
-            reported_urls = set()
+        # Reported jobs: incrementally refreshed in-process index, pushed into the query when it fits
+        exclusions = get_feedback_exclusions()
+        exclusions.refresh(supabase_client)
+        query, pushed_down = exclusions.apply_to_query(query)
+        print(f"🚫 Excluding {len(exclusions.urls)} reported jobs from memory search"
+              f"{' (server-side)' if pushed_down else ''}")
         
         # Apply agent-specific filters at Supabase level for efficiency
         if agent_params:
@@ -309,14 +310,8 @@ def search_memory_jobs(location: str, limit: int = 100, days_back: int = 7,
             .execute()
         )
         
-        # Filter out reported jobs
-        jobs_data = response.data or []
-        if reported_urls:
-            jobs_before = len(jobs_data)
-            jobs_data = [job for job in jobs_data if job.get('apply_url') not in reported_urls]
-            jobs_filtered = jobs_before - len(jobs_data)
-            if jobs_filtered > 0:
-                print(f"🚫 Filtered out {jobs_filtered} reported jobs")
+        # Filter out reported jobs (job IDs, and URLs when the list was too long to push down)
+        jobs_data = exclusions.filter_jobs(response.data or [])
         
         print(f"📦 Found {len(jobs_data)} memory jobs in Supabase (after feedback filtering)")
         
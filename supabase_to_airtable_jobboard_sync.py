@@ -3,6 +3,10 @@
 Supabase → Airtable Job Board Sync System
 Daily sync that updates Airtable job board with good/so-so quality jobs from last 72 hours.
 Automatically deletes jobs older than 72 hours to keep the board fresh.
+
+Syncs are batched (airtable_sync_engine): the board is loaded once, only new
+jobs and changed fields are written, 10 records per API call under a rate
+limiter. --dry-run prints the planned creates/updates/deletes.
 """
 
 import os
@@ -14,6 +18,8 @@ from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 
+from airtable_sync_engine import AirtableSyncEngine
+
 # Load environment variables from .env if available
 try:
     from dotenv import load_dotenv
@@ -51,6 +57,7 @@ class SupabaseToAirtableJobSync:
             'fetched_from_supabase': 0,
             'created_in_airtable': 0,
             'updated_in_airtable': 0,
+            'unchanged_in_airtable': 0,
             'deleted_old_jobs': 0,
             'errors': 0,
             'skipped': 0
@@ -149,6 +156,61 @@ class SupabaseToAirtableJobSync:
             logger.error(f"❌ Job conversion failed: {str(e)}")
             raise
     
+    @staticmethod
+    def is_stale_job_record(fields: Dict[str, Any], cutoff_time: datetime) -> bool:
+        """True when an Airtable job record was created before the cutoff (or has an unparseable date)"""
+        created_at_str = fields.get('Created At')
+        if not created_at_str:
+            return False
+        try:
+            # Parse ISO format datetime
+            return datetime.fromisoformat(str(created_at_str).replace('Z', '+00:00')) < cutoff_time
+        except (ValueError, TypeError):
+            # If can't parse date, consider it old and delete
+            return True
+
+    def sync_jobs_batched(self, jobs: List[Dict[str, Any]], hours: int = 72, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Sync jobs with one paged read of the board and batched, diffed writes
+
+        Args:
+            jobs: Supabase job rows (newest first)
+            hours: Board records created before this window are deleted
+            dry_run: Plan and report only
+
+        Returns:
+            The plan summary
+        """
+        records = []
+        for job in jobs:
+            try:
+                record = self.convert_job_to_airtable_format(job)
+                if record.get('Job ID'):
+                    records.append(record)
+                else:
+                    self.stats['errors'] += 1
+                    logger.error(f"❌ Skipping job without Job ID: {job.get('job_title', 'Unknown')}")
+            except Exception:
+                self.stats['errors'] += 1
+
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        engine = AirtableSyncEngine(self.airtable_client)
+        plan, result = engine.sync(records, delete_filter=lambda fields: self.is_stale_job_record(fields, cutoff_time),
+                                   dry_run=dry_run)
+
+        for line in plan.report().splitlines():
+            logger.info(line)
+        self.stats['unchanged_in_airtable'] = plan.unchanged
+        if dry_run:
+            self.stats['skipped'] = len(records)
+        else:
+            self.stats['created_in_airtable'] = result['created']
+            self.stats['updated_in_airtable'] = result['updated']
+            self.stats['deleted_old_jobs'] = result['deleted']
+            self.stats['errors'] += result['errors']
+        logger.info(f"📡 Airtable API calls: {engine.api_calls}")
+        return plan.summary()
+
     def delete_old_jobs_from_airtable(self, hours: int = 72) -> int:
         """Delete jobs older than N hours from Airtable"""
         try:
@@ -161,18 +223,8 @@ class SupabaseToAirtableJobSync:
                 existing_records.extend(record_batch)
             
             # Find records to delete (older than cutoff)
-            records_to_delete = []
-            for record in existing_records:
-                created_at_str = record['fields'].get('Created At')
-                if created_at_str:
-                    try:
-                        # Parse ISO format datetime
-                        created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                        if created_at < cutoff_time:
-                            records_to_delete.append(record['id'])
-                    except (ValueError, TypeError):
-                        # If can't parse date, consider it old and delete
-                        records_to_delete.append(record['id'])
+            records_to_delete = [record['id'] for record in existing_records
+                                 if self.is_stale_job_record(record['fields'], cutoff_time)]
             
             # Delete old records in batches
             deleted_count = 0
@@ -218,11 +270,24 @@ class SupabaseToAirtableJobSync:
             logger.error(f"❌ Airtable upsert failed for job {job_record.get('Job ID', 'unknown')}: {str(e)}")
             raise
     
-    def sync_jobs(self, hours: int = 72, dry_run: bool = False) -> Dict[str, Any]:
-        """Main sync process"""
+    def sync_jobs(self, hours: int = 72, dry_run: bool = False, batched: bool = True) -> Dict[str, Any]:
+        """
+        Main sync process
+
+        Args:
+            hours: Lookback window for jobs (older board records are deleted)
+            dry_run: Preview changes without modifying Airtable
+            batched: Use the batched diff sync (False = per-job lookups and writes)
+        """
         logger.info(f"🚀 Starting {'DRY RUN' if dry_run else 'LIVE'} job board sync (last {hours}h)")
         
         try:
+            if batched:
+                jobs = self.fetch_quality_jobs_from_supabase(hours)
+                self.sync_jobs_batched(jobs, hours=hours, dry_run=dry_run)
+                self._log_summary()
+                return self.stats
+
             # Step 1: Clean up old jobs first
             if not dry_run:
                 deleted_count = self.delete_old_jobs_from_airtable(hours)
@@ -259,20 +324,22 @@ class SupabaseToAirtableJobSync:
                     logger.error(f"❌ [{i}/{len(jobs)}] Failed to sync job: {type(e).__name__}: {str(e)}")
                     continue
             
-            # Summary
-            logger.info("📊 JOB SYNC SUMMARY:")
-            logger.info(f"   Fetched from Supabase: {self.stats['fetched_from_supabase']}")
-            logger.info(f"   Created in Airtable: {self.stats['created_in_airtable']}")
-            logger.info(f"   Updated in Airtable: {self.stats['updated_in_airtable']}")
-            logger.info(f"   Deleted old jobs: {self.stats['deleted_old_jobs']}")
-            logger.info(f"   Errors: {self.stats['errors']}")
-            logger.info(f"   Skipped (dry run): {self.stats['skipped']}")
-            
+            self._log_summary()
             return self.stats
             
         except Exception as e:
             logger.error(f"❌ Job sync failed: {type(e).__name__}")
             raise
+
+    def _log_summary(self) -> None:
+        logger.info("📊 JOB SYNC SUMMARY:")
+        logger.info(f"   Fetched from Supabase: {self.stats['fetched_from_supabase']}")
+        logger.info(f"   Created in Airtable: {self.stats['created_in_airtable']}")
+        logger.info(f"   Updated in Airtable: {self.stats['updated_in_airtable']}")
+        logger.info(f"   Unchanged in Airtable: {self.stats['unchanged_in_airtable']}")
+        logger.info(f"   Deleted old jobs: {self.stats['deleted_old_jobs']}")
+        logger.info(f"   Errors: {self.stats['errors']}")
+        logger.info(f"   Skipped (dry run): {self.stats['skipped']}")
     
     def validate_sync(self) -> Dict[str, Any]:
         """Validate sync results by checking Airtable record counts"""
@@ -408,6 +475,7 @@ def main():
     parser = argparse.ArgumentParser(description='Sync quality jobs from Supabase to Airtable job board')
     parser.add_argument('--hours', type=int, default=72, help='Hours lookback for jobs (default: 72)')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying data')
+    parser.add_argument('--per-job', action='store_true', help='Legacy per-job lookups and writes (no batching)')
     parser.add_argument('--validate', action='store_true', help='Validate sync results')
     parser.add_argument('--generate-edge-function', action='store_true', help='Generate Supabase Edge Function code')
     
@@ -426,7 +494,7 @@ def main():
         if args.validate:
             syncer.validate_sync()
         else:
-            syncer.sync_jobs(hours=args.hours, dry_run=args.dry_run)
+            syncer.sync_jobs(hours=args.hours, dry_run=args.dry_run, batched=not args.per_job)
             
     except Exception as e:
         logger.error(f"❌ Sync failed: {type(e).__name__}")
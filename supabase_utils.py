@@ -1,5 +1,6 @@
 import os
-from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from datetime import datetime, timedelta, timezone
 import pandas as pd
 
@@ -103,44 +104,236 @@ def fetch_candidate_clicks(limit: int = 100) -> List[Dict]:
         return []
 
 
-def fetch_click_events(start_date: datetime, end_date: datetime) -> pd.DataFrame:
-    """Fetch recent click events for in-app analytics.
+CLICK_EVENT_COLUMNS = "clicked_at,coach,market,route,match,fair,candidate_id,candidate_name,short_id,original_url,job_title,company"
+
+
+def _prepare_click_frame(rows: List[Dict]) -> pd.DataFrame:
+    """Add the derived columns the dashboards expect to raw click_events rows"""
+    df = pd.DataFrame(rows)
+    df['timestamp'] = pd.to_datetime(df['clicked_at'], format='ISO8601', utc=True)
+    df['click_id'] = df['short_id']  # Use short_id as a unique click identifier
+    # Map coach to coach_username for dashboard compatibility
+    df['coach_username'] = df['coach']
+    # The redirect function writes original_url (target_url on older schemas)
+    df['target_url'] = df['original_url']
+    return df
+
+
+def _click_events_query(client, start_date: datetime, end_date: datetime,
+                        coach_username: Optional[str], candidate_ids: Optional[List[str]],
+                        market: Optional[str]):
+    query = (
+        client.table("click_events")
+        .select(CLICK_EVENT_COLUMNS)
+        .gte("clicked_at", start_date.isoformat())
+        .lte("clicked_at", end_date.isoformat())
+    )
+    if coach_username:
+        query = query.eq("coach", coach_username)
+    if candidate_ids is not None:
+        query = query.in_("candidate_id", list(candidate_ids))
+    if market:
+        query = query.eq("market", market)
+    return query
+
+
+def iter_click_events(start_date: datetime, end_date: datetime,
+                      coach_username: Optional[str] = None,
+                      candidate_ids: Optional[List[str]] = None,
+                      market: Optional[str] = None,
+                      page_size: int = 1000,
+                      client=None) -> Iterator[pd.DataFrame]:
+    """Stream click events newest-first as DataFrame chunks.
+
+    Pages with a keyset on clicked_at (clicked_at < last seen) instead of one
+    unbounded select, which PostgREST silently caps at its max-rows setting.
+    Rows sharing the boundary timestamp of a full page are fetched as their own
+    block so none are skipped or repeated. Coach, agent, market and date
+    filters are applied server-side.
+
+    Args:
+        start_date: Earliest clicked_at (inclusive)
+        end_date: Latest clicked_at (inclusive)
+        coach_username: Only clicks attributed to this coach
+        candidate_ids: Only clicks from these Free Agent UUIDs
+        market: Only clicks in this market
+        page_size: Rows per request (keep <= the PostgREST max-rows setting)
+        client: Supabase client (defaults to get_client())
+
+    Yields:
+        DataFrames of at most page_size rows (the boundary block may be larger)
+    """
+    client = client or get_client()
+    if client is None:
+        return
+    if candidate_ids is not None and not candidate_ids:
+        return
+
+    def query():
+        return _click_events_query(client, start_date, end_date, coach_username, candidate_ids, market)
+
+    cursor = None
+    while True:
+        q = query()
+        if cursor is not None:
+            q = q.lt("clicked_at", cursor)
+        rows = q.order("clicked_at", desc=True).limit(page_size).execute().data or []
+        if len(rows) < page_size:
+            if rows:
+                yield _prepare_click_frame(rows)
+            return
+
+        # Full page: the oldest timestamp may continue past the limit
+        boundary = rows[-1]["clicked_at"]
+        head = [r for r in rows if r["clicked_at"] != boundary]
+        if head:
+            yield _prepare_click_frame(head)
+
+        block, offset = [], 0
+        while True:
+            batch = (query().eq("clicked_at", boundary).order("short_id")
+                     .range(offset, offset + page_size - 1).execute().data or [])
+            block.extend(batch)
+            if len(batch) < page_size:
+                break
+            offset += page_size
+        if block:
+            yield _prepare_click_frame(block)
+        cursor = boundary
+
+
+def fetch_click_events(start_date: datetime, end_date: datetime,
+                       coach_username: Optional[str] = None,
+                       candidate_ids: Optional[List[str]] = None,
+                       market: Optional[str] = None) -> pd.DataFrame:
+    """Fetch click events for in-app analytics.
 
     Args:
         start_date: The start datetime for the query.
         end_date: The end datetime for the query.
+        coach_username: Optional coach filter (applied server-side).
+        candidate_ids: Optional Free Agent UUID filter (applied server-side).
+        market: Optional market filter (applied server-side).
 
     Returns:
-        A pandas DataFrame with click event data.
+        A pandas DataFrame with click event data, newest first.
     """
-    client = get_client()
-    if client is None:
-        return pd.DataFrame()
-    
     try:
-        res = (
-            client.table("click_events")
-            .select("clicked_at,coach,market,route,match,fair,candidate_id,candidate_name,short_id,original_url,job_title,company")
-            .gte("clicked_at", start_date.isoformat())
-            .lte("clicked_at", end_date.isoformat())
-            .order("clicked_at", desc=True)
-            .execute()
-        )
-        
-        if not res.data:
+        chunks = list(iter_click_events(start_date, end_date, coach_username=coach_username,
+                                        candidate_ids=candidate_ids, market=market))
+        if not chunks:
             return pd.DataFrame()
-
-        df = pd.DataFrame(res.data)
-        df['timestamp'] = pd.to_datetime(df['clicked_at'], format='ISO8601')
-        df['click_id'] = df['short_id'] # Use short_id as a unique click identifier
-        # Map coach to coach_username for dashboard compatibility
-        df['coach_username'] = df['coach']
-        return df
+        return pd.concat(chunks, ignore_index=True)
     except Exception as e:
         print(f"Error fetching click events: {e}")
         return pd.DataFrame()
 
 
+def rollup_click_events(chunks: Iterable[pd.DataFrame], recent_rows: int = 500) -> Dict:
+    """Aggregate click-event chunks into dashboard rollups in one pass.
+
+    Only per-group counts are kept between chunks, so memory is bounded by the
+    number of days/agents/markets/jobs rather than the number of clicks.
+
+    Args:
+        chunks: DataFrames from iter_click_events (newest first)
+        recent_rows: Number of newest raw rows to keep for display
+
+    Returns:
+        Dict with:
+          - totals: total_clicks, unique_clicks, unique_agents, unique_jobs
+          - daily: date, clicks
+          - agents: candidate_id, candidate_name, total_clicks, unique_jobs_clicked
+          - markets: market, clicks
+          - jobs: target_url, clicks
+          - recent: newest raw rows
+    """
+    daily: Counter = Counter()
+    markets: Counter = Counter()
+    jobs: Counter = Counter()
+    agent_jobs: Counter = Counter()
+    click_ids = set()
+    names: Dict[str, str] = {}
+    recent = []
+    recent_count = 0
+    total = 0
+
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        total += len(chunk)
+        daily.update(chunk.groupby(chunk['timestamp'].dt.date).size().to_dict())
+        markets.update(chunk['market'].fillna('Unknown').value_counts().to_dict())
+        jobs.update(chunk['target_url'].value_counts().to_dict())
+        agent_jobs.update(chunk.groupby(['candidate_id', 'target_url']).size().to_dict())
+        click_ids.update(chunk['click_id'].dropna())
+        named = chunk.dropna(subset=['candidate_id', 'candidate_name'])
+        for candidate_id, name in zip(named['candidate_id'], named['candidate_name']):
+            names.setdefault(candidate_id, name)
+        if recent_count < recent_rows:
+            recent.append(chunk.head(recent_rows - recent_count))
+            recent_count += len(recent[-1])
+
+    agent_clicks: Counter = Counter()
+    agent_unique_jobs: Counter = Counter()
+    for (candidate_id, _), clicks in agent_jobs.items():
+        agent_clicks[candidate_id] += clicks
+        agent_unique_jobs[candidate_id] += 1
+    agents = pd.DataFrame({
+        'candidate_id': list(agent_clicks),
+        'candidate_name': [names.get(c) for c in agent_clicks],
+        'total_clicks': list(agent_clicks.values()),
+        'unique_jobs_clicked': [agent_unique_jobs[c] for c in agent_clicks],
+    }, columns=['candidate_id', 'candidate_name', 'total_clicks', 'unique_jobs_clicked'])
+
+    def counts_frame(counts: Counter, key: str, sort_by: str) -> pd.DataFrame:
+        frame = pd.DataFrame({key: list(counts), 'clicks': list(counts.values())}, columns=[key, 'clicks'])
+        return frame.sort_values(sort_by, ascending=sort_by == key, kind='stable').reset_index(drop=True)
+
+    return {
+        'totals': {
+            'total_clicks': total,
+            'unique_clicks': len(click_ids),
+            'unique_agents': len(agent_clicks),
+            'unique_jobs': len(jobs),
+        },
+        'daily': counts_frame(daily, 'date', 'date'),
+        'agents': agents.sort_values('total_clicks', ascending=False, kind='stable').reset_index(drop=True),
+        'markets': counts_frame(markets, 'market', 'clicks'),
+        'jobs': counts_frame(jobs, 'target_url', 'clicks'),
+        'recent': pd.concat(recent, ignore_index=True) if recent else pd.DataFrame(),
+    }
+
+
+def fetch_click_rollups(start_date: datetime, end_date: datetime,
+                        coach_username: Optional[str] = None,
+                        candidate_ids: Optional[List[str]] = None,
+                        market: Optional[str] = None,
+                        recent_rows: int = 500) -> Dict:
+    """Daily/agent/market/job click rollups computed while streaming click_events.
+
+    Args:
+        start_date: The start datetime for the query.
+        end_date: The end datetime for the query.
+        coach_username: Optional coach filter (applied server-side).
+        candidate_ids: Optional Free Agent UUID filter (applied server-side).
+        market: Optional market filter (applied server-side).
+        recent_rows: Number of newest raw rows to include.
+
+    Returns:
+        Dict as returned by rollup_click_events (empty rollups on error).
+    """
+    try:
+        return rollup_click_events(
+            iter_click_events(start_date, end_date, coach_username=coach_username,
+                              candidate_ids=candidate_ids, market=market),
+            recent_rows=recent_rows,
+        )
+    except Exception as e:
+        print(f"Error fetching click rollups: {e}")
+        return rollup_click_events([], recent_rows=recent_rows)
+
+
 def fetch_market_quality_counts(hours: int = 72) -> pd.DataFrame:
     """Return counts of good/so-so jobs per market created in the last N hours.
 
@@ -875,18 +1068,18 @@ def instant_memory_search(location: str, search_terms: str = "", hours: int = 72
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         print(f"🔍 Instant memory search: location='{location}', market='{market}', hours={hours}")
         
-        # Get reported job URLs to exclude them
-        reported_jobs_result = client.table('job_feedback').select('job_url').execute()
-        reported_urls = {job['job_url'] for job in (reported_jobs_result.data or [])}
-        print(f"🚫 Excluding {len(reported_urls)} reported jobs from memory search")
+        # Reported jobs: incrementally refreshed in-process index (see feedback_exclusions)
+        from feedback_exclusions import get_feedback_exclusions
+        exclusions = get_feedback_exclusions()
+        exclusions.refresh(client)
         
         # Direct Supabase query - no pipeline needed!
         query = client.table('jobs').select('*')
         
-        # Exclude reported jobs (if any exist)
-        if reported_urls:
-            # Supabase doesn't have NOT IN, so we'll filter after retrieval
-            pass  # We'll filter these out after getting results
+        # Exclude reported jobs server-side when the URL list fits in the request
+        query, pushed_down = exclusions.apply_to_query(query)
+        print(f"🚫 Excluding {len(exclusions.urls)} reported jobs from memory search"
+              f"{' (server-side)' if pushed_down else ''}")
         
         # Market filter (crucial for R1 deduplication) - use market field for consistent matching
         # Use provided market parameter, otherwise fall back to location
@@ -920,13 +1113,8 @@ def instant_memory_search(location: str, search_terms: str = "", hours: int = 72
         result = query.execute()
         jobs = result.data or []
         
-        # Filter out reported jobs
-        if reported_urls:
-            jobs_before = len(jobs)
-            jobs = [job for job in jobs if job.get('apply_url') not in reported_urls]
-            jobs_filtered = jobs_before - len(jobs)
-            if jobs_filtered > 0:
-                print(f"🚫 Filtered out {jobs_filtered} reported jobs")
+        # Filter out reported jobs (job IDs, and URLs when the list was too long to push down)
+        jobs = exclusions.filter_jobs(jobs)
 
         # Expired feedback filtering is now handled at database level
         
@@ -958,11 +1146,12 @@ def instant_memory_search(location: str, search_terms: str = "", hours: int = 72
             
             try:
                 from link_tracker import LinkTracker
-                import time
                 
                 link_tracker = LinkTracker()
                 
-                for i, job in enumerate(jobs):
+                link_jobs = []
+                link_requests = []
+                for job in jobs:
                     # Use apply_url as the base URL for tracking
                     base_url = job.get('apply_url', '') or job.get('indeed_job_url', '') or job.get('clean_apply_url', '')
                     
@@ -974,27 +1163,19 @@ def instant_memory_search(location: str, search_terms: str = "", hours: int = 72
                             f"market:{market or 'unknown'}",
                             "type:job_application"
                         ]
-                        
-                        # Generate tracked URL
-                        try:
-                            tracked_url = link_tracker.create_short_link(
-                                base_url, 
-                                title=f"Job: {job.get('job_title', 'CDL Position')}",
-                                tags=tags,
-                                candidate_id=agent_uuid
-                            )
-                            
-                            if tracked_url and tracked_url.startswith('https://freeworldjobs.short.gy'):
-                                job['tracked_url'] = tracked_url
-                            
-                            # Rate limiting: 1 second delay every 10 jobs
-                            if (i + 1) % 10 == 0:
-                                print(f"   Generated {i + 1}/{len(jobs)} tracking URLs... (rate limiting)")
-                                time.sleep(1.0)
-                                
-                        except Exception as e:
-                            print(f"   Failed to create tracking URL for job {i + 1}: {e}")
-                            continue
+                        link_jobs.append(job)
+                        link_requests.append({
+                            'url': base_url,
+                            'title': f"Job: {job.get('job_title', 'CDL Position')}",
+                            'tags': tags,
+                            'candidate_id': agent_uuid,
+                        })
+                
+                # Concurrent batch; rate limiting now lives in the link engine's token bucket
+                tracked_urls = link_tracker.create_short_links(link_requests)
+                for job, tracked_url in zip(link_jobs, tracked_urls):
+                    if tracked_url and tracked_url.startswith('https://freeworldjobs.short.gy'):
+                        job['tracked_url'] = tracked_url
                 
                 tracked_count = sum(1 for job in jobs if job.get('tracked_url'))
                 print(f"🔗 Generated {tracked_count}/{len(jobs)} tracking URLs")
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from canonical_transforms import transform_ai_classification
+
+
+def test_ai_results_joined_by_job_id():
+    df = pd.DataFrame({
+        'id.job': ['a', 'b', 'c'],
+        'ai.match': ['', '', ''],
+    })
+    ai_results = {
+        'a': {'job_id': 'a', 'match': 'good', 'reason': 'Local', 'route_type': 'Local'},
+        'b': {'job_id': 'b', 'match': 'bad', 'career_pathway': 'warehouse_pathway', 'training_provided': True},
+    }
+
+    out = transform_ai_classification(df, ai_results)
+
+    assert out['ai.match'].tolist() == ['good', 'bad', '']
+    assert out['ai.reason'].tolist() == ['Local', 'No reason provided', '']
+    assert out['ai.route_type'].tolist() == ['Local', 'Unknown', '']
+    assert out['ai.career_pathway'].tolist() == ['cdl_pathway', 'warehouse_pathway', 'cdl_pathway']
+    assert out['ai.training_provided'].tolist() == [False, True, False]
+    assert out['ai.fair_chance'].tolist() == ['no_requirements_mentioned'] * 3
+
+
+def test_existing_classification_on_first_duplicate_is_preserved():
+    df = pd.DataFrame({
+        'id.job': ['dup', 'dup', 'late'],
+        'ai.match': ['so-so', '', ''],
+        'ai.reason': ['from memory', '', ''],
+    })
+    ai_results = {
+        'dup': {'match': 'bad', 'reason': 'fresh result'},
+        'late': {'match': 'good', 'reason': 'fresh result'},
+    }
+
+    out = transform_ai_classification(df, ai_results)
+
+    # Both 'dup' rows take the first row's stored values
+    assert out['ai.match'].tolist() == ['so-so', 'so-so', 'good']
+    assert out['ai.reason'].tolist() == ['from memory', 'from memory', 'fresh result']
+    assert (out['route.stage'] == 'classified').all()
+
+
+def test_empty_frame():
+    df = pd.DataFrame({'id.job': pd.Series([], dtype=object), 'ai.match': pd.Series([], dtype=object)})
+    out = transform_ai_classification(df, {})
+    assert len(out) == 0
+    assert 'ai.summary' in out.columns
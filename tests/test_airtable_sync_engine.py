@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+from airtable_sync_engine import AirtableSyncEngine, RateLimiter
+from fake_airtable import FakeAirtableTable
+
+NOW = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _record(i, quality='good', created=None):
+    created = created or NOW - timedelta(hours=i % 48)
+    return {'Job ID': f'job-{i}', 'Job Title': f'CDL-A Driver {i}', 'Company': 'Swift',
+            'Match Quality': quality, 'Created At': created.isoformat()}
+
+
+def _no_wait_engine(table, sleeps=None):
+    limiter = RateLimiter(rate_per_second=5, sleep=lambda s: None)
+    return AirtableSyncEngine(table, rate_limiter=limiter,
+                              sleep=(sleeps.append if sleeps is not None else lambda s: None))
+
+
+def _stale(fields):
+    return datetime.fromisoformat(fields['Created At'].replace('Z', '+00:00')) < NOW - timedelta(hours=72)
+
+
+def test_diff_plan_and_batched_writes():
+    board = [_record(i) for i in range(23)]
+    # Airtable hands timestamps back in its own format
+    board = [dict(r, **{'Created At': r['Created At'].replace('+00:00', '.000Z')}) for r in board]
+    board += [_record(900 + i, created=NOW - timedelta(days=5)) for i in range(12)]
+    table = FakeAirtableTable(board)
+    desired = [_record(i, quality='so-so' if i < 3 else 'good') for i in range(40)]
+    desired.append(_record(5, quality='bad'))  # duplicate key: first occurrence wins
+
+    engine = _no_wait_engine(table)
+    plan, result = engine.sync(desired, delete_filter=_stale, dry_run=True)
+    assert result is None and table.call_count == 1
+    assert plan.summary() == {'create': 17, 'update': 3, 'delete': 12, 'unchanged': 20,
+                              'duplicate_keys': 0, 'write_calls': 2 + 1 + 2}
+    assert all(u['changed'] == ['Match Quality'] for u in plan.updates)
+    report = plan.report(limit=2)
+    assert '17 create, 3 update, 12 delete, 20 unchanged' in report and '~ job-0: Match Quality' in report
+
+    table.calls.clear()
+    result = engine.apply(plan)
+    assert result == {'created': 17, 'updated': 3, 'deleted': 12, 'errors': 0}
+    assert [(c['method'], c['records']) for c in table.calls] == [
+        ('batch_delete', 10), ('batch_delete', 2), ('batch_create', 10), ('batch_create', 7), ('batch_update', 3)]
+    board_now = table.fields_by_key('Job ID')
+    assert set(board_now) == {f'job-{i}' for i in range(40)}
+    assert board_now['job-1']['Match Quality'] == 'so-so' and board_now['job-5']['Match Quality'] == 'good'
+
+    # Nothing changed since: a re-sync is one list call and no writes
+    table.calls.clear()
+    plan, _ = _no_wait_engine(table).sync(desired, delete_filter=_stale)
+    assert plan.unchanged == 40 and [c['method'] for c in table.calls] == ['list']
+
+
+def test_supabase_microseconds_match_airtable_milliseconds():
+    table = FakeAirtableTable([{'Job ID': 'job-1', 'Created At': '2025-09-24T14:28:25.707Z'},
+                               {'Job ID': 'job-2', 'Created At': '2025-09-24T14:28:25.707Z'}])
+    desired = [{'Job ID': 'job-1', 'Created At': '2025-09-24 14:28:25.707378+00'},
+               {'Job ID': 'job-2', 'Created At': '2025-09-24 14:28:25.708001+00'}]
+    plan, _ = _no_wait_engine(table).sync(desired, dry_run=True)
+    assert plan.unchanged == 1 and [u['key'] for u in plan.updates] == ['job-2']
+
+
+def test_rate_limited_calls_are_retried_and_paced():
+    table = FakeAirtableTable()
+    sleeps = []
+    engine = _no_wait_engine(table, sleeps)
+    plan, _ = engine.sync([_record(i) for i in range(5)], dry_run=True)
+    table.fail_next_with_429(2)
+    assert engine.apply(plan)['created'] == 5
+    assert sleeps == [1, 2] and len(table.records) == 5
+
+    clock, waits = [0.0], []
+    limiter = RateLimiter(rate_per_second=5, clock=lambda: clock[0], sleep=waits.append)
+    for _ in range(6):
+        limiter.acquire()
+    assert [round(w, 6) for w in waits] == [0.2, 0.4, 0.6, 0.8, 1.0]
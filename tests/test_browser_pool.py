@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+
+import pdf.html_pdf_generator as generator
+from pdf.browser_pool import BrowserPool, PoolQueueFull
+
+
+def test_queue_full_is_rejected_without_launching():
+    pool = BrowserPool(max_pages=0, max_queue=0)
+    with pytest.raises(PoolQueueFull):
+        pool.render_pdf('<html></html>', '/tmp/never.pdf')
+    assert pool.stats['launches'] == 0
+
+
+def test_export_falls_back_to_cold_launch(monkeypatch, tmp_path):
+    cold_calls = []
+
+    def cold(html, path):
+        cold_calls.append(path)
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-cold')
+    monkeypatch.setattr(generator, 'export_pdf_playwright_cold', cold)
+
+    class BrokenPool:
+        def render_pdf(self, html, path):
+            raise RuntimeError('browser crashed')
+
+    monkeypatch.setattr('pdf.browser_pool.get_browser_pool', lambda: BrokenPool())
+    generator.export_pdf_playwright('<html></html>', str(tmp_path / 'a.pdf'))
+
+    monkeypatch.setenv('FREEWORLD_PDF_BROWSER_POOL', 'off')
+    generator.export_pdf_playwright('<html></html>', str(tmp_path / 'b.pdf'))
+
+    # The fallback renders to its own temp file, then renames it into place
+    assert len(cold_calls) == 2 and str(tmp_path / 'a.pdf') not in cold_calls
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['a.pdf', 'b.pdf']
+    assert (tmp_path / 'a.pdf').read_bytes() == b'%PDF-cold'
+
+
+def test_timed_out_render_is_cancelled(tmp_path):
+    pool = BrowserPool(max_pages=1)
+    cancelled = []
+
+    async def slow_render(html, output_path):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(output_path)
+            raise
+
+    pool._render = slow_render
+    try:
+        with pytest.raises(TimeoutError):
+            pool.render_pdf('<html></html>', str(tmp_path / 'late.pdf'), timeout=0.1)
+        deadline = time.time() + 2
+        while not cancelled and time.time() < deadline:
+            time.sleep(0.01)
+        assert cancelled == [str(tmp_path / 'late.pdf')]
+        assert not (tmp_path / 'late.pdf').exists()
+    finally:
+        pool.shutdown()
+
+
+def test_pool_reuses_browser(tmp_path):
+    pytest.importorskip('playwright')
+    pool = BrowserPool(max_pages=1)
+    try:
+        if not pool.health_check():
+            pytest.skip('chromium not installed')
+        for i in range(3):
+            pool.render_pdf('<html><body><h1>hi</h1></body></html>', str(tmp_path / f'{i}.pdf'))
+            assert (tmp_path / f'{i}.pdf').stat().st_size > 0
+        assert pool.stats['launches'] == 1
+        assert pool.stats['renders'] == 3
+    finally:
+        pool.shutdown()
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from checkpoint_store import CheckpointWriter, apply_retention, checkpoint_disk_usage, load_checkpoint
+
+
+def _frame(rows=4):
+    return pd.DataFrame({
+        'id.job': [f'j{i}' for i in range(rows)],
+        'source.title': [f'CDL Driver {i}' for i in range(rows)],
+        'norm.title': [''] * rows,
+        'ai.match': [''] * rows,
+    })
+
+
+def test_deltas_store_changed_groups_and_rebuild(tmp_path):
+    writer = CheckpointWriter(str(tmp_path), 'pipeline_v3_test', background=True)
+    df = _frame()
+    writer.submit(df, '01_ingestion')
+
+    df['norm.title'] = df['source.title'].str.lower()
+    writer.submit(df, '02_normalization')
+    expected_norm = df.copy()
+
+    df['ai.match'] = ['good', 'bad', 'so-so', 'good']  # mutating after submit must not leak
+    writer.submit(df, '05_classification')
+
+    df = df[df['ai.match'] != 'bad']  # rows change -> full snapshot
+    writer.submit(df, '06_routing')
+    writer.submit(df, '99_complete')
+    writer.close(retention=False)
+
+    manifest = json.loads((tmp_path / 'pipeline_v3_test_manifest.json').read_text())
+    kinds = {e['stage']: (e['kind'], e['groups']) for e in manifest['stages']}
+    assert kinds['02_normalization'] == ('delta', ['norm'])
+    assert kinds['05_classification'] == ('delta', ['ai'])
+    assert kinds['06_routing'][0] == 'full' and kinds['99_complete'][0] == 'full'
+    assert (tmp_path / 'pipeline_v3_test_99_complete.parquet').exists()
+
+    pd.testing.assert_frame_equal(load_checkpoint(str(tmp_path), 'pipeline_v3_test', '02_normalization'), expected_norm)
+    classified = load_checkpoint(str(tmp_path), 'pipeline_v3_test', '05_classification')
+    assert classified['ai.match'].tolist() == ['good', 'bad', 'so-so', 'good']
+    assert load_checkpoint(str(tmp_path), 'pipeline_v3_test', '06_routing')['id.job'].tolist() == ['j0', 'j2', 'j3']
+    assert load_checkpoint(str(tmp_path), 'pipeline_v3_test', 'missing') is None
+
+
+def test_safety_csv_written_before_submit_returns(tmp_path):
+    gate = threading.Event()
+
+    def prepare(df):
+        if threading.current_thread().name.startswith('checkpoint-'):
+            gate.wait(5)  # Hold the writer thread
+        return df
+
+    writer = CheckpointWriter(str(tmp_path), 'pipeline_v3_csv', prepare=prepare, background=True)
+    writer.submit(_frame(), '01_ingestion')
+    writer.submit(_frame(), '05_classification', safety_csv=str(tmp_path / 'SAFETY_05_classified_pipeline_v3_csv.csv'))
+    assert len(pd.read_csv(tmp_path / 'SAFETY_05_classified_pipeline_v3_csv.csv')) == 4
+    assert not (tmp_path / 'pipeline_v3_csv_01_ingestion.parquet').exists()
+    gate.set()
+    writer.close(retention=False)
+    assert load_checkpoint(str(tmp_path), 'pipeline_v3_csv', '05_classification') is not None
+
+
+def test_retention_compacts_old_runs_and_caps_disk(tmp_path):
+    for i in range(3):
+        writer = CheckpointWriter(str(tmp_path), f'pipeline_v3_run{i}', background=False)
+        writer.manifest['created'] = i
+        df = _frame(200)
+        writer.submit(df, '01_ingestion')
+        df['norm.title'] = 'x'
+        writer.submit(df, '02_normalization')
+        writer.submit(df, '99_complete')
+        writer.close(retention=False)
+
+    stats = apply_retention(str(tmp_path), keep_runs=1, max_mb=1000)
+    assert stats['compacted_runs'] == 2
+    assert not (tmp_path / 'pipeline_v3_run0_01_ingestion.parquet').exists()
+    assert (tmp_path / 'pipeline_v3_run0_99_complete.parquet').exists()
+    assert load_checkpoint(str(tmp_path), 'pipeline_v3_run2', '02_normalization') is not None
+
+    apply_retention(str(tmp_path), keep_runs=1, max_mb=0, protect_run_id='pipeline_v3_run2')
+    remaining = [n for n in os.listdir(tmp_path) if n.endswith('.parquet')]
+    assert remaining and all(n.startswith('pipeline_v3_run2') for n in remaining)
+    assert checkpoint_disk_usage(str(tmp_path)) > 0
+
+
+def test_retention_spares_running_runs_and_delta_bases(tmp_path):
+    running = CheckpointWriter(str(tmp_path), 'pipeline_v3_running', background=False)
+    running.submit(_frame(200), '01_ingestion')  # Base of the deltas it has yet to write
+
+    done = CheckpointWriter(str(tmp_path), 'pipeline_v3_done', background=False)
+    df = _frame(200)
+    done.submit(df, '01_ingestion')
+    df['norm.title'] = 'x'
+    done.submit(df, '02_normalization')
+    done.submit(df, '99_complete')
+    done.close(retention=False)
+    old = os.path.getmtime(tmp_path / 'pipeline_v3_done_99_complete.parquet') - 100
+    os.utime(tmp_path / 'pipeline_v3_done_01_ingestion.parquet', (old, old))  # Oldest file: the base
+
+    cap_mb = (checkpoint_disk_usage(str(tmp_path)) - 1) / 1024 / 1024
+    apply_retention(str(tmp_path), keep_runs=10, max_mb=cap_mb)
+
+    assert (tmp_path / 'pipeline_v3_running_01_ingestion.parquet').exists()
+    assert not (tmp_path / 'pipeline_v3_done_01_ingestion.parquet').exists()
+    assert not (tmp_path / 'pipeline_v3_done_02_normalization.delta.parquet').exists()  # Went with its base
+    assert (tmp_path / 'pipeline_v3_done_99_complete.parquet').exists()
+    manifest = json.loads((tmp_path / 'pipeline_v3_done_manifest.json').read_text())
+    assert [e['stage'] for e in manifest['stages']] == ['99_complete']
+
+    running.submit(_frame(200).assign(**{'norm.title': 'y'}), '02_normalization')
+    assert load_checkpoint(str(tmp_path), 'pipeline_v3_running', '02_normalization') is not None
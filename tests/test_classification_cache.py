@@ -0,0 +1,99 @@
+import pytest
+
+from classification_cache import ClassificationCache, content_hash
+from cost_calculator import CostCalculator
+
+
+def _job(job_id, description='Home daily. No experience needed.'):
+    return {
+        'job_id': job_id,
+        'job_title': 'CDL-A Driver',
+        'company': 'Acme Freight',
+        'location': 'Houston, TX',
+        'job_description': description,
+    }
+
+
+def _result(job_id, match='good'):
+    return {'job_id': job_id, 'match': match, 'reason': 'r', 'summary': 's'}
+
+
+def test_key_ignores_case_whitespace_and_job_id():
+    a = _job('a', 'Home  daily.\nNo experience needed.')
+    b = dict(_job('b', 'home daily. no EXPERIENCE needed.'), company='  ACME freight ')
+    assert content_hash(a, 'cdl', 'v1') == content_hash(b, 'cdl', 'v1')
+    assert content_hash(a, 'cdl', 'v1') != content_hash(a, 'cdl', 'v2')
+    assert content_hash(a, 'cdl', 'v1') != content_hash(a, 'pathway', 'v1')
+
+
+def test_hits_are_restamped_and_errors_not_stored(tmp_path):
+    cache = ClassificationCache(str(tmp_path / 'cache.sqlite'))
+    stored = cache.store_results(
+        [_job('old'), _job('bad', 'Owner operator')],
+        [_result('old'), _result('bad', match='error')],
+        'cdl', 'v1'
+    )
+    assert stored == 1
+
+    cached, misses = cache.lookup_jobs([_job('repost'), _job('bad2', 'Owner operator')], 'cdl', 'v1')
+    assert cached['repost']['job_id'] == 'repost'
+    assert cached['repost']['match'] == 'good'
+    assert [j['job_id'] for j in misses] == ['bad2']
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+
+    savings = CostCalculator().calculate_classification_cache_savings(cache.stats)
+    assert savings['hit_rate'] == 0.5
+    assert savings['saved_usd'] == pytest.approx(0.0003)
+
+    # A later run only reports the lookups made since its own start
+    run_start = dict(cache.stats)
+    cache.lookup_jobs([_job('repost')], 'cdl', 'v1')
+    savings = CostCalculator().calculate_classification_cache_savings(cache.stats, since=run_start)
+    assert (savings['hits'], savings['misses'], savings['hit_rate']) == (1, 0, 1.0)
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    now = [1000.0]
+    cache = ClassificationCache(str(tmp_path / 'cache.sqlite'), ttl_hours=1, max_entries=2)
+    cache._clock = lambda: now[0]
+
+    cache.store_results([_job('0', 'desc 0')], [_result('0')], 'cdl', 'v1')
+    now[0] += 1
+    cache.store_results([_job('1', 'desc 1')], [_result('1')], 'cdl', 'v1')
+    now[0] += 1
+    cache.lookup_jobs([_job('0', 'desc 0')], 'cdl', 'v1')  # touch: 1 becomes LRU
+    now[0] += 1
+    cache.store_results([_job('2', 'desc 2')], [_result('2')], 'cdl', 'v1')
+    assert cache.entry_count() == 2
+    assert cache.stats['evictions'] == 1
+    _, misses = cache.lookup_jobs([_job('1', 'desc 1')], 'cdl', 'v1')
+    assert len(misses) == 1
+
+    now[0] += 3601
+    cached, misses = cache.lookup_jobs([_job('0', 'desc 0'), _job('2', 'desc 2')], 'cdl', 'v1')
+    assert cached == {} and len(misses) == 2
+    assert cache.stats['expired'] == 2
+
+
+def test_classifier_only_sends_cache_misses(tmp_path, monkeypatch):
+    from mock_openai_server import MockOpenAIServer
+    from job_classifier import JobClassifier
+
+    monkeypatch.setenv('FREEWORLD_CLASSIFICATION_CACHE', str(tmp_path / 'cache.sqlite'))
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+
+    with MockOpenAIServer() as server:
+        monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+        classifier = JobClassifier()
+
+        first = classifier.classify_jobs_in_batches([_job('a'), _job('b', 'Owner operator wanted')])
+        assert [r['match'] for r in first] == ['good', 'bad']
+        assert server.request_count == 2
+
+        second = classifier.classify_jobs_in_batches([_job('c', 'owner  OPERATOR wanted'), _job('d', 'Brand new')])
+        assert [r['job_id'] for r in second] == ['c', 'd']
+        assert second[0]['match'] == 'bad'
+        assert server.request_count == 3
+
+        classifier.classify_jobs_in_batches([_job('e')], use_cache=False)
+        assert server.request_count == 4
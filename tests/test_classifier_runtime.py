@@ -0,0 +1,91 @@
+import asyncio
+
+import job_classifier
+from classifier_runtime import AdaptiveLimiter, ClassifierRuntime
+from mock_openai_server import MockOpenAIServer
+
+
+def _jobs(n, prefix='job'):
+    return [{'job_id': f'{prefix}-{i}', 'job_title': 'CDL-A Driver', 'company': 'Acme', 'location': 'Houston, TX',
+             'job_description': 'No experience needed, training provided.'} for i in range(n)]
+
+
+def test_limiter_halves_on_throttling_and_grows_when_fast():
+    now = [0.0]
+    limiter = AdaptiveLimiter(8, max_limit=10, clock=lambda: now[0])
+
+    limiter.record(429, 0.01)
+    limiter.record(429, 0.01)  # No latency sample yet: every 429 counts
+    assert limiter.limit == 2
+
+    for _ in range(4):
+        limiter.record(200, 0.1)
+    assert limiter.limit == 3
+
+    now[0] = 5.0
+    limiter.record(429, 0.01)
+    limiter.record(429, 0.01)  # Same round trip (< smoothed latency): halved once
+    assert limiter.limit == 1 and limiter.stats['decreases'] == 3 and limiter.stats['throttled'] == 4
+
+    fixed = AdaptiveLimiter(4, adaptive=False)
+    fixed.record(429, 0.01)
+    assert fixed.limit == 4 and fixed.stats['throttled'] == 1
+
+
+def test_limiter_bounds_in_flight_requests():
+    async def run():
+        limiter = AdaptiveLimiter(3, adaptive=False)
+
+        async def work():
+            async with limiter:
+                await asyncio.sleep(0.01)
+                await limiter.backoff(0.01)  # Retry waits give the slot away
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(20)))
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.stats['peak_in_flight'] == 3 and limiter.in_flight == 0
+
+
+def test_runtime_reuses_connections_across_batches(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    with MockOpenAIServer(latency=0.02) as server:
+        monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+        classifier = job_classifier.JobClassifier()
+
+        monkeypatch.setattr(job_classifier, 'get_classifier_runtime', lambda: None)
+        for batch in range(3):
+            classifier.classify_jobs_in_batches(_jobs(8, f'legacy{batch}'), use_cache=False)
+        legacy_connections = len(server.connections)
+
+        runtime = ClassifierRuntime(initial_concurrency=8)
+        monkeypatch.setattr(job_classifier, 'get_classifier_runtime', lambda: runtime)
+        server.connections.clear()
+        try:
+            for batch in range(3):
+                results = classifier.classify_jobs_in_batches(_jobs(8, f'pooled{batch}'), use_cache=False)
+                assert [r['job_id'] for r in results] == [f'pooled{batch}-{i}' for i in range(8)]
+            assert runtime.runs == 3 and runtime.snapshot()['responses'] == 24
+        finally:
+            runtime.close()
+
+    assert len(server.connections) <= 8 < legacy_connections
+
+
+def test_runtime_adapts_to_rate_limit(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    with MockOpenAIServer(latency=0.03, max_concurrency=4, retry_after=0.01) as server:
+        monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+        runtime = ClassifierRuntime(initial_concurrency=20, max_concurrency=20)
+        monkeypatch.setattr(job_classifier, 'get_classifier_runtime', lambda: runtime)
+        try:
+            results = job_classifier.JobClassifier().classify_jobs_in_batches(_jobs(60), use_cache=False)
+            snapshot = runtime.snapshot()
+        finally:
+            runtime.close()
+
+    assert len(results) == 60 and all(r['match'] == 'good' for r in results)
+    assert server.throttled > 0 and snapshot['throttled'] == server.throttled
+    assert snapshot['limit'] < 20 and server.max_in_flight == 4
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import supabase_utils
+from mock_postgrest_server import MockPostgrestServer
+
+END = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _clicks(n):
+    rows = []
+    for i in range(n):
+        # Blocks of 7 clicks share a timestamp, so page boundaries split them
+        ts = END - timedelta(minutes=30 * (i // 7) + 1)
+        rows.append({
+            'clicked_at': ts.isoformat(), 'coach': 'maria' if i % 3 else 'james',
+            'market': 'Houston' if i % 2 else 'Dallas', 'route': 'Local', 'match': 'good',
+            'fair': 'fair_chance_employer', 'candidate_id': f'agent-{i % 11}',
+            'candidate_name': f'Agent {i % 11}', 'short_id': f's{i}',
+            'original_url': f'https://www.indeed.com/viewjob?jk={i % 40}', 'job_title': 'CDL-A',
+            'company': 'Carrier',
+        })
+    return rows
+
+
+def test_keyset_pages_return_every_row_once():
+    rows = _clicks(430)
+    start = END - timedelta(days=30)
+    with MockPostgrestServer({'click_events': rows}, max_rows=50) as server:
+        client = server.client()
+        chunks = list(supabase_utils.iter_click_events(start, END, page_size=50, client=client))
+        legacy = client.table('click_events').select('*').execute().data
+
+    ids = [sid for chunk in chunks for sid in chunk['short_id']]
+    assert len(legacy) == 50
+    assert sorted(ids) == sorted(r['short_id'] for r in rows)
+    times = [t for chunk in chunks for t in chunk['timestamp']]
+    assert times == sorted(times, reverse=True)
+
+
+def test_filters_are_server_side_and_rollups_match(monkeypatch):
+    rows = _clicks(300)
+    start = END - timedelta(days=2)
+    with MockPostgrestServer({'click_events': rows}, max_rows=40) as server:
+        client = server.client()
+        monkeypatch.setattr(supabase_utils, 'get_client', lambda: client)
+        rollups = supabase_utils.fetch_click_rollups(start, END, coach_username='maria',
+                                                     candidate_ids=['agent-1', 'agent-2'], recent_rows=5)
+        params = dict(server.requests[0]['params'])
+
+    assert params['coach'] == 'eq.maria' and params['candidate_id'].startswith('in.(')
+    expected = [r for r in rows if r['coach'] == 'maria' and r['candidate_id'] in ('agent-1', 'agent-2')
+                and r['clicked_at'] >= start.isoformat()]
+    assert rollups['totals']['total_clicks'] == len(expected)
+    assert rollups['totals']['unique_jobs'] == len({r['original_url'] for r in expected})
+    assert rollups['daily']['clicks'].sum() == len(expected)
+    agents = rollups['agents'].set_index('candidate_id')
+    for agent in ('agent-1', 'agent-2'):
+        mine = [r for r in expected if r['candidate_id'] == agent]
+        assert agents.loc[agent, 'total_clicks'] == len(mine)
+        assert agents.loc[agent, 'unique_jobs_clicked'] == len({r['original_url'] for r in mine})
+    assert dict(zip(rollups['markets']['market'], rollups['markets']['clicks'])) == {
+        m: sum(r['market'] == m for r in expected) for m in {r['market'] for r in expected}}
+    assert len(rollups['recent']) == 5
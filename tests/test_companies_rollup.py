@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+import companies_rollup
+from companies_rollup import BlacklistLookup, IncrementalCompanyRollup, analyze_jobs_for_companies
+from mock_postgrest_server import MockPostgrestServer
+
+T0 = datetime(2026, 9, 1, tzinfo=timezone.utc)
+COMPARED = ('total_jobs', 'fair_chance_jobs', 'markets', 'job_titles', 'route_types', 'quality_breakdown',
+            'route_breakdown', 'oldest_job_date', 'newest_job_date', 'avg_salary_min', 'avg_salary_max')
+
+
+def _job(i, company, match='good', updated=None):
+    created = T0 + timedelta(hours=i)
+    return {'id': i, 'company': company, 'location': 'Houston, TX', 'job_title': f'CDL-A Driver {i % 3}',
+            'match_level': match, 'route_type': ['Local', 'OTR', 'Regional'][i % 3],
+            'fair_chance': 'fair_chance_employer' if i % 2 else 'unknown', 'salary': f'{50000 + i}-{60000 + i}',
+            'created_at': created.isoformat(), 'updated_at': (updated or created).isoformat(),
+            'success_coach': 'maria', 'market': ['Houston', 'Dallas'][i % 2]}
+
+
+def _assert_table_matches_full_rollup(server):
+    expected = {r['normalized_company_name']: r for r in analyze_jobs_for_companies().to_dict('records')}
+    table = {r['normalized_company_name']: r for r in server.tables['companies']}
+    assert set(table) == set(expected)
+    for name, row in table.items():
+        assert {k: row[k] for k in COMPARED} == {k: expected[name][k] for k in COMPARED}
+
+
+def test_incremental_companies_rollup_diff_writes(tmp_path, monkeypatch):
+    companies = ['Swift Transportation', 'Werner Enterprises, Inc.', 'Schneider', 'Acme Co']
+    jobs = [_job(i, companies[i % 4], match='bad' if i % 7 == 0 else 'good') for i in range(1, 120)]
+    existing = [
+        {'id': 10, 'company_name': 'Schneider', 'normalized_company_name': 'Schneider', 'total_jobs': 1,
+         'is_blacklisted': True, 'blacklist_reason': 'spam'},
+        {'id': 11, 'company_name': 'Gone LLC', 'normalized_company_name': 'Gone', 'total_jobs': 3},
+    ]
+    state_path = str(tmp_path / 'companies.json')
+    with MockPostgrestServer({'jobs': jobs, 'companies': existing}) as server:
+        client = server.client()
+        monkeypatch.setattr(companies_rollup, 'get_client', lambda: client)
+
+        stats = IncrementalCompanyRollup(client, state_path, page_size=50).run()
+        assert stats['full_rebuild'] and stats['inserted'] == 3 and stats['upserted'] == 1 and stats['deleted'] == 1
+        _assert_table_matches_full_rollup(server)
+        schneider = next(r for r in server.tables['companies'] if r['normalized_company_name'] == 'Schneider')
+        assert schneider['id'] == 10 and schneider['is_blacklisted'] and schneider['total_jobs'] > 1
+
+        # Two new Swift jobs and one Werner job downgraded to bad
+        later = T0 + timedelta(days=30)
+        server.tables['jobs'] += [_job(500, 'Swift Transportation', updated=later),
+                                  _job(501, 'Swift Transportation', updated=later)]
+        werner = next(j for j in server.tables['jobs'] if j['id'] == 2)
+        werner.update(match_level='bad', updated_at=later.isoformat())
+        server.reset_stats()
+
+        stats = IncrementalCompanyRollup(client, state_path, page_size=50).run()
+        # Reads the changed jobs plus the overlap window before the watermark
+        assert not stats['full_rebuild'] and stats['jobs_read'] < 10 and stats['changed_jobs'] == 3
+        assert stats['upserted'] == 2 and stats['inserted'] == 0 and stats['deleted'] == 0
+        assert not [r for r in server.requests if r['method'] == 'DELETE']
+        _assert_table_matches_full_rollup(server)
+
+        # Deleted jobs never show up as changes; the id reconciliation removes them
+        server.tables['jobs'] = [j for j in server.tables['jobs'] if j['company'] != 'Acme Co']
+        stats = IncrementalCompanyRollup(client, state_path, page_size=50, reconcile_hours=0).run()
+        assert stats['reconciled'] and stats['deleted'] == 1
+        _assert_table_matches_full_rollup(server)
+
+
+class _FailingInsertClient:
+    """Wraps a supabase client so companies inserts raise while ``failing`` is set"""
+
+    def __init__(self, client):
+        self.client = client
+        self.failing = True
+
+    def table(self, name):
+        builder = self.client.table(name)
+        if self.failing:
+            def insert(*args, **kwargs):
+                raise RuntimeError('insert rejected')
+            builder.insert = insert
+        return builder
+
+
+def test_incremental_companies_rollup_retries_failed_batches(tmp_path, monkeypatch):
+    jobs = [_job(i, 'Swift Transportation') for i in range(1, 6)]
+    state_path = str(tmp_path / 'companies.json')
+    with MockPostgrestServer({'jobs': jobs, 'companies': []}) as server:
+        client = server.client()
+        monkeypatch.setattr(companies_rollup, 'get_client', lambda: client)
+        IncrementalCompanyRollup(client, state_path).run()
+
+        # A new company whose insert fails; its jobs are behind the watermark afterwards
+        server.tables['jobs'] += [_job(600, 'Werner Enterprises, Inc.', updated=T0 + timedelta(days=30))]
+        failing = _FailingInsertClient(client)
+        stats = IncrementalCompanyRollup(failing, state_path).run()
+        assert stats['failed'] == 1 and stats['inserted'] == 0
+        assert 'Werner' not in {r['normalized_company_name'] for r in server.tables['companies']}
+
+        # Nothing changed since, but the failed company is rebuilt and written
+        failing.failing = False
+        stats = IncrementalCompanyRollup(failing, state_path).run()
+        assert stats['retried'] == 1 and stats['inserted'] == 1 and stats['failed'] == 0
+        _assert_table_matches_full_rollup(server)
+
+        stats = IncrementalCompanyRollup(client, state_path).run()
+        assert stats['retried'] == 0 and stats['inserted'] == 0 and stats['upserted'] == 0
+
+
+def test_blacklist_lookup_queries_once(monkeypatch):
+    rows = [{'id': 1, 'company_name': 'Bad Carrier LLC', 'normalized_company_name': 'Bad Carrier',
+             'is_blacklisted': True, 'blacklist_reason': 'scam'}]
+    with MockPostgrestServer({'companies': rows}) as server:
+        client = server.client()
+        monkeypatch.setattr(companies_rollup, 'get_client', lambda: client)
+        lookup = BlacklistLookup(ttl_seconds=300)
+        answers = [lookup.is_blacklisted(name) for name in ['Bad Carrier', 'bad carrier, llc', 'Good Co'] * 50]
+        assert answers[:3] == [True, True, False]
+        assert server.request_count == 1
+
+        lookup.invalidate()
+        assert not lookup.is_blacklisted('') and lookup.is_blacklisted('Bad Carrier')
+        assert server.request_count == 2
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from component_registry import ComponentRegistry, get_component_registry
+
+
+def test_components_built_once_on_first_use():
+    built = []
+    registry = ComponentRegistry()
+    registry.register('memory_db', lambda: built.append('memory_db') or object())
+    registry.register('scraper', lambda: built.append('scraper') or object())
+    assert built == []
+
+    threads = [threading.Thread(target=registry.get, args=('memory_db',)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert built == ['memory_db']
+    assert set(registry.init_seconds) == {'memory_db'}
+    assert registry.warm() == {'scraper': registry.init_seconds['scraper']}
+    with pytest.raises(KeyError):
+        registry.get('missing')
+
+
+def test_pipeline_resolves_components_lazily(monkeypatch):
+    import pipeline_v3
+
+    registry = ComponentRegistry()
+    built = []
+    for name in pipeline_v3.PIPELINE_COMPONENTS:
+        registry.register(name, lambda name=name: built.append(name) or f'<{name}>')
+
+    first = pipeline_v3.FreeWorldPipelineV3(components=registry)
+    second = pipeline_v3.FreeWorldPipelineV3(components=registry)
+    assert built == []
+
+    assert first.memory_db == '<memory_db>' and second.memory_db == '<memory_db>'
+    assert built == ['memory_db']
+
+    second.memory_db = 'override'
+    assert second.memory_db == 'override' and first.memory_db == '<memory_db>'
+
+    assert first.warm_start(memory_only=True) == {'free_agent_lookup': registry.init_seconds['free_agent_lookup']}
+    assert 'scraper' not in built
+
+
+def test_shared_registry_can_be_disabled(monkeypatch):
+    assert get_component_registry() is get_component_registry()
+    monkeypatch.setenv('FREEWORLD_SHARED_COMPONENTS', 'off')
+    assert get_component_registry() is not get_component_registry()
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from dedup_engine import deduplicate_jobs, extract_clean_url, clean_url_series
+
+
+def _jobs(rows):
+    base = {
+        'route.filtered': False,
+        'route.final_status': '',
+        'route.ready_for_ai': True,
+        'meta.market': 'Houston',
+        'id.source': 'indeed',
+        'source.url': '',
+    }
+    return pd.DataFrame([{**base, **row} for row in rows])
+
+
+def test_clean_url_series_matches_scalar():
+    urls = pd.Series([
+        'https://www.indeed.com/viewjob?jk=abc123&from=serp',
+        'https://careers.acme.com/jobs/42?utm_source=x&jobid=42',
+        'https://careers.acme.com/jobs/43?utm_source=x',
+        'https://www.indeed.com/viewjob?jk=',
+        '',
+        None,
+    ])
+    expected = [extract_clean_url(u) for u in urls]
+    assert clean_url_series(urls).tolist() == expected
+    assert expected[0] == 'indeed_abc123'
+
+
+def test_r1_r2_and_url_rules():
+    df = _jobs([
+        {'id.job': 'a', 'rules.duplicate_r1': 'r1x', 'rules.duplicate_r2': 'r2x'},
+        {'id.job': 'b', 'rules.duplicate_r1': 'r1x', 'rules.duplicate_r2': 'r2x'},  # R1 dupe of a
+        {'id.job': 'c', 'rules.duplicate_r1': 'r1y', 'rules.duplicate_r2': 'r2x'},  # R2 dupe of a
+        {'id.job': 'd', 'rules.duplicate_r1': 'r1z', 'rules.duplicate_r2': 'r2z', 'id.source': 'google',
+         'source.url': 'https://www.indeed.com/viewjob?jk=same'},
+        {'id.job': 'e', 'rules.duplicate_r1': 'r1w', 'rules.duplicate_r2': 'r2w',
+         'source.url': 'https://www.indeed.com/viewjob?jk=same&from=x'},  # Indeed beats Google
+        {'id.job': 'e', 'rules.duplicate_r1': 'r1w', 'rules.duplicate_r2': 'r2w',
+         'source.url': 'https://www.indeed.com/viewjob?jk=same&from=x'},  # exact dupe
+    ])
+
+    out, stats = deduplicate_jobs(df)
+
+    assert stats == {'exact': 1, 'r1': 1, 'r2': 1, 'url': 1, 'removed': 3}
+    assert out['id.job'].tolist() == ['a', 'e']
+    assert (out['route.stage'] == 'deduped').all()
+
+
+def test_rules_can_be_disabled():
+    df = _jobs([
+        {'id.job': 'a', 'rules.duplicate_r1': 'r1x', 'rules.duplicate_r2': 'r2x'},
+        {'id.job': 'b', 'rules.duplicate_r1': 'r1x', 'rules.duplicate_r2': 'r2x'},
+    ])
+
+    out, stats = deduplicate_jobs(df, {'r1_dedup': False, 'r2_dedup': False, 'url_dedup': False})
+
+    assert len(out) == 2
+    assert stats['removed'] == 0
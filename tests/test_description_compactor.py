@@ -0,0 +1,75 @@
+import job_classifier
+from description_compactor import compact_description, compact_jobs, split_segments
+from mock_openai_server import MockOpenAIServer
+from packed_classification import estimate_tokens
+
+POSTING = (
+    "Acme Freight is hiring CDL-A drivers for dedicated regional routes. "
+    "Home weekly &amp; paid weekly. "
+    "&#9642; No experience needed, paid training provided "
+    "&#9642; Must pass a background check. "
+    "Acme Freight is an Equal Opportunity Employer. "
+    "Qualified applicants will receive consideration without regard to race, color or religion. "
+    "Apply today! "
+    "Home weekly &amp; paid weekly. "
+    "Qualified applicants with arrest and conviction records will be considered without regard to their record. "
+    "Job Type: Full-time Pay: $0.60 - $0.70 per mile Work Location: On the road"
+)
+
+
+def test_boilerplate_and_repeats_dropped_signals_kept():
+    assert compact_description(POSTING).split('\n') == [
+        "Acme Freight is hiring CDL-A drivers for dedicated regional routes.",
+        "Home weekly & paid weekly.",
+        "No experience needed, paid training provided",
+        "Must pass a background check.",
+        "Qualified applicants with arrest and conviction records will be considered without regard to their record.",
+        "Job Type: Full-time",
+        "Pay: $0.60 - $0.70 per mile",
+        "Work Location: On the road",
+    ]
+    assert compact_description('') == ''
+    assert compact_description('We are an Equal Opportunity Employer.') == 'We are an Equal Opportunity Employer.'
+
+
+def test_urls_and_emails_keep_sentence_boundaries():
+    text = ('Apply today at https://acme.com/jobs. Must have 2 years experience. '
+            'Email hr@acme.com. Home daily. Details: www.acme.com/cdl!')
+    assert split_segments(text) == ['Apply today at.', 'Must have 2 years experience.', 'Email.', 'Home daily.',
+                                    'Details:!']
+    assert compact_description(text).split('\n')[:3] == ['Must have 2 years experience.', 'Email.', 'Home daily.']
+
+
+def test_token_ceiling_keeps_lead_and_signals_in_order():
+    filler = ' '.join(f"Our company culture value number {i} is something we care about." for i in range(40))
+    text = ("Yard jockey wanted at our Dallas terminal. " + filler
+            + " Felony convictions older than 7 years are OK. Class A CDL required.")
+    short = compact_description(text, max_tokens=60)
+    lines = short.split('\n')
+    assert lines[0] == "Yard jockey wanted at our Dallas terminal."
+    assert lines[-2:] == ["Felony convictions older than 7 years are OK.", "Class A CDL required."]
+    assert estimate_tokens(short) <= 60
+
+    jobs = [{'job_id': 'a', 'job_description': text}]
+    compacted, stats = compact_jobs(jobs, max_tokens=60)
+    assert jobs[0]['job_description'] == text and compacted[0]['job_description'] == short
+    assert stats['tokens_before'] == estimate_tokens(text) and stats['tokens_after'] == estimate_tokens(short)
+
+
+def test_classifier_sends_compacted_descriptions(monkeypatch):
+    jobs = [{'job_id': 'job-1', 'job_title': 'CDL-A Driver', 'company': 'Acme', 'location': 'Houston, TX',
+             'job_description': POSTING}]
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(job_classifier, 'get_classifier_runtime', lambda: None)
+    sent = {}
+    for mode in ('on', 'off'):
+        monkeypatch.setenv('FREEWORLD_DESCRIPTION_COMPACTION', mode)
+        with MockOpenAIServer() as server:
+            monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+            results = job_classifier.JobClassifier().classify_jobs_in_batches(jobs, use_cache=False)
+        sent[mode] = server.requests[0]['messages'][1]['content']
+        assert results[0]['job_id'] == 'job-1' and results[0]['match'] == 'good'
+
+    assert 'Equal Opportunity' in sent['off'] and 'Equal Opportunity' not in sent['on']
+    assert sent['on'].endswith(compact_description(POSTING))
+    assert jobs[0]['job_description'] == POSTING
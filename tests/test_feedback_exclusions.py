@@ -0,0 +1,61 @@
+from feedback_exclusions import FeedbackExclusionIndex
+from mock_postgrest_server import MockPostgrestServer
+
+JOBS = [
+    {'id': 1, 'job_id': 'a', 'apply_url': 'https://www.indeed.com/viewjob?jk=1', 'market': 'Houston'},
+    {'id': 2, 'job_id': 'b', 'apply_url': 'https://www.indeed.com/viewjob?jk=2', 'market': 'Houston'},
+    {'id': 3, 'job_id': 'c', 'apply_url': None, 'market': 'Houston'},
+    {'id': 4, 'job_id': 'd', 'apply_url': 'https://www.indeed.com/viewjob?jk=4', 'market': 'Houston'},
+]
+FEEDBACK = [
+    {'id': 1, 'job_id': None, 'job_url': 'https://www.indeed.com/viewjob?jk=1', 'created_at': '2026-10-01T00:00:00+00:00'},
+    {'id': 2, 'job_id': 'd', 'job_url': 'https://elsewhere.example/d', 'created_at': '2026-10-02T00:00:00+00:00'},
+]
+
+
+def test_incremental_refresh_uses_watermark():
+    with MockPostgrestServer({'job_feedback': FEEDBACK}) as server:
+        client = server.client()
+        index = FeedbackExclusionIndex(refresh_seconds=60, page_size=1)
+        clock = [1000.0]
+        index._clock = lambda: clock[0]
+
+        assert index.refresh(client)
+        assert index.urls == {'https://www.indeed.com/viewjob?jk=1', 'https://elsewhere.example/d'}
+        assert index.watermark == '2026-10-02T00:00:00+00:00'
+        assert server.request_count == 3  # two full pages + empty page
+
+        assert not index.refresh(client)  # inside the refresh interval
+        assert server.request_count == 3
+
+        server.tables['job_feedback'].append({'id': 3, 'job_id': 'b', 'job_url': 'https://www.indeed.com/viewjob?jk=2',
+                                              'created_at': '2026-10-03T00:00:00+00:00'})
+        clock[0] += 61
+        server.reset_stats()
+        assert index.refresh(client)
+        refreshed = [dict(r['params']) for r in server.requests]
+        assert all(p.get('created_at') == 'gte.2026-10-02T00:00:00+00:00' for p in refreshed)
+        assert index.job_ids == {'d', 'b'} and len(index.urls) == 3
+
+
+def test_pushdown_matches_client_side_filter():
+    with MockPostgrestServer({'jobs': JOBS, 'job_feedback': FEEDBACK}) as server:
+        client = server.client()
+        index = FeedbackExclusionIndex(refresh_seconds=0)
+        index.refresh(client)
+
+        query, pushed = index.apply_to_query(client.table('jobs').select('*').eq('market', 'Houston'))
+        server_side = index.filter_jobs(query.execute().data)
+        client_side = index.filter_jobs(client.table('jobs').select('*').execute().data)
+
+        assert pushed
+        assert [j['id'] for j in server_side] == [j['id'] for j in client_side] == [2, 3]
+
+
+def test_long_url_list_falls_back_to_client_filter():
+    index = FeedbackExclusionIndex(refresh_seconds=0)
+    index.urls = frozenset(f'https://www.indeed.com/viewjob?jk={i:08x}' for i in range(1000))
+    marker = object()
+    assert index.apply_to_query(marker) == (marker, False)
+    jobs = [{'apply_url': 'https://www.indeed.com/viewjob?jk=00000001'}, {'apply_url': 'https://x.example'}]
+    assert index.filter_jobs(jobs) == [{'apply_url': 'https://x.example'}]
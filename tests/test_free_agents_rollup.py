@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import free_agents_rollup
+from free_agents_rollup import analyze_free_agents_for_rollup, incremental_free_agents_rollup
+from mock_postgrest_server import MockPostgrestServer
+
+NOW = datetime.now(timezone.utc)
+PATTERNS = ('companies_clicked', 'route_types_clicked', 'markets_engaged', 'job_qualities_clicked')
+
+
+def _agents():
+    return [{'agent_uuid': f'agent-{i}', 'agent_name': f'Agent {i}', 'coach_username': 'maria',
+             'agent_city': 'Houston', 'agent_state': 'TX', 'is_active': i != 4, 'portal_visits': i * 3,
+             'job_clicks': i, 'last_job_click': (NOW - timedelta(days=i * 5)).isoformat()} for i in range(5)]
+
+
+def _click(i, agent, ts, company=None):
+    return {'clicked_at': ts.isoformat(), 'coach': 'maria', 'market': ['Houston', 'Dallas'][i % 2],
+            'route': ['Local', 'OTR', None][i % 3], 'match': 'good', 'fair': True, 'candidate_id': agent,
+            'candidate_name': agent, 'short_id': f's{i}', 'original_url': f'https://indeed.com/{i}',
+            'job_title': 'CDL-A', 'company': company if company is not None else f'Carrier {i % 4}'}
+
+
+def _patterns(row):
+    return {field: {('null' if k is None else k): v for k, v in row[field].items()} for field in PATTERNS}
+
+
+def _assert_matches_legacy(rows):
+    legacy = {r['agent_uuid']: r for r in analyze_free_agents_for_rollup().to_dict('records')}
+    assert set(legacy) == {r['agent_uuid'] for r in rows}
+    for row in rows:
+        assert _patterns(row) == _patterns(legacy[row['agent_uuid']])
+        assert row['engagement_score'] == legacy[row['agent_uuid']]['engagement_score']
+
+
+def test_incremental_rollup_folds_only_new_clicks(tmp_path, monkeypatch):
+    # Buckets are whole UTC days, so keep the day at the edge of the 30-day window empty
+    times = [NOW - timedelta(days=45) + timedelta(hours=7 * i) for i in range(150)]
+    edge = (NOW - timedelta(days=30)).date()
+    clicks = [_click(i, f'agent-{i % 5}', ts) for i, ts in enumerate(times)
+              if abs((ts.date() - edge).days) > 1 and ts < NOW - timedelta(minutes=10)]
+    state_path = str(tmp_path / 'free_agents.json')
+    tables = {'agent_profiles': _agents(), 'click_events': clicks, 'free_agents_analytics': []}
+    with MockPostgrestServer(tables) as server:
+        client = server.client()
+        monkeypatch.setattr(free_agents_rollup, 'get_client', lambda: client)
+
+        rows, stats = incremental_free_agents_rollup(client, state_path)
+        assert stats['changed_agents'] == 4 and len(server.tables['free_agents_analytics']) == 4
+        _assert_matches_legacy(rows.to_dict('records'))
+
+        # New clicks for one agent, including one that committed late inside the overlap window
+        server.tables['click_events'] += [
+            _click(500, 'agent-2', NOW - timedelta(minutes=1), company='New Carrier'),
+            _click(501, 'agent-2', NOW - timedelta(minutes=3), company='New Carrier'),
+        ]
+        server.reset_stats()
+        rows, stats = incremental_free_agents_rollup(client, state_path)
+        click_requests = [r for r in server.requests if r['table'] == 'click_events']
+        upserts = [r for r in server.requests if r['table'] == 'free_agents_analytics']
+        assert stats['new_clicks'] == 2 and stats['changed_agents'] == 1
+        assert len(click_requests) == 1 and len(upserts) == 1
+        _assert_matches_legacy(rows.to_dict('records'))
+
+        server.reset_stats()
+        _, stats = incremental_free_agents_rollup(client, state_path)
+        assert stats['new_clicks'] == 0 and stats['changed_agents'] == 0
+        assert not [r for r in server.requests if r['table'] == 'free_agents_analytics']
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pandas as pd
+
+from job_memory_store import BulkJobWriter, build_job_records, plan_batches, payload_bytes
+from mock_postgrest_server import MockPostgrestServer, upsert_rows_rpc
+
+NOW = datetime(2026, 10, 1, 12, 0)
+DEDUP_RPC = {'batch_insert_jobs_with_dedup': upsert_rows_rpc('jobs', 'job_id', 'p_jobs_data')}
+
+
+def _records(n, bad=(), description_chars=2000):
+    records = [{'job_id': f'job-{i}', 'job_title': 'CDL-A Driver', 'job_description': 'x' * description_chars,
+                'market': 'Houston'} for i in range(n)]
+    for i in bad:
+        records[i]['job_description'] = 'pasted\x00binary'  # Postgres text can't hold NUL
+    return records
+
+
+def test_records_built_column_by_column():
+    df = pd.DataFrame({
+        'id.job': ['a', 'b', 'c', 'd', ''],
+        'source.title': ['Local CDL-A', 'OTR Driver', 'Yard', None, 'x'],
+        'source.description_raw': ['d' * 6000, 'short', '', 'z', 'y'],
+        'ai.match': ['good', float('nan'), '', 'bad', 'good'],
+        'ai.summary': ['Great job', 'None', None, 's', 's'],
+        'ai.training_provided': [True, pd.NA, False, False, False],
+        'meta.market': ['Houston, TX', 'Dallas', 'Berkeley', 'Dallas', 'Dallas'],
+        'route.final_status': ['included: good match', 'passed_all_filters', '', 'filtered: owner op', 'included'],
+        'filter_reason': ['', '', 'included: so-so match', '', ''],
+    }, index=[7, 7, 8, 9, 10])
+
+    records, skipped = build_job_records(df, now=NOW)
+
+    assert [r['job_id'] for r in records] == ['a', 'b', 'c']  # empty job_id dropped, 'd' filtered
+    assert [s['job_id'] for s in skipped] == ['d'] and skipped[0]['final_status'] == 'filtered: owner op'
+    a, b, c = records
+    assert len(a['job_description']) == 5000 and a['market'] == 'Houston' and a['training_provided'] == 'true'
+    assert (b['match_level'], b['match_reason'], b['summary']) == \
+        ('pending', 'passed_all_filters', 'Job with status: passed_all_filters')
+    assert (c['match_level'], c['filter_reason'], c['market']) == ('so-so', '', 'Bay Area')
+    assert b['training_provided'] == 'none' and b['company'] == '' and b['fair_chance'] == 'unknown'
+    assert a['source'] == 'outscraper' and a['classified_at'] == NOW.isoformat()
+    assert build_job_records(df.iloc[0:0]) == ([], [])
+
+
+def test_batches_bounded_by_payload_bytes():
+    records = _records(40)
+    batches = plan_batches(records, max_bytes=10_000, max_rows=100)
+    assert [r for batch in batches for r in batch] == records
+    assert all(sum(payload_bytes(r) for r in batch) + 2 <= 10_000 for batch in batches)
+    assert len(batches) == 10
+    assert [len(b) for b in plan_batches(records, max_bytes=10**9, max_rows=15)] == [15, 15, 10]
+    assert len(plan_batches(_records(2, description_chars=50_000), max_bytes=10_000)) == 2
+
+
+def test_writer_isolates_bad_rows_and_splits_oversized_batches():
+    with MockPostgrestServer({'jobs': []}, rpc_functions=DEDUP_RPC, max_body_bytes=60_000) as server:
+        writer = BulkJobWriter(server.client(), max_workers=4, max_batch_bytes=100_000)
+        stats = writer.write(_records(120, bad=[5, 77]))
+        assert sorted(stats['failed_job_ids']) == ['job-5', 'job-77']
+        assert stats['stored'] == 118 and stats['bisections'] > 0 and stats['rows_per_second'] > 0
+        assert {r['job_id'] for r in server.tables['jobs']} == {f'job-{i}' for i in range(120)} - {'job-5', 'job-77'}
+        assert stats['rpc_available']
+
+        # Re-sending is an upsert on job_id, not duplicate rows
+        writer.write(_records(10))
+        assert len(server.tables['jobs']) == 118 + 1
+
+
+def test_missing_rpc_detected_once():
+    with MockPostgrestServer({'jobs': []}) as server:
+        stats = BulkJobWriter(server.client(), max_batch_bytes=20_000).write(_records(50))
+        rpc_calls = [r for r in server.requests if r['table'].startswith('rpc/')]
+        assert len(rpc_calls) == 1 and not stats['rpc_available']
+        assert stats['stored'] == 50 and len(server.tables['jobs']) == 50
+        assert stats['requests'] == stats['batches'] + 1
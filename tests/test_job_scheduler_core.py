@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from job_scheduler_core import InMemoryJobQueue, SchedulerCore, SupabaseJobQueue
+from mock_postgrest_server import MockPostgrestServer
+
+NOW = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _rows(due=10, future=()):
+    rows = [{'id': i + 1, 'status': 'scheduled', 'job_type': 'indeed_jobs',
+             'scheduled_run_at': (NOW - timedelta(minutes=due - i)).isoformat()} for i in range(due)]
+    rows += [{'id': 100 + i, 'status': 'scheduled', 'job_type': 'indeed_jobs',
+              'scheduled_run_at': (NOW + timedelta(seconds=s)).isoformat()} for i, s in enumerate(future)]
+    return rows
+
+
+def test_bounded_pool_runs_due_jobs_once_with_metrics():
+    queue = InMemoryJobQueue(_rows(due=10, future=[20]))
+    release = threading.Event()
+    ran, active, peak = Counter(), [0], [0]
+    lock = threading.Lock()
+
+    def run_job(row):
+        with lock:
+            ran[row['id']] += 1
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        release.wait(5)
+        with lock:
+            active[0] -= 1
+
+    core = SchedulerCore(queue, run_job, max_workers=3, job_timeout=60, min_interval=1, max_interval=60,
+                         clock=lambda: NOW)
+    assert core.poll_once() == 3
+    metrics = core.metrics()
+    assert metrics['queue_depth'] == 10 and metrics['lag_seconds'] == 600 and metrics['running'] == 3
+    assert core.next_interval == 1
+    assert core.poll_once() == 0  # pool full: nothing else is claimed
+    assert [r['id'] for r in queue.rows if r['status'] == 'processing'] == [1, 2, 3]
+
+    release.set()
+    while core.poll_once() or core.metrics()['running']:
+        core.wait_idle(5)
+    core.shutdown()
+
+    assert ran == Counter(range(1, 11)) and peak[0] <= 3
+    assert queue.get(100)['status'] == 'scheduled'
+    assert core.metrics()['completed'] == 10 and core.metrics()['queue_depth'] == 0
+    intervals = []
+    for _ in range(6):
+        core.poll_once()
+        intervals.append(core.next_interval)
+    assert intervals == sorted(intervals) and intervals[-1] == 20  # backs off, but the next job is due in 20s
+
+
+def test_timed_out_job_is_failed_and_keeps_its_slot():
+    queue = InMemoryJobQueue(_rows(due=2))
+    release = threading.Event()
+    late_writes = []
+
+    def run_job(row):
+        if row['id'] == 1:
+            release.wait(5)
+        late_writes.append(queue.finish(row['id'], {'status': 'completed'}))
+
+    core = SchedulerCore(queue, run_job, max_workers=1, job_timeout=0.05, min_interval=1, max_interval=8,
+                         clock=lambda: NOW)
+    assert core.poll_once() == 1
+    time.sleep(0.1)
+    assert core.poll_once() == 0  # the stuck thread still holds the only worker
+    assert queue.get(1)['status'] == 'failed' and 'Timed out' in queue.get(1)['error_message']
+    assert core.metrics()['timed_out'] == 1 and core.metrics()['timed_out_running'] == 1
+
+    release.set()
+    time.sleep(0.05)
+    assert core.poll_once() == 1
+    core.wait_idle(5)
+    assert late_writes == [False, True]  # The timed-out job's late result does not overwrite the failure
+    assert queue.get(1)['status'] == 'failed' and queue.get(2)['status'] == 'completed'
+    core.poll_once()
+    assert core.next_interval == 2  # idle with nothing scheduled: backs off
+    core.shutdown()
+
+
+def test_competing_schedulers_never_run_the_same_job():
+    ran = Counter()
+    lock = threading.Lock()
+
+    def run_job(row):
+        time.sleep(0.01)
+        with lock:
+            ran[row['id']] += 1
+
+    with MockPostgrestServer({'async_job_queue': _rows(due=24)}) as server:
+        cores = [SchedulerCore(SupabaseJobQueue(server.client()), run_job, max_workers=4, job_timeout=60,
+                               min_interval=1, max_interval=60) for _ in range(3)]
+
+        def drive(core):
+            for _ in range(20):
+                core.poll_once()
+                core.wait_idle(5)
+
+        threads = [threading.Thread(target=drive, args=(core,)) for core in cores]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for core in cores:
+            core.shutdown()
+        fetches = [dict(r['params']) for r in server.requests
+                   if r['method'] == 'GET' and dict(r['params']).get('select') == '*']
+
+    assert ran == Counter(range(1, 25))
+    assert all(p['status'] == 'eq.scheduled' and p['scheduled_run_at'].startswith('lte.') and int(p['limit']) <= 4
+               for p in fetches)
+    assert sum(core.metrics()['claimed'] for core in cores) == 24
+
+
+def test_supabase_finish_only_writes_claimed_rows():
+    with MockPostgrestServer({'async_job_queue': _rows(due=2)}) as server:
+        queue = SupabaseJobQueue(server.client())
+        assert queue.claim(1, NOW)
+        assert queue.finish(1, {'status': 'failed', 'error_message': 'Timed out'})
+        assert not queue.finish(1, {'status': 'completed'})  # Already failed
+        assert not queue.finish(2, {'status': 'completed'})  # Never claimed
+        statuses = {row['id']: row['status'] for row in server.tables['async_job_queue']}
+    assert statuses == {1: 'failed', 2: 'scheduled'}
@@ -0,0 +1,52 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from job_sorting_utils import apply_unified_sorting, get_unified_sort_priority, unified_sort_key, unified_sort_order
+
+ROUTES = ['Local', 'OTR', 'Regional', 'Unknown', 'LOCAL', '', None]
+MATCHES = ['good', 'so-so', 'bad', 'error', 'Good', '', None]
+FAIR_CHANCE = ['fair_chance_employer', 'background_check_required', 'no_requirements_mentioned', 'true', '', None]
+
+
+def _grid():
+    return pd.DataFrame(list(itertools.product(ROUTES, MATCHES, FAIR_CHANCE)),
+                        columns=['ai.route_type', 'ai.match', 'ai.fair_chance'])
+
+
+def test_vectorized_key_matches_row_wise_priority():
+    df = _grid()
+    expected = df.apply(get_unified_sort_priority, axis=1).to_numpy()
+    assert unified_sort_key(df).tolist() == expected.tolist()
+    assert unified_sort_key(df, by_route=False).tolist() == (expected % 10).tolist()
+
+    row = {'ai.route_type': 'Local', 'ai.match': 'good', 'ai.fair_chance': 'fair_chance_employer'}
+    assert get_unified_sort_priority(row) == 1
+    assert unified_sort_key(pd.DataFrame({'ai.match': ['good', 'so-so']})).tolist() == [22, 24]
+
+
+def test_sorting_is_stable():
+    df = pd.DataFrame({
+        'job_id': ['a', 'b', 'c', 'd', 'e', 'f'],
+        'ai.route_type': ['OTR', 'Local', 'OTR', 'Local', 'Unknown', 'Local'],
+        'ai.match': ['good', 'so-so', 'good', 'good', 'good', 'so-so'],
+        'ai.fair_chance': ['', 'fair_chance_employer', '', '', 'fair_chance_employer', 'fair_chance_employer'],
+    }, index=[10, 11, 12, 13, 14, 15])
+    result = apply_unified_sorting(df)
+    assert result['job_id'].tolist() == ['d', 'b', 'f', 'a', 'c', 'e']
+    assert result.index.tolist() == list(range(6))
+    assert apply_unified_sorting(df.iloc[:0]).empty
+
+
+def test_newest_first_breaks_ties_like_sort_values():
+    rng = np.random.default_rng(7)
+    df = _grid().sample(frac=1, random_state=3)
+    times = pd.Series(pd.date_range('2025-09-01', periods=8, freq='h')).sample(len(df), replace=True,
+                                                                             random_state=5).to_numpy()
+    df['sys.created_at'] = np.where(rng.random(len(df)) < 0.1, pd.NaT, times)
+
+    legacy = df.assign(_priority=df.apply(get_unified_sort_priority, axis=1) % 10)
+    legacy = legacy.sort_values(by=['_priority', 'sys.created_at'], ascending=[True, False], kind='stable')
+    order = unified_sort_order(df, by_route=False, newest_first='sys.created_at')
+    assert df.iloc[order].index.tolist() == legacy.index.tolist()
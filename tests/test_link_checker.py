@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from indeed_link_checker import AsyncIndeedLinkChecker, IndeedLinkChecker, LinkVerdictCache
+from mock_job_site_server import MockJobSiteServer
+
+STATES = {'a1': 'active', 'a2': 'active', 'x1': 'expired', 'm1': 'missing', 'r1': 'removed', 'e1': 'error',
+          'c1': 'challenge'}
+
+
+def test_verdicts_head_fallback_and_cache():
+    with MockJobSiteServer(STATES) as site:
+        urls = [site.job_url(key) for key in STATES] + [site.job_url('a1')]
+        checker = IndeedLinkChecker(delay_between_requests=0, cache=LinkVerdictCache(ttl_seconds=60))
+        results = checker.check_multiple_links(urls)
+        verdicts = {r['job_key']: (r['is_active'], r['status_code']) for r in results}
+        assert len(results) == len(urls) and results[-1]['original_url'] == urls[0]
+        assert verdicts == {'a1': (True, 200), 'a2': (True, 200), 'x1': (False, 200),
+                            'm1': (False, 404), 'r1': (False, 410), 'e1': (False, 500), 'c1': (False, 200)}
+        # 404/410 are settled by HEAD alone; the duplicate URL is fetched once
+        gets = [r['job_key'] for r in site.requests if r['method'] == 'GET']
+        assert sorted(gets) == ['a1', 'a2', 'c1', 'e1', 'x1']
+
+        # Second pass: definitive verdicts come from the cache; the 500 and the
+        # 200 page with no job markup (bot challenge) are checked again
+        site.reset_stats()
+        again = checker.check_multiple_links(urls)
+        assert [r['is_active'] for r in again] == [r['is_active'] for r in results]
+        assert {r['job_key'] for r in site.requests} == {'c1', 'e1'}
+        assert all(r['cached'] for r in again if r['job_key'] not in ('c1', 'e1'))
+
+    with MockJobSiteServer(STATES, head_allowed=False) as site:
+        checker = AsyncIndeedLinkChecker(delay_between_requests=0)
+        results = asyncio.run(checker.check_links([site.job_url('a1'), site.job_url('m1')]))
+        assert [(r['is_active'], r['status_code']) for r in results] == [(True, 200), (False, 404)]
+        assert checker.stats == {'checked': 2, 'cached': 0, 'head_requests': 2, 'get_requests': 2}
+
+
+def test_per_host_limits_and_politeness_delay():
+    jobs = {f'j{i}': 'active' for i in range(40)}
+    with MockJobSiteServer(jobs, latency=0.05) as site:
+        urls = [site.job_url(key, host='127.0.0.1' if i % 2 else 'localhost') for i, key in enumerate(jobs)]
+        checker = AsyncIndeedLinkChecker(max_concurrent=8, per_host_limit=3, delay_between_requests=0, head_first=False)
+        t0 = time.perf_counter()
+        results = asyncio.run(checker.check_links(urls))
+        elapsed = time.perf_counter() - t0
+        assert all(r['is_active'] for r in results)
+        assert site.peak_in_flight == {'127.0.0.1': 3, 'localhost': 3}
+        assert elapsed < 40 * 0.05 / 3  # vs 2s one at a time
+
+        site.reset_stats()
+        checker = AsyncIndeedLinkChecker(max_concurrent=8, per_host_limit=3, delay_between_requests=0.04,
+                                         head_first=False)
+        asyncio.run(checker.check_links([site.job_url(f'j{i}') for i in range(8)]))
+        starts = sorted(r['started'] for r in site.requests)
+        assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.03
+
+        # HEAD and its GET fallback share one slot: the delay spaces URLs, not requests
+        site.reset_stats()
+        checker = AsyncIndeedLinkChecker(max_concurrent=8, per_host_limit=8, delay_between_requests=0.1)
+        t0 = time.perf_counter()
+        asyncio.run(checker.check_links([site.job_url(f'j{i}') for i in range(6)]))
+        elapsed = time.perf_counter() - t0
+        assert checker.stats['head_requests'] == checker.stats['get_requests'] == 6
+        assert 5 * 0.1 <= elapsed < 11 * 0.1
@@ -0,0 +1,70 @@
+from market_geo_index import MarketGeoIndex, haversine_miles, normalize_location
+from market_mapper import MarketMapper
+
+LOOKUP = MarketMapper().market_lookup
+INDEX = MarketGeoIndex(LOOKUP)
+
+
+def test_lookups_match_linear_scans():
+    for raw_key, markets in LOOKUP.items():
+        assert INDEX.markets_for(raw_key) == markets
+        assert INDEX.markets_for(raw_key.upper() + '  ') == markets
+    all_markets = sorted({m for markets in LOOKUP.values() for m in markets})
+    assert INDEX.markets == all_markets
+    for market in all_markets:
+        assert INDEX.cities_in_market(market) == sorted(c for c, ms in LOOKUP.items() if market in ms)
+    assert INDEX.search_markets('an') == [m for m in all_markets if 'an' in m.lower()]
+
+    assert normalize_location('Mt. Laurel Township, NJ, US') == 'mount laurel, nj'
+    assert INDEX.market_for('Township of Brick, NJ') == INDEX.market_for('brick, nj') != ''
+    assert INDEX.market_for('Unknown City, CA') == ''
+
+
+def test_radius_queries_match_brute_force():
+    assert INDEX.coordinates, "bundled market_geo_cities.csv should load"
+    for center, radius in [('Dallas, TX', 50), ('Houston', 25), ('Newark, NJ', 10), ('Phoenix, AZ', 80)]:
+        lat, lon = INDEX.coordinates_for(center)
+        expected = {k for k, (la, lo) in INDEX.coordinates.items() if haversine_miles(lat, lon, la, lo) <= radius}
+        found = INDEX.cities_within(center, radius)
+        assert {k for k, _ in found} == expected and expected
+        assert [d for _, d in found] == sorted(d for _, d in found)
+
+    dallas = INDEX.cities_within('Dallas, TX', 50, market='Dallas')
+    assert dallas[0] == ('dallas, tx', 0.0)
+    assert {'fort worth, tx', 'irving, tx', 'plano, tx'} <= {k for k, _ in dallas}
+    assert all('Dallas' in INDEX.markets_for(k) for k, _ in dallas)
+    assert INDEX.cities_within('Nowhere, ZZ', 50) == []
+
+
+def test_fuzzy_matching_of_misspelled_cities():
+    assert INDEX.fuzzy_match('Dalas, TX') == 'dallas, tx'
+    assert INDEX.fuzzy_match('Pheonix, AZ') == 'phoenix, az'
+    assert INDEX.markets_for('Scotsdale, AZ') == []
+    assert INDEX.markets_for('Scotsdale, AZ', fuzzy=True) == ['Phoenix']
+    assert INDEX.fuzzy_match('Xqzvbn, TX') is None
+    assert MarketMapper().map_market('Houstn, TX', fuzzy=True) == 'Houston'
+
+
+def test_google_radius_search_keeps_query_count_unless_opted_in(monkeypatch):
+    import job_scraper
+
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return {'data': [[]]}
+
+    sent = []
+    scraper = object.__new__(job_scraper.FreeWorldJobScraper)
+    monkeypatch.setattr(scraper, '_outscraper_get', lambda url, params, timeout=None: sent.append(params) or Response())
+
+    monkeypatch.delenv('FREEWORLD_GOOGLE_RADIUS_CITIES', raising=False)
+    result = scraper.search_google_jobs_api('CDL Driver', 'Houston, TX', radius=50, limit=100)
+    assert result['queries_executed'] == 1 and sent[0]['query'] == ['CDL Driver Houston, TX']
+    assert sent[0]['pagesPerQuery'] == 5
+
+    sent.clear()
+    monkeypatch.setenv('FREEWORLD_GOOGLE_RADIUS_CITIES', 'on')
+    result = scraper.search_google_jobs_api('CDL Driver, Truck Driver', 'Houston, TX', radius=50, limit=100)
+    assert result['queries_executed'] == 4  # 5 pages over 2 terms: 2 nearest cities each
+    assert all(params['pagesPerQuery'] == 1 for params in sent)
@@ -0,0 +1,79 @@
+import time
+
+import requests
+
+import job_scraper
+from mock_outscraper_server import MockOutscraperServer, fake_indeed_jobs
+from outscraper_async_client import OutscraperAsyncClient, indeed_queries, indeed_search_url
+
+
+def _client(server, **kwargs):
+    kwargs.setdefault('poll_initial', 0.02)
+    kwargs.setdefault('poll_max', 0.1)
+    return OutscraperAsyncClient('test-key', base_url=server.base_url, **kwargs)
+
+
+def test_queries_cover_every_term_location_pair():
+    assert indeed_search_url('CDL Driver', 'Houston, TX', 50) == \
+        'https://www.indeed.com/jobs?q=CDL+Driver&l=Houston%2C+TX&radius=50'
+    assert indeed_search_url('CDL', 'Dallas', 25.0, no_experience=True).endswith('&radius=25&sc=0kf%3Aattr%28D7S5D%29%3B')
+    queries = indeed_queries(['CDL Driver', 'Truck Driver'], ['Houston, TX', 'Dallas, TX'])
+    assert len(queries) == 4 and len(set(queries)) == 4
+    assert queries[1] == indeed_search_url('Truck Driver', 'Houston, TX')
+
+
+def test_queries_run_concurrently_under_the_budget():
+    queries = indeed_queries(['CDL Driver', 'Truck Driver', 'Class A'], ['Houston', 'Dallas'])
+    with MockOutscraperServer(processing_time=0.3, fail_queries={queries[4]}) as server:
+        client = _client(server, max_concurrent=3)
+        start = time.perf_counter()
+        pages = client.fetch_indeed_results(queries, limit=5)
+        elapsed = time.perf_counter() - start
+
+        assert server.peak_processing == 3
+        assert elapsed < 6 * 0.3  # Two waves of three, not six back to back
+        assert pages[4] == [] and client.stats['failed'] == 1 and client.stats['failed_queries'] == [queries[4]]
+        assert [p for i, p in enumerate(pages) if i != 4] == \
+            [fake_indeed_jobs(q, 5) for i, q in enumerate(queries) if i != 4]
+        assert client.stats['submitted'] == 6 and client.stats['jobs'] == 25
+        assert all(r['query']['async'] == 'true' for r in server.requests if r['path'] == '/indeed-search')
+
+
+def test_webhook_completions_replace_polling():
+    client = None
+    server = MockOutscraperServer(processing_time=0.2, on_complete=lambda rid, payload: client.notify_complete(rid, payload))
+    with server:
+        client = _client(server, poll_max=30.0, webhook_url='https://example.com/webhook/outscraper/job-complete')
+        start = time.perf_counter()
+        pages = client.fetch_indeed_results(indeed_queries(['CDL'], ['Houston', 'Dallas']), limit=3)
+        assert time.perf_counter() - start < 5
+        assert [len(p) for p in pages] == [3, 3]
+        assert client.stats['webhook_completions'] == 2 and client.stats['polls'] == 0
+        assert server.count('/requests/') == 0
+
+
+def test_ingest_streams_pages_into_canonical_frame():
+    queries = indeed_queries(['CDL Driver', 'Truck Driver'], ['Houston, TX'])
+    with MockOutscraperServer(processing_time=0.05) as server:
+        df, raw_jobs = _client(server).ingest_indeed(queries, 4, 'run-1', 'Houston, TX')
+
+    assert len(df) == len(raw_jobs) == 8
+    assert df['source.title'].tolist() == [job['title'] for job in raw_jobs]
+    assert df['id.source_row'].tolist() == list(range(8))
+    assert df['id.job'].nunique() == 8
+    assert (df['sys.run_id'] == 'run-1').all()
+
+
+def test_scraper_retries_failed_async_queries_synchronously(monkeypatch):
+    queries = indeed_queries(['CDL Driver', 'Truck Driver', 'Class A'], ['Houston, TX'])
+    with MockOutscraperServer(processing_time=0.05, fail_queries={queries[1]}) as server:
+        monkeypatch.setattr(job_scraper, 'OutscraperAsyncClient', lambda api_key: _client(server))
+        scraper = object.__new__(job_scraper.FreeWorldJobScraper)
+        scraper.api_key = 'test-key'
+        monkeypatch.setattr(scraper, '_outscraper_get', lambda url, params, timeout=None: requests.get(
+            url.replace('https://api.outscraper.cloud', server.base_url), params=params, timeout=timeout))
+        data = scraper._fetch_indeed_data(queries, 3)
+
+        assert data['data'] == [fake_indeed_jobs(q, 3) for q in queries]
+        retries = [r['query'] for r in server.requests if r['query'].get('async') == 'false']
+        assert [r['query'] for r in retries] == [queries[1]]
@@ -0,0 +1,73 @@
+import job_classifier
+from mock_openai_server import MockOpenAIServer, default_classification, default_packed_classification
+from packed_classification import plan_packs, validate_items
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'job_id': {'type': 'string'},
+        'match': {'type': 'string', 'enum': ['good', 'so-so', 'bad']},
+        'training_provided': {'type': 'boolean'},
+    },
+    'required': ['job_id', 'match', 'training_provided'],
+}
+
+
+def _jobs(n):
+    descriptions = ['No experience needed, training provided.', 'Owner operator wanted.', 'Home weekly.']
+    return [{'job_id': f'job-{i}', 'job_title': 'CDL-A Driver', 'company': 'Acme', 'location': 'Houston, TX',
+             'job_description': descriptions[i % 3]} for i in range(n)]
+
+
+def test_packs_fit_the_token_budget():
+    # prompt 1000 + per job (tokens + 8 marker + 350 output)
+    assert plan_packs([100] * 10, 1000, token_budget=3000, max_jobs=10) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert plan_packs([100] * 5, 1000, token_budget=100_000, max_jobs=2) == [[0, 1], [2, 3], [4]]
+    assert plan_packs([100, 5000, 100, 100], 1000, token_budget=3000, max_jobs=10) == [[0], [1], [2, 3]]
+    assert plan_packs([], 1000, 3000, 10) == []
+
+
+def test_items_validated_against_the_pack():
+    items = [
+        {'job_id': 'a', 'match': 'good', 'training_provided': True},
+        {'job_id': 'b', 'match': 'great', 'training_provided': True},   # not an allowed value
+        {'job_id': 'c', 'match': 'bad'},                                # missing field
+        {'job_id': 'zzz', 'match': 'bad', 'training_provided': False},  # not in this pack
+        {'job_id': 'd', 'match': 'bad', 'training_provided': False},
+        {'job_id': 'd', 'match': 'good', 'training_provided': False},   # answered twice
+        'garbage',
+    ]
+    valid, requeue = validate_items(['a', 'b', 'c', 'd', 'e'], items, SCHEMA)
+    assert list(valid) == ['a'] and requeue == ['b', 'c', 'd', 'e']
+    assert validate_items(['a'], None, SCHEMA) == ({}, ['a'])
+
+
+def test_packed_mode_requeues_only_bad_items(monkeypatch):
+    def responder(payload):
+        user = payload['messages'][1]['content']
+        schema = payload['response_format']['json_schema']['schema']
+        if 'results' not in schema['properties']:
+            return default_classification(user, schema)
+        answer = default_packed_classification(user, schema)
+        results = [r for r in answer['results'] if r['job_id'] != 'job-4']  # dropped by the model
+        for r in results:
+            if r['job_id'] == 'job-7':
+                r['match'] = 'excellent'  # malformed
+        return {'results': results}
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('FREEWORLD_PACKED_CLASSIFICATION', 'on')
+    monkeypatch.setenv('FREEWORLD_PACKED_MAX_JOBS', '5')
+    monkeypatch.setattr(job_classifier, 'get_classifier_runtime', lambda: None)
+    with MockOpenAIServer(responder=responder) as server:
+        monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+        classifier = job_classifier.JobClassifier()
+        results = classifier.classify_jobs_in_batches(_jobs(12), use_cache=False)
+
+    assert [r['job_id'] for r in results] == [f'job-{i}' for i in range(12)]
+    assert [r['match'] for r in results] == ['good', 'bad', 'so-so'] * 4
+    packed = [p for p in server.requests if 'results' in p['response_format']['json_schema']['schema']['properties']]
+    single = [p for p in server.requests if p not in packed]
+    assert len(packed) == 3  # 12 jobs, at most 5 per request
+    assert sorted(p['messages'][1]['content'].split('\n')[0] for p in single) == ['Job ID: job-4', 'Job ID: job-7']
+    assert packed[0]['messages'][0]['content'].startswith(classifier.SYSTEM_PROMPT)
@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pipeline_performance_monitor as ppm
+from async_runner import run_coroutine_sync
+from pipeline_performance_monitor import (
+    PerformanceAnalyzer, PerformanceMonitor, record_external_call, reset_active_monitor, set_active_monitor,
+    track_external_call
+)
+
+
+def _use_tmp_metrics(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ppm, 'METRICS_DIR', tmp_path / 'logs' / 'metrics')
+    monkeypatch.setattr(ppm, 'HISTORY_FILE', tmp_path / 'logs' / 'metrics' / 'history.jsonl')
+
+
+def _run(stage_seconds, run_id):
+    monitor = PerformanceMonitor(run_id=run_id)
+    for name, seconds in stage_seconds.items():
+        monitor.start_stage(name, rows_in=10)
+        monitor.end_stage(jobs_processed=8)
+        monitor.stages[-1].duration_seconds = seconds
+    return monitor.finalize_run('Houston', 'test', 10, 8, success=True)
+
+
+def test_stage_records_rows_calls_and_checkpoint(monkeypatch, tmp_path):
+    _use_tmp_metrics(monkeypatch, tmp_path)
+    monitor = PerformanceMonitor(run_id='telemetry_test')
+    set_active_monitor(monitor)
+    try:
+        record_external_call('openai', 1.0)  # before any stage: run totals only
+        monitor.start_stage('05_classification', rows_in=20)
+        record_external_call('openai', 0.25)
+        record_external_call('openai', 0.75, error=True)
+        with track_external_call('supabase'):
+            time.sleep(0.01)
+        monitor.record_checkpoint_write(0.5)
+        stage = monitor.end_stage(jobs_processed=18)
+    finally:
+        set_active_monitor(None)
+    record_external_call('openai', 9.0)  # no active monitor: ignored
+
+    assert (stage.rows_in, stage.rows_out) == (20, 18)
+    assert stage.external_calls['openai'] == {'calls': 2, 'errors': 1, 'total_seconds': 1.0}
+    assert stage.external_calls['supabase']['calls'] == 1
+    assert stage.checkpoint_seconds == 0.5
+    assert stage.peak_rss_delta_mb >= 0.0
+
+    report = monitor.finalize_run('Houston', 'test', 20, 18, success=True)
+    assert report.external_calls['openai']['calls'] == 3
+    assert PerformanceAnalyzer.load_history()[-1].stages[0].rows_in == 20
+
+
+def test_concurrent_runs_keep_their_own_monitor():
+    monitors = {name: PerformanceMonitor(run_id=name) for name in ('run_a', 'run_b')}
+    started, a_detached = threading.Barrier(2), threading.Event()
+
+    async def api_call(service):
+        record_external_call(service, 0.1)
+
+    def run(name):
+        token = set_active_monitor(monitors[name])
+        monitors[name].start_stage('01_ingestion', rows_in=0)
+        started.wait()
+        if name == 'run_a':
+            record_external_call('outscraper', 0.1)
+            reset_active_monitor(token)  # run_a finishing must not detach run_b
+            a_detached.set()
+            return
+        a_detached.wait()
+        record_external_call('outscraper', 0.1)
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(record_external_call, 'openai', 0.1))
+        worker.start()
+        worker.join()
+
+        async def inside_loop():  # run_coroutine_sync's helper thread when a loop is already running
+            run_coroutine_sync(api_call('shortio'))
+        asyncio.run(inside_loop())
+        reset_active_monitor(token)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in monitors]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    calls = {name: monitor.end_stage(jobs_processed=0).external_calls for name, monitor in monitors.items()}
+    assert set(calls['run_a']) == {'outscraper'} and calls['run_a']['outscraper']['calls'] == 1
+    assert set(calls['run_b']) == {'outscraper', 'openai', 'shortio'}
+    assert ppm.get_active_monitor() is None
+
+
+def test_concurrent_runs_append_history_without_losing_entries(monkeypatch, tmp_path):
+    _use_tmp_metrics(monkeypatch, tmp_path)
+    threads = [threading.Thread(target=_run, args=({'01_ingestion': 1.0}, f'run_{i}')) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(run.run_id for run in PerformanceAnalyzer.load_history(limit=100)) == \
+        sorted(f'run_{i}' for i in range(16))
+    assert not list((tmp_path / 'logs' / 'metrics').glob('*.tmp'))
+
+
+def test_regressions_flag_slow_stage(monkeypatch, tmp_path):
+    _use_tmp_metrics(monkeypatch, tmp_path)
+    for i in range(4):
+        _run({'02_normalization': 1.0, '04_deduplication': 2.0}, f'run{i}')
+    latest = _run({'02_normalization': 1.1, '04_deduplication': 6.0}, 'slow')
+
+    history = PerformanceAnalyzer.load_history()
+    assert len(history) == 5
+    flags = PerformanceAnalyzer.detect_regressions(latest, history)
+    assert len(flags) == 1 and flags[0].startswith('04_deduplication')
+    assert PerformanceAnalyzer.stage_trends(history)['04_deduplication']['median'] == 2.0
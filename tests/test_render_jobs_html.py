@@ -0,0 +1,46 @@
+import os
+
+import pdf.html_pdf_generator as generator
+from pdf.html_pdf_generator import _encode_asset_base64, render_jobs_html
+
+JOBS = [{'job_id': 'j1', 'title': 'CDL-A Driver', 'company': 'Acme', 'location': 'Houston, TX',
+         'match_badge': 'Excellent Match', 'tracked_url': 'https://freeworldjobs.short.gy/a'}]
+
+
+def test_asset_cache_invalidated_by_mtime(tmp_path):
+    asset = tmp_path / 'logo.png'
+    asset.write_bytes(b'one')
+    first = _encode_asset_base64(asset)
+    assert _encode_asset_base64(asset) is first  # served from cache
+
+    asset.write_bytes(b'two!')
+    os.utime(asset, ns=(1, 1))
+    second = _encode_asset_base64(asset)
+    assert second != first and second.startswith('data:image/png;base64,')
+    assert _encode_asset_base64(tmp_path / 'missing.png') == ''
+
+
+def test_fragment_built_from_partials():
+    full = render_jobs_html(JOBS, {'location': 'Houston'})
+    fragment = render_jobs_html(JOBS, {'location': 'Houston'}, fragment=True)
+
+    assert full.startswith('<!doctype html>') and full.count('<script>') == 1
+    assert fragment.startswith('<style>') and '<body' not in fragment
+    assert fragment.count('<script>') == 1 and fragment.rstrip().endswith('</script>')
+    assert 'CDL-A Driver' in fragment
+    assert 'DEBUG_JOBS_DATA' not in fragment
+
+
+def test_debug_payload_switch(monkeypatch):
+    assert 'DEBUG_JOBS_DATA' in render_jobs_html(JOBS, {}, fragment=True, debug_payload=True)
+    monkeypatch.setenv('FREEWORLD_HTML_DEBUG_JOBS', '1')
+    assert 'DEBUG_JOBS_DATA' in render_jobs_html(JOBS, {}, fragment=True)
+
+
+def test_template_cache_refreshes_on_change(monkeypatch):
+    render_jobs_html(JOBS, {})
+    assert generator.env.get_template('report.html') is generator.env.get_template('report.html')
+    monkeypatch.setattr(generator, '_template_mtimes', {'report.html': -1})
+    cached = generator.env.get_template('report.html')
+    render_jobs_html(JOBS, {})
+    assert generator.env.get_template('report.html') is not cached
@@ -0,0 +1,73 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from route_classifier import CompiledRouteClassifier, RouteClassifier, keyword_trie_pattern
+
+PARQUET_DIR = os.path.join(os.path.dirname(__file__), '..', 'FreeWorld_Jobs', 'parquet')
+LEGACY = RouteClassifier()
+COMPILED = CompiledRouteClassifier()
+
+JOBS = [
+    ('OTR CDL-A Driver', 'Home daily, $25/hour', 'Acme'),
+    ('Yard Hostler', 'Over the road lanes', ''),
+    ('Local Delivery Driver', 'Team driver needed', 'Werner Enterprises'),
+    ('Airport Shuttle', '', None),
+    ('CDL Driver', 'Earn $28.50 per hour, no touch freight', 'Acme'),
+    ('CDL Driver', 'Earn $28.50 per hour, otr lanes', 'Acme'),
+    ('CDL Driver', 'Regional runs, home weekends', 'Acme'),
+    ('CDL Driver', 'Regional runs, home daily', 'Acme'),
+    ('CDL Driver', 'Out 12 days at a time', 'Acme'),
+    ('CDL Driver', '$.60 per mile', 'Acme'),
+    ('CDL Driver', '$.60 per mile, day cab', 'Acme'),
+    ('CDL Driver', '$1,200 - $1,500/week', 'Acme'),
+    ('CDL Driver', 'Great benefits', 'Swift Transportation'),
+    ('CDL Driver', 'Great benefits, dump truck', 'Swift Transportation'),
+    ('CDL Driver', 'Pet and rider policy', 'Acme'),
+    ('CDL Driver', 'Pet and rider policy, drayage', 'Acme'),
+    ('CDL Driver', 'Dedicated lanes', 'Acme'),
+    ('CDL Driver', 'Concrete mixer', 'Acme'),
+    ('CDL Driver', 'Great benefits', 'Acme'),
+    (None, None, None),
+    ('Driver', float('nan'), float('nan')),
+]
+
+
+def test_matches_legacy_labels_with_rules_and_confidence():
+    titles, descriptions, companies = zip(*JOBS)
+    result = COMPILED.classify_series(pd.Series(titles, index=range(10, 10 + len(JOBS))), descriptions, companies)
+    assert list(result.index) == list(range(10, 10 + len(JOBS)))
+    assert result['route_type'].tolist() == [LEGACY.classify_route_type(*job) for job in JOBS]
+    assert result['route_rule'].tolist()[:5] == ['otr_title', 'yard_driver', 'local_title', 'local_title', 'hourly_pay']
+    assert set(result['route_rule']) >= {'otr_pattern', 'mileage_or_weekly_pay', 'known_otr_carrier',
+                                         'mixed_keywords', 'otr_keywords', 'local_keywords', 'no_signal'}
+    assert result['route_confidence'].between(0, 1).all()
+    assert COMPILED.classify_route_details('CDL Driver', 'Team driver needed', '') == {
+        'route_type': 'OTR', 'route_rule': 'otr_pattern', 'route_confidence': 0.85}
+    assert COMPILED.classify_series([], [], []).empty
+
+    df = pd.DataFrame({'job_title': titles, 'job_description': descriptions, 'company': companies})
+    assert COMPILED.classify_jobs_dataframe(df.copy())['route_type'].tolist() == \
+        LEGACY.classify_jobs_dataframe(df.copy())['route_type'].tolist()
+
+
+def test_keyword_trie_pattern_matches_any_keyword():
+    import re
+    words = ['airport', 'airport shuttle', 'air', 'bus driver', 'a.b']
+    pattern = re.compile(keyword_trie_pattern(words))
+    for text in ['the air', 'airport', 'bus driver', 'xa.bx']:
+        assert bool(pattern.search(text)) == any(w in text for w in words)
+    assert not pattern.search('bus drive aXb')
+
+
+def test_parity_over_checkpointed_descriptions():
+    paths = sorted(glob.glob(os.path.join(PARQUET_DIR, '*_02_normalization.parquet')))
+    if not paths:
+        pytest.skip('no pipeline checkpoints available')
+    cols = ['norm.title', 'norm.description', 'norm.company']
+    df = pd.concat([pd.read_parquet(p, columns=cols) for p in paths], ignore_index=True)
+    expected = [LEGACY.classify_route_type(t, d, c) for t, d, c in df[cols].itertuples(index=False)]
+    result = COMPILED.classify_series(df['norm.title'], df['norm.description'], df['norm.company'])
+    assert result['route_type'].tolist() == expected
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from short_link_engine import AsyncShortLinkCreator, ShortLinkCache, TokenBucket, ZapierBatchQueue
+
+
+def _run_against_fake_shortio(items, cache=None, fail_first=0, **engine_kwargs):
+    calls = []
+
+    async def create_link(request):
+        body = await request.json()
+        calls.append(body)
+        if len(calls) <= fail_first:
+            return web.json_response({'error': 'rate limited'}, status=429, headers={'Retry-After': '0'})
+        return web.json_response({'shortURL': f"https://freeworldjobs.short.gy/{abs(hash(body['originalURL'])) % 10**6}"})
+
+    async def main():
+        app = web.Application()
+        app.router.add_post('/links', create_link)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            engine = AsyncShortLinkCreator('key', 'freeworldjobs.short.gy', base_url=str(server.make_url('')),
+                                           cache=cache, **engine_kwargs)
+            return await engine.create_links(items), engine
+        finally:
+            await server.close()
+
+    results, engine = asyncio.run(main())
+    return results, engine, calls
+
+
+def test_batch_dedupes_targets_and_keeps_order(tmp_path):
+    cache = ShortLinkCache(str(tmp_path / 'links.sqlite'))
+    items = [{'url': 'https://a.example/1', 'tags': ['coach:x']},
+             {'url': 'https://a.example/2'},
+             {'url': 'https://a.example/1', 'title': 'repeat'}]
+
+    results, engine, calls = _run_against_fake_shortio(items, cache=cache)
+
+    assert len(calls) == 2
+    assert results[0] == results[2] != results[1]
+    assert all(r.startswith('https://freeworldjobs.short.gy/') for r in results)
+    assert calls[0]['tags'] == ['coach:x'] and calls[0]['allowDuplicates'] is False
+
+    # Second batch is served entirely from the persistent cache
+    again, engine, calls = _run_against_fake_shortio(items, cache=ShortLinkCache(str(tmp_path / 'links.sqlite')))
+    assert again == results
+    assert calls == [] and engine.stats['cache_hits'] == 3
+
+
+def test_retries_rate_limited_requests():
+    results, engine, calls = _run_against_fake_shortio([{'url': 'https://a.example/1'}], fail_first=2)
+    assert results[0].startswith('https://freeworldjobs.short.gy/')
+    assert len(calls) == 3 and engine.stats['retries'] == 2
+
+
+def test_gives_up_with_original_url():
+    results, engine, _ = _run_against_fake_shortio([{'url': 'https://a.example/1'}], fail_first=10, max_retries=1)
+    assert results == ['https://a.example/1']
+    assert engine.stats['failures'] == 1
+
+
+def test_token_bucket_limits_rate():
+    async def main():
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 0.18
+
+
+def test_zapier_queue_posts_one_request_per_batch():
+    posts = []
+
+    class Hook(BaseHTTPRequestHandler):
+        def do_POST(self):
+            posts.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Hook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        zq = ZapierBatchQueue(f"http://127.0.0.1:{server.server_port}/hook", batch_size=25, flush_interval=0.2)
+        for i in range(30):
+            zq.enqueue('link_created', {'n': i})
+        assert zq.flush(timeout=5)
+    finally:
+        server.shutdown()
+
+    assert [len(body) for body in posts] == [25, 5]
+    events = [event for body in posts for event in body]
+    assert [e['payload']['n'] for e in events] == list(range(30))
+    assert events[0]['event'] == 'link_created' and 'timestamp' in events[0]
+    assert zq.sent == 30 and zq.failed == 0
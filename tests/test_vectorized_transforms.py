@@ -0,0 +1,104 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from canonical_transforms import transform_normalize, transform_business_rules
+from vectorized_transforms import transform_normalize_vectorized, transform_business_rules_vectorized
+
+NORM_COLS = [
+    'norm.title', 'norm.company', 'norm.description', 'norm.city', 'norm.state',
+    'norm.location', 'norm.salary_display', 'norm.salary_min', 'norm.salary_max',
+    'norm.salary_unit', 'norm.salary_currency',
+]
+RULES_COLS = [
+    'rules.is_owner_op', 'rules.is_school_bus', 'rules.is_spam_source',
+    'rules.duplicate_r1', 'rules.duplicate_r2', 'route.ready_for_ai',
+]
+PARQUET_DIR = os.path.join(os.path.dirname(__file__), '..', 'FreeWorld_Jobs', 'parquet')
+
+
+def _sample_df():
+    return pd.DataFrame([
+        {
+            'id.job': 'a1',
+            'source.title': '<b>CDL-A  Driver</b>\n Local',
+            'source.company': 'Acme &amp; Sons',
+            'source.description_raw': ' Home daily.&nbsp;Must own truck? no. <br/>school bus ',
+            'source.location_raw': 'Houston, TX 77032',
+            'source.salary_raw': "{'baseSalary': {'unitOfWork': 'WEEK', 'range': {'min': 1200, 'max': 1500}}, 'currencyCode': 'USD'}",
+            'meta.market': 'Houston',
+            'sys.is_fresh_job': True,
+        },
+        {
+            'id.job': 'a2',
+            'source.title': 'Owner Operator',
+            'source.company': 'Easy',
+            'source.description_raw': 'money every week',
+            'source.location_raw': 'Dallas',
+            'source.salary_raw': '$25 - $30 an hour',
+            'meta.market': 'Dallas',
+            'sys.is_fresh_job': True,
+        },
+        {
+            'id.job': 'a3',
+            'source.title': 'CDL Driver / Owner-Operator',
+            'source.company': '',
+            'source.description_raw': None,
+            'source.location_raw': 'phoenix, arizona',
+            'source.salary_raw': None,
+            'meta.market': 'Phoenix',
+            'sys.is_fresh_job': True,
+        },
+        {
+            'id.job': 'a4',
+            'source.title': 'Fleet Owner',
+            'source.company': 'Memory Co',
+            'source.description_raw': 'pyramid scheme',
+            'source.location_raw': '',
+            'source.salary_raw': '$50,000 a year',
+            'meta.market': 'Phoenix',
+            'sys.is_fresh_job': False,
+            'rules.is_owner_op': False,
+        },
+    ])
+
+
+def test_normalize_matches_row_wise():
+    df = _sample_df()
+    legacy = transform_normalize(df)
+    fast = transform_normalize_vectorized(df)
+    for col in NORM_COLS:
+        pd.testing.assert_series_equal(legacy[col], fast[col], check_exact=True)
+
+
+@pytest.mark.parametrize('filter_settings', [
+    {},
+    {'owner_op': False, 'school_bus': True, 'spam_filter': False},
+])
+def test_business_rules_matches_row_wise(filter_settings):
+    df = transform_normalize(_sample_df())
+    legacy = transform_business_rules(df, filter_settings=filter_settings)
+    fast = transform_business_rules_vectorized(df, filter_settings=filter_settings)
+    for col in RULES_COLS:
+        pd.testing.assert_series_equal(legacy[col], fast[col], check_exact=True)
+
+
+def test_parity_on_checkpoints():
+    paths = sorted(glob.glob(os.path.join(PARQUET_DIR, 'pipeline_v3_*_01_ingestion.parquet')))
+    frames = [pd.read_parquet(p) for p in paths]
+    frames = [f for f in frames if len(f) > 0]
+    if not frames:
+        pytest.skip('no pipeline checkpoints available')
+
+    for raw in frames[:3]:
+        legacy = transform_normalize(raw)
+        fast = transform_normalize_vectorized(raw)
+        for col in NORM_COLS:
+            pd.testing.assert_series_equal(legacy[col], fast[col], check_exact=True)
+
+        legacy_rules = transform_business_rules(legacy, filter_settings={})
+        fast_rules = transform_business_rules_vectorized(legacy, filter_settings={})
+        for col in RULES_COLS:
+            pd.testing.assert_series_equal(legacy_rules[col], fast_rules[col], check_exact=True)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the free-agent analytics rollup: per-agent queries vs incremental.
+
+Usage:
+  python tools/benchmark_agent_rollup.py [--agents 300] [--clicks 20000] [--latency 0.02]
+
+Seeds a MockPostgrestServer (with per-request latency to stand in for the
+network) and runs:
+  full          update_free_agents_analytics_table(incremental=False): one
+                click_events query per agent, every agent upserted
+  incremental   first run (no state: window backfill), then a run after 50
+                new clicks, then a run with no new clicks
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import free_agents_rollup
+from mock_postgrest_server import MockPostgrestServer
+
+
+def _seed(num_agents: int, num_clicks: int):
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    agents = [{'agent_uuid': f'agent-{i:04d}', 'agent_name': f'Agent {i}', 'coach_username': 'maria',
+               'agent_city': 'Houston', 'agent_state': 'TX', 'is_active': True,
+               'portal_visits': rng.randint(0, 40), 'job_clicks': rng.randint(0, 20),
+               'last_job_click': (now - timedelta(days=rng.randint(0, 70))).isoformat()} for i in range(num_agents)]
+    clicks = [_click(rng, i, num_agents, now - timedelta(seconds=rng.randint(600, 29 * 86400)))
+              for i in range(num_clicks)]
+    return agents, clicks
+
+
+def _click(rng, i, num_agents, ts):
+    return {'clicked_at': ts.isoformat(), 'coach': 'maria', 'market': rng.choice(['Houston', 'Dallas']),
+            'route': rng.choice(['Local', 'OTR']), 'match': rng.choice(['good', 'so-so']), 'fair': True,
+            'candidate_id': f'agent-{rng.randrange(num_agents):04d}', 'candidate_name': None,
+            'short_id': f's{i}', 'original_url': f'https://indeed.com/{i}', 'job_title': 'CDL-A',
+            'company': f'Carrier {rng.randint(0, 30)}'}
+
+
+def _run(server, label: str, fn) -> None:
+    server.reset_stats()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - t0
+    clicks = sum(1 for r in server.requests if r['table'] == 'click_events')
+    upserts = sum(1 for r in server.requests if r['table'] == 'free_agents_analytics')
+    print(f"{label:<28} {elapsed:>8.2f}s {clicks:>14} {upserts:>14} {server.bytes_sent / 1024:>10.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--agents', type=int, default=300)
+    parser.add_argument('--clicks', type=int, default=20000)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    agents, clicks = _seed(args.agents, args.clicks)
+    tables = {'agent_profiles': agents, 'click_events': clicks, 'free_agents_analytics': []}
+    with MockPostgrestServer(tables, latency=args.latency, max_rows=1000) as server, \
+            tempfile.TemporaryDirectory() as state_dir:
+        client = server.client()
+        free_agents_rollup.get_client = lambda: client
+        os.environ['FREEWORLD_ROLLUP_STATE_DIR'] = state_dir
+
+        print(f"{'run':<28} {'time':>9} {'click queries':>14} {'upsert calls':>14} {'KB':>10}")
+        _run(server, 'full (per-agent queries)',
+             lambda: free_agents_rollup.update_free_agents_analytics_table(incremental=False))
+        _run(server, 'incremental: first run',
+             lambda: free_agents_rollup.update_free_agents_analytics_table(incremental=True))
+        rng = random.Random(9)
+        now = datetime.now(timezone.utc)
+        server.tables['click_events'] += [_click(rng, args.clicks + i, args.agents, now - timedelta(seconds=i))
+                                          for i in range(50)]
+        _run(server, 'incremental: +50 clicks',
+             lambda: free_agents_rollup.update_free_agents_analytics_table(incremental=True))
+        _run(server, 'incremental: no new clicks',
+             lambda: free_agents_rollup.update_free_agents_analytics_table(incremental=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark the AI result join in transform_ai_classification.
+
+Usage:
+  python tools/benchmark_ai_join.py [--sizes 1000,10000,50000] [--legacy-max 10000]
+
+Builds synthetic canonical frames (duplicate job_ids, memory rows that already
+carry ai.* values, jobs without AI results) and times the indexed join against
+the previous row-wise implementation. The row-wise version scans the whole
+DataFrame per job, so it is only run up to --legacy-max rows; wherever both run,
+the ai.* columns must be identical.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from canonical_transforms import transform_ai_classification, AI_FIELD_DEFAULTS
+
+
+def legacy_transform_ai_classification(df: pd.DataFrame, ai_results: Dict[str, Dict], job_ids_classified: set = None) -> pd.DataFrame:
+    """
+    Row-wise transform_ai_classification as it was before the indexed join
+    (reference for parity and timing only)
+    
+    Args:
+        df: DataFrame with jobs ready for classification
+        ai_results: Dictionary mapping job_id to AI classification results
+        
+    Returns:
+        DataFrame with ai.* fields populated
+    """
+    def apply_ai_result(job_id: str) -> Dict[str, Any]:
+        """Apply AI result for a specific job"""
+        # Check if this job has already been classified (memory jobs, etc.)
+        current_row = df[df['id.job'] == job_id].iloc[0] if not df[df['id.job'] == job_id].empty else None
+        if current_row is not None and current_row.get('ai.match') and str(current_row.get('ai.match')).strip():
+            # Job already has classification - preserve existing values
+            return {
+                'ai.match': current_row.get('ai.match', ''),
+                'ai.reason': current_row.get('ai.reason', ''),
+                'ai.summary': current_row.get('ai.summary', ''),
+                'ai.normalized_location': current_row.get('ai.normalized_location', ''),
+                'ai.fair_chance': current_row.get('ai.fair_chance', 'no_requirements_mentioned'),
+                'ai.endorsements': current_row.get('ai.endorsements', 'none_required'),
+                'ai.route_type': current_row.get('ai.route_type', ''),
+                'ai.career_pathway': current_row.get('ai.career_pathway', 'cdl_pathway'),
+                'ai.training_provided': current_row.get('ai.training_provided', False)
+            }
+        
+        if job_id not in ai_results:
+            # Job was eligible for classification but AI didn't return a result
+            # This could be due to API errors, filtering during AI processing, etc.
+            # Use neutral defaults that won't break routing
+            return {
+                'ai.match': '',  # Empty = not classified
+                'ai.reason': '',
+                'ai.summary': '',
+                'ai.normalized_location': '',
+                'ai.fair_chance': 'no_requirements_mentioned',
+                'ai.endorsements': 'none_required',
+                'ai.route_type': '',
+                'ai.career_pathway': 'cdl_pathway',  # Default to CDL pathway
+                'ai.training_provided': False
+            }
+        
+        result = ai_results[job_id]
+        ai_result = {
+            'ai.match': result.get('match', 'error'),
+            'ai.reason': result.get('reason', 'No reason provided'),
+            'ai.summary': result.get('summary', 'No summary provided'),
+            'ai.normalized_location': result.get('normalized_location', ''),
+            'ai.fair_chance': result.get('fair_chance', 'no_requirements_mentioned'),
+            'ai.endorsements': result.get('endorsements', 'none_required'),
+            'ai.route_type': result.get('route_type', 'Unknown')
+        }
+
+        # Handle career pathway fields (from pathway classifier)
+        if 'career_pathway' in result:
+            ai_result['ai.career_pathway'] = result.get('career_pathway', 'cdl_pathway')
+        else:
+            # For CDL jobs, set career_pathway to 'cdl_pathway'
+            ai_result['ai.career_pathway'] = 'cdl_pathway'
+
+        if 'training_provided' in result:
+            ai_result['ai.training_provided'] = result.get('training_provided', False)
+        else:
+            # Default for CDL jobs
+            ai_result['ai.training_provided'] = False
+
+        return ai_result
+    
+    # Apply AI results
+    ai_fields = {}
+    classification_data = df['id.job'].apply(apply_ai_result)
+    
+    for field in ['ai.match', 'ai.reason', 'ai.summary', 'ai.normalized_location', 'ai.fair_chance', 'ai.endorsements', 'ai.route_type', 'ai.career_pathway', 'ai.training_provided']:
+        ai_fields[field] = classification_data.apply(lambda x: x[field])
+    
+    # Set classification metadata
+    current_date = datetime.now().date().isoformat()  # Just YYYY-MM-DD format
+    current_time = datetime.now().isoformat()
+    ai_fields['route.stage'] = 'classified'
+    ai_fields['sys.classified_at'] = current_date  # Date only for schema validation
+    ai_fields['sys.updated_at'] = current_time
+    ai_fields['sys.classification_source'] = 'ai_classification'
+    ai_fields['sys.model'] = 'gpt-4o-mini'
+    
+    return df.assign(**ai_fields)
+
+
+def build_frame(n: int):
+    """Synthetic stage-5 input: ~5% duplicate ids, ~10% memory rows, ~80% with results"""
+    job_ids = [f"job{i % int(n * 0.95) or 1:06d}" for i in range(n)]
+    df = pd.DataFrame({
+        'id.job': job_ids,
+        'ai.match': ['good' if i % 10 == 0 else '' for i in range(n)],
+        'ai.reason': ['from memory' if i % 10 == 0 else '' for i in range(n)],
+        'ai.route_type': ['Local' if i % 10 == 0 else '' for i in range(n)],
+        'sys.is_fresh_job': [i % 10 != 0 for i in range(n)],
+    })
+    matches = ['good', 'so-so', 'bad']
+    ai_results = {
+        job_id: {
+            'job_id': job_id,
+            'match': matches[i % 3],
+            'reason': f'reason {i}',
+            'summary': f'summary {i}',
+            'route_type': 'OTR' if i % 2 else 'Local',
+            'fair_chance': 'fair_chance_employer',
+            'endorsements': 'none_required',
+        }
+        for i, job_id in enumerate(dict.fromkeys(job_ids))
+        if i % 5 != 0
+    }
+    return df, ai_results
+
+
+def main():
+    sizes = [1000, 10000, 50000]
+    legacy_max = 10000
+    if '--sizes' in sys.argv:
+        sizes = [int(s) for s in sys.argv[sys.argv.index('--sizes') + 1].split(',')]
+    if '--legacy-max' in sys.argv:
+        legacy_max = int(sys.argv[sys.argv.index('--legacy-max') + 1])
+
+    ok = True
+    for n in sizes:
+        df, ai_results = build_frame(n)
+
+        start = time.perf_counter()
+        fast = transform_ai_classification(df, ai_results)
+        t_fast = time.perf_counter() - start
+
+        if n > legacy_max:
+            print(f"{n:>7} rows: indexed {t_fast * 1000:9.1f}ms | row-wise skipped (> --legacy-max)")
+            continue
+
+        start = time.perf_counter()
+        legacy = legacy_transform_ai_classification(df, ai_results)
+        t_legacy = time.perf_counter() - start
+
+        mismatched = [
+            col for col in AI_FIELD_DEFAULTS
+            if not legacy[col].equals(fast[col]) or legacy[col].dtype != fast[col].dtype
+        ]
+        ok = ok and not mismatched
+        status = "✅ identical" if not mismatched else f"❌ mismatch in {mismatched}"
+        print(f"{n:>7} rows: indexed {t_fast * 1000:9.1f}ms | row-wise {t_legacy * 1000:9.1f}ms "
+              f"({t_legacy / t_fast:.0f}x) {status}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark JobClassifier batches: per-call event loop + session vs the shared ClassifierRuntime.
+
+Usage:
+  python tools/benchmark_classifier_runtime.py [--batches 10] [--batch-jobs 25] [--latency 0.05]
+                                               [--rate-limit 16]
+
+Two scenarios against a MockOpenAIServer (--latency seconds per completion):
+
+  pooling      --batches calls of --batch-jobs jobs, as the pipeline makes them;
+               reports wall time and TCP connections the server saw (every new
+               connection is a TLS handshake against the real API)
+  rate limit   one call of --batches × --batch-jobs jobs against a server that
+               answers 429 beyond --rate-limit concurrent requests; the legacy
+               path keeps 50 in flight, the runtime adapts its limit
+
+Results are checked for errors (jobs that ran out of retries).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('OPENAI_API_KEY', 'bench')
+
+import job_classifier
+from classifier_runtime import ClassifierRuntime
+from mock_openai_server import MockOpenAIServer
+
+
+def jobs(n: int, prefix: str) -> list:
+    return [{'job_id': f'{prefix}-{i}', 'job_title': 'CDL-A Driver', 'company': 'Acme Logistics',
+             'location': 'Houston, TX', 'job_description': 'Home daily. No experience needed, training provided.'}
+            for i in range(n)]
+
+
+def run(server: MockOpenAIServer, runtime, batches: list) -> dict:
+    """Classify each batch with the runtime (or the legacy path when runtime is None)"""
+    job_classifier.get_classifier_runtime = lambda: runtime
+    classifier = job_classifier.JobClassifier()
+    server.connections.clear()
+    server.throttled = 0
+    start = time.perf_counter()
+    errors = 0
+    with contextlib.redirect_stdout(io.StringIO()):  # The classifier prints per-batch guard reports
+        for batch in batches:
+            results = classifier.classify_jobs_in_batches(batch, use_cache=False)
+            errors += sum(1 for r in results if r.get('match') == 'error')
+    return {'seconds': time.perf_counter() - start, 'connections': len(server.connections),
+            'throttled': server.throttled, 'errors': errors}
+
+
+def report(label: str, jobs_total: int, stats: dict, extra: str = '') -> None:
+    print(f"  {label:<22} {stats['seconds']:6.2f}s  {jobs_total / stats['seconds']:7.0f} jobs/s  "
+          f"{stats['connections']:4d} connections  {stats['throttled']:5d} 429s  {stats['errors']:3d} errors{extra}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--batches', type=int, default=10)
+    parser.add_argument('--batch-jobs', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--rate-limit', type=int, default=16)
+    args = parser.parse_args()
+    total = args.batches * args.batch_jobs
+
+    print(f"Pooling: {args.batches} batches × {args.batch_jobs} jobs, {args.latency}s per completion")
+    with MockOpenAIServer(latency=args.latency) as server:
+        os.environ['OPENAI_BASE_URL'] = server.base_url
+        batches = [jobs(args.batch_jobs, f'b{b}') for b in range(args.batches)]
+        report('per-call loop', total, run(server, None, batches))
+        runtime = ClassifierRuntime()
+        try:
+            report('shared runtime', total, run(server, runtime, batches))
+        finally:
+            runtime.close()
+
+    print(f"\nRate limit: {total} jobs in one call, server allows {args.rate_limit} concurrent requests")
+    ok = True
+    with MockOpenAIServer(latency=args.latency, max_concurrency=args.rate_limit, retry_after=0.1) as server:
+        os.environ['OPENAI_BASE_URL'] = server.base_url
+        batch = [jobs(total, 'rl')]
+        report('fixed 50', total, run(server, None, batch))
+        runtime = ClassifierRuntime()
+        try:
+            stats = run(server, runtime, batch)
+            report('adaptive', total, stats, f"  (limit now {runtime.snapshot()['limit']})")
+            ok = stats['errors'] == 0
+        finally:
+            runtime.close()
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
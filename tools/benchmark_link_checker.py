@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark Indeed link checking: one-at-a-time vs the async checker.
+
+Usage:
+  python tools/benchmark_link_checker.py [--urls 300] [--latency 0.2] [--delay 0.05]
+
+Serves fake job pages from a MockJobSiteServer (a quarter of them expired or
+removed) and runs:
+  sequential    check_indeed_link per URL with the politeness delay between them
+  async         check_multiple_links (concurrent, per-host limit, HEAD-then-GET)
+  async cached  the same call again, answered from the verdict cache
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from indeed_link_checker import IndeedLinkChecker, LinkVerdictCache
+from mock_job_site_server import MockJobSiteServer
+
+
+def _run(site, label: str, fn) -> None:
+    site.reset_stats()
+    t0 = time.perf_counter()
+    results = fn()
+    elapsed = time.perf_counter() - t0
+    active = sum(1 for r in results if r['is_active'])
+    print(f"{label:<16} {elapsed:>8.2f}s {site.request_count:>10} {active:>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--urls', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--delay', type=float, default=0.05)
+    parser.add_argument('--per-host', type=int, default=4)
+    args = parser.parse_args()
+
+    states = ['active', 'active', 'active', 'missing', 'active', 'expired', 'active', 'removed']
+    jobs = {f'job{i}': states[i % len(states)] for i in range(args.urls)}
+    with MockJobSiteServer(jobs, latency=args.latency) as site:
+        urls = [site.job_url(key) for key in jobs]
+        checker = IndeedLinkChecker(delay_between_requests=args.delay, per_host_limit=args.per_host,
+                                    cache=LinkVerdictCache(ttl_seconds=3600))
+
+        uncached = IndeedLinkChecker(delay_between_requests=0, cache=LinkVerdictCache(ttl_seconds=0))
+
+        def sequential():
+            results = []
+            for i, url in enumerate(urls):
+                if i:
+                    time.sleep(args.delay)
+                results.append(uncached.check_indeed_link(url))
+            return results
+
+        print(f"{'run':<16} {'time':>9} {'requests':>10} {'active':>8}")
+        _run(site, 'sequential', sequential)
+        _run(site, 'async', lambda: checker.check_multiple_links(urls, max_concurrent=10))
+        _run(site, 'async cached', lambda: checker.check_multiple_links(urls, max_concurrent=10))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
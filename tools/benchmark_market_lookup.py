@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark MarketMapper lookups: linear scans vs MarketGeoIndex.
+
+Usage:
+  python tools/benchmark_market_lookup.py [--repeat 2000]
+
+Compares the original dict-scanning implementations of get_cities_in_market,
+search_markets and get_all_markets against the precomputed index, and times
+map_market, radius queries (grid vs checking every city) and fuzzy matching.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_geo_index import MarketGeoIndex, haversine_miles
+from market_mapper import MarketMapper
+
+
+def _scan_all_markets(lookup):
+    all_markets = set()
+    for markets in lookup.values():
+        all_markets.update(markets)
+    return sorted(all_markets)
+
+
+def _scan_cities_in_market(lookup, market_name):
+    return sorted(city for city, markets in lookup.items() if market_name in markets)
+
+
+def _scan_search_markets(lookup, term):
+    return sorted(m for m in _scan_all_markets(lookup) if term.lower() in m.lower())
+
+
+def _scan_within(index, center, radius):
+    lat, lon = index.coordinates_for(center)
+    return sorted((k, haversine_miles(lat, lon, *c)) for k, c in index.coordinates.items()
+                  if haversine_miles(lat, lon, *c) <= radius)
+
+
+def _time(label: str, repeat: int, fn) -> float:
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    per_call = (time.perf_counter() - t0) / repeat * 1e6
+    print(f"{label:<44} {per_call:>10.1f} µs/call")
+    return per_call
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    mapper = MarketMapper()
+    lookup = mapper.market_lookup
+    t0 = time.perf_counter()
+    index = MarketGeoIndex(lookup)
+    print(f"Index build: {(time.perf_counter() - t0) * 1000:.1f} ms "
+          f"({len(lookup)} cities, {len(index.coordinates)} with coordinates)\n")
+
+    markets = index.markets
+    cities = list(lookup)
+    rng = random.Random(7)
+    typos = []
+    for city in rng.sample(cities, 50):
+        name, _, state = city.rpartition(', ')
+        pos = rng.randrange(1, len(name))
+        typos.append(f"{name[:pos]}{name[pos + 1:]}, {state}")
+    centers = ['Dallas, TX', 'Houston, TX', 'Phoenix, AZ', 'Newark, NJ', 'Denver, CO']
+    n = args.repeat
+
+    _time('get_cities_in_market (scan)', n, lambda i: _scan_cities_in_market(lookup, markets[i % len(markets)]))
+    _time('get_cities_in_market (index)', n, lambda i: index.cities_in_market(markets[i % len(markets)]))
+    _time('search_markets (scan)', n, lambda i: _scan_search_markets(lookup, 'an'))
+    _time('search_markets (index)', n, lambda i: index.search_markets('an'))
+    _time('get_all_markets (scan)', n, lambda i: _scan_all_markets(lookup))
+    _time('get_all_markets (index)', n, lambda i: list(index.markets))
+    _time('map_market (exact dict)', n, lambda i: lookup.get(cities[i % len(cities)], [''])[0])
+    _time('map_market (index)', n, lambda i: index.market_for(cities[i % len(cities)]))
+    _time('cities within 50mi (every city)', n // 10, lambda i: _scan_within(index, centers[i % 5], 50))
+    _time('cities within 50mi (grid)', n // 10, lambda i: index.cities_within(centers[i % 5], 50))
+    _time('fuzzy match (first call)', len(typos), lambda i: index.fuzzy_match(typos[i]))
+    _time('fuzzy match (memoized)', n, lambda i: index.fuzzy_match(typos[i % len(typos)]))
+    hits = sum(1 for t in typos if index.fuzzy_match(t))
+    print(f"\nFuzzy: {hits}/{len(typos)} single-deletion typos resolved to a known city")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark Supabase round-trips and bytes per memory search.
+
+Usage:
+  python tools/benchmark_memory_search.py [--jobs 2000] [--feedback 5000] [--searches 10]
+
+Seeds a local MockPostgrestServer with synthetic jobs and job_feedback rows, then
+runs the same market searches before/after and reports requests and response
+bytes per search (job_feedback vs jobs):
+  search (legacy)   previous search_memory_jobs pattern: two debug count queries,
+                    full job_feedback download, jobs query, client-side URL filter
+  search            supabase_converter.search_memory_jobs (exclusion index)
+  instant (legacy)  previous instant_memory_search pattern
+  instant           supabase_utils.instant_memory_search (no link generation)
+New feedback is inserted between searches so incremental refreshes are exercised.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import supabase_utils
+from feedback_exclusions import FeedbackExclusionIndex
+import feedback_exclusions
+from mock_postgrest_server import MockPostgrestServer
+from supabase_converter import search_memory_jobs
+
+MARKETS = ['Houston', 'Dallas', 'Bay Area', 'Phoenix', 'Denver']
+
+
+def _seed(num_jobs: int, num_feedback: int):
+    now = datetime.now(timezone.utc)
+    jobs = [{
+        'id': i,
+        'job_id': f'job{i}',
+        'job_title': f'CDL-A Driver {i}',
+        'company': f'Carrier {i % 50}',
+        'location': 'Houston, TX',
+        'market': MARKETS[i % len(MARKETS)],
+        'match_level': 'good' if i % 3 else 'so-so',
+        'route_type': 'Local' if i % 2 else 'OTR',
+        'fair_chance': 'fair_chance_employer',
+        'apply_url': f'https://www.indeed.com/viewjob?jk={i:08x}',
+        'job_flagged': False,
+        'last_expired_feedback_at': None,
+        'job_description': 'Home daily route, paid training, no experience required. ' * 6,
+        'created_at': (now - timedelta(hours=i % 60)).isoformat(),
+    } for i in range(num_jobs)]
+    feedback = [{
+        'id': i,
+        'candidate_id': f'cand{i % 200}',
+        'job_id': f'job{(i * 7) % (num_jobs * 5)}',
+        'job_url': f'https://www.indeed.com/viewjob?jk={(i * 7) % (num_jobs * 5):08x}',
+        'feedback_type': 'job_expired',
+        'created_at': (now - timedelta(days=30) + timedelta(seconds=i)).isoformat(),
+    } for i in range(num_feedback)]
+    return jobs, feedback
+
+
+def legacy_search(client, market: str, limit: int = 100):
+    """Query pattern of search_memory_jobs before the exclusion index"""
+    cutoff = (datetime.now() - timedelta(days=7)).isoformat()
+    client.table('jobs').select('route_type', count='exact').eq('market', market).gte('created_at', cutoff).execute()
+    client.table('jobs').select('route_type', count='exact').eq('market', market).ilike('route_type', '%local%').gte('created_at', cutoff).execute()
+    reported = {row['job_url'] for row in (client.table('job_feedback').select('job_url').execute().data or [])}
+    rows = (client.table('jobs').select('*').eq('market', market).in_('match_level', ['good', 'so-so'])
+            .gte('created_at', cutoff).order('created_at', desc=True).limit(limit).execute().data or [])
+    return [row for row in rows if row.get('apply_url') not in reported]
+
+
+def legacy_instant(client, market: str, hours: int = 72):
+    """Query pattern of instant_memory_search before the exclusion index"""
+    cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+    expired_cutoff = cutoff
+    reported = {row['job_url'] for row in (client.table('job_feedback').select('job_url').execute().data or [])}
+    rows = (client.table('jobs').select('*').eq('market', market).gte('created_at', cutoff)
+            .in_('match_level', ['good', 'so-so']).eq('job_flagged', False)
+            .or_(f'last_expired_feedback_at.is.null,last_expired_feedback_at.lt.{expired_cutoff}')
+            .execute().data or [])
+    return [row for row in rows if row.get('apply_url') not in reported]
+
+
+def _measure(server, label: str, searches: int, run) -> None:
+    server.reset_stats()
+    counts = []
+    for i in range(searches):
+        before = server.request_count
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(MARKETS[i % len(MARKETS)])
+        counts.append(server.request_count - before)
+        # A new report lands between searches
+        server.tables['job_feedback'].append({
+            'id': 10_000_000 + i, 'job_id': f'job{i}', 'job_url': f'https://www.indeed.com/viewjob?jk={i:08x}',
+            'feedback_type': 'job_expired', 'created_at': datetime.now(timezone.utc).isoformat(),
+        })
+    feedback_bytes = sum(r['bytes'] for r in server.requests if r['table'] == 'job_feedback')
+    jobs_bytes = server.bytes_sent - feedback_bytes
+    print(f"{label:<16} {sum(counts) / searches:>10.1f} {counts[0]:>6} {sum(counts[1:]) / max(1, searches - 1):>6.1f} "
+          f"{feedback_bytes / searches / 1024:>12.1f} {jobs_bytes / searches / 1024:>9.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--feedback', type=int, default=5000)
+    parser.add_argument('--searches', type=int, default=10)
+    args = parser.parse_args()
+
+    jobs, feedback = _seed(args.jobs, args.feedback)
+    with MockPostgrestServer({'jobs': jobs, 'job_feedback': feedback}) as server:
+        client = server.client()
+        supabase_utils.get_client = lambda: client
+
+        print(f"{'path':<16} {'req/search':>10} {'first':>6} {'later':>6} {'feedback KB':>12} {'jobs KB':>9}   (per search)")
+        _measure(server, 'search (legacy)', args.searches, lambda market: legacy_search(client, market))
+        # refresh_seconds=0 so every search does an incremental refresh (worst case)
+        feedback_exclusions._shared_index = FeedbackExclusionIndex(refresh_seconds=0)
+        _measure(server, 'search', args.searches, lambda market: search_memory_jobs(market, limit=100))
+
+        _measure(server, 'instant (legacy)', args.searches, lambda market: legacy_instant(client, market))
+        feedback_exclusions._shared_index = FeedbackExclusionIndex(refresh_seconds=0)
+        _measure(server, 'instant', args.searches, lambda market: supabase_utils.instant_memory_search(market, hours=72))
+        stats = feedback_exclusions._shared_index.stats
+        print(f"\nexclusion index: {stats['refreshes']} refreshes ({stats['full_reloads']} full), "
+              f"{stats['rows_fetched']} feedback rows fetched, {stats['pushdowns']} server-side pushdowns")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
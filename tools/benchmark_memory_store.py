@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark JobMemoryDB storage: iterrows + sequential batches of 100 vs job_memory_store.
+
+Usage:
+  python tools/benchmark_memory_store.py [--jobs 5000] [--latency 0.05] [--workers 4]
+
+Builds a synthetic canonical jobs frame and stores it in a MockPostgrestServer
+(with --latency seconds per request) twice per backend: with the
+batch_insert_jobs_with_dedup RPC deployed, and without it (the production
+project answers PGRST202, so every legacy batch paid for a failed RPC call
+before its upsert). Record building is timed separately and the records of
+both paths must be identical.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from job_memory_store import BulkJobWriter, build_job_records
+from mock_postgrest_server import MockPostgrestServer, upsert_rows_rpc
+
+MARKETS = ['Houston', 'Dallas, TX', 'Bay Area', 'Phoenix, AZ', 'Inland Empire', 'Berkeley', '']
+
+
+def legacy_build_records(jobs_df: pd.DataFrame) -> list:
+    """
+    Record building from JobMemoryDB.store_classifications as it was before
+    job_memory_store (reference for parity and timing only)
+    """
+    records = []
+    for idx, job in jobs_df.iterrows():
+        final_status = job.get('route.final_status', '') or job.get('filter_reason', '')
+        match = job.get('ai.match', job.get('match_level', job.get('match', '')))
+        reason = job.get('ai.reason', job.get('match_reason', job.get('reason', '')))
+        summary = job.get('ai.summary', job.get('summary', ''))
+        if final_status == 'passed_all_filters' or final_status.startswith('included'):
+            if not match or str(match) in ['', 'nan', 'None', 'null']:
+                if final_status.startswith('included'):
+                    match = 'good' if 'good' in final_status.lower() else 'so-so'
+                else:
+                    match = 'pending'
+            if not reason or str(reason) in ['', 'nan', 'None', 'null']:
+                reason = final_status
+            if not summary or str(summary) in ['', 'nan', 'None', 'null']:
+                summary = f'Job with status: {final_status}'
+        else:
+            continue
+
+        def _sanitize_market(val: str) -> str:
+            try:
+                from shared_search import MARKET_TO_LOCATION
+                std = {m: m for m in MARKET_TO_LOCATION.keys()}
+                inv = {v: k for k, v in MARKET_TO_LOCATION.items()}
+                city_map = {v.split(',')[0].strip().lower(): k for k, v in MARKET_TO_LOCATION.items()}
+            except Exception:
+                std, inv, city_map = {}, {}, {}
+            s = str(val or '').strip()
+            if not s:
+                return ''
+            if s in std:
+                return s
+            if s in inv:
+                return inv[s]
+            if ',' in s:
+                s = s.split(',')[0].strip()
+            if s.lower() in city_map:
+                return city_map[s.lower()]
+            if s.lower() == 'berkeley':
+                return 'Bay Area'
+            if s.lower() == 'ontario':
+                return 'Inland Empire'
+            return s
+
+        def safe_str(val):
+            if val is None or val == '':
+                return ''
+            return str(val)
+
+        record = {
+            'job_id': safe_str(job.get('id.job', job.get('job_id', ''))),
+            'job_title': safe_str(job.get('source.title', job.get('job_title', ''))),
+            'company': safe_str(job.get('source.company', job.get('company', ''))),
+            'location': safe_str(job.get('source.location_raw', job.get('location', ''))),
+            'job_description': safe_str(job.get('source.description_raw', job.get('job_description', '')))[:5000],
+            'apply_url': safe_str(job.get('source.indeed_url', job.get('apply_url', ''))),
+            'salary': safe_str(job.get('source.salary_raw', job.get('salary', ''))),
+            'match_level': safe_str(match),
+            'match_reason': safe_str(reason),
+            'summary': safe_str(summary),
+            'fair_chance': safe_str(job.get('ai.fair_chance', job.get('fair_chance', 'unknown'))),
+            'endorsements': safe_str(job.get('ai.endorsements', job.get('endorsements', 'unknown'))),
+            'route_type': safe_str(job.get('ai.route_type', job.get('route_type', ''))),
+            'career_pathway': safe_str(job.get('ai.career_pathway', job.get('career_pathway', 'cdl_pathway'))),
+            'training_provided': str(job.get('ai.training_provided', job.get('training_provided', False))).lower(),
+            'market': safe_str(_sanitize_market(job.get('meta.market', job.get('market', '')))),
+            'tracked_url': safe_str(job.get('meta.tracked_url', job.get('tracked_url', ''))),
+            'indeed_job_url': safe_str(job.get('source.indeed_url', job.get('indeed_job_url', ''))),
+            'search_query': safe_str(job.get('meta.query', job.get('search_query', ''))),
+            'source': safe_str(job.get('id.source', job.get('source', 'outscraper'))),
+            'filter_reason': safe_str(job.get('route.final_status', job.get('filter_reason', ''))),
+            'classification_source': safe_str(job.get('sys.classification_source', 'ai_classification')),
+            'classified_at': datetime.now().isoformat(),
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat(),
+            'rules_duplicate_r1': safe_str(job.get('rules.duplicate_r1', '')),
+            'rules_duplicate_r2': safe_str(job.get('rules.duplicate_r2', '')),
+            'clean_apply_url': safe_str(job.get('clean_apply_url', '')),
+            'job_id_hash': safe_str(job.get('sys.hash', ''))
+        }
+        if record['job_id']:
+            records.append(record)
+    return records
+
+
+def legacy_send(client, records: list, batch_size: int = 100) -> int:
+    """Sequential fixed-size batches: RPC first, upsert fallback (as before)"""
+    stored = 0
+    for i in range(0, len(records), batch_size):
+        batch = records[i:i + batch_size]
+        try:
+            result = client.rpc('batch_insert_jobs_with_dedup', {'p_jobs_data': batch}).execute()
+            if result.data is None:
+                raise Exception("RPC returned no data")
+            stored += result.data if isinstance(result.data, int) else len(batch)
+        except Exception:
+            result = client.table('jobs').upsert(batch).execute()
+            stored += len(result.data or [])
+    return stored
+
+
+def synthetic_jobs(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    words = 'home daily regional otr cdl class a driver benefits pay weekly miles freight dedicated'.split()
+    rows = []
+    for i in range(n):
+        status = rng.choice(['included: good match', 'included: so-so match', 'passed_all_filters',
+                             'filtered: owner op'])
+        rows.append({
+            'id.job': f'job-{i:06d}',
+            'source.title': f'CDL-A Driver {i}',
+            'source.company': rng.choice(['Swift', 'Werner', 'Acme Logistics', 'DMV Express']),
+            'source.location_raw': 'Houston, TX',
+            'source.description_raw': ' '.join(rng.choice(words) for _ in range(rng.randint(100, 900))),
+            'source.indeed_url': f'https://www.indeed.com/viewjob?jk={i:012x}',
+            'source.salary_raw': '$1,200 - $1,500 a week',
+            'ai.match': rng.choice(['good', 'so-so', '', None]),
+            'ai.reason': 'Entry level friendly',
+            'ai.summary': 'Regional role with weekly home time.',
+            'ai.route_type': rng.choice(['Local', 'OTR', 'Unknown']),
+            'ai.training_provided': rng.choice([True, False]),
+            'meta.market': rng.choice(MARKETS),
+            'meta.query': 'CDL Driver No Experience',
+            'id.source': 'indeed',
+            'route.final_status': status,
+            'rules.duplicate_r1': f'{i:016x}',
+        })
+    return pd.DataFrame(rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    df = synthetic_jobs(args.jobs)
+    t0 = time.perf_counter()
+    legacy_records = legacy_build_records(df)
+    legacy_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    records, _ = build_job_records(df)
+    build = time.perf_counter() - t0
+    strip = lambda rs: [{k: v for k, v in r.items() if not k.endswith('_at')} for r in rs]
+    same = strip(records) == strip(legacy_records)
+    print(f"{len(df)} jobs -> {len(records)} records")
+    print(f"Record building: iterrows {legacy_build:.2f}s  columnar {build:.2f}s  "
+          f"x{legacy_build / build:.1f}  {'✅ identical records' if same else '❌ RECORDS DIFFER'}\n")
+
+    rpc = {'batch_insert_jobs_with_dedup': upsert_rows_rpc('jobs', 'job_id', 'p_jobs_data')}
+    for label, functions in [('RPC deployed', rpc), ('RPC missing (production)', {})]:
+        for name in ('sequential x100', 'bulk writer'):
+            with MockPostgrestServer({'jobs': []}, latency=args.latency, rpc_functions=functions) as server:
+                client = server.client()
+                t0 = time.perf_counter()
+                if name == 'bulk writer':
+                    stored = BulkJobWriter(client, max_workers=args.workers).write(records)['stored']
+                else:
+                    stored = legacy_send(client, legacy_records)
+                elapsed = time.perf_counter() - t0
+                print(f"{label:<26} {name:<16} {elapsed:6.2f}s  {len(records) / elapsed:7.0f} rows/s  "
+                      f"{server.request_count:4d} requests  {server.bytes_sent / 1e6:6.2f} MB back  "
+                      f"stored {stored}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark Indeed ingestion: one synchronous Outscraper request vs the async client.
+
+Usage:
+  python tools/benchmark_outscraper_ingest.py [--terms 3] [--locations 4] [--processing 0.5] [--limit 50]
+
+Runs terms × locations queries against a MockOutscraperServer that spends
+--processing seconds scraping each query. The legacy path sends every query in
+one async=false request (Outscraper works through them back to back) and then
+transforms all jobs at once; the async client submits each query separately,
+polls with backoff and transforms pages as they land. Reports wall time,
+time to the first usable page, and jobs/s per concurrency budget. Both paths
+must produce the same job ids in the same order.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from canonical_transforms import transform_ingest_outscraper
+from mock_outscraper_server import MockOutscraperServer
+from outscraper_async_client import OutscraperAsyncClient, indeed_queries
+
+TERMS = ['CDL Driver No Experience', 'Truck Driver', 'Class A Driver', 'Delivery Driver', 'Yard Jockey']
+LOCATIONS = ['Houston, TX', 'Dallas, TX', 'Phoenix, AZ', 'Atlanta, GA', 'Denver, CO', 'Las Vegas, NV']
+
+
+def legacy_ingest(base_url: str, queries: list, limit: int):
+    """Single async=false request for every query, then one transform (as before)"""
+    response = requests.get(f"{base_url}/indeed-search", headers={'X-API-KEY': 'bench'},
+                            params={'query': queries, 'limit': limit, 'async': 'false'})
+    jobs = [job for page in response.json()['data'] for job in page]
+    return transform_ingest_outscraper(jobs, 'bench', 'Houston, TX')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--terms', type=int, default=3)
+    parser.add_argument('--locations', type=int, default=4)
+    parser.add_argument('--processing', type=float, default=0.5, help='seconds Outscraper spends per query')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    queries = indeed_queries(TERMS[:args.terms], LOCATIONS[:args.locations])
+    print(f"{len(queries)} queries × {args.limit} jobs, {args.processing}s scraping per query\n")
+    quiet = contextlib.redirect_stdout(io.StringIO())  # transform_ingest_outscraper is chatty
+
+    with MockOutscraperServer(processing_time=args.processing) as server:
+        t0 = time.perf_counter()
+        with quiet:
+            expected = legacy_ingest(server.base_url, queries, args.limit)
+        legacy = time.perf_counter() - t0
+        print(f"{'sync, one request':<22} {legacy:6.2f}s  first page {legacy:6.2f}s  "
+              f"{len(expected) / legacy:7.0f} jobs/s  1 request")
+
+        ok = True
+        for concurrency in args.concurrency:
+            server.requests.clear()
+            client = OutscraperAsyncClient('bench', base_url=server.base_url, max_concurrent=concurrency,
+                                           poll_initial=args.processing / 4, poll_max=args.processing)
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                df, _ = client.ingest_indeed(queries, args.limit, 'bench', 'Houston, TX')
+            elapsed = time.perf_counter() - t0
+            same = df['id.job'].tolist() == expected['id.job'].tolist()
+            ok &= same
+            print(f"{f'async x{concurrency}':<22} {elapsed:6.2f}s  first page "
+                  f"{client.stats['first_page_seconds']:6.2f}s  {len(df) / elapsed:7.0f} jobs/s  "
+                  f"{server.request_count} requests ({client.stats['polls']} polls)  x{legacy / elapsed:.1f}  "
+                  f"{'✅ same jobs' if same else '❌ JOBS DIFFER'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
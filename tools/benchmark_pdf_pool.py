@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-launch vs pooled Playwright PDF export.
+
+Usage:
+  python tools/benchmark_pdf_pool.py [--counts 1,10,50] [--pages 2] [--out-dir /tmp/pdf_bench]
+
+Renders the same job report (render_jobs_html on synthetic jobs) N times
+sequentially with export_pdf_playwright_cold (one Chromium per PDF) and with a
+fresh BrowserPool, and prints total / per-PDF latency. The pool's first render
+includes the browser launch, so the 1-export row shows the warm-up cost.
+Requires `pip install playwright && playwright install chromium`.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pdf.browser_pool import BrowserPool
+from pdf.html_pdf_generator import export_pdf_playwright_cold, render_jobs_html
+
+
+def _sample_html(num_jobs: int = 12) -> str:
+    jobs = []
+    for i in range(num_jobs):
+        jobs.append({
+            'job_title': f'CDL-A Local Driver {i}',
+            'company': f'Carrier {i}',
+            'location': 'Houston, TX',
+            'salary': '$1,200 - $1,500 per week',
+            'summary': 'Home daily route with company-provided equipment. No experience required; '
+                       'paid training and full benefits from day one. ' * 3,
+            'apply_url': f'https://example.com/jobs/{i}',
+            'route_type': 'Local',
+            'match': 'good',
+            'fair_chance': 'fair_chance_employer',
+        })
+    return render_jobs_html(jobs, {'agent_name': 'Benchmark Agent', 'coach_name': 'Benchmark Coach'})
+
+
+def _time_runs(render, count: int, out_dir: str, label: str):
+    latencies = []
+    for i in range(count):
+        path = os.path.join(out_dir, f'{label}_{i}.pdf')
+        start = time.perf_counter()
+        render(path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--counts', default='1,10,50')
+    parser.add_argument('--pages', type=int, default=2, help='pool render slots')
+    parser.add_argument('--out-dir', default=None)
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.counts.split(',') if c.strip()]
+    out_dir = args.out_dir or tempfile.mkdtemp(prefix='pdf_bench_')
+    os.makedirs(out_dir, exist_ok=True)
+    html = _sample_html()
+
+    print(f"📄 HTML size: {len(html) / 1024:.0f} KB, output: {out_dir}")
+    print(f"{'exports':>8} {'cold total':>11} {'cold/pdf':>9} {'pool total':>11} {'pool/pdf':>9} {'pool p50':>9} {'speedup':>8}")
+    for count in counts:
+        cold = _time_runs(lambda p: export_pdf_playwright_cold(html, p), count, out_dir, f'cold{count}')
+
+        pool = BrowserPool(max_pages=args.pages)
+        try:
+            pooled = _time_runs(lambda p: pool.render_pdf(html, p), count, out_dir, f'pool{count}')
+        finally:
+            pool.shutdown()
+
+        cold_total, pool_total = sum(cold), sum(pooled)
+        print(f"{count:>8} {cold_total:>10.2f}s {cold_total / count:>8.3f}s "
+              f"{pool_total:>10.2f}s {pool_total / count:>8.3f}s {statistics.median(pooled):>8.3f}s "
+              f"{cold_total / pool_total:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark pipeline startup: import + construct latency per entry point.
+
+Usage:
+  python tools/benchmark_pipeline_startup.py [--repeat 3]
+
+Each scenario runs in a fresh interpreter and reports:
+  import     `import pipeline_v3`
+  construct  FreeWorldPipelineV3() (components are lazy)
+  first use  building the components the entry point touches
+             (memory_only: MEMORY_ONLY_COMPONENTS, complete: COMPLETE_PIPELINE_COMPONENTS)
+  rerun      second FreeWorldPipelineV3() + first use in the same process
+             (a Streamlit rerun; components come from the shared registry)
+Per-component construction times are printed below the table. Components that
+cannot be built here (missing API keys/secrets) are listed as errors.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD = r'''
+import contextlib, io, json, sys, time
+sys.path.insert(0, {root!r})
+memory_only = {memory_only!r}
+out = {{}}
+with contextlib.redirect_stdout(io.StringIO()):
+    t = time.perf_counter()
+    import pipeline_v3
+    out['import'] = time.perf_counter() - t
+
+    names = pipeline_v3.MEMORY_ONLY_COMPONENTS if memory_only else pipeline_v3.COMPLETE_PIPELINE_COMPONENTS
+
+    def first_use(pipe):
+        errors = {{}}
+        for name in names:
+            try:
+                getattr(pipe, name)
+            except Exception as e:
+                errors[name] = type(e).__name__
+        return errors
+
+    t = time.perf_counter()
+    pipe = pipeline_v3.FreeWorldPipelineV3()
+    out['construct'] = time.perf_counter() - t
+    t = time.perf_counter()
+    out['errors'] = first_use(pipe)
+    out['first_use'] = time.perf_counter() - t
+    out['components'] = dict(pipe.components.init_seconds)
+
+    t = time.perf_counter()
+    first_use(pipeline_v3.FreeWorldPipelineV3())
+    out['rerun'] = time.perf_counter() - t
+print(json.dumps(out))
+'''
+
+
+def _run(memory_only: bool) -> dict:
+    code = CHILD.format(root=ROOT, memory_only=memory_only)
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else 'child failed')
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'entry point':<24} {'import ms':>10} {'construct ms':>13} {'first use ms':>13} {'rerun ms':>9}")
+    details = {}
+    for label, memory_only in (('run_memory_only_search', True), ('run_complete_pipeline', False)):
+        runs = [_run(memory_only) for _ in range(args.repeat)]
+        med = {k: statistics.median(r[k] for r in runs) * 1000 for k in ('import', 'construct', 'first_use', 'rerun')}
+        print(f"{label:<24} {med['import']:>10.0f} {med['construct']:>13.1f} {med['first_use']:>13.0f} {med['rerun']:>9.1f}")
+        details[label] = runs[-1]
+
+    for label, run in details.items():
+        parts = ', '.join(f"{name} {secs * 1000:.0f}ms" for name, secs in run['components'].items())
+        print(f"\n{label}: {parts or 'no components built'}")
+        for name, error in run['errors'].items():
+            print(f"  ⚠️ {name}: {error}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
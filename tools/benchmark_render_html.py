@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark render_jobs_html latency and output size.
+
+Usage:
+  python tools/benchmark_render_html.py [--sizes 25,100,500] [--repeat 5]
+
+For each job count it reports:
+  cold      caches cleared before every render (asset re-encode + template compile)
+  warm      process-wide asset/template caches populated
+  fragment  portal fragment from the report partials (no debug payload)
+  legacy    previous fragment path (warm): full render + regex extraction + DEBUG_JOBS_DATA comment
+and the size of the full document and both fragments.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pdf.html_pdf_generator import clear_render_caches, render_jobs_html
+
+AGENT_PARAMS = {'agent_name': 'jane.doe', 'coach_name': 'coach.smith', 'location': 'Houston',
+                'show_prepared_for': True, 'agent_uuid': 'bench-agent'}
+
+
+def _jobs(count: int):
+    return [{
+        'job_id': f'job{i}',
+        'title': f'CDL-A Local Driver {i}',
+        'company': f'Carrier {i % 40}',
+        'location': 'Houston, TX',
+        'match_badge': 'Excellent Match' if i % 3 else 'Possible Fit',
+        'fair_chance': bool(i % 2),
+        'career_pathway': 'dock_to_driver' if i % 5 == 0 else '',
+        'salary': '$1,200 - $1,500 per week',
+        'description': 'Home daily route with company-provided equipment. No experience required; '
+                       'paid training and full benefits from day one. ' * 4,
+        'tracked_url': f'https://freeworldjobs.short.gy/{i}',
+        'route_type': 'Local',
+    } for i in range(count)]
+
+
+def legacy_fragment(jobs):
+    """Fragment as built before the partial templates: regexes over the full document."""
+    html = render_jobs_html(jobs, dict(AGENT_PARAMS))
+    style_match = re.search(r"<style>(.*?)</style>", html, flags=re.DOTALL | re.IGNORECASE)
+    css_content = style_match.group(1).strip() if style_match else ""
+    script_matches = re.findall(r"<script[^>]*>(.*?)</script>", html, flags=re.DOTALL | re.IGNORECASE)
+    js_content = "\n".join(match.strip() for match in script_matches if match.strip())
+    body_match = re.search(r"<body[^>]*>(.*)</body>", html, flags=re.DOTALL | re.IGNORECASE)
+    body_content = body_match.group(1).strip() if body_match else html
+    body_content = f"<!-- DEBUG_JOBS_DATA: {jobs} -->\n{body_content}"
+    result = f"<style>{css_content}</style>"
+    if js_content:
+        result += f"\n<script>{js_content}</script>"
+    return result + body_content
+
+
+def _median_ms(fn, repeat: int, before=None) -> float:
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='25,100,500')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'jobs':>5} {'cold ms':>9} {'warm ms':>9} {'frag ms':>9} {'legacy ms':>10} "
+          f"{'full KB':>9} {'frag KB':>9} {'legacy KB':>10}")
+    for size in [int(s) for s in args.sizes.split(',') if s.strip()]:
+        jobs = _jobs(size)
+        cold = _median_ms(lambda: render_jobs_html(jobs, dict(AGENT_PARAMS)), args.repeat, before=clear_render_caches)
+        render_jobs_html(jobs, dict(AGENT_PARAMS))  # populate caches
+        warm = _median_ms(lambda: render_jobs_html(jobs, dict(AGENT_PARAMS)), args.repeat)
+        frag = _median_ms(lambda: render_jobs_html(jobs, dict(AGENT_PARAMS), fragment=True, debug_payload=False), args.repeat)
+        legacy = _median_ms(lambda: legacy_fragment(jobs), args.repeat)
+
+        full_kb = len(render_jobs_html(jobs, dict(AGENT_PARAMS)).encode('utf-8')) / 1024
+        frag_kb = len(render_jobs_html(jobs, dict(AGENT_PARAMS), fragment=True, debug_payload=False).encode('utf-8')) / 1024
+        legacy_kb = len(legacy_fragment(jobs).encode('utf-8')) / 1024
+        print(f"{size:>5} {cold:>9.1f} {warm:>9.1f} {frag:>9.1f} {legacy:>10.1f} "
+              f"{full_kb:>9.0f} {frag_kb:>9.0f} {legacy_kb:>10.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark route classification: per-row RouteClassifier vs CompiledRouteClassifier.
+
+Usage:
+  python tools/benchmark_route_classifier.py [--repeat 10]
+
+Loads title/description/company from the *_02_normalization.parquet checkpoints,
+repeats them --repeat times, and times classify_route_type row by row against one
+classify_series pass. Runs twice: as stored (postings repeat across searches) and
+with every description made unique, so the deduplication doesn't flatter the
+vectorized path. Labels must be identical.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from route_classifier import CompiledRouteClassifier, RouteClassifier
+
+PARQUET_DIR = os.path.join(ROOT, 'FreeWorld_Jobs', 'parquet')
+COLUMNS = ['norm.title', 'norm.description', 'norm.company']
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(PARQUET_DIR, '*_02_normalization.parquet')))
+    if not paths:
+        print(f"❌ No normalization checkpoints in {PARQUET_DIR}")
+        return 1
+    base = pd.concat([pd.read_parquet(p, columns=COLUMNS) for p in paths], ignore_index=True)
+    print(f"{len(base)} checkpointed jobs ({base['norm.description'].nunique()} unique descriptions), "
+          f"x{args.repeat}\n")
+
+    legacy, compiled = RouteClassifier(), CompiledRouteClassifier()
+    unique = [base.assign(**{'norm.description': base['norm.description'].astype(str) + f' #{i}'})
+              for i in range(args.repeat)]
+    ok = True
+    for label, df in [('as stored', pd.concat([base] * args.repeat, ignore_index=True)),
+                      ('unique descriptions', pd.concat(unique, ignore_index=True))]:
+        t0 = time.perf_counter()
+        expected = [legacy.classify_route_type(t, d, c) for t, d, c in df[COLUMNS].itertuples(index=False)]
+        row_wise = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        result = compiled.classify_series(df['norm.title'], df['norm.description'], df['norm.company'])
+        vectorized = time.perf_counter() - t0
+        same = result['route_type'].tolist() == expected
+        ok &= same
+        print(f"{label:<20} {len(df):>7} rows  row-wise {row_wise:6.2f}s ({len(df) / row_wise:8.0f} rows/s)  "
+              f"compiled {vectorized:6.2f}s ({len(df) / vectorized:8.0f} rows/s)  "
+              f"x{row_wise / vectorized:.1f}  {'✅ same labels' if same else '❌ LABELS DIFFER'}")
+
+    print("\nRules (as stored):")
+    rules = compiled.classify_series(base['norm.title'], base['norm.description'], base['norm.company'])
+    for rule, count in rules['route_rule'].value_counts().items():
+        print(f"  {rule:<24} {count}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
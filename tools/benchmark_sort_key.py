@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark job priority sorting: row-wise get_unified_sort_priority vs the vectorized sort key.
+
+Usage:
+  python tools/benchmark_sort_key.py [--rows 200000]
+
+Takes ai.route_type / ai.match / ai.fair_chance (and sys.created_at) from the
+*_99_complete.parquet checkpoints, tiles them to --rows rows, and times:
+
+  unified      apply(get_unified_sort_priority) + sort_values, as the PDF
+               generators and portal sorted, vs apply_unified_sorting
+  memory       the memory-only search's quality tier + newest first, vs
+               unified_sort_order(by_route=False, newest_first=...)
+
+The row-wise baselines sort stably so both sides must produce the same order.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from job_sorting_utils import apply_unified_sorting, get_unified_sort_priority, unified_sort_order
+
+PARQUET_DIR = os.path.join(ROOT, 'FreeWorld_Jobs', 'parquet')
+COLUMNS = ['id.job', 'ai.route_type', 'ai.match', 'ai.fair_chance', 'sys.created_at']
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def report(label: str, rows: int, row_wise: float, vectorized: float, same: bool) -> None:
+    print(f"  {label:<8} {rows:>8} rows  row-wise {row_wise:7.3f}s ({rows / row_wise:9.0f} rows/s)  "
+          f"vectorized {vectorized:7.3f}s ({rows / vectorized:10.0f} rows/s)  x{row_wise / vectorized:6.1f}  "
+          f"{'✅ same order' if same else '❌ ORDER DIFFERS'}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(PARQUET_DIR, '*_99_complete.parquet')))
+    if not paths:
+        print(f"❌ No completed-run checkpoints in {PARQUET_DIR}")
+        return 1
+    base = pd.concat([pd.read_parquet(p, columns=COLUMNS) for p in paths], ignore_index=True)
+    df = pd.concat([base] * (args.rows // len(base) + 1), ignore_index=True).head(args.rows)
+    print(f"{len(base)} checkpointed rows tiled to {len(df)}\n")
+
+    def legacy_unified():
+        out = df.copy()
+        out['_sort_priority'] = out.apply(get_unified_sort_priority, axis=1)
+        return out.sort_values('_sort_priority', kind='stable').drop('_sort_priority', axis=1).reset_index(drop=True)
+
+    def legacy_memory():
+        out = df.copy()
+        out['_priority'] = out.apply(get_unified_sort_priority, axis=1) % 10
+        return out.sort_values(by=['_priority', 'sys.created_at'], ascending=[True, False], kind='stable')
+
+    expected, row_wise = timed(legacy_unified)
+    result, vectorized = timed(lambda: apply_unified_sorting(df))
+    same_unified = result['id.job'].tolist() == expected['id.job'].tolist()
+    report('unified', len(df), row_wise, vectorized, same_unified)
+
+    expected, row_wise = timed(legacy_memory)
+    result, vectorized = timed(lambda: df.iloc[unified_sort_order(df, by_route=False, newest_first='sys.created_at')])
+    same_memory = result.index.tolist() == expected.index.tolist()
+    report('memory', len(df), row_wise, vectorized, same_memory)
+    return 0 if same_unified and same_memory else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Build market_geo_cities.csv, the offline coordinate table behind MarketGeoIndex.
+
+Usage:
+  pip install zipcodes        # build-time only; the app reads the CSV
+  python tools/build_market_geo_table.py [--out market_geo_cities.csv]
+
+For every city in MarketMapper.market_lookup, finds the US ZIP codes whose
+primary or acceptable city name matches (after normalize_location) in the same
+state and writes the median latitude/longitude of those ZIPs. Cities with no
+match are listed and left out; they still map to markets.
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_geo_index import MARKET_GEO_TABLE, normalize_location
+from market_mapper import MarketMapper
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--out', default=MARKET_GEO_TABLE)
+    args = parser.parse_args()
+
+    try:
+        import zipcodes
+    except ImportError:
+        print("❌ zipcodes is not installed (pip install zipcodes)")
+        return 1
+
+    points = {}
+    for z in zipcodes.list_all():
+        try:
+            lat, lon = float(z['lat']), float(z['long'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not lat or not lon:  # Unique/PO box ZIPs carry 0,0 placeholders
+            continue
+        # Primary names first: they win over "acceptable" alternates
+        for rank, name in enumerate([z['city']] + list(z.get('acceptable_cities') or [])):
+            key = normalize_location(f"{name}, {z['state']}")
+            points.setdefault(key, {}).setdefault(min(rank, 1), []).append((lat, lon))
+
+    rows, missing = {}, []
+    for raw_key in MarketMapper().market_lookup:
+        key = normalize_location(raw_key)
+        if key in rows:
+            continue
+        ranked = points.get(key)
+        if not ranked:
+            missing.append(raw_key)
+            continue
+        coords = ranked.get(0) or ranked[1]
+        rows[key] = (round(statistics.median(c[0] for c in coords), 4),
+                     round(statistics.median(c[1] for c in coords), 4))
+
+    with open(args.out, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['city', 'lat', 'lon'])
+        for key in sorted(rows):
+            writer.writerow([key, *rows[key]])
+
+    print(f"✅ Wrote {len(rows)} cities to {args.out}")
+    if missing:
+        print(f"⚠️ {len(missing)} mapped cities have no coordinates: {', '.join(sorted(missing))}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Check the paginated click-event reader and rollups against a local stub.
+
+Usage:
+  python tools/check_click_analytics.py [--rows 60000] [--max-rows 1000]
+
+Seeds a MockPostgrestServer (capped at --max-rows per response, like Supabase)
+with synthetic click_events, including bursts that share a clicked_at
+timestamp across page boundaries, then compares:
+  - the previous single-select fetch (truncated by the cap)
+  - iter_click_events / fetch_click_rollups, unfiltered and with coach,
+    agent and market filters
+against rollups computed directly from the seeded rows with pandas.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import supabase_utils
+from mock_postgrest_server import MockPostgrestServer
+
+COACHES = ['james', 'maria', 'tamara', 'admin']
+MARKETS = ['Houston', 'Dallas', 'Bay Area', 'Phoenix', None]
+
+
+def _seed(num_rows: int, end: datetime):
+    rng = random.Random(7)
+    rows = []
+    ts = end - timedelta(seconds=5)
+    while len(rows) < num_rows:
+        ts -= timedelta(seconds=rng.randint(1, 40), microseconds=rng.randint(0, 999999))
+        # Occasional bursts of identical timestamps (bulk inserts / replays)
+        for _ in range(rng.choice([1] * 20 + [3, 40, 1500])):
+            agent = rng.randint(0, 399)
+            rows.append({
+                'clicked_at': ts.isoformat(),
+                'coach': COACHES[agent % len(COACHES)],
+                'market': MARKETS[agent % len(MARKETS)],
+                'route': rng.choice(['Local', 'OTR']),
+                'match': rng.choice(['good', 'so-so']),
+                'fair': 'fair_chance_employer',
+                'candidate_id': f'agent-{agent:04d}',
+                'candidate_name': f'Agent {agent}',
+                'short_id': f's{len(rows):07d}',
+                'original_url': f'https://www.indeed.com/viewjob?jk={rng.randint(0, 2999):06x}',
+                'job_title': 'CDL-A Driver',
+                'company': f'Carrier {rng.randint(0, 60)}',
+            })
+    return rows[:num_rows]
+
+
+def _expected(rows, start, end, coach=None, candidate_ids=None, market=None):
+    df = pd.DataFrame(rows)
+    df['ts'] = pd.to_datetime(df['clicked_at'], format='ISO8601', utc=True)
+    df = df[(df['ts'] >= start) & (df['ts'] <= end)]
+    if coach:
+        df = df[df['coach'] == coach]
+    if candidate_ids is not None:
+        df = df[df['candidate_id'].isin(candidate_ids)]
+    if market:
+        df = df[df['market'] == market]
+    return df
+
+
+def _compare(label, got, expected) -> bool:
+    checks = {
+        'total': got['totals']['total_clicks'] == len(expected),
+        'unique clicks': got['totals']['unique_clicks'] == expected['short_id'].nunique(),
+        'unique agents': got['totals']['unique_agents'] == expected['candidate_id'].nunique(),
+        'unique jobs': got['totals']['unique_jobs'] == expected['original_url'].nunique(),
+        'daily': dict(zip(got['daily']['date'], got['daily']['clicks']))
+                 == expected.groupby(expected['ts'].dt.date).size().to_dict(),
+        'markets': dict(zip(got['markets']['market'], got['markets']['clicks']))
+                   == expected['market'].fillna('Unknown').value_counts().to_dict(),
+        'agents': dict(zip(got['agents']['candidate_id'], zip(got['agents']['total_clicks'], got['agents']['unique_jobs_clicked'])))
+                  == {k: (len(g), g['original_url'].nunique()) for k, g in expected.groupby('candidate_id')},
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    print(f"{'✅' if not failed else '❌'} {label:<28} {len(expected):>7} rows"
+          f"{'' if not failed else '  mismatched: ' + ', '.join(failed)}")
+    return not failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=60000)
+    parser.add_argument('--max-rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    end = datetime.now(timezone.utc)
+    rows = _seed(args.rows, end)
+    start = pd.Timestamp(rows[-1]['clicked_at']).to_pydatetime() - timedelta(seconds=1)
+
+    with MockPostgrestServer({'click_events': rows}, max_rows=args.max_rows) as server:
+        client = server.client()
+        supabase_utils.get_client = lambda: client
+
+        legacy = (client.table('click_events').select(supabase_utils.CLICK_EVENT_COLUMNS)
+                  .gte('clicked_at', start.isoformat()).lte('clicked_at', end.isoformat())
+                  .order('clicked_at', desc=True).execute().data or [])
+        print(f"⚠️  single select (previous fetch_click_events): {len(legacy)} of {len(rows)} rows")
+
+        ok = True
+        agents = [f'agent-{i:04d}' for i in range(0, 400, 9)]
+        cases = [
+            ('all clicks', {}),
+            ('coach=maria', {'coach_username': 'maria'}),
+            ('market=Dallas', {'market': 'Dallas'}),
+            (f'{len(agents)} agents', {'candidate_ids': agents}),
+        ]
+        for label, filters in cases:
+            server.reset_stats()
+            t0 = time.perf_counter()
+            got = supabase_utils.fetch_click_rollups(start, end, **filters)
+            elapsed = time.perf_counter() - t0
+            expected = _expected(rows, pd.Timestamp(start), pd.Timestamp(end),
+                                 coach=filters.get('coach_username'),
+                                 candidate_ids=filters.get('candidate_ids'),
+                                 market=filters.get('market'))
+            ok &= _compare(label, got, expected)
+            print(f"   {server.request_count} requests, {server.bytes_sent / 1024:.0f}KB, {elapsed:.1f}s")
+
+        df = supabase_utils.fetch_click_events(start, end, coach_username='james')
+        expected = _expected(rows, pd.Timestamp(start), pd.Timestamp(end), coach='james')
+        same_rows = sorted(df['short_id']) == sorted(expected['short_id'])
+        newest_first = df['timestamp'].is_monotonic_decreasing
+        print(f"{'✅' if same_rows and newest_first else '❌'} fetch_click_events(coach=james)  "
+              f"{len(df)} rows, newest first: {newest_first}")
+        ok &= same_rows and newest_first
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
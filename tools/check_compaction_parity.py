@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Check that description compaction saves tokens without changing classifier verdicts.
+
+Usage:
+  python tools/check_compaction_parity.py [--max-tokens 600] [--mock] [--live] [--limit 100]
+
+Offline: loads the jobs in the *_99_complete.parquet checkpoints, builds the
+classifier input as pipeline stage 6 does (norm.description, else
+source.description_raw), and reports description tokens before and after
+compaction plus how often background / record, CDL, endorsement, route and
+experience phrases survive it.
+
+--mock runs JobClassifier over the jobs against a MockOpenAIServer (keyword
+verdicts) with compaction off and on, and checks the verdicts are identical.
+
+--live (needs OPENAI_API_KEY) re-classifies up to --limit jobs that have a
+stored verdict, with compaction off and on, and reports how often each run
+agrees with the stored ai.match / ai.fair_chance / ai.endorsements /
+ai.route_type. The compaction-off run is the baseline: the model is not fully
+deterministic, so compacted agreement should be compared with it rather than
+with 100%.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from description_compactor import compact_jobs
+from packed_classification import estimate_tokens, format_job
+
+PARQUET_DIR = os.path.join(ROOT, 'FreeWorld_Jobs', 'parquet')
+VERDICT_FIELDS = ['match', 'fair_chance', 'endorsements', 'route_type']
+KEY_PHRASES = ['criminal record', 'felon', 'fair chance', 'second chance', 'background check', 'no experience',
+               'cdl', 'hazmat', 'tanker', 'passenger', 'home daily', 'home weekly', 'otr', 'on the road',
+               'training']
+
+
+def load_jobs() -> tuple:
+    """(classifier inputs, stored ai.* verdicts by job_id) from the completed-run checkpoints"""
+    paths = sorted(glob.glob(os.path.join(PARQUET_DIR, '*_99_complete.parquet')))
+    if not paths:
+        return [], {}
+    df = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True).drop_duplicates('id.job', keep='last')
+    clean = df['norm.description'].fillna('').astype(str)
+    jobs = [{'job_id': job_id, 'job_title': title or '', 'company': company or '', 'location': location or '',
+             'job_description': desc if desc.strip() else raw or ''}
+            for job_id, title, company, location, desc, raw in zip(
+                df['id.job'], df['source.title'], df['source.company'], df['source.location_raw'],
+                clean, df['source.description_raw'])]
+    stored = {}
+    for record in df[['id.job'] + [f'ai.{f}' for f in VERDICT_FIELDS]].to_dict('records'):
+        if record['ai.match'] in ('good', 'so-so', 'bad'):
+            stored[record['id.job']] = {f: record[f'ai.{f}'] for f in VERDICT_FIELDS}
+    return jobs, stored
+
+
+def report_tokens(jobs: list, compacted: list, stats: dict) -> bool:
+    saved = stats['tokens_before'] - stats['tokens_after']
+    print(f"Descriptions: {stats['tokens_before']:,} → {stats['tokens_after']:,} tokens "
+          f"({saved / max(1, stats['tokens_before']) * 100:.1f}% saved, "
+          f"{saved / max(1, len(jobs)):.0f} per job)")
+    request_before = sum(estimate_tokens(format_job(job)) for job in jobs)
+    request_after = sum(estimate_tokens(format_job(job)) for job in compacted)
+    print(f"User messages: {request_before:,} → {request_after:,} tokens")
+
+    ok = True
+    print("\nKey phrases kept (jobs containing the phrase before → after):")
+    for phrase in KEY_PHRASES:
+        pattern = re.compile(r'\b' + re.escape(phrase) + r'\b', re.IGNORECASE)
+        before = sum(1 for job in jobs if pattern.search(job['job_description']))
+        after = sum(1 for job, short in zip(jobs, compacted)
+                    if pattern.search(job['job_description']) and pattern.search(short['job_description']))
+        if before:
+            ok &= after == before
+            print(f"  {'✅' if after == before else '❌'} {phrase:<18} {before:4d} → {after:4d}")
+    return ok
+
+
+def classify(jobs: list, compaction: str) -> dict:
+    import job_classifier
+
+    os.environ['FREEWORLD_DESCRIPTION_COMPACTION'] = compaction
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = job_classifier.JobClassifier().classify_jobs_in_batches(jobs, use_cache=False)
+    return {r['job_id']: r for r in results if isinstance(r, dict)}
+
+
+def run_mock(jobs: list) -> bool:
+    from mock_openai_server import MockOpenAIServer
+    import job_classifier
+
+    os.environ.setdefault('OPENAI_API_KEY', 'mock')
+    job_classifier.get_classifier_runtime = lambda: None
+    verdicts = {}
+    for mode in ('off', 'on'):
+        with MockOpenAIServer() as server:
+            os.environ['OPENAI_BASE_URL'] = server.base_url
+            t0 = time.perf_counter()
+            results = classify(jobs, mode)
+            sent = sum(estimate_tokens(p['messages'][1]['content']) for p in server.requests)
+            verdicts[mode] = {job_id: tuple(r.get(f) for f in VERDICT_FIELDS + ['training_provided'])
+                              for job_id, r in results.items()}
+            print(f"  compaction={mode:<4} {server.request_count:5d} requests  {sent:9,d} user-message tokens  "
+                  f"{time.perf_counter() - t0:6.2f}s")
+    differ = [job_id for job_id in verdicts['off'] if verdicts['off'][job_id] != verdicts['on'].get(job_id)]
+    print(f"  {'✅ identical verdicts' if not differ else f'❌ {len(differ)} VERDICTS DIFFER: {differ[:5]}'}")
+    return not differ
+
+
+def run_live(jobs: list, stored: dict, limit: int) -> bool:
+    if not os.getenv('OPENAI_API_KEY'):
+        print("❌ --live needs OPENAI_API_KEY")
+        return False
+    jobs = [job for job in jobs if job['job_id'] in stored][:limit]
+    runs = {mode: classify(jobs, mode) for mode in ('off', 'on')}
+    print(f"  {len(jobs)} jobs with stored verdicts; agreement with stored ai.* fields:")
+    for field in VERDICT_FIELDS:
+        line = f"  {field:<14}"
+        for mode, results in runs.items():
+            agree = sum(1 for job in jobs if results.get(job['job_id'], {}).get(field) == stored[job['job_id']][field])
+            line += f"  compaction={mode}: {agree / max(1, len(jobs)) * 100:5.1f}%"
+        both = sum(1 for job in jobs
+                   if runs['off'].get(job['job_id'], {}).get(field) == runs['on'].get(job['job_id'], {}).get(field))
+        print(f"{line}  off vs on: {both / max(1, len(jobs)) * 100:5.1f}%")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--max-tokens', type=int, default=None)
+    parser.add_argument('--mock', action='store_true')
+    parser.add_argument('--live', action='store_true')
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+    if args.max_tokens:
+        os.environ['FREEWORLD_DESCRIPTION_MAX_TOKENS'] = str(args.max_tokens)
+
+    jobs, stored = load_jobs()
+    if not jobs:
+        print(f"❌ No completed-run checkpoints in {PARQUET_DIR}")
+        return 1
+    print(f"{len(jobs)} unique checkpointed jobs, {len(stored)} with stored verdicts\n")
+    compacted, stats = compact_jobs(jobs, args.max_tokens)
+    ok = report_tokens(jobs, compacted, stats)
+
+    if args.mock:
+        print("\nMock run (JobClassifier):")
+        ok &= run_mock(jobs)
+    if args.live:
+        print("\nLive run (JobClassifier):")
+        ok &= run_live(jobs, stored, args.limit)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
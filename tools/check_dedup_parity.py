@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Check that dedup_engine.deduplicate_jobs makes the same keep/drop decisions as
+the previous groupby-loop stage 4.
+
+Usage:
+  python tools/check_dedup_parity.py [parquet_dir]
+
+Runs both implementations on every *_03_business_rules.parquet checkpoint and
+on the union of all of them (which adds cross-run exact, R1/R2 and URL
+duplicates), then compares the surviving job ids, per-rule counts and
+route.final_status of every row.
+"""
+
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from checkpoint_store import iter_stage_checkpoints
+from dedup_engine import deduplicate_jobs, extract_clean_url
+
+
+def legacy_deduplicate(df: pd.DataFrame, filter_settings=None):
+    """Groupby-loop stage 4 as it was before dedup_engine (reference only)"""
+    if filter_settings is None:
+        filter_settings = {'r1_dedup': True, 'r2_dedup': True}
+    initial_count = len(df)
+    df = df.copy()
+    df.loc[:, 'clean_apply_url'] = df.apply(lambda x: extract_clean_url(x.get('source.url', '')), axis=1)
+    df = df.drop_duplicates(subset=['id.job'], keep='last')
+    stats = {'exact': initial_count - len(df), 'r1': 0, 'r2': 0, 'url': 0}
+
+    if filter_settings.get('r1_dedup', True):
+        for _, group_df in df.groupby('rules.duplicate_r1'):
+            if len(group_df) > 1:
+                dupe_indices = group_df.index[1:]
+                df.loc[dupe_indices, 'route.final_status'] = 'filtered: R1 collapse (company+title+market)'
+                df.loc[dupe_indices, 'route.filtered'] = True
+                df.loc[dupe_indices, 'route.ready_for_ai'] = False
+                stats['r1'] += len(dupe_indices)
+
+    if filter_settings.get('r2_dedup', True):
+        for _, group_df in df.groupby('rules.duplicate_r2'):
+            if len(group_df) > 1:
+                unfiltered = group_df[group_df['route.filtered'] != True]
+                if len(unfiltered) > 1:
+                    dupe_indices = unfiltered.index[1:]
+                    df.loc[dupe_indices, 'route.final_status'] = 'filtered: R2 collapse (company+market)'
+                    df.loc[dupe_indices, 'route.filtered'] = True
+                    df.loc[dupe_indices, 'route.ready_for_ai'] = False
+                    stats['r2'] += len(dupe_indices)
+
+    if filter_settings.get('url_dedup', True):
+        df.loc[:, 'clean_apply_url'] = df.apply(lambda x: extract_clean_url(x.get('source.url', '')), axis=1)
+        url_groups = df[df['clean_apply_url'] != ''].groupby(['clean_apply_url', 'meta.market'])
+        for _, group_df in url_groups:
+            if len(group_df) > 1:
+                unfiltered = group_df[group_df['route.filtered'] != True]
+                if len(unfiltered) > 1:
+                    sorted_df = unfiltered.sort_values(['id.source'], key=lambda x: x.map({'indeed': 0, 'google': 1}))
+                    dupe_indices = sorted_df.index[1:]
+                    df.loc[dupe_indices, 'route.final_status'] = 'filtered: URL duplicate (same job posting)'
+                    df.loc[dupe_indices, 'route.filtered'] = True
+                    df.loc[dupe_indices, 'route.ready_for_ai'] = False
+                    stats['url'] += len(dupe_indices)
+
+    return df, df[df.get('route.filtered', False) != True], stats
+
+
+def check(name: str, df: pd.DataFrame) -> bool:
+    df = df.reset_index(drop=True)
+    with redirect_stdout(StringIO()):
+        start = time.perf_counter()
+        marked, legacy_clean, legacy_stats = legacy_deduplicate(df)
+        t_legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        fast_clean, fast_stats = deduplicate_jobs(df)
+        t_fast = time.perf_counter() - start
+
+    problems = []
+    if list(legacy_clean.index) != list(fast_clean.index):
+        problems.append(f"kept rows differ ({len(legacy_clean)} vs {len(fast_clean)})")
+    for rule in ('exact', 'r1', 'r2', 'url'):
+        if legacy_stats[rule] != fast_stats[rule]:
+            problems.append(f"{rule}: {legacy_stats[rule]} vs {fast_stats[rule]}")
+    if not legacy_clean['clean_apply_url'].equals(fast_clean['clean_apply_url']):
+        problems.append("clean_apply_url differs")
+    if not legacy_clean['route.final_status'].astype(str).equals(fast_clean['route.final_status'].astype(str)):
+        problems.append("route.final_status differs on kept rows")
+
+    status = "✅" if not problems else "❌"
+    print(f"{status} {name}: {len(df)} rows -> {len(fast_clean)} kept "
+          f"(exact {fast_stats['exact']}, r1 {fast_stats['r1']}, r2 {fast_stats['r2']}, url {fast_stats['url']}) "
+          f"loop {t_legacy * 1000:.1f}ms vs engine {t_fast * 1000:.1f}ms")
+    for problem in problems:
+        print(f"    {problem}")
+    return not problems
+
+
+def main():
+    parquet_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'FreeWorld_Jobs', 'parquet')
+    frames = [(n, f) for n, f in iter_stage_checkpoints(parquet_dir, '03_business_rules') if len(f) > 0]
+    if not frames:
+        print(f"No non-empty stage 3 checkpoints found in {parquet_dir}")
+        sys.exit(1)
+
+    results = [check(name, frame) for name, frame in frames]
+    results.append(check('ALL CHECKPOINTS', pd.concat([f for _, f in frames], ignore_index=True)))
+    print(f"\n{sum(results)}/{len(results)} at parity")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == '__main__':
+    main()
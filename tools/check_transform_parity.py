@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Check that the vectorized stage 2-3 transforms match the row-wise ones.
+
+Usage:
+  python tools/check_transform_parity.py [parquet_dir] [--scale N]
+
+For every pipeline checkpoint in parquet_dir (default FreeWorld_Jobs/parquet):
+  - *_01_ingestion.parquet      -> transform_normalize vs transform_normalize_vectorized
+  - *_03_business_rules.parquet -> transform_business_rules vs transform_business_rules_vectorized
+
+Compared columns must be identical (exact values and dtypes). --scale N repeats
+each checkpoint N times to time both engines on larger frames.
+"""
+
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import List
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from canonical_transforms import transform_normalize, transform_business_rules
+from checkpoint_store import iter_stage_checkpoints
+from vectorized_transforms import transform_normalize_vectorized, transform_business_rules_vectorized
+
+NORMALIZE_COLUMNS = [
+    'norm.title', 'norm.company', 'norm.description', 'norm.city', 'norm.state',
+    'norm.location', 'norm.salary_display', 'norm.salary_min', 'norm.salary_max',
+    'norm.salary_unit', 'norm.salary_currency',
+]
+RULES_COLUMNS = [
+    'rules.is_owner_op', 'rules.is_school_bus', 'rules.has_experience_req',
+    'rules.experience_years_min', 'rules.is_spam_source', 'rules.duplicate_r1',
+    'rules.duplicate_r2', 'route.ready_for_ai',
+]
+
+
+def _quiet(fn, *args, **kwargs):
+    """Run a transform with its debug prints suppressed, returning (result, seconds)"""
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def compare_columns(legacy: pd.DataFrame, fast: pd.DataFrame, columns: List[str]) -> List[str]:
+    """Return a list of human-readable mismatches (empty list means parity)"""
+    problems = []
+    for col in columns:
+        try:
+            pd.testing.assert_series_equal(legacy[col], fast[col], check_exact=True, check_names=True)
+        except AssertionError as e:
+            first_line = str(e).strip().splitlines()[0]
+            problems.append(f"{col}: {first_line}")
+    return problems
+
+
+def check_file(name: str, df: pd.DataFrame, scale: int = 1) -> bool:
+    if len(df) == 0:
+        print(f"⏭️  {name}: empty checkpoint")
+        return True
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+
+    if '_01_ingestion' in name:
+        legacy, t_legacy = _quiet(transform_normalize, df)
+        fast, t_fast = _quiet(transform_normalize_vectorized, df)
+        columns = NORMALIZE_COLUMNS
+    else:
+        legacy, t_legacy = _quiet(transform_business_rules, df, filter_settings={})
+        fast, t_fast = _quiet(transform_business_rules_vectorized, df, filter_settings={})
+        columns = RULES_COLUMNS
+
+    problems = compare_columns(legacy, fast, columns)
+    speedup = t_legacy / t_fast if t_fast > 0 else float('inf')
+    status = "✅" if not problems else "❌"
+    print(f"{status} {name}: {len(df)} rows, "
+          f"row-wise {t_legacy * 1000:.1f}ms vs vectorized {t_fast * 1000:.1f}ms ({speedup:.1f}x)")
+    for problem in problems:
+        print(f"    {problem}")
+    return not problems
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    scale = 1
+    if '--scale' in sys.argv:
+        scale = int(sys.argv[sys.argv.index('--scale') + 1])
+        args = [a for a in args if a != str(scale)]
+    parquet_dir = args[0] if args else os.path.join(ROOT, 'FreeWorld_Jobs', 'parquet')
+
+    frames = sorted(
+        iter_stage_checkpoints(parquet_dir, '01_ingestion') +
+        iter_stage_checkpoints(parquet_dir, '03_business_rules'),
+        key=lambda item: item[0]
+    )
+    if not frames:
+        print(f"No pipeline checkpoints found in {parquet_dir}")
+        sys.exit(1)
+
+    results = [check_file(name, df, scale) for name, df in frames]
+    print(f"\n{sum(results)}/{len(results)} checkpoints at parity")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == '__main__':
+    main()
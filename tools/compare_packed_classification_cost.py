@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compare LLM classification token use and cost: one job per request vs packed requests.
+
+Usage:
+  python tools/compare_packed_classification_cost.py [--budgets 8000 16000 32000] [--max-jobs 10]
+                                                     [--requeue 0.02] [--mock]
+
+Offline: builds the classifier inputs from the *_02_normalization.parquet
+checkpoints exactly as pipeline stage 6 does, then counts prompt and
+completion tokens for both classifiers' system prompts (tiktoken when
+installed, else characters/4) and prices them at gpt-4o-mini rates, with and
+without OpenAI's prompt cache discount on the repeated system prompt.
+--requeue is the share of packed jobs assumed to come back malformed and
+cost a single request on top.
+
+--mock also runs JobClassifier over the jobs against a MockOpenAIServer in
+both modes and checks the verdicts match and how many requests were sent.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from job_classifier import JobClassifier
+from packed_classification import (MESSAGE_OVERHEAD_TOKENS, OUTPUT_TOKENS_PER_JOB, PACKED_INSTRUCTIONS,
+                                   estimate_tokens, format_job, plan_packs, request_cost)
+from pathway_classifier import PathwayClassifier
+
+PARQUET_DIR = os.path.join(ROOT, 'FreeWorld_Jobs', 'parquet')
+
+
+def load_jobs() -> list:
+    """Classifier inputs (norm.description preferred, as in pipeline stage 6)"""
+    paths = sorted(glob.glob(os.path.join(PARQUET_DIR, '*_02_normalization.parquet')))
+    df = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True).drop_duplicates('id.job')
+    clean = df['norm.description'].fillna('').astype(str)
+    return [{'job_id': job_id, 'job_title': title or '', 'company': company or '', 'location': location or '',
+             'job_description': desc if desc.strip() else raw or ''}
+            for job_id, title, company, location, desc, raw in zip(
+                df['id.job'], df['source.title'], df['source.company'], df['source.location_raw'],
+                clean, df['source.description_raw'])]
+
+
+def single_mode(system_prompt: str, job_tokens: list) -> dict:
+    prompt = estimate_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+    return {'requests': len(job_tokens), 'prompt': prompt * len(job_tokens) + sum(job_tokens),
+            'cacheable': prompt * len(job_tokens), 'completion': OUTPUT_TOKENS_PER_JOB * len(job_tokens)}
+
+
+def packed_mode(system_prompt: str, job_tokens: list, budget: int, max_jobs: int, requeue: float) -> dict:
+    prompt = estimate_tokens(system_prompt + PACKED_INSTRUCTIONS) + MESSAGE_OVERHEAD_TOKENS
+    packs = plan_packs(job_tokens, prompt, budget, max_jobs)
+    stats = {'requests': len(packs), 'prompt': prompt * len(packs) + sum(job_tokens) + 8 * len(job_tokens),
+             'cacheable': prompt * len(packs), 'completion': OUTPUT_TOKENS_PER_JOB * len(job_tokens)}
+    # Malformed items get a single request on top
+    extra = single_mode(system_prompt, job_tokens[:int(len(job_tokens) * requeue)])
+    return {key: stats[key] + extra[key] for key in stats}
+
+
+def report(label: str, stats: dict, baseline: dict = None) -> None:
+    cost = request_cost(stats['prompt'], stats['completion'])
+    cached = request_cost(stats['prompt'], stats['completion'], cached_tokens=stats['cacheable'])
+    line = (f"  {label:<24} {stats['requests']:6d} requests  {stats['prompt'] / 1e6:7.2f}M prompt  "
+            f"{stats['completion'] / 1e6:5.2f}M completion  ${cost:7.3f}  (${cached:7.3f} with prompt cache)")
+    if baseline:
+        base = request_cost(baseline['prompt'], baseline['completion'])
+        line += f"  -{(1 - cost / base) * 100:.0f}%"
+    print(line)
+
+
+def run_mock(jobs: list) -> bool:
+    from mock_openai_server import MockOpenAIServer
+    import job_classifier
+
+    os.environ.setdefault('OPENAI_API_KEY', 'mock')
+    job_classifier.get_classifier_runtime = lambda: None
+    verdicts, ok = {}, True
+    for mode in ('off', 'on'):
+        os.environ['FREEWORLD_PACKED_CLASSIFICATION'] = mode
+        with MockOpenAIServer() as server:
+            os.environ['OPENAI_BASE_URL'] = server.base_url
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = JobClassifier().classify_jobs_in_batches(jobs, use_cache=False)
+            verdicts[mode] = [(r['job_id'], r['match'], r['fair_chance']) for r in results]
+            print(f"  packed={mode:<4} {server.request_count:6d} requests  {time.perf_counter() - t0:6.2f}s")
+    same = verdicts['off'] == verdicts['on']
+    print(f"  {'✅ identical verdicts' if same else '❌ VERDICTS DIFFER'}")
+    return same and ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--budgets', type=int, nargs='+', default=[8000, 16000, 32000])
+    parser.add_argument('--max-jobs', type=int, default=10)
+    parser.add_argument('--requeue', type=float, default=0.02)
+    parser.add_argument('--mock', action='store_true')
+    args = parser.parse_args()
+
+    jobs = load_jobs()
+    if not jobs:
+        print(f"❌ No normalization checkpoints in {PARQUET_DIR}")
+        return 1
+    job_tokens = [estimate_tokens(format_job(job)) for job in jobs]
+    print(f"{len(jobs)} unique checkpointed jobs, {sum(job_tokens) / len(jobs):.0f} tokens each on average\n")
+
+    for name, prompt in [('CDL (JobClassifier)', JobClassifier.SYSTEM_PROMPT),
+                         ('Pathway (PathwayClassifier)', PathwayClassifier.SYSTEM_PROMPT)]:
+        print(f"{name}: system prompt {estimate_tokens(prompt)} tokens")
+        single = single_mode(prompt, job_tokens)
+        report('one job per request', single)
+        for budget in args.budgets:
+            report(f'packed, {budget} budget', packed_mode(prompt, job_tokens, budget, args.max_jobs, args.requeue),
+                   single)
+        print()
+
+    if args.mock:
+        print("Mock run (JobClassifier):")
+        return 0 if run_mock(jobs) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Vectorized Canonical Transforms for FreeWorld Job Scraper
+Column-at-a-time versions of the stage 2 (normalize) and stage 3 (business rules)
+transforms in canonical_transforms.py.
+
+Output contract: the norm.*, rules.* and route.ready_for_ai columns are identical
+(values and dtypes) to transform_normalize / transform_business_rules. Parity is
+checked by tools/check_transform_parity.py against the Parquet checkpoints.
+"""
+
+import hashlib
+import re
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from canonical_transforms import _parse_salary
+
+# ==============================================================================
+# PRECOMPILED PATTERNS
+# ==============================================================================
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_STATE_RE = re.compile(r'^([A-Z]{2})')
+
+
+def _alternation(terms) -> re.Pattern:
+    """Compile a list of literal phrases into one alternation regex"""
+    return re.compile('|'.join(re.escape(t) for t in terms))
+
+
+# Owner-operator detection (mirrors detect_owner_operator). Titles are short, so
+# they use one combined regex; descriptions are long and use literal scans below.
+_OWNER_OP_DRIVER_TITLE_RE = _alternation(['drivers', 'driver', 'cdl', 'company driver'])
+_OWNER_OP_MIXED_TITLE_RE = _alternation(['owner operator', 'owner-operator'])
+_OWNER_OP_TITLE_RE = _alternation(['owner operator', 'owner-operator', 'fleet owner'])
+_OWN_EQUIPMENT_TERMS = [
+    'must own truck', 'must own tractor', 'must own trailer',
+    'must have truck', 'must have tractor', 'must have trailer',
+    'need own truck', 'need own tractor'
+]
+
+# Spam detection (mirrors detect_spam_source; matched against lowercased text,
+# so 'MLM' never matches - kept for parity with the row-wise version)
+_SPAM_TERMS = [
+    'make money from home', 'work from home opportunity',
+    'no experience necessary - will train', 'easy money',
+    'MLM', 'multi-level marketing', 'pyramid'
+]
+
+_SALARY_FIELDS = ['display', 'min', 'max', 'unit', 'currency']
+
+# ==============================================================================
+# COLUMN HELPERS
+# ==============================================================================
+
+def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+    """Return df[name] as an object Series, or a constant Series if missing"""
+    if name in df.columns:
+        return df[name].astype(object)
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _blank_mask(series: pd.Series) -> pd.Series:
+    """True where the row-wise helpers treat a value as empty (NaN/None/'')"""
+    return series.isna() | (series == '')
+
+
+def _infer(values, index) -> pd.Series:
+    """Build a Series with the same dtype inference as Series.apply/df.apply"""
+    return pd.Series(list(values), index=index)
+
+
+def _truthy_mask(series: pd.Series) -> np.ndarray:
+    """Python truthiness per value (NaN is truthy, pd.NA is treated as falsy)"""
+    return np.fromiter(
+        (v is not pd.NA and bool(v) for v in series.to_numpy(dtype=object)),
+        dtype=bool, count=len(series)
+    )
+
+
+def _contains_any(text: pd.Series, terms) -> pd.Series:
+    """
+    Literal substring search for any of terms.
+
+    On multi-KB descriptions a per-term `in` scan is several times faster than a
+    regex alternation, which has to try every branch at every offset.
+    """
+    found = pd.Series(False, index=text.index)
+    for term in terms:
+        found |= text.str.contains(term, regex=False)
+    return found
+
+
+def _md5_16(keys: pd.Series) -> pd.Series:
+    """First 16 hex chars of md5 for each key, hashing each distinct key once"""
+    codes, uniques = pd.factorize(keys)
+    digests = np.array(
+        [hashlib.md5(key.encode()).hexdigest()[:16] for key in uniques],
+        dtype=object
+    )
+    return pd.Series(digests[codes], index=keys.index, dtype=object)
+
+
+def clean_html_series(series: pd.Series) -> pd.Series:
+    """Vectorized clean_html: strip tags, collapse whitespace, unescape basics"""
+    values = series.astype(object)
+    text = values.where(~_blank_mask(values), '').astype(str)
+
+    # Only rows that can contain a tag pay for the tag regex
+    has_tag = text.str.contains('<', regex=False)
+    if has_tag.any():
+        text = text.copy()
+        text[has_tag] = text[has_tag].str.replace(_HTML_TAG_RE, ' ', regex=True)
+
+    # split()/join collapses whitespace runs exactly like re.sub(r'\s+', ' ')
+    # (both use str.isspace); the leading/trailing space it drops is removed by
+    # the final strip() in the row-wise version anyway
+    return (
+        text.str.split().str.join(' ')
+            .str.replace('&nbsp;', ' ', regex=False)
+            .str.replace('&amp;', '&', regex=False)
+            .str.strip()
+    )
+
+
+def parse_location_series(series: pd.Series) -> Dict[str, pd.Series]:
+    """Vectorized parse_location: returns norm.city / norm.state / norm.location"""
+    values = series.astype(object)
+    location = values.where(~_blank_mask(values), '').astype(str).str.strip()
+    has_comma = location.str.contains(',', regex=False)
+
+    parts = location.str.split(',')
+    city = parts.str[0].str.strip()
+    state_part = parts.str[1].fillna('').str.strip()
+    state = state_part.str.extract(_STATE_RE, expand=False)
+    state = state.fillna(state_part.str[:2].str.upper())
+
+    return {
+        'norm.city': city.where(has_comma, location),
+        'norm.state': state.where(has_comma, ''),
+        'norm.location': (city + ', ' + state).where(has_comma, location),
+    }
+
+
+def parse_salary_series(series: pd.Series) -> Dict[str, pd.Series]:
+    """
+    Salary parsing memoized over distinct values.
+
+    Salary strings repeat heavily across a scrape (the same salarySnippet dict
+    for every posting of a company), so each distinct value is parsed once with
+    the scalar parser and the results are broadcast back by factorize code.
+    """
+    codes, uniques = pd.factorize(series.astype(object))
+    parsed = [_parse_salary(value) for value in uniques]
+    # Missing values get code -1, which picks the trailing "empty" entry
+    parsed.append(_parse_salary(''))
+
+    result = {}
+    for field in _SALARY_FIELDS:
+        lookup = np.empty(len(parsed), dtype=object)
+        lookup[:] = [p[field] for p in parsed]
+        result[f'norm.salary_{field}'] = _infer(lookup[codes], series.index)
+    return result
+
+# ==============================================================================
+# STAGE 2: NORMALIZATION
+# ==============================================================================
+
+def transform_normalize_vectorized(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized equivalent of canonical_transforms.transform_normalize
+
+    Args:
+        df: Canonical DataFrame with source.* fields populated
+
+    Returns:
+        DataFrame with norm.* fields added
+    """
+    if len(df) == 0:
+        return df
+
+    normalized_fields = {}
+
+    # Clean text fields
+    normalized_fields['norm.title'] = clean_html_series(df['source.title'])
+    normalized_fields['norm.company'] = clean_html_series(df['source.company'])
+    normalized_fields['norm.description'] = clean_html_series(df['source.description_raw'])
+
+    # Parse locations and salaries
+    normalized_fields.update(parse_location_series(df['source.location_raw']))
+    salary_fields = parse_salary_series(df['source.salary_raw'])
+    normalized_fields['norm.salary_display'] = salary_fields['norm.salary_display']
+    normalized_fields['norm.salary_min'] = salary_fields['norm.salary_min']
+    normalized_fields['norm.salary_max'] = salary_fields['norm.salary_max']
+    normalized_fields['norm.salary_unit'] = salary_fields['norm.salary_unit']
+    normalized_fields['norm.salary_currency'] = salary_fields['norm.salary_currency']
+
+    # Initialize QA fields during normalization
+    current_date = datetime.now().date().isoformat()
+    normalized_fields['qa.last_validated_at'] = current_date
+    normalized_fields['qa.missing_required_fields'] = False
+    normalized_fields['qa.flags'] = ''
+    normalized_fields['qa.data_quality_score'] = 1.0
+
+    # Update stage and timestamp
+    normalized_fields['route.stage'] = 'normalized'
+    current_time = datetime.now().isoformat()
+    normalized_fields['sys.updated_at'] = current_time
+    normalized_fields['sys.created_at'] = current_time
+
+    print(f"⚡ Vectorized normalization: {len(df)} jobs")
+    return df.assign(**normalized_fields)
+
+# ==============================================================================
+# STAGE 3: BUSINESS RULES
+# ==============================================================================
+
+def _rule_column(df: pd.DataFrame, column: str, detected: pd.Series,
+                 enabled: bool, memory_mask: pd.Series) -> pd.Series:
+    """Combine fresh-job detection with preserved values for memory jobs"""
+    if not enabled:
+        return pd.Series(False, index=df.index)
+    if not memory_mask.any():
+        return detected
+    values = detected.astype(object)
+    existing = _column(df, column, False)
+    values[memory_mask] = existing[memory_mask]
+    return _infer(values, df.index)
+
+
+def detect_owner_operator_series(title: pd.Series, description: pd.Series) -> pd.Series:
+    """Vectorized detect_owner_operator (title-based, plus must-own-equipment)"""
+    title_lower = title.astype(str).str.lower()
+    description_lower = description.astype(str).str.lower()
+
+    mixed = (
+        title_lower.str.contains(_OWNER_OP_DRIVER_TITLE_RE, regex=True)
+        & title_lower.str.contains(_OWNER_OP_MIXED_TITLE_RE, regex=True)
+    )
+    exclusive = (
+        title_lower.str.contains(_OWNER_OP_TITLE_RE, regex=True)
+        | _contains_any(description_lower, _OWN_EQUIPMENT_TERMS)
+    )
+    return (~mixed & exclusive).astype(bool)
+
+
+def generate_dedup_keys_series(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """Vectorized R1 (company+title+market) and R2 (company+market) keys"""
+
+    def first_truthy(primary: str, fallback: str) -> pd.Series:
+        primary_values = _column(df, primary, '')
+        fallback_values = _column(df, fallback, '')
+        chosen = primary_values.where(_truthy_mask(primary_values), fallback_values)
+        return chosen.astype(str).str.lower().str.strip()
+
+    company = first_truthy('norm.company', 'source.company')
+    title = first_truthy('norm.title', 'source.title')
+
+    # Empty company/title get a per-job suffix so they never collapse together
+    if 'id.job' in df.columns:
+        unique_id = df['id.job'].astype(object).astype(str)
+    else:
+        unique_id = pd.Series(df.index.astype(str), index=df.index)
+    company = company.mask(company == '', 'empty_company_' + unique_id)
+    title = title.mask(title == '', 'empty_title_' + unique_id)
+
+    market = _column(df, 'meta.market', 'Unknown').astype(str).str.lower()
+
+    return {
+        'rules.duplicate_r1': _md5_16(company + '|' + title + '|' + market),
+        'rules.duplicate_r2': _md5_16(company + '|' + market),
+    }
+
+
+def transform_business_rules_vectorized(df: pd.DataFrame, filter_settings: Dict[str, bool] = None) -> pd.DataFrame:
+    """
+    Vectorized equivalent of canonical_transforms.transform_business_rules
+
+    Args:
+        df: DataFrame with norm.* fields populated
+        filter_settings: Dict of filter names to enabled/disabled state
+
+    Returns:
+        DataFrame with rules.* fields added
+    """
+    if filter_settings is None:
+        filter_settings = {
+            'owner_op': True,
+            'school_bus': True,
+            'spam_filter': True,
+            'experience_filter': True,
+        }
+
+    if len(df) == 0:
+        return df
+
+    # Memory jobs keep their stored rule values
+    if 'sys.is_fresh_job' in df.columns:
+        memory_mask = df['sys.is_fresh_job'].astype(object).eq(False)
+    else:
+        memory_mask = pd.Series(False, index=df.index)
+
+    title = df['norm.title'].astype(str)
+    company = df['norm.company'].astype(str)
+    description = df['norm.description'].astype(str)
+
+    rules_fields = {}
+
+    rules_fields['rules.is_owner_op'] = _rule_column(
+        df, 'rules.is_owner_op',
+        detect_owner_operator_series(title, description),
+        filter_settings.get('owner_op', True), memory_mask
+    )
+
+    school_bus_text = (title + ' ' + description).str.lower()
+    rules_fields['rules.is_school_bus'] = _rule_column(
+        df, 'rules.is_school_bus',
+        school_bus_text.str.contains('school bus', regex=False).astype(bool),
+        filter_settings.get('school_bus', True), memory_mask
+    )
+
+    # Experience requirements - LLM handles this in AI classification
+    rules_fields['rules.has_experience_req'] = False
+    rules_fields['rules.experience_years_min'] = 0.0
+
+    spam_text = (company + ' ' + description).str.lower()
+    rules_fields['rules.is_spam_source'] = _rule_column(
+        df, 'rules.is_spam_source',
+        _contains_any(spam_text, _SPAM_TERMS),
+        filter_settings.get('spam_filter', True), memory_mask
+    )
+
+    rules_fields.update(generate_dedup_keys_series(df))
+
+    # Same readiness expression as the row-wise transform
+    rules_fields['route.ready_for_ai'] = (
+        (df['sys.is_fresh_job'] == True) &
+        (~rules_fields['rules.is_spam_source']) &
+        (~rules_fields['rules.is_owner_op']) &
+        (~rules_fields['rules.is_school_bus'])
+    )
+
+    rules_fields['route.stage'] = 'business_rules_applied'
+    rules_fields['sys.updated_at'] = datetime.now().isoformat()
+
+    print(f"⚡ Vectorized business rules: {len(df)} jobs ({int(memory_mask.sum())} memory jobs preserved)")
+    return df.assign(**rules_fields)